@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Plotly payload serialization benchmark script.
+Compares payload size and encode time of the standard JSON encoding with the
+orjson path, with and without base64 typed arrays (bdata), for each chart type.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+# Add analytics-service to path to import the app package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "analytics-service"))
+
+from app.visualization.visualizer import DataVisualizer
+from app.visualization.serialization import figure_to_json
+
+ROWS = 100_000
+REPEAT = 3
+
+
+class CapturingVisualizer(DataVisualizer):
+    """
+    DataVisualizer that keeps the last figure dict it serialized
+    """
+
+    def _figure_json(self, figure):
+        self.figure = figure if isinstance(figure, dict) else figure.to_dict()
+        return super()._figure_json(figure)
+
+
+def build_frame():
+    """
+    Build a per-ticket style frame
+    """
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "created_at": pd.date_range("2020-01-01", periods=ROWS, freq="15min"),
+        "response_time": rng.gamma(2.0, 30.0, ROWS),
+        "resolution_time": rng.gamma(3.0, 120.0, ROWS),
+        "reopened": rng.integers(0, 5, ROWS),
+        "day_of_week": rng.integers(0, 7, ROWS),
+        "hour": rng.integers(0, 24, ROWS),
+        "category": rng.choice(["network", "hardware", "software", "access"], ROWS),
+    })
+
+
+def chart_cases(df):
+    """
+    Chart type name and a callable building it with a visualizer
+    """
+    return [
+        ("line", lambda v: v.create_line_chart(df, "created_at", ["response_time", "resolution_time"], max_points=0)),
+        ("bar", lambda v: v.create_bar_chart(df.head(5000), "day_of_week", "response_time")),
+        ("scatter", lambda v: v.create_scatter_plot(df, "response_time", "resolution_time")),
+        ("heatmap", lambda v: v.create_heatmap(df, "hour", "day_of_week", "response_time")),
+        ("correlation", lambda v: v.create_correlation_matrix(df[["response_time", "resolution_time", "reopened", "hour"]])),
+        ("pie", lambda v: v.create_pie_chart(df.groupby("category", as_index=False)["reopened"].sum(), "category", "reopened")),
+    ]
+
+
+def timed(func, *args, **kwargs):
+    """
+    Run func REPEAT times and return (best seconds, result)
+    """
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """
+    Run the benchmark cases and print a comparison table.
+    """
+    df = build_frame()
+    visualizer = CapturingVisualizer(render_cache=None)
+    visualizer.render_cache = None
+
+    print(f"Benchmarking Plotly payload encoding on {ROWS:,} rows\n")
+    print(
+        f"{'chart':<14}{'json (KB)':>12}{'orjson (KB)':>13}{'bdata (KB)':>12}"
+        f"{'json (ms)':>12}{'orjson (ms)':>13}{'bdata (ms)':>12}{'size':>8}"
+    )
+
+    for name, build in chart_cases(df):
+        build(visualizer)
+        figure = visualizer.figure
+
+        json_time, json_payload = timed(json.dumps, figure, cls=PlotlyJSONEncoder)
+        orjson_time, orjson_payload = timed(figure_to_json, figure)
+        bdata_time, bdata_payload = timed(figure_to_json, figure, binary_arrays=True)
+
+        print(
+            f"{name:<14}{len(json_payload) / 1024:>12.1f}{len(orjson_payload) / 1024:>13.1f}"
+            f"{len(bdata_payload) / 1024:>12.1f}{json_time * 1000:>12.1f}{orjson_time * 1000:>13.1f}"
+            f"{bdata_time * 1000:>12.1f}{len(bdata_payload) / len(json_payload):>7.0%}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
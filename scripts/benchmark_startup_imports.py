@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Analytics service startup import benchmark script.
+Measures the import time of the application entry point, the modules that used
+to pull in plotting and modelling libraries, and each of those libraries, each
+in a fresh interpreter so no measurement benefits from an earlier import.
+"""
+
+import os
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "analytics-service")
+
+# Application modules on the startup path
+APP_MODULES = [
+    "app.main",
+    "app.api",
+    "app.visualization.visualizer",
+    "app.analytics.forecasting",
+    "app.analytics.normalization",
+]
+
+REPEAT = 3
+
+MEASURE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(f"{{elapsed:.6f}}|{{','.join(heavy)}}")
+"""
+
+
+def measure(module, heavy_modules):
+    """
+    Import a module in a fresh interpreter and return (best seconds, heavy modules loaded)
+    """
+    best = None
+    loaded = []
+    for _ in range(REPEAT):
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(module=module, heavy=heavy_modules)],
+            cwd=SERVICE_DIR,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            return None, error[-1] if error else "import failed"
+        elapsed, names = result.stdout.strip().splitlines()[-1].split("|")
+        best = float(elapsed) if best is None else min(best, float(elapsed))
+        loaded = [name for name in names.split(",") if name]
+    return best, loaded
+
+
+def main():
+    """
+    Run the import measurements and print a table.
+    """
+    sys.path.insert(0, SERVICE_DIR)
+    from app.core.lazy_imports import HEAVY_MODULES
+
+    print(f"Import time per module (best of {REPEAT}, fresh interpreter each)\n")
+    print(f"{'module':<34}{'import (ms)':>12}  heavy modules loaded")
+
+    for module in APP_MODULES + HEAVY_MODULES:
+        elapsed, loaded = measure(module, HEAVY_MODULES)
+        if elapsed is None:
+            print(f"{module:<34}{'error':>12}  {loaded}")
+            continue
+        if module in HEAVY_MODULES:
+            loaded = [name for name in loaded if name != module]
+        print(f"{module:<34}{elapsed * 1000:>12.1f}  {', '.join(loaded) or '-'}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
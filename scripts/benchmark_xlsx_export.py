@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Report service XLSX export benchmark script.
+Streams a report with row-level ticket data through the constant-memory
+Excel exporter and compares time and peak memory with building the same
+sheet through a pandas DataFrame. Each run happens in a fresh interpreter so
+peak RSS belongs to that run only.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "benchmark",
+    "MONGO_PASSWORD": "benchmark",
+    "MONGO_DB": "benchmark",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_DB": "benchmark",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "benchmark",
+}
+
+MEASURE = """
+import resource, time
+from datetime import datetime, timedelta
+
+from app.analytics.data_sources import TICKET_EXPORT_COLUMNS
+from app.analytics.report_exporter import stream_excel
+
+ROWS = {rows}
+STATUSES = ["open", "in_progress", "resolved", "closed"]
+PRIORITIES = ["low", "medium", "high", "critical"]
+
+def ticket_rows():
+    start = datetime(2024, 1, 1)
+    for i in range(ROWS):
+        yield (
+            f"T{{i:08d}}", start + timedelta(minutes=i), STATUSES[i % 4], PRIORITIES[i % 4],
+            f"user{{i % 5000}}", (i % 480) / 60, (i % 4800) / 60
+        )
+
+data = {{"summary": {{"total_tickets": ROWS}}, "timestamp": datetime.now().isoformat(), "period_days": 30}}
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+started = time.perf_counter()
+size = 0
+if {mode!r} == "constant_memory":
+    for chunk in stream_excel(data, rows=ticket_rows(), columns=TICKET_EXPORT_COLUMNS):
+        size += len(chunk)
+else:
+    import io
+    import pandas as pd
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        pd.DataFrame(ticket_rows(), columns=TICKET_EXPORT_COLUMNS).to_excel(writer, sheet_name="Data", index=False)
+    size = len(buffer.getvalue())
+elapsed = time.perf_counter() - started
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"{{elapsed:.3f}}|{{(peak - baseline) / 1024:.1f}}|{{size}}")
+"""
+
+
+def measure(mode, rows):
+    """
+    Export rows in a fresh interpreter and return (seconds, peak RSS growth in MB, file size)
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(mode=mode, rows=rows)],
+        cwd=SERVICE_DIR,
+        env={**SERVICE_ENV, **os.environ},
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError(error[-1] if error else "export failed")
+    elapsed, peak_mb, size = result.stdout.strip().splitlines()[-1].split("|")
+    return float(elapsed), float(peak_mb), int(size)
+
+
+def main():
+    """
+    Run the export measurements and print a table.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark XLSX report exports")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000],
+                        help="Row counts for the constant-memory exporter")
+    parser.add_argument("--pandas-rows", type=int, nargs="*", default=[100000],
+                        help="Row counts for the pandas DataFrame baseline")
+    args = parser.parse_args()
+
+    runs = [("constant_memory", rows) for rows in args.rows] + [("pandas", rows) for rows in args.pandas_rows]
+
+    print(f"{'mode':<18}{'rows':>10}{'seconds':>10}{'peak MB':>10}{'file MB':>10}")
+    for mode, rows in runs:
+        try:
+            elapsed, peak_mb, size = measure(mode, rows)
+        except RuntimeError as e:
+            print(f"{mode:<18}{rows:>10}  failed: {e}")
+            continue
+        print(f"{mode:<18}{rows:>10}{elapsed:>10.2f}{peak_mb:>10.1f}{size / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
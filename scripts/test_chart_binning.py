@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Analytics service chart binning test script.
+Bins large scatter data into density grids and checks that every point is
+accounted for by the grid or the individually shown outliers, that the grid
+is not stretched by extreme values and that the outlier budget is respected.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "analytics-service")
+sys.path.insert(0, SERVICE_DIR)
+
+from app.visualization.binning import bin_points  # noqa: E402
+
+
+def gamma_points(points=1_000_000, seed=1):
+    """
+    Skewed scatter data with a long tail of Tukey outliers
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.gamma(2.0, 2.0, points), "y": rng.gamma(2.0, 2.0, points)})
+
+
+def test_every_point_is_binned_or_shown():
+    df = gamma_points()
+    result = bin_points(df, "x", "y", bins=100, max_outliers=500)
+
+    assert result["summary"]["outliers"] > 500
+    assert len(result["outliers"]) == 500
+    assert result["counts"].sum() + len(result["outliers"]) == len(df)
+    assert result["summary"]["binned_points"] + result["summary"]["outliers_shown"] == result["summary"]["points"]
+
+
+def test_grid_spans_the_fenced_points():
+    df = gamma_points(points=100_000)
+    df.loc[0, "x"] = 1e9
+    result = bin_points(df, "x", "y", bins=50, max_outliers=10)
+
+    # The extreme point is shown individually and does not stretch the grid
+    assert 1e9 in result["outliers"]["x"].tolist()
+    assert result["x_edges"][-1] < 100
+
+
+def test_without_outlier_budget():
+    df = gamma_points(points=100_000)
+    result = bin_points(df, "x", "y", bins=50, max_outliers=0)
+
+    assert len(result["outliers"]) == 0
+    assert result["counts"].sum() == len(df)
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Analytics service line chart downsampling test script.
+Downsamples series with Largest-Triangle-Three-Buckets and checks that the
+point budget is never exceeded (with or without the min/max envelope), that
+the first and last points are kept and that spikes survive.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "analytics-service")
+sys.path.insert(0, SERVICE_DIR)
+
+from app.visualization.downsampling import downsample_series, lttb_indices  # noqa: E402
+
+
+def random_walk(points=10_000, seed=1):
+    """
+    Noisy series with evenly spaced x values
+    """
+    rng = np.random.default_rng(seed)
+    return np.arange(points, dtype=float), rng.normal(size=points).cumsum()
+
+
+def test_budget_is_never_exceeded():
+    x, y = random_walk()
+    for envelope in (True, False):
+        for max_points in range(1, 40):
+            indices = lttb_indices(x, y, max_points, envelope)
+            assert len(indices) <= max_points, (envelope, max_points, len(indices))
+            assert np.all(np.diff(indices) > 0)
+
+
+def test_first_and_last_points_are_kept():
+    x, y = random_walk()
+    for max_points in (2, 3, 4, 5, 100):
+        indices = lttb_indices(x, y, max_points)
+        assert indices[0] == 0 and indices[-1] == len(x) - 1
+
+
+def test_small_series_and_disabled_budget_keep_every_point():
+    x, y = random_walk(points=50)
+    assert len(lttb_indices(x, y, 50)) == 50
+    assert len(lttb_indices(x, y, 0)) == 50
+
+
+def test_envelope_keeps_spikes():
+    x, y = random_walk()
+    y[4321] = 1e6
+    y[7654] = -1e6
+    indices = lttb_indices(x, y, 200, envelope=True)
+    assert 4321 in indices and 7654 in indices
+
+
+def test_downsample_series_respects_small_budgets():
+    x, y = random_walk()
+    df = pd.DataFrame({"x": pd.date_range("2026-01-01", periods=len(x), freq="min"), "y": y})
+    series, summary = downsample_series(df, "x", ["y"], max_points=4)
+
+    assert len(series["y"][1]) <= 4
+    assert summary["downsampled"]
+    assert summary["reduced_points"]["y"] == len(series["y"][1])
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
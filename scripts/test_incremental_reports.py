@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+"""
+Report service incremental report test script.
+Builds a small analytics warehouse in SQLite and checks that incremental
+report aggregates reuse the per-day partials of earlier runs, recompute only
+new or changed days, and stay identical to a full rebuild.
+
+Requires: pip install mongomock
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import mongomock
+import numpy as np
+import pandas as pd
+import pymongo
+from sqlalchemy import create_engine, event, func, insert, select, update
+from sqlalchemy.pool import StaticPool
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_DB": "report_test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "test",
+}
+for name, value in SERVICE_ENV.items():
+    os.environ.setdefault(name, value)
+
+# The report service connects with pymongo.MongoClient at import time
+pymongo.MongoClient = mongomock.MongoClient
+sys.path.insert(0, SERVICE_DIR)
+
+from app.analytics import data_sources, incremental  # noqa: E402
+from app.analytics.report_generator import report_period  # noqa: E402
+from app.models import report_partial  # noqa: E402
+from app.models.warehouse import (  # noqa: E402
+    dim_dates, dim_priorities, dim_statuses, dim_users, fact_tickets, warehouse_metadata
+)
+
+AGGREGATES = ("ticket_summary", "user_activity", "response_times")
+TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class CountingSource(data_sources.WarehouseReportDataSource):
+    """
+    Warehouse data source recording how many days each partial computation covers
+    """
+
+    def __init__(self, engine):
+        super().__init__(engine, snapshots=data_sources.SnapshotCache())
+        self.computed = []
+
+    async def daily_partials(self, aggregate, days):
+        self.computed.append((aggregate, len(days)))
+        return await super().daily_partials(aggregate, days)
+
+
+def make_warehouse(tickets=5000, days=60, seed=1):
+    """
+    Create an in-memory warehouse with random tickets over the last days
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    warehouse_metadata.create_all(engine)
+    rng = np.random.default_rng(seed)
+    loaded_at = datetime(2024, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(dim_dates), [{"id": i + 1, "date": TODAY - timedelta(days=i)} for i in range(days)])
+        conn.execute(insert(dim_users), [
+            {"id": i + 1, "user_id": f"user{i}", "role": ["agent", "customer", "admin"][i % 3], "etl_updated_at": loaded_at}
+            for i in range(30)
+        ])
+        conn.execute(insert(dim_priorities), [
+            {"id": i + 1, "name": name, "level": i, "etl_updated_at": loaded_at}
+            for i, name in enumerate(["low", "medium", "high"])
+        ])
+        conn.execute(insert(dim_statuses), [
+            {"id": i + 1, "name": name, "etl_updated_at": loaded_at} for i, name in enumerate(["open", "closed"])
+        ])
+        conn.execute(insert(fact_tickets), [
+            {
+                "id": i + 1,
+                "ticket_id": f"T{i}",
+                "created_date_id": int(rng.integers(1, days + 1)),
+                "user_id": int(rng.integers(1, 31)),
+                "priority_id": int(rng.integers(1, 4)),
+                "status_id": int(rng.integers(1, 3)),
+                "response_time_minutes": float(rng.gamma(2, 30)) if rng.random() > 0.1 else None,
+                "resolution_time_minutes": float(rng.gamma(3, 300)) if rng.random() > 0.3 else None,
+                "etl_updated_at": loaded_at,
+            }
+            for i in range(tickets)
+        ])
+    return engine
+
+
+def fresh_store():
+    """
+    Point the partial model at an empty collection
+    """
+    report_partial.report_partial_collection = mongomock.MongoClient()["report_test"]["report_partials"]
+
+
+async def build(source, days=30, full_rebuild=False):
+    """
+    All aggregates of the last days through an incremental data source
+    """
+    incremental_source = incremental.IncrementalReportDataSource(source, full_rebuild=full_rebuild)
+    start, end = report_period(days)
+    return {name: await getattr(incremental_source, name)(start, end) for name in AGGREGATES}
+
+
+async def build_direct(engine, days=30):
+    """
+    All aggregates of the last days queried directly from the warehouse
+    """
+    source = data_sources.WarehouseReportDataSource(engine, snapshots=data_sources.SnapshotCache())
+    start, end = report_period(days)
+    return {name: await getattr(source, name)(start, end) for name in AGGREGATES}
+
+
+def identical(a, b):
+    """
+    Exact equality of aggregate results, including order and floats
+    """
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(identical(a[key], b[key]) for key in a)
+    if isinstance(a, (pd.Series, pd.DataFrame)):
+        return a.equals(b) and list(a.index) == list(b.index)
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(np.array_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def equivalent(a, b):
+    """
+    Equality of aggregate results up to ordering and float rounding
+
+    Histograms merged from per-day sketches may move values lying within the
+    sketch accuracy of a bin edge into the neighbouring bin.
+    """
+    if isinstance(a, dict):
+        return set(a) == set(b) and all(equivalent(a[key], b[key]) for key in a)
+    if isinstance(a, pd.Series):
+        return a.sort_index().tolist() == b.sort_index().tolist()
+    if isinstance(a, pd.DataFrame):
+        return sorted(map(tuple, a.values.tolist())) == sorted(map(tuple, b.values.tolist()))
+    if isinstance(a, tuple):
+        return (
+            np.allclose(a[0], b[0])
+            and a[1].sum() == b[1].sum()
+            and np.abs(a[1] - b[1]).sum() <= 0.02 * a[1].sum()
+        )
+    if isinstance(a, float):
+        return abs(a - b) < 1e-9
+    return a == b
+
+
+def test_first_run_matches_direct_queries():
+    fresh_store()
+    engine = make_warehouse()
+    source = CountingSource(engine)
+
+    result = asyncio.run(build(source))
+
+    assert [days for _, days in source.computed] == [30, 30, 30]
+    assert equivalent(result, asyncio.run(build_direct(engine)))
+
+
+def test_unchanged_days_are_reused():
+    fresh_store()
+    source = CountingSource(make_warehouse())
+    first = asyncio.run(build(source))
+
+    source.computed.clear()
+    second = asyncio.run(build(source))
+
+    assert source.computed == []
+    assert identical(first, second)
+
+
+def test_only_changed_and_new_days_are_recomputed():
+    fresh_store()
+    engine = make_warehouse()
+    source = CountingSource(engine)
+    asyncio.run(build(source))
+
+    with engine.begin() as conn:
+        # Reload the tickets of one day with new values
+        conn.execute(
+            update(fact_tickets)
+            .where(fact_tickets.c.created_date_id == 11)
+            .values(
+                resolution_time_minutes=fact_tickets.c.resolution_time_minutes * 2,
+                status_id=1,
+                etl_updated_at=datetime(2024, 2, 1)
+            )
+        )
+        # New tickets today
+        last_id = conn.execute(select(func.max(fact_tickets.c.id))).scalar()
+        conn.execute(insert(fact_tickets), [
+            {
+                "id": last_id + i + 1, "ticket_id": f"N{i}", "created_date_id": 1, "user_id": 3,
+                "priority_id": 2, "status_id": 2, "response_time_minutes": 5000.0,
+                "resolution_time_minutes": 9.0, "etl_updated_at": datetime(2024, 2, 1)
+            }
+            for i in range(5)
+        ])
+
+    source.computed.clear()
+    incremental_result = asyncio.run(build(source))
+    assert [days for _, days in source.computed] == [2, 2, 2]
+
+    source.computed.clear()
+    full_result = asyncio.run(build(source, full_rebuild=True))
+    assert [days for _, days in source.computed] == [30, 30, 30]
+
+    assert identical(incremental_result, full_result)
+    assert equivalent(incremental_result, asyncio.run(build_direct(engine)))
+
+
+def test_unchanged_reload_keeps_partials():
+    fresh_store()
+    engine = make_warehouse()
+    source = CountingSource(engine)
+    first = asyncio.run(build(source))
+
+    # A nightly ETL run touches every dimension row without changing it
+    with engine.begin() as conn:
+        for dimension in (dim_users, dim_priorities, dim_statuses):
+            conn.execute(update(dimension).values(etl_updated_at=datetime(2024, 3, 1)))
+
+    source.computed.clear()
+    second = asyncio.run(build(source))
+
+    assert source.computed == []
+    assert identical(first, second)
+
+
+def test_dimension_change_recomputes_every_day():
+    fresh_store()
+    engine = make_warehouse()
+    source = CountingSource(engine)
+    asyncio.run(build(source))
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(dim_users).where(dim_users.c.id == 1).values(role="vip", etl_updated_at=datetime(2024, 3, 1))
+        )
+
+    source.computed.clear()
+    result = asyncio.run(build(source))
+
+    assert [days for _, days in source.computed] == [30, 30, 30]
+    assert "vip" in set(result["user_activity"]["role_activity"]["role"])
+
+
+def test_windows_share_partials():
+    fresh_store()
+    source = CountingSource(make_warehouse())
+    asyncio.run(build(source, days=30))
+
+    source.computed.clear()
+    asyncio.run(build(source, days=7))
+
+    assert source.computed == []
+
+
+def test_response_time_partials_are_bounded():
+    fresh_store()
+    source = CountingSource(make_warehouse(tickets=20000, days=2))
+    partials = asyncio.run(source.daily_partials("response_times", [TODAY.date(), (TODAY - timedelta(days=1)).date()]))
+
+    for partial in partials.values():
+        for name in ("response", "resolution"):
+            times = partial[name]
+            # One bucket per 0.1% of the value range instead of one entry per ticket
+            buckets = np.log(times["max"] / times["min"]) / np.log(data_sources.RESPONSE_SKETCH_GAMMA) + 2
+            assert "values" not in times
+            assert len(times["sketch"]) <= buckets < times["count"]
+            assert sum(count for _, count in times["sketch"]) == times["count"]
+
+
+def test_histogram_buckets_are_floored():
+    fresh_store()
+    # Minutes in the upper half of their buckets: rounding the bucket index
+    # instead of flooring it moves them into the next bucket
+    values = [0.0, 100.0, 3.0, 18.0, 29.0, 44.0, 54.0, 69.0, 79.0, 89.0]
+    engine = make_warehouse(tickets=len(values))
+    with engine.begin() as conn:
+        for ticket_id, minutes in enumerate(values, start=1):
+            conn.execute(
+                update(fact_tickets).where(fact_tickets.c.id == ticket_id).values(response_time_minutes=minutes)
+            )
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    direct = asyncio.run(build_direct(engine, days=60))["response_times"]["response_histogram"]
+    incremental_result = asyncio.run(build(CountingSource(engine), days=60))["response_times"]["response_histogram"]
+
+    bins = data_sources.HISTOGRAM_BINS
+    expected = np.histogram(values, bins=bins, range=(0.0, 100.0))[0]
+    rounded = np.bincount(np.minimum(np.round(np.array(values) / (100.0 / bins)).astype(int), bins - 1), minlength=bins)
+    assert not np.array_equal(expected, rounded)
+    assert np.array_equal(direct[1], expected), direct[1]
+    assert np.array_equal(incremental_result[1], expected), incremental_result[1]
+    # SQLite truncates when casting, so also check the query floors explicitly
+    histogram_queries = [statement for statement in statements if "GROUP BY" in statement and "CASE" in statement]
+    assert histogram_queries and all("floor(" in statement.lower() for statement in histogram_queries)
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
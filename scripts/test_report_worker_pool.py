@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""
+Report service worker pool test script.
+Runs CPU-bound stand-in report tasks in the report worker pool and checks
+priorities (on-demand before scheduled), bounded concurrency, progress
+reporting, cancellation, that PDF renders and report data loads of worker
+processes run in the API process (sharing its snapshot cache across jobs),
+and that the event loop stays responsive while reports build.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_DB": "report_test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "test",
+}
+for name, value in SERVICE_ENV.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, SERVICE_DIR)
+
+from app.analytics import data_sources, pdf_renderer, report_jobs  # noqa: E402
+
+# Worker processes import the tasks from this module
+TASKS = os.path.splitext(os.path.basename(__file__))[0]
+
+
+async def busy_report(seconds, label, steps=5, progress=None):
+    """
+    Stand-in report task keeping a CPU busy for `seconds` in `steps` stages
+    """
+    for step in range(steps):
+        progress(f"step {step}", step / steps)
+        end = time.perf_counter() + seconds / steps
+        while time.perf_counter() < end:
+            pass
+    return {"label": label}
+
+
+async def failing_report(progress=None):
+    raise ValueError("report failed")
+
+
+async def pdf_report(html, progress=None):
+    return os.getpid(), await pdf_renderer.get_pdf_renderer().render_async(html)
+
+
+async def summary_report(seconds=0.0, progress=None):
+    """
+    Stand-in report task loading the ticket summary after `seconds` of work without progress updates
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    start = datetime(2024, 1, 1)
+    return os.getpid(), await data_sources.get_report_data_source().ticket_summary(start, start + timedelta(days=30))
+
+
+class SlowSummarySource(data_sources.ReportDataSource):
+    """
+    Stand-in for the API process's data source loading summaries through a snapshot cache
+    """
+
+    def __init__(self):
+        self.snapshots = data_sources.SnapshotCache(ttl=60)
+        self.loads = []
+
+    async def ticket_summary(self, start, end):
+        async def load():
+            self.loads.append(os.getpid())
+            await asyncio.sleep(0.5)
+            return {"total_tickets": 42}
+
+        return await self.snapshots.get(("summary", start, end), load)
+
+
+class RecordingPdfRenderer:
+    """
+    Stand-in for the API process's PDF renderer recording the process it renders in
+    """
+
+    def __init__(self):
+        self.renders = []
+
+    def submit(self, html):
+        if html == "busy":
+            raise pdf_renderer.PdfRenderBusy("PDF render queue is full")
+        self.renders.append(os.getpid())
+        future = Future()
+        future.set_result(f"PDF {html}".encode())
+        return future
+
+
+def submit(pool, seconds, label, priority=report_jobs.PRIORITY_ON_DEMAND, steps=5):
+    return pool.submit(f"{TASKS}:busy_report", {"seconds": seconds, "label": label, "steps": steps}, priority)
+
+
+async def wait_until(condition, timeout=30):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def check_priorities():
+    pool = report_jobs.ReportWorkerPool(max_workers=1)
+    try:
+        await check_priority_order(pool)
+    finally:
+        pool.shutdown()
+
+
+async def check_priority_order(pool):
+    blocker = submit(pool, 1.0, "blocker", report_jobs.PRIORITY_SCHEDULED)
+    await wait_until(lambda: blocker.status == report_jobs.JOB_RUNNING)
+
+    # Queued behind the running job: on-demand jobs overtake scheduled ones
+    jobs = [
+        submit(pool, 0.1, "scheduled 1", report_jobs.PRIORITY_SCHEDULED),
+        submit(pool, 0.1, "scheduled 2", report_jobs.PRIORITY_SCHEDULED),
+        submit(pool, 0.1, "on demand 1"),
+        submit(pool, 0.1, "on demand 2"),
+    ]
+    for job in [blocker] + jobs:
+        await job.wait()
+
+    order = [job.kwargs["label"] for job in sorted(jobs, key=lambda job: job.started_at)]
+    assert order == ["on demand 1", "on demand 2", "scheduled 1", "scheduled 2"], order
+
+
+async def check_progress_and_responsiveness(pool):
+    job = submit(pool, 2.0, "progress")
+    stages = set()
+    lags = []
+    while not job.finished:
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - started - 0.01)
+        if job.status == report_jobs.JOB_RUNNING and job.stage:
+            stages.add(job.stage)
+
+    assert (await job.wait()) == {"label": "progress"}
+    assert job.progress == 1.0 and job.stage == "done"
+    assert {"step 1", "step 2", "step 3"} <= stages, stages
+    print(f"   max event loop lag while building: {max(lags) * 1000:.1f} ms")
+    assert max(lags) < 0.1
+
+
+async def check_bounded_concurrency(pool):
+    jobs = [submit(pool, 0.3, f"job {i}") for i in range(4)]
+    running = 0
+    while not all(job.finished for job in jobs):
+        running = max(running, sum(job.status == report_jobs.JOB_RUNNING for job in jobs))
+        await asyncio.sleep(0.01)
+    assert running == pool.max_workers, running
+
+
+async def check_cancellation(pool):
+    running = submit(pool, 5.0, "running", steps=50)
+    queued = [submit(pool, 0.1, "queued") for _ in range(pool.max_workers)]
+    await wait_until(lambda: running.status == report_jobs.JOB_RUNNING and running.progress > 0)
+
+    pool.cancel(queued[-1].id)
+    started = time.monotonic()
+    pool.cancel(running.id)
+
+    for job in (running, queued[-1]):
+        try:
+            await job.wait()
+            raise AssertionError("cancelled job completed")
+        except report_jobs.ReportJobCancelled:
+            assert job.status == report_jobs.JOB_CANCELLED
+    assert time.monotonic() - started < 1.0
+    for job in queued[:-1]:
+        await job.wait()
+
+
+async def check_failure(pool):
+    job = pool.submit(f"{TASKS}:failing_report", {})
+    try:
+        await job.wait()
+        raise AssertionError("failing job completed")
+    except ValueError:
+        assert job.status == report_jobs.JOB_FAILED and job.error == "report failed"
+
+
+async def check_pdf_rendered_in_api_process(pool):
+    renderer = RecordingPdfRenderer()
+    pdf_renderer.set_pdf_renderer(renderer)
+    try:
+        worker_pid, pdf = await pool.submit(f"{TASKS}:pdf_report", {"html": "report"}).wait()
+        assert pdf == b"PDF report"
+        assert worker_pid != os.getpid() and renderer.renders == [os.getpid()]
+
+        job = pool.submit(f"{TASKS}:pdf_report", {"html": "busy"})
+        try:
+            await job.wait()
+            raise AssertionError("busy render completed")
+        except pdf_renderer.PdfRenderBusy:
+            assert job.status == report_jobs.JOB_FAILED
+    finally:
+        pdf_renderer.set_pdf_renderer(None)
+
+
+async def check_data_loaded_in_api_process(pool):
+    source = SlowSummarySource()
+    data_sources.set_report_data_source(source)
+    try:
+        jobs = [pool.submit(f"{TASKS}:summary_report", {}) for _ in range(2)]
+        results = [await job.wait() for job in jobs]
+
+        # Both workers got the summary of a single load in the API process
+        assert [summary for _, summary in results] == [{"total_tickets": 42}] * 2
+        assert all(worker_pid != os.getpid() for worker_pid, _ in results)
+        assert source.loads == [os.getpid()]
+
+        # A job cancelled while it works stops at its next data request
+        job = pool.submit(f"{TASKS}:summary_report", {"seconds": 1.0})
+        await wait_until(lambda: job.status == report_jobs.JOB_RUNNING)
+        pool.cancel(job.id)
+        try:
+            await job.wait()
+            raise AssertionError("cancelled job completed")
+        except report_jobs.ReportJobCancelled:
+            assert len(source.loads) == 1
+    finally:
+        data_sources.set_report_data_source(None)
+
+
+async def check_queue_limit():
+    pool = report_jobs.ReportWorkerPool(max_workers=0, max_queued=1)
+    first = submit(pool, 0.01, "first")
+    try:
+        submit(pool, 0.01, "second")
+        raise AssertionError("queue limit not applied")
+    except report_jobs.ReportQueueFull:
+        pass
+    await first.wait()
+
+
+def main():
+    """
+    Run all checks and print the results.
+    """
+    async def run_checks():
+        pool = report_jobs.ReportWorkerPool(max_workers=2, max_queued=20)
+        checks = [
+            ("priorities", check_priorities),
+            ("progress_and_responsiveness", lambda: check_progress_and_responsiveness(pool)),
+            ("bounded_concurrency", lambda: check_bounded_concurrency(pool)),
+            ("cancellation", lambda: check_cancellation(pool)),
+            ("failure", lambda: check_failure(pool)),
+            ("pdf_rendered_in_api_process", lambda: check_pdf_rendered_in_api_process(pool)),
+            ("data_loaded_in_api_process", lambda: check_data_loaded_in_api_process(pool)),
+            ("queue_limit", check_queue_limit),
+        ]
+        failures = 0
+        for name, check in checks:
+            try:
+                await check()
+                print(f"[OK]   {name}")
+            except Exception as e:
+                failures += 1
+                print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+        pool.shutdown()
+        print(f"{len(checks) - failures}/{len(checks)} passed")
+        return 1 if failures else 0
+
+    return asyncio.run(run_checks())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+"""
+Report service response cache test script.
+Runs the response cache against an in-memory Redis and checks stampede
+protection within and across replicas, probabilistic early refresh (XFetch),
+tag invalidation and that arguments with different contents get different
+cache keys.
+
+Requires: pip install -r services/report-service/requirements-dev.txt
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+from fakeredis import FakeServer, aioredis
+from pydantic import BaseModel
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_DB": "report_test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "test",
+}
+for name, value in SERVICE_ENV.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, SERVICE_DIR)
+
+from app.core import cache  # noqa: E402
+
+
+class Counter:
+    """
+    Stand-in computation counting its calls
+    """
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.seconds = seconds
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.seconds)
+        if self.fail:
+            raise RuntimeError("compute failed")
+        return {"value": self.calls}
+
+
+class Filters(BaseModel):
+    status: str
+    tags: list
+
+
+def replicas(count=2):
+    """
+    Response caches of several replicas sharing one Redis server
+    """
+    server = FakeServer()
+    return [cache.ResponseCache(aioredis.FakeRedis(server=server)) for _ in range(count)]
+
+
+def fixed_draw(run, draw=0.5):
+    """
+    Run a coroutine function with the early refresh draw fixed, so XFetch decisions are deterministic
+    """
+    random = cache.random.random
+    cache.random.random = lambda: draw
+    try:
+        return asyncio.run(run())
+    finally:
+        cache.random.random = random
+
+
+def test_stampede_computes_once_per_process():
+    async def run():
+        (response_cache,) = replicas(1)
+        compute = Counter(seconds=0.2)
+        results = await asyncio.gather(*[response_cache.get_or_compute("key", compute) for _ in range(20)])
+        return compute.calls, results, response_cache.metrics
+
+    calls, results, metrics = asyncio.run(run())
+    assert calls == 1
+    assert results == [{"value": 1}] * 20
+    assert metrics.misses == 20 and metrics.computes == 1
+
+
+def test_stampede_computes_once_across_replicas():
+    async def run():
+        first, second = replicas(2)
+        compute = Counter(seconds=0.2)
+        results = await asyncio.gather(
+            first.get_or_compute("key", compute),
+            second.get_or_compute("key", compute)
+        )
+        return compute.calls, results, second.metrics
+
+    calls, results, metrics = asyncio.run(run())
+    # The second replica waits for the value written under the first one's fill lock
+    assert calls == 1
+    assert results == [{"value": 1}] * 2
+    assert metrics.lock_waits == 1
+
+
+def test_early_refresh_near_expiry():
+    async def run():
+        (response_cache,) = replicas(1)
+        compute = Counter(seconds=0.01)
+        await response_cache.get_or_compute("key", compute, ttl=60)
+
+        # Far from expiry a hit is served as is
+        assert await response_cache.get_or_compute("key", compute, ttl=60) == {"value": 1}
+        await asyncio.sleep(0.05)
+        assert compute.calls == 1
+
+        # A value that took long to compute is refreshed in the background well before expiry
+        await response_cache._write("key", {"value": 1}, 60, 3600.0, [])
+        assert await response_cache.get_or_compute("key", compute, ttl=60) == {"value": 1}
+        await asyncio.sleep(0.05)
+        refreshed = await response_cache.get_or_compute("key", Counter(), ttl=60)
+        return compute.calls, refreshed, response_cache.metrics
+
+    calls, refreshed, metrics = fixed_draw(run)
+    assert calls == 2
+    assert refreshed == {"value": 2}
+    assert metrics.early_refreshes >= 1
+
+
+def test_failed_early_refresh_is_logged():
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    cache.logger.addHandler(handler)
+
+    async def run():
+        (response_cache,) = replicas(1)
+        await response_cache._write("key", {"value": 1}, 60, 3600.0, [])
+        value = await response_cache.get_or_compute("key", Counter(fail=True), ttl=60)
+        await asyncio.sleep(0.05)
+        return value, response_cache.metrics
+
+    try:
+        value, metrics = fixed_draw(run)
+    finally:
+        cache.logger.removeHandler(handler)
+    assert value == {"value": 1}
+    assert metrics.errors == 1
+    assert any("Early refresh of cache key key failed" in record.getMessage() for record in records)
+
+
+def test_tag_invalidation():
+    async def run():
+        (response_cache,) = replicas(1)
+        for key, tags in (("a", ["reports"]), ("b", ["reports", "user:1"]), ("c", ["user:1"]), ("d", [])):
+            await response_cache.get_or_compute(key, Counter(), tags=tags)
+
+        removed = await response_cache.invalidate_tags("reports")
+        remaining = {key: await response_cache._read(key) is not None for key in "abcd"}
+        tag_left = await response_cache.client.exists(cache.TAG_PREFIX + "reports")
+        return removed, remaining, tag_left
+
+    removed, remaining, tag_left = asyncio.run(run())
+    assert removed == 2
+    assert remaining == {"a": False, "b": False, "c": True, "d": True}
+    assert not tag_left
+
+
+def test_keys_vary_on_argument_contents():
+    keys = []
+
+    async def endpoint(ids, body, filters, current_user):
+        return None
+
+    async def run():
+        original = cache.get_response_cache
+        async def record(key, compute, **kwargs):
+            keys.append(key)
+            return await compute()
+        stub = type("Stub", (), {"get_or_compute": staticmethod(record)})()
+        cache.get_response_cache = lambda: stub
+        try:
+            wrapped = cache.cached("test")(endpoint)
+            user = {"id": "u1", "name": "User"}
+            await wrapped([1, 2], {"status": "open"}, Filters(status="open", tags=["a"]), user)
+            await wrapped([1, 3], {"status": "open"}, Filters(status="open", tags=["a"]), user)
+            await wrapped([1, 2], {"status": "closed"}, Filters(status="open", tags=["a"]), user)
+            await wrapped([1, 2], {"status": "open"}, Filters(status="open", tags=["b"]), user)
+            await wrapped([1, 2], {"status": "open"}, Filters(status="open", tags=["a"]), {"id": "u1", "name": "Renamed"})
+        finally:
+            cache.get_response_cache = original
+
+    asyncio.run(run())
+    assert len(set(keys[:4])) == 4, keys
+    # Dicts with an id (the current user) contribute only their id
+    assert keys[4] == keys[0]
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+"""
+Report service scheduled report claim test script.
+Runs several simulated replicas against a local in-process MongoDB stand-in
+(mongomock) and checks that every due scheduled report is claimed and
+executed exactly once, that expired leases can be taken over, that more
+replicas finish a backlog faster, and that each run of a report group job
+(fired by every replica sharing the job store) is built once.
+
+Requires: pip install -r services/report-service/requirements-dev.txt
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import mongomock
+import pymongo
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_DB": "report_test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "test",
+}
+for name, value in SERVICE_ENV.items():
+    os.environ.setdefault(name, value)
+
+# The report service connects with pymongo.MongoClient at import time
+pymongo.MongoClient = mongomock.MongoClient
+sys.path.insert(0, SERVICE_DIR)
+
+from app.analytics import scheduler  # noqa: E402
+from app.models import scheduled_report  # noqa: E402
+
+
+class AtomicCollection:
+    """
+    Collection wrapper making each operation atomic across threads, as single
+    operations are on a MongoDB server (mongomock does not lock them)
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        return call
+
+
+def fresh_collection():
+    """
+    Point the model at an empty collection with the claim index
+    """
+    collection = mongomock.MongoClient()["report_test"]["scheduled_reports"]
+    collection.create_index([("active", 1), ("next_run", 1)])
+    scheduled_report.scheduled_report_collection = AtomicCollection(collection)
+    return collection
+
+
+def insert_due_reports(collection, count):
+    """
+    Insert count active daily reports that are overdue
+    """
+    now = datetime.utcnow()
+    collection.insert_many([
+        {
+            "name": f"Report {i}",
+            "report_params": {"report_type": "ticket_summary", "time_range": "monthly"},
+            "frequency": "daily",
+            "hour": 6,
+            "minute": 0,
+            "format": "pdf",
+            "recipients": [],
+            "created_by": f"user{i}",
+            "active": True,
+            "next_run": now - timedelta(minutes=i % 60),
+        }
+        for i in range(count)
+    ])
+
+
+def fresh_group_run_collection():
+    """
+    Point the model at an empty collection of group run claims
+    """
+    collection = mongomock.MongoClient()["report_test"]["report_group_runs"]
+    scheduled_report.report_group_run_collection = AtomicCollection(collection)
+    return collection
+
+
+def run_replicas(replicas, work_seconds=0.0, lease_seconds=60):
+    """
+    Run replicas in threads, each claiming and completing reports until none are due
+
+    Returns:
+        (executions as (replica, report id) pairs, elapsed seconds)
+    """
+    executions = []
+    executions_lock = threading.Lock()
+
+    def replica(owner):
+        while True:
+            report = scheduled_report.claim_due_report(owner, lease_seconds)
+            if report is None:
+                return
+            time.sleep(work_seconds)
+            assert scheduled_report.complete_claimed_report(report["id"], owner)
+            with executions_lock:
+                executions.append((owner, report["id"]))
+
+    threads = [threading.Thread(target=replica, args=(f"replica-{i}",)) for i in range(replicas)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return executions, time.perf_counter() - started
+
+
+def test_claim_index():
+    collection = fresh_collection()
+    keys = [index["key"] for index in collection.index_information().values()]
+    assert [("active", 1), ("next_run", 1)] in keys
+
+
+def test_each_report_runs_once_across_replicas():
+    collection = fresh_collection()
+    insert_due_reports(collection, 300)
+
+    executions, _ = run_replicas(replicas=6)
+
+    report_ids = [report_id for _, report_id in executions]
+    assert len(report_ids) == 300
+    assert len(set(report_ids)) == 300
+    assert len({owner for owner, _ in executions}) > 1
+
+    now = datetime.utcnow()
+    for report in collection.find():
+        assert report["next_run"] > now
+        assert "lease_owner" not in report and "lease_expires_at" not in report
+
+
+def test_inactive_and_future_reports_are_not_claimed():
+    collection = fresh_collection()
+    insert_due_reports(collection, 2)
+    collection.update_many({}, {"$set": {"active": False}})
+    collection.insert_one({
+        "frequency": "daily", "hour": 6, "minute": 0, "created_by": "user",
+        "active": True, "next_run": datetime.utcnow() + timedelta(hours=1)
+    })
+
+    assert scheduled_report.claim_due_report("replica-0", 60) is None
+
+
+def test_held_claim_blocks_other_replicas():
+    collection = fresh_collection()
+    insert_due_reports(collection, 1)
+
+    claimed = scheduled_report.claim_due_report("replica-0", 60)
+    assert claimed["lease_owner"] == "replica-0"
+    assert scheduled_report.claim_due_report("replica-1", 60) is None
+    assert not scheduled_report.complete_claimed_report(claimed["id"], "replica-1")
+
+
+def test_expired_lease_is_taken_over():
+    collection = fresh_collection()
+    insert_due_reports(collection, 1)
+
+    crashed = scheduled_report.claim_due_report("replica-0", 0.2)
+    time.sleep(0.3)
+    taken_over = scheduled_report.claim_due_report("replica-1", 60)
+
+    assert taken_over["id"] == crashed["id"]
+    # The replica that lost its lease can no longer renew or complete the report
+    assert not scheduled_report.renew_report_lease(crashed["id"], "replica-0", 60)
+    assert not scheduled_report.complete_claimed_report(crashed["id"], "replica-0")
+    assert scheduled_report.complete_claimed_report(taken_over["id"], "replica-1")
+
+
+def test_released_report_is_retried_later():
+    collection = fresh_collection()
+    insert_due_reports(collection, 1)
+
+    claimed = scheduled_report.claim_due_report("replica-0", 60)
+    assert scheduled_report.release_claimed_report(claimed["id"], "replica-0", retry_seconds=0.2)
+    assert scheduled_report.claim_due_report("replica-1", 60) is None
+
+    time.sleep(0.3)
+    assert scheduled_report.claim_due_report("replica-1", 60)["id"] == claimed["id"]
+
+
+def test_more_replicas_increase_throughput():
+    timings = {}
+    for replicas in (1, 4):
+        collection = fresh_collection()
+        insert_due_reports(collection, 40)
+        executions, elapsed = run_replicas(replicas=replicas, work_seconds=0.02)
+        assert len({report_id for _, report_id in executions}) == 40
+        timings[replicas] = elapsed
+
+    print(f"   1 replica: {timings[1]:.2f}s, 4 replicas: {timings[4]:.2f}s")
+    assert timings[4] < timings[1] / 2
+
+
+def test_group_run_time_is_shared_by_replicas():
+    subscribers = [{"frequency": "daily", "start_date": "2026-03-01T06:00:00"}]
+    run_time = datetime(2026, 3, 10, 6, 0)
+
+    # Replicas firing the same run a little early or late agree on its time
+    for delay in (-30, 0, 5, 600):
+        assert scheduler._group_run_time(subscribers, run_time + timedelta(seconds=delay)) == run_time
+    assert scheduler._group_run_time(subscribers, run_time + timedelta(days=1)) == run_time + timedelta(days=1)
+
+
+def test_group_run_is_built_once_across_replicas():
+    fresh_group_run_collection()
+    builds = []
+
+    class Job:
+        async def wait(self):
+            await asyncio.sleep(0.05)
+            return {"report": "built"}
+
+    def submit_report_build(*args, **kwargs):
+        builds.append(args)
+        return Job()
+
+    async def save_report_for_user(built_report, **kwargs):
+        return {"id": kwargs["user_id"]}
+
+    subscribers = [
+        {"subscription_id": f"s{i}", "user_id": f"user{i}", "frequency": "daily",
+         "start_date": (datetime.now() - timedelta(days=3)).isoformat(), "end_date": None}
+        for i in range(2)
+    ]
+
+    async def fire_on_replicas(replicas):
+        return await asyncio.gather(*[
+            scheduler.run_report_group("report-group-test", "ticket_summary", {"days": 7}, None, ["pdf"], subscribers)
+            for _ in range(replicas)
+        ])
+
+    original = scheduler.submit_report_build, scheduler.save_report_for_user
+    scheduler.submit_report_build, scheduler.save_report_for_user = submit_report_build, save_report_for_user
+    try:
+        results = asyncio.run(fire_on_replicas(4))
+    finally:
+        scheduler.submit_report_build, scheduler.save_report_for_user = original
+
+    assert len(builds) == 1
+    assert sorted(len(saved) for saved in results) == [0, 0, 0, 2]
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Report service snapshot cache test script.
+Checks that concurrent loads of the same snapshot are single-flight, that
+snapshots are evicted with their last consumer and not shared past the TTL,
+and that snapshots of another event loop or failed loads are not reused.
+"""
+
+import asyncio
+import os
+import sys
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "report-service")
+
+# Settings required to import the report service modules
+SERVICE_ENV = {
+    "MONGO_HOST": "localhost",
+    "MONGO_PORT": "27017",
+    "MONGO_USER": "test",
+    "MONGO_PASSWORD": "test",
+    "MONGO_DB": "report_test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "USER_SERVICE_URL": "http://localhost:8001",
+    "TICKET_SERVICE_URL": "http://localhost:8002",
+    "JWT_PUBLIC_KEY": "test",
+}
+for name, value in SERVICE_ENV.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, SERVICE_DIR)
+
+from app.analytics.snapshot_cache import SnapshotCache, _Snapshot  # noqa: E402
+
+
+class Loader:
+    """
+    Stand-in snapshot load counting its calls
+    """
+
+    def __init__(self, seconds=0.0, fail=False):
+        self.seconds = seconds
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.seconds)
+        if self.fail:
+            raise RuntimeError("load failed")
+        return {"load": self.calls}
+
+
+def test_concurrent_gets_load_once():
+    async def run():
+        snapshot_cache = SnapshotCache(ttl=60)
+        loader = Loader(seconds=0.1)
+        results = await asyncio.gather(*[snapshot_cache.get("key", loader) for _ in range(10)])
+        return loader.calls, results, snapshot_cache.stats()
+
+    calls, results, stats = asyncio.run(run())
+    assert calls == 1
+    assert results == [{"load": 1}] * 10
+    assert stats == {"snapshots": 0, "loads": 1, "shared": 9}
+
+
+def test_snapshot_is_not_shared_past_ttl():
+    async def run():
+        snapshot_cache = SnapshotCache(ttl=0.05)
+        loader = Loader()
+        async with snapshot_cache.snapshot("key", loader) as first:
+            async with snapshot_cache.snapshot("key", loader) as shared:
+                pass
+            await asyncio.sleep(0.1)
+            async with snapshot_cache.snapshot("key", loader) as expired:
+                pass
+        return first, shared, expired, loader.calls
+
+    first, shared, expired, calls = asyncio.run(run())
+    assert shared is first
+    assert expired == {"load": 2}
+    assert calls == 2
+
+
+def test_snapshot_is_released_with_its_last_consumer():
+    async def run():
+        snapshot_cache = SnapshotCache(ttl=60)
+        loader = Loader()
+        counts = []
+        async with snapshot_cache.snapshot("key", loader):
+            async with snapshot_cache.snapshot("key", loader):
+                counts.append(snapshot_cache._snapshots["key"].consumers)
+            # The first consumer still holds it
+            counts.append(snapshot_cache._snapshots["key"].consumers)
+        counts.append(len(snapshot_cache._snapshots))
+        await snapshot_cache.get("key", loader)
+        return counts, loader.calls
+
+    counts, calls = asyncio.run(run())
+    assert counts == [2, 1, 0]
+    assert calls == 2
+
+
+def test_snapshot_of_another_loop_is_not_used():
+    snapshot_cache = SnapshotCache(ttl=60)
+
+    async def load_in_first_loop():
+        future = asyncio.get_running_loop().create_future()
+        future.set_result({"load": "first loop"})
+        snapshot = _Snapshot(future, float("inf"))
+        snapshot.consumers = 1
+        snapshot_cache._snapshots["key"] = snapshot
+        return snapshot
+
+    async def get_in_second_loop(snapshot):
+        loader = Loader()
+        return snapshot.usable(), await snapshot_cache.get("key", loader), loader.calls
+
+    snapshot = asyncio.run(load_in_first_loop())
+    usable, value, calls = asyncio.run(get_in_second_loop(snapshot))
+    assert not usable
+    assert value == {"load": 1}
+    assert calls == 1
+
+
+def test_failed_load_is_not_reused():
+    async def run():
+        snapshot_cache = SnapshotCache(ttl=60)
+        failing = Loader(fail=True)
+        results = await asyncio.gather(*[snapshot_cache.get("key", failing) for _ in range(3)], return_exceptions=True)
+        value = await snapshot_cache.get("key", Loader())
+        return failing.calls, results, value
+
+    calls, results, value = asyncio.run(run())
+    # Consumers waiting on the failed load share its error, later ones load again
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert value == {"load": 1}
+
+
+def main():
+    """
+    Run all tests and print the results.
+    """
+    tests = [(name, value) for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failures = 0
+    for name, test in tests:
+        try:
+            test()
+            print(f"[OK]   {name}")
+        except Exception as e:
+            failures += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+    print(f"{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
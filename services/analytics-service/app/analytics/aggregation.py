@@ -1,24 +1,79 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, desc, asc, and_, or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, distinct, desc, asc, and_, or_, case
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from app.models.sql_models import (
     FactTicket, DimTicketType, DimTicketStatus, DimDate, 
-    DimUser, DimPriority, DimDepartment, FactUserActivity
+    DimUser, DimPriority, DimDepartment, FactUserActivity,
+    DimCategory, DimStatus
 )
 from app.schemas.analytics import (
     AggregationWindow, TimeGranularity, 
     AggregationDimension, AggregationMetric
 )
+from app.analytics.correlation import StreamingCorrelation, correlation_from_chunks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Aliases for dimensions that fact_tickets references more than once
+CreatedDate = aliased(DimDate, name="created_date")
+Assignee = aliased(DimUser, name="assignee")
+
+# Join conditions from fact_tickets to each dimension
+TICKET_DIMENSION_JOINS = {
+    CreatedDate: FactTicket.created_date_id == CreatedDate.id,
+    Assignee: FactTicket.assigned_to_id == Assignee.id,
+    DimCategory: FactTicket.category_id == DimCategory.id,
+    DimPriority: FactTicket.priority_id == DimPriority.id,
+    DimStatus: FactTicket.status_id == DimStatus.id,
+}
+
+# Per-ticket value columns for ticket metrics
+TICKET_METRIC_COLUMNS = {
+    AggregationMetric.TICKET_COUNT: FactTicket.id,
+    AggregationMetric.RESPONSE_TIME: FactTicket.response_time_minutes,
+    AggregationMetric.RESOLUTION_TIME: FactTicket.resolution_time_minutes,
+    AggregationMetric.REOPENED_COUNT: FactTicket.reopened_count,
+}
+
+# Seasonal buckets: DimDate attributes (or the ticket's creation hour) to group by,
+# and the calendar period ('day' or 'year') each occurrence of a bucket belongs to
+SEASONAL_BUCKETS = {
+    "daily": ([FactTicket.created_hour.label("hour")], "day"),
+    "weekly": ([CreatedDate.day_of_week.label("day_of_week")], "day"),
+    "monthly": ([CreatedDate.day.label("day")], "day"),
+    "quarterly": ([CreatedDate.quarter.label("quarter")], "year"),
+    "yearly": ([CreatedDate.month.label("month")], "year"),
+    "heatmap": (
+        [CreatedDate.day_of_week.label("day_of_week"), FactTicket.created_hour.label("hour")],
+        "day"
+    ),
+}
+
+# DimDate bucket attributes computed from calendar days (matching the ETL's date dimension)
+CALENDAR_ATTRIBUTES = {
+    "day_of_week": lambda days: days.dayofweek,
+    "day": lambda days: days.day,
+    "quarter": lambda days: days.quarter,
+    "month": lambda days: days.month,
+}
+
+# SQL aggregate functions available for pivot cells
+PIVOT_AGGREGATIONS = {
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+    "count": func.count,
+}
+
 
 class DataAggregator:
     """
@@ -548,4 +603,518 @@ class DataAggregator:
         results = query.all()
         df = pd.DataFrame([dict(row) for row in results])
         
-        return df
\ No newline at end of file
+        return df
+    
+    def _ticket_dimension(
+        self,
+        dimension: AggregationDimension,
+        time_granularity: Optional[TimeGranularity] = None
+    ) -> Tuple[Any, List[Any]]:
+        """
+        Resolve a dimension to its SQL expression on fact_tickets
+        
+        Args:
+            dimension: Dimension to resolve
+            time_granularity: Granularity used for the time dimension (defaults to day)
+            
+        Returns:
+            Tuple of (SQL expression, dimension tables that must be joined)
+        """
+        if dimension == AggregationDimension.TIME:
+            granularity = time_granularity or TimeGranularity.DAY
+            return func.date_trunc(granularity.value, CreatedDate.date), [CreatedDate]
+        elif dimension == AggregationDimension.USER:
+            return Assignee.username, [Assignee]
+        elif dimension == AggregationDimension.DEPARTMENT:
+            return Assignee.department, [Assignee]
+        elif dimension == AggregationDimension.CATEGORY:
+            return DimCategory.name, [DimCategory]
+        elif dimension == AggregationDimension.PRIORITY:
+            return DimPriority.name, [DimPriority]
+        elif dimension == AggregationDimension.STATUS:
+            return DimStatus.name, [DimStatus]
+        
+        raise ValueError(f"Unsupported ticket dimension: {dimension}")
+    
+    def _ticket_metric_value(self, metric: AggregationMetric) -> Any:
+        """
+        Resolve a metric to its per-ticket value column on fact_tickets
+        """
+        if metric not in TICKET_METRIC_COLUMNS:
+            raise ValueError(f"Unsupported ticket metric: {metric}")
+        
+        return TICKET_METRIC_COLUMNS[metric]
+    
+    def _ticket_query(
+        self,
+        columns: List[Any],
+        joins: List[Any],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Build a query over fact_tickets with the required dimension joins and filters
+        
+        Args:
+            columns: Columns to select
+            joins: Dimension tables referenced by the selected columns
+            start_date: Optional start of the ticket creation window
+            end_date: Optional end of the ticket creation window
+            filters: Optional filters keyed by dimension name, either a raw value
+                or {"operator": ..., "value": ...}
+            
+        Returns:
+            SQLAlchemy query
+        """
+        required_joins = list(joins)
+        conditions = []
+        
+        if start_date is not None or end_date is not None:
+            required_joins.append(CreatedDate)
+            if start_date is not None:
+                conditions.append(CreatedDate.date >= start_date)
+            if end_date is not None:
+                conditions.append(CreatedDate.date <= end_date)
+        
+        for field, condition in (filters or {}).items():
+            try:
+                expression, filter_joins = self._ticket_dimension(AggregationDimension(field))
+            except ValueError:
+                logger.warning(f"Ignoring filter on unsupported field '{field}'")
+                continue
+            
+            required_joins.extend(filter_joins)
+            
+            if isinstance(condition, dict) and "value" in condition:
+                operator = condition.get("operator", "eq")
+                value = condition["value"]
+            else:
+                operator = "eq"
+                value = condition
+            
+            if operator == "eq":
+                conditions.append(expression == value)
+            elif operator == "ne":
+                conditions.append(expression != value)
+            elif operator == "gt":
+                conditions.append(expression > value)
+            elif operator == "gte":
+                conditions.append(expression >= value)
+            elif operator == "lt":
+                conditions.append(expression < value)
+            elif operator == "lte":
+                conditions.append(expression <= value)
+            elif operator == "in":
+                conditions.append(expression.in_(value if isinstance(value, list) else [value]))
+            elif operator == "not_in":
+                conditions.append(expression.notin_(value if isinstance(value, list) else [value]))
+            elif operator == "contains":
+                conditions.append(expression.contains(value))
+            else:
+                logger.warning(f"Ignoring filter with unsupported operator '{operator}'")
+        
+        query = self.db.query(*columns).select_from(FactTicket)
+        
+        # Join each dimension once, keeping tickets with missing dimension keys
+        joined = []
+        for target in required_joins:
+            if target not in joined:
+                query = query.outerjoin(target, TICKET_DIMENSION_JOINS[target])
+                joined.append(target)
+        
+        if conditions:
+            query = query.filter(and_(*conditions))
+        
+        return query
+    
+    def pivot_ticket_metrics(
+        self,
+        row_dimension: AggregationDimension,
+        column_dimension: AggregationDimension,
+        value_metric: AggregationMetric,
+        aggregation_function: str = "sum",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        time_granularity: Optional[TimeGranularity] = None,
+        top_k_columns: int = 20,
+        other_label: str = "Other"
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Compute a pivot table in the database with conditional aggregation
+        
+        The column dimension is limited to its top K values by ticket count; all
+        remaining values are folded into a single "other" column. Only the final
+        matrix is transferred from the database.
+        
+        Args:
+            row_dimension: Dimension for pivot table rows
+            column_dimension: Dimension for pivot table columns
+            value_metric: Metric for pivot table values
+            aggregation_function: Function to aggregate values (sum, avg, min, max, count)
+            start_date: Optional start date for the analysis
+            end_date: Optional end date for the analysis
+            filters: Optional filters to apply
+            time_granularity: Granularity used when either dimension is time
+            top_k_columns: Maximum number of individual columns before folding into "other"
+            other_label: Label for the folded column
+            
+        Returns:
+            Tuple of (pivot DataFrame indexed by row value, pivot metadata)
+        """
+        if aggregation_function not in PIVOT_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation function: {aggregation_function}")
+        
+        top_k_columns = max(int(top_k_columns), 1)
+        
+        row_expr, row_joins = self._ticket_dimension(row_dimension, time_granularity)
+        column_expr, column_joins = self._ticket_dimension(column_dimension, time_granularity)
+        value_expr = self._ticket_metric_value(value_metric)
+        aggregate = PIVOT_AGGREGATIONS[aggregation_function]
+        
+        # Rank column values by ticket count; fetching K + 1 tells whether an "other" bucket is needed
+        ranking = self._ticket_query(
+            [column_expr.label("column_value"), func.count(FactTicket.id).label("tickets")],
+            column_joins, start_date, end_date, filters
+        ).group_by(column_expr).order_by(desc("tickets"), column_expr).limit(top_k_columns + 1).all()
+        
+        top_values = [row.column_value for row in ranking[:top_k_columns]]
+        has_other = len(ranking) > top_k_columns
+        
+        def cell(condition):
+            # Ticket count is always a count of tickets, other metrics use the requested function
+            if value_metric == AggregationMetric.TICKET_COUNT:
+                return func.count(case((condition, FactTicket.id)))
+            return aggregate(case((condition, value_expr)))
+        
+        select_columns = [row_expr.label("row_value")]
+        column_labels = []
+        for index, value in enumerate(top_values):
+            condition = column_expr.is_(None) if value is None else column_expr == value
+            select_columns.append(cell(condition).label(f"c{index}"))
+            column_labels.append(self._pivot_label(value))
+        
+        if has_other:
+            known_values = [value for value in top_values if value is not None]
+            if None in top_values:
+                condition = and_(column_expr.isnot(None), column_expr.notin_(known_values))
+            else:
+                condition = or_(column_expr.is_(None), column_expr.notin_(known_values))
+            select_columns.append(cell(condition).label("c_other"))
+            column_labels.append(other_label)
+        
+        results = self._ticket_query(
+            select_columns, row_joins + column_joins, start_date, end_date, filters
+        ).group_by(row_expr).order_by(row_expr).all()
+        
+        pivot_df = pd.DataFrame(
+            [list(row)[1:] for row in results],
+            index=[self._pivot_label(row.row_value) for row in results],
+            columns=column_labels,
+            dtype=float
+        ).fillna(0)
+        
+        metadata = {
+            "top_k_columns": top_k_columns,
+            "column_count": len(column_labels),
+            "other_bucket": has_other
+        }
+        
+        return pivot_df, metadata
+    
+    def stream_ticket_correlation(
+        self,
+        metrics: List[AggregationMetric],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 10000,
+        partitions: int = 1
+    ) -> StreamingCorrelation:
+        """
+        Correlate per-ticket metrics by streaming rows from a server-side cursor
+        
+        Rows are fetched in chunks and folded into an incremental covariance
+        accumulator, so memory stays constant regardless of the number of tickets.
+        With partitions > 1 the date range is split and each partition is
+        streamed on its own session in parallel, then the accumulators are merged.
+        
+        Args:
+            metrics: Per-ticket metrics to correlate
+            start_date: Optional start date for the analysis
+            end_date: Optional end date for the analysis
+            filters: Optional filters to apply
+            chunk_size: Number of rows fetched per chunk
+            partitions: Number of date partitions to stream in parallel (requires both dates)
+            
+        Returns:
+            StreamingCorrelation accumulator over the metric columns
+        """
+        for metric in metrics:
+            if metric == AggregationMetric.TICKET_COUNT:
+                raise ValueError("Ticket count is constant per ticket and cannot be correlated")
+        
+        columns = [metric.value.lower() for metric in metrics]
+        
+        if partitions <= 1 or start_date is None or end_date is None:
+            return self._stream_correlation_partition(self.db, metrics, columns, start_date, end_date, filters, chunk_size)
+        
+        # Split the window into contiguous, non-overlapping date ranges
+        step = (end_date - start_date) / partitions
+        bounds = []
+        for index in range(partitions):
+            partition_start = start_date + step * index
+            if index == partitions - 1:
+                partition_end = end_date
+            else:
+                partition_end = start_date + step * (index + 1) - timedelta(microseconds=1)
+            bounds.append((partition_start, partition_end))
+        
+        from app.db.database import SessionLocal
+        
+        def run_partition(partition_bounds):
+            session = SessionLocal()
+            try:
+                return self._stream_correlation_partition(
+                    session, metrics, columns, partition_bounds[0], partition_bounds[1], filters, chunk_size
+                )
+            finally:
+                session.close()
+        
+        accumulator = StreamingCorrelation(columns)
+        with ThreadPoolExecutor(max_workers=partitions) as executor:
+            for partial in executor.map(run_partition, bounds):
+                accumulator.merge(partial)
+        
+        return accumulator
+    
+    def _stream_correlation_partition(
+        self,
+        session: Session,
+        metrics: List[AggregationMetric],
+        columns: List[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        filters: Optional[Dict[str, Any]],
+        chunk_size: int
+    ) -> StreamingCorrelation:
+        """
+        Stream one date range of per-ticket metric rows into an accumulator
+        """
+        select_columns = [self._ticket_metric_value(metric) for metric in metrics]
+        statement = (
+            DataAggregator(session)
+            ._ticket_query(select_columns, [], start_date, end_date, filters)
+            .statement
+            .execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        
+        result = session.execute(statement)
+        try:
+            return correlation_from_chunks(columns, result.partitions(chunk_size))
+        finally:
+            result.close()
+    
+    def seasonal_ticket_profile(
+        self,
+        metric: AggregationMetric,
+        seasonality: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Compute a seasonal profile by grouping on date dimension attributes in SQL
+        
+        Buckets come straight from DimDate (day_of_week, day, month, quarter) or the
+        ticket's creation hour, so multi-year profiles are a single aggregate query
+        instead of a full time series regrouped in pandas.
+        
+        For ticket count the value is the average number of tickets per calendar
+        occurrence of the bucket in the window (e.g. per Monday, counting Mondays
+        without tickets); other metrics are averaged per ticket. Without a start
+        or end date, the window ends at the first or last matching ticket.
+        Tickets with no value for a bucket attribute (e.g. a NULL created_hour on
+        tickets loaded before the column existed and not backfilled yet) are left
+        out of the profile rather than grouped into a NULL bucket.
+        
+        Args:
+            metric: Metric to profile
+            seasonality: Bucket type ('daily', 'weekly', 'monthly', 'quarterly', 'yearly', 'heatmap')
+            start_date: Optional start date for the analysis
+            end_date: Optional end date for the analysis
+            filters: Optional filters to apply
+            
+        Returns:
+            DataFrame with one column per bucket attribute plus 'value' and 'tickets'
+        """
+        if seasonality not in SEASONAL_BUCKETS:
+            raise ValueError(f"Unsupported seasonality: {seasonality}")
+        
+        bucket_columns, period = SEASONAL_BUCKETS[seasonality]
+        
+        if metric == AggregationMetric.TICKET_COUNT:
+            value_expr = func.count(FactTicket.id) * 1.0
+        else:
+            value_expr = func.avg(self._ticket_metric_value(metric))
+        
+        group_columns = [column.element for column in bucket_columns]
+        query = self._ticket_query(
+            bucket_columns + [value_expr.label("value"), func.count(FactTicket.id).label("tickets")],
+            [CreatedDate], start_date, end_date, filters
+        ).filter(*[column.isnot(None) for column in group_columns])
+        
+        results = query.group_by(*group_columns).order_by(*group_columns).all()
+        
+        bucket_names = [column.name for column in bucket_columns]
+        df = pd.DataFrame([tuple(row) for row in results], columns=bucket_names + ["value", "tickets"])
+        
+        if metric == AggregationMetric.TICKET_COUNT and not df.empty:
+            # Average over every calendar occurrence of the bucket in the window,
+            # including the ones without tickets
+            first_day, last_day = start_date, end_date
+            if first_day is None or last_day is None:
+                first_created, last_created = self._ticket_query(
+                    [func.min(CreatedDate.date), func.max(CreatedDate.date)],
+                    [CreatedDate], start_date, end_date, filters
+                ).one()
+                first_day = first_day or first_created
+                last_day = last_day or last_created
+            
+            periods = self._calendar_periods(bucket_names, period, first_day, last_day)
+            if isinstance(periods, pd.DataFrame):
+                periods = df[periods.columns[:-1]].merge(periods, how="left")["periods"].to_numpy()
+            df["value"] = df["tickets"] / np.maximum(periods, 1)
+        
+        return df
+    
+    @staticmethod
+    def _calendar_periods(
+        bucket_names: List[str],
+        period: str,
+        first_day: datetime,
+        last_day: datetime
+    ) -> Union[int, pd.DataFrame]:
+        """
+        Count the calendar periods in which each seasonal bucket occurs within a window
+        
+        Args:
+            bucket_names: Seasonal bucket attributes
+            period: Calendar period of a bucket occurrence ('day' or 'year')
+            first_day: First day of the window
+            last_day: Last day of the window
+            
+        Returns:
+            The number of periods when no bucket attribute depends on the date (e.g.
+            hours occur once per day), otherwise a DataFrame with the date-derived
+            bucket attributes and a 'periods' column
+        """
+        days = pd.date_range(pd.Timestamp(first_day).normalize(), pd.Timestamp(last_day).normalize(), freq="D")
+        calendar = pd.DataFrame({
+            name: CALENDAR_ATTRIBUTES[name](days) for name in bucket_names if name in CALENDAR_ATTRIBUTES
+        })
+        calendar["period"] = days.year if period == "year" else days
+        
+        attributes = [name for name in bucket_names if name in CALENDAR_ATTRIBUTES]
+        if not attributes:
+            return calendar["period"].nunique()
+        return calendar.groupby(attributes)["period"].nunique().rename("periods").reset_index()
+    
+    def compare_ticket_periods(
+        self,
+        metric: AggregationMetric,
+        periods: List[Tuple[datetime, datetime]],
+        granularity: TimeGranularity = TimeGranularity.DAY,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Aggregate a metric over several time periods in a single scan
+        
+        Each ticket is labelled with the index of the period containing it using a
+        CASE expression, so N periods cost one query. Buckets are aligned across
+        periods by their offset from the start of their own period.
+        
+        Args:
+            metric: Metric to compare
+            periods: List of (start, end) windows; index 0 is the current period.
+                Windows should not overlap (a ticket is counted in the first match)
+            granularity: Bucket granularity within each period
+            filters: Optional filters to apply
+            
+        Returns:
+            DataFrame with columns period, bucket, bucket_start, value and tickets
+        """
+        if not periods:
+            raise ValueError("At least one period is required")
+        
+        date_expr = CreatedDate.date
+        period_ranges = [and_(date_expr >= start, date_expr <= end) for start, end in periods]
+        period_expr = case(*[(condition, index) for index, condition in enumerate(period_ranges)])
+        bucket_expr = func.date_trunc(granularity.value, date_expr)
+        
+        if metric == AggregationMetric.TICKET_COUNT:
+            value_expr = func.count(FactTicket.id)
+        else:
+            value_expr = func.avg(self._ticket_metric_value(metric))
+        
+        results = self._ticket_query(
+            [
+                period_expr.label("period"),
+                bucket_expr.label("bucket_start"),
+                value_expr.label("value"),
+                func.count(FactTicket.id).label("tickets")
+            ],
+            [CreatedDate], filters=filters
+        ).filter(or_(*period_ranges)).group_by(period_expr, bucket_expr).all()
+        
+        df = pd.DataFrame(
+            [tuple(row) for row in results],
+            columns=["period", "bucket_start", "value", "tickets"]
+        )
+        
+        if df.empty:
+            df["bucket"] = pd.Series(dtype=int)
+            return df[["period", "bucket", "bucket_start", "value", "tickets"]]
+        
+        df["bucket_start"] = pd.to_datetime(df["bucket_start"])
+        df["bucket"] = [
+            self._bucket_offset(periods[int(period)][0], bucket_start, granularity)
+            for period, bucket_start in zip(df["period"], df["bucket_start"])
+        ]
+        
+        return df[["period", "bucket", "bucket_start", "value", "tickets"]].sort_values(
+            ["period", "bucket"]
+        ).reset_index(drop=True)
+    
+    @staticmethod
+    def _bucket_offset(period_start: datetime, bucket_start: datetime, granularity: TimeGranularity) -> int:
+        """
+        Number of granularity steps between the start of a period and a bucket
+        """
+        start = pd.Timestamp(period_start)
+        bucket = pd.Timestamp(bucket_start)
+        
+        if granularity == TimeGranularity.DAY:
+            return (bucket.normalize() - start.normalize()).days
+        if granularity == TimeGranularity.WEEK:
+            start_week = start.normalize() - pd.Timedelta(days=start.weekday())
+            return (bucket.normalize() - start_week).days // 7
+        
+        months = (bucket.year - start.year) * 12 + (bucket.month - start.month)
+        if granularity == TimeGranularity.MONTH:
+            return months
+        if granularity == TimeGranularity.QUARTER:
+            return (bucket.year - start.year) * 4 + (bucket.quarter - start.quarter)
+        return bucket.year - start.year
+    
+    @staticmethod
+    def _pivot_label(value: Any) -> str:
+        """
+        Convert a dimension value into a pivot table label
+        """
+        if value is None:
+            return "Unknown"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
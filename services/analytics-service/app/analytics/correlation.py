@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class StreamingCorrelation:
+    """
+    Incremental covariance and correlation accumulator
+
+    Rows are consumed in chunks and merged with Chan's parallel update of the
+    means and co-moments, so memory is constant in the number of rows and
+    accumulators built on separate partitions can be merged together.
+
+    Statistics are tracked per pair of columns over the rows where both values
+    are present, which reproduces pandas' pairwise-complete DataFrame.corr().
+    """
+
+    def __init__(self, columns: List[str]):
+        """
+        Initialize the accumulator
+
+        Args:
+            columns: Names of the columns being correlated
+        """
+        self.columns = list(columns)
+        k = len(self.columns)
+
+        # Pairwise statistics: entry [i, j] is computed over rows where i and j are both present
+        self.count = np.zeros((k, k))
+        self.mean = np.zeros((k, k))      # mean of column i over the (i, j) rows
+        self.m2 = np.zeros((k, k))        # sum of squared deviations of column i over the (i, j) rows
+        self.comoment = np.zeros((k, k))  # sum of (x_i - mean_i)(x_j - mean_j) over the (i, j) rows
+
+    @property
+    def rows(self) -> int:
+        """
+        Largest number of observations seen for any single column
+        """
+        return int(self.count.diagonal().max()) if self.columns else 0
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Merge a block of rows into the accumulator
+
+        Args:
+            block: 2D array with one column per tracked column (NaN for missing values)
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim != 2 or block.shape[0] == 0:
+            return
+
+        self._merge(*self._block_statistics(block))
+
+    def merge(self, other: "StreamingCorrelation") -> "StreamingCorrelation":
+        """
+        Merge another accumulator (e.g. from a parallel partition) into this one
+
+        Args:
+            other: Accumulator over the same columns
+
+        Returns:
+            This accumulator
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+
+        self._merge(other.count, other.mean, other.m2, other.comoment)
+        return self
+
+    def covariance(self, ddof: int = 1) -> pd.DataFrame:
+        """
+        Get the pairwise covariance matrix
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(self.count > ddof, self.comoment / (self.count - ddof), np.nan)
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def correlation(self, min_periods: int = 1) -> pd.DataFrame:
+        """
+        Get the pairwise Pearson correlation matrix
+
+        Args:
+            min_periods: Minimum number of paired observations required per entry
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = self.comoment / np.sqrt(self.m2 * self.m2.T)
+
+        values = np.clip(values, -1.0, 1.0)
+        values[self.count < max(min_periods, 2)] = np.nan
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def _block_statistics(self, block: np.ndarray):
+        """
+        Compute pairwise count, mean, M2 and co-moment for a single block
+        """
+        valid = ~np.isnan(block)
+        weights = valid.astype(float)
+
+        # Shift by the block's column means to keep the sums well conditioned
+        present = weights.sum(axis=0)
+        shift = np.divide(np.where(valid, block, 0.0).sum(axis=0), present, out=np.zeros(block.shape[1]), where=present > 0)
+        centered = np.where(valid, block - shift, 0.0)
+
+        count = weights.T @ weights
+        sums = centered.T @ weights                # sum of x_i over (i, j) rows
+        squares = (centered ** 2).T @ weights      # sum of x_i^2 over (i, j) rows
+        products = centered.T @ centered           # sum of x_i * x_j over (i, j) rows
+
+        mean = np.divide(sums, count, out=np.zeros_like(sums), where=count > 0)
+        m2 = squares - sums * mean
+        comoment = products - sums * mean.T
+
+        return count, mean + shift[:, None], m2, comoment
+
+    def _merge(self, count_b: np.ndarray, mean_b: np.ndarray, m2_b: np.ndarray, comoment_b: np.ndarray) -> None:
+        """
+        Chan et al. parallel merge of pairwise statistics
+        """
+        count_a = self.count
+        total = count_a + count_b
+
+        ratio = np.divide(count_b, total, out=np.zeros_like(total), where=total > 0)
+        weight = count_a * ratio
+        delta = mean_b - self.mean
+
+        self.mean = self.mean + delta * ratio
+        self.m2 = self.m2 + m2_b + delta ** 2 * weight
+        # Pair (i, j) uses the deviation of column i and of column j over the same rows
+        self.comoment = self.comoment + comoment_b + delta * delta.T * weight
+
+        self.count = total
+
+
+def correlation_from_chunks(columns: List[str], chunks, accumulator: Optional[StreamingCorrelation] = None) -> StreamingCorrelation:
+    """
+    Feed an iterable of row chunks into a StreamingCorrelation
+
+    Args:
+        columns: Names of the columns being correlated
+        chunks: Iterable of row sequences (one value per column, None for missing)
+        accumulator: Optional accumulator to continue
+
+    Returns:
+        The accumulator
+    """
+    accumulator = accumulator or StreamingCorrelation(columns)
+    for chunk in chunks:
+        if chunk:
+            accumulator.update(np.array(chunk, dtype=float))
+    return accumulator
@@ -3,10 +3,10 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple, Optional
 from sqlalchemy.orm import Session
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
-from statsmodels.tsa.arima.model import ARIMA
 import logging
 
+from app.core.lazy_imports import lazy_import
+from app.analytics.normalization import DataNormalizer
 from app.models.sql_models import (
     FactTicket, DimDate, FactUserActivity
 )
@@ -18,6 +18,10 @@ from app.schemas.analytics import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# statsmodels is imported on first forecast
+holtwinters = lazy_import("statsmodels.tsa.holtwinters")
+arima_model = lazy_import("statsmodels.tsa.arima.model")
+
 def generate_forecast(
     db: Session,
     metric: str,
@@ -36,8 +40,16 @@ def generate_forecast(
     if history_df.empty or len(history_df) < 3:
         raise ValueError(f"Insufficient historical data for forecasting {metric}")
     
-    # Generate forecast
-    forecast_df = forecast_time_series(history_df, periods, interval_width)
+    # Generate forecast; the scaler fitted on this history is reused until the next ETL run
+    spec = {
+        "metric": metric,
+        "start_date": start_date,
+        "end_date": end_date,
+        "granularity": granularity
+    }
+    forecast_df = forecast_time_series(
+        history_df, periods, interval_width, scaler_id=f"forecast:{metric}", spec=spec
+    )
     
     # Format result
     result = ForecastResult(
@@ -186,22 +198,35 @@ def get_metric_value(
 def forecast_time_series(
     history_df: pd.DataFrame,
     periods: int,
-    interval_width: float
+    interval_width: float,
+    scaler_id: Optional[str] = None,
+    spec: Optional[Dict[str, Any]] = None
 ) -> pd.DataFrame:
     """
     Forecast time series using appropriate model
+    
+    With a scaler_id, the models are fitted on standardized values using a
+    stored scaler (see DataNormalizer.standardize), and the forecast is
+    mapped back to the original scale.
     """
     # Check if we have enough data
     if len(history_df) < 3:
         raise ValueError("Insufficient data for forecasting (need at least 3 data points)")
     
+    original_df = history_df
+    if scaler_id:
+        normalizer = DataNormalizer()
+        history_df = normalizer.standardize(
+            history_df[["value"]], ["value"], persist_scaler=True, scaler_id=scaler_id, spec=spec
+        )
+    
     # Determine appropriate model based on data characteristics
     # For simplicity, we'll use Exponential Smoothing for most cases
     # In a real system, you'd want to do model selection based on the data
     
     try:
         # Try Exponential Smoothing first
-        model = ExponentialSmoothing(
+        model = holtwinters.ExponentialSmoothing(
             history_df["value"],
             trend="add",
             seasonal=None,
@@ -223,7 +248,7 @@ def forecast_time_series(
         
         # Fall back to ARIMA
         try:
-            model = ARIMA(history_df["value"], order=(1, 1, 0))
+            model = arima_model.ARIMA(history_df["value"], order=(1, 1, 0))
             fit_model = model.fit()
             
             # Generate forecast
@@ -259,6 +284,13 @@ def forecast_time_series(
         "upper_bound": upper.values if hasattr(upper, 'values') else upper
     }, index=future_dates)
     
+    if scaler_id:
+        for column in forecast_df.columns:
+            forecast_df[column] = normalizer.transform_with_stored_scaler(
+                forecast_df[[column]].rename(columns={column: "value"}), scaler_id, inverse=True
+            )["value"]
+        history_df = original_df
+    
     # Ensure non-negative values for counts
     if "ticket_count" in str(history_df) or "tickets_closed" in str(history_df) or "user_activity" in str(history_df):
         forecast_df["forecast"] = forecast_df["forecast"].apply(lambda x: max(0, x))
@@ -1,14 +1,20 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Union, Optional
-from sklearn.preprocessing import MinMaxScaler, StandardScaler, RobustScaler
-from scipy import stats
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterator
 import logging
 
+from app.core.lazy_imports import lazy_import
+from app.analytics.scaler_store import (
+    ScalerStore, get_scaler_store, dataset_signature, scaler_type_name
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# scikit-learn is imported on first use
+preprocessing = lazy_import("sklearn.preprocessing")
+
 
 class DataNormalizer:
     """
@@ -16,8 +22,15 @@ class DataNormalizer:
     Provides various methods to normalize, standardize, and transform data
     """
     
-    def __init__(self):
+    def __init__(self, scaler_store: Optional[ScalerStore] = None):
+        """
+        Initialize the DataNormalizer
+        
+        Args:
+            scaler_store: Store for persisted scalers (defaults to the shared store)
+        """
         self.scalers = {}
+        self.scaler_store = scaler_store or get_scaler_store()
     
     def normalize_minmax(
         self, 
@@ -25,7 +38,8 @@ class DataNormalizer:
         columns: List[str] = None, 
         feature_range: tuple = (0, 1),
         persist_scaler: bool = False,
-        scaler_id: str = None
+        scaler_id: str = None,
+        spec: Optional[Dict[str, Any]] = None
     ) -> pd.DataFrame:
         """
         Normalize data using Min-Max scaling
@@ -36,6 +50,8 @@ class DataNormalizer:
             feature_range: Output range for normalized values
             persist_scaler: Whether to store the scaler for future use
             scaler_id: ID to store the scaler (required if persist_scaler=True)
+            spec: Feature/window spec of the data, identifying a stored fit
+                within an ETL generation (see dataset_signature)
             
         Returns:
             DataFrame with normalized columns
@@ -48,15 +64,17 @@ class DataNormalizer:
             columns = result_df.select_dtypes(include=['number']).columns.tolist()
         
         # Create a scaler
-        scaler = MinMaxScaler(feature_range=feature_range)
+        scaler = preprocessing.MinMaxScaler(feature_range=feature_range)
         
         # Normalize the specified columns
         if columns:
-            result_df[columns] = scaler.fit_transform(result_df[columns])
-            
-            # Store the scaler if requested
             if persist_scaler and scaler_id:
-                self.scalers[scaler_id] = scaler
+                # Reuse a stored fit when available, otherwise fit and store it
+                result_df[columns] = self._fit_or_reuse_scaler(
+                    scaler, scaler_id, columns, result_df[columns], spec
+                )
+            else:
+                result_df[columns] = scaler.fit_transform(result_df[columns])
         
         return result_df
     
@@ -66,7 +84,8 @@ class DataNormalizer:
         columns: List[str] = None,
         robust: bool = False,
         persist_scaler: bool = False,
-        scaler_id: str = None
+        scaler_id: str = None,
+        spec: Optional[Dict[str, Any]] = None
     ) -> pd.DataFrame:
         """
         Standardize data (zero mean, unit variance)
@@ -77,6 +96,8 @@ class DataNormalizer:
             robust: Whether to use robust scaling (median/IQR instead of mean/std)
             persist_scaler: Whether to store the scaler for future use
             scaler_id: ID to store the scaler (required if persist_scaler=True)
+            spec: Feature/window spec of the data, identifying a stored fit
+                within an ETL generation (see dataset_signature)
             
         Returns:
             DataFrame with standardized columns
@@ -90,17 +111,19 @@ class DataNormalizer:
         
         # Create a scaler
         if robust:
-            scaler = RobustScaler()
+            scaler = preprocessing.RobustScaler()
         else:
-            scaler = StandardScaler()
+            scaler = preprocessing.StandardScaler()
         
         # Standardize the specified columns
         if columns:
-            result_df[columns] = scaler.fit_transform(result_df[columns])
-            
-            # Store the scaler if requested
             if persist_scaler and scaler_id:
-                self.scalers[scaler_id] = scaler
+                # Reuse a stored fit when available, otherwise fit and store it
+                result_df[columns] = self._fit_or_reuse_scaler(
+                    scaler, scaler_id, columns, result_df[columns], spec
+                )
+            else:
+                result_df[columns] = scaler.fit_transform(result_df[columns])
         
         return result_df
     
@@ -108,7 +131,8 @@ class DataNormalizer:
         self,
         df: pd.DataFrame,
         scaler_id: str,
-        columns: List[str] = None
+        columns: List[str] = None,
+        inverse: bool = False
     ) -> pd.DataFrame:
         """
         Transform data using a previously stored scaler
@@ -116,15 +140,23 @@ class DataNormalizer:
         Args:
             df: Input DataFrame
             scaler_id: ID of the stored scaler
-            columns: Columns to transform (if None, all numeric columns)
+            columns: Columns to transform (if None, all numeric columns); they
+                must be named like the columns the scaler was fitted on
+            inverse: Map scaled values back to the original scale
             
         Returns:
             DataFrame with transformed columns
         """
-        # Check if scaler exists
-        if scaler_id not in self.scalers:
+        # Look up the scaler locally first, then in the shared store
+        scaler = self.scalers.get(scaler_id)
+        if scaler is None:
+            scaler = self.scaler_store.get_latest(scaler_id)
+        
+        if scaler is None:
             raise ValueError(f"No scaler found with ID: {scaler_id}")
         
+        self.scalers[scaler_id] = scaler
+        
         # Create a copy of the DataFrame to avoid modifying the original
         result_df = df.copy()
         
@@ -132,134 +164,344 @@ class DataNormalizer:
         if columns is None:
             columns = result_df.select_dtypes(include=['number']).columns.tolist()
         
-        # Get the scaler
-        scaler = self.scalers[scaler_id]
-        
         # Transform the specified columns
         if columns:
-            result_df[columns] = scaler.transform(result_df[columns])
+            transform = scaler.inverse_transform if inverse else scaler.transform
+            result_df[columns] = transform(result_df[columns])
         
         return result_df
     
+    def _fit_or_reuse_scaler(
+        self,
+        scaler: Any,
+        scaler_id: str,
+        columns: List[str],
+        data: pd.DataFrame,
+        spec: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """
+        Transform data with a stored scaler, fitting and storing it on first use
+        
+        Args:
+            scaler: Unfitted scaler carrying the requested configuration
+            scaler_id: ID to store the scaler under
+            columns: Columns being scaled
+            data: Column data to transform
+            spec: Feature/window spec of the data
+            
+        Returns:
+            Transformed values
+        """
+        signature = dataset_signature(scaler_id, scaler_type_name(scaler), columns, scaler.get_params(), spec)
+        
+        stored = self.scaler_store.get(scaler_id, signature)
+        if stored is None:
+            stored = scaler.fit(data)
+            self.scaler_store.save(scaler_id, signature, stored, columns)
+        
+        self.scalers[scaler_id] = stored
+        return stored.transform(data)
+    
     def remove_outliers(
         self,
         df: pd.DataFrame,
-        columns: List[str] = None,
+        columns: Union[str, List[str]] = None,
         method: str = 'zscore',
         threshold: float = 3.0,
-        replace_with: Optional[Union[str, float]] = None
+        replace_with: Optional[Union[str, float]] = None,
+        chunk_size: Optional[int] = None,
+        inplace: bool = False
     ) -> pd.DataFrame:
         """
         Remove or replace outliers in the data
         
+        Outlier bounds for all selected columns are computed in a single pass and
+        the resulting masks are applied once, instead of re-filtering the frame
+        column by column.
+        
         Args:
             df: Input DataFrame
-            columns: Columns to process (if None, all numeric columns)
+            columns: Column(s) to process (if None, all numeric columns)
             method: Outlier detection method ('zscore', 'iqr', 'percentile')
             threshold: Threshold for outlier detection
             replace_with: Value to replace outliers with (None to remove rows)
+            chunk_size: Number of rows to process per block (None to process the whole frame at once)
+            inplace: Write replacements into df instead of a copy (only used with replace_with)
             
         Returns:
             DataFrame with outliers removed or replaced
         """
-        # Create a copy of the DataFrame to avoid modifying the original
-        result_df = df.copy()
-        
         # If no columns specified, use all numeric columns
         if columns is None:
-            columns = result_df.select_dtypes(include=['number']).columns.tolist()
+            columns = df.select_dtypes(include=['number']).columns.tolist()
+        elif isinstance(columns, str):
+            columns = [columns]
+        
+        if method not in ('zscore', 'iqr', 'percentile'):
+            raise ValueError(f"Unknown outlier detection method: {method}")
+        
+        if not columns or df.empty:
+            return df if inplace else df.copy()
+        
+        # When processing in one block, materialize the selected columns once and
+        # reuse the array for both the statistics and the masks
+        values = None
+        if chunk_size is None:
+            values = df[columns].to_numpy(dtype=float)
+        
+        lower, upper = self._outlier_bounds(df, columns, method, threshold, values)
+        column_indexer = df.columns.get_indexer(columns)
+        
+        if replace_with is None:
+            # Remove rows with an outlier in any of the selected columns
+            keep = np.ones(len(df), dtype=bool)
+            for start, stop in self._iter_row_chunks(len(df), chunk_size):
+                block = values if values is not None else df.iloc[start:stop, column_indexer].to_numpy(dtype=float)
+                keep[start:stop] = ~((block < lower) | (block > upper)).any(axis=1)
+            
+            return df[keep]
         
-        # Process each column
+        # Replace outliers with the requested value
+        fill_values = self._outlier_replacement_values(df, columns, replace_with, values)
+        result_df = df if inplace else df.copy()
+        
+        if values is not None:
+            outliers = (values < lower) | (values > upper)
+            result_df[columns] = np.where(outliers, fill_values, values)
+            return result_df
+        
+        # Replacements are written back block by block, so the columns must be able to hold floats
         for column in columns:
-            if method == 'zscore':
-                # Z-score method
-                z_scores = np.abs(stats.zscore(result_df[column], nan_policy='omit'))
-                outliers = z_scores > threshold
-                
-            elif method == 'iqr':
-                # IQR method
-                q1 = result_df[column].quantile(0.25)
-                q3 = result_df[column].quantile(0.75)
-                iqr = q3 - q1
-                lower_bound = q1 - threshold * iqr
-                upper_bound = q3 + threshold * iqr
-                outliers = (result_df[column] < lower_bound) | (result_df[column] > upper_bound)
-                
-            elif method == 'percentile':
-                # Percentile method
-                lower_bound = result_df[column].quantile(threshold / 100)
-                upper_bound = result_df[column].quantile(1 - threshold / 100)
-                outliers = (result_df[column] < lower_bound) | (result_df[column] > upper_bound)
-            
-            else:
-                raise ValueError(f"Unknown outlier detection method: {method}")
+            if not pd.api.types.is_float_dtype(result_df[column]):
+                result_df[column] = result_df[column].astype(float)
+        
+        for start, stop in self._iter_row_chunks(len(result_df), chunk_size):
+            block = result_df.iloc[start:stop, column_indexer].to_numpy(dtype=float)
+            outliers = (block < lower) | (block > upper)
+            if outliers.any():
+                result_df.iloc[start:stop, column_indexer] = np.where(outliers, fill_values, block)
+        
+        return result_df
+    
+    def _outlier_bounds(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        method: str,
+        threshold: float,
+        values: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute per-column lower and upper outlier bounds
+        
+        Every method reduces to a pair of bounds per column (a z-score above the
+        threshold is a value outside mean +/- threshold * std), so a single
+        comparison against the bounds yields the outlier mask for all columns.
+        
+        Args:
+            df: Input DataFrame
+            columns: Columns to compute bounds for
+            method: Outlier detection method ('zscore', 'iqr', 'percentile')
+            threshold: Threshold for outlier detection
+            values: Pre-materialized column values (if None, statistics are computed column by column)
             
-            # Replace or remove outliers
-            if replace_with is not None:
-                if replace_with == 'mean':
-                    result_df.loc[outliers, column] = result_df[column].mean()
-                elif replace_with == 'median':
-                    result_df.loc[outliers, column] = result_df[column].median()
-                elif replace_with == 'mode':
-                    result_df.loc[outliers, column] = result_df[column].mode()[0]
-                else:
-                    result_df.loc[outliers, column] = replace_with
+        Returns:
+            Tuple of (lower bounds, upper bounds) arrays
+        """
+        if method == 'zscore':
+            if values is not None:
+                center = np.nanmean(values, axis=0)
+                spread = np.nanstd(values, axis=0)
             else:
-                # Remove rows with outliers
-                result_df = result_df[~outliers]
+                center = np.array([df[column].mean() for column in columns], dtype=float)
+                spread = np.array([df[column].std(ddof=0) for column in columns], dtype=float)
+            return center - threshold * spread, center + threshold * spread
         
-        return result_df
+        if method == 'iqr':
+            quantiles = [0.25, 0.75]
+        else:  # percentile
+            quantiles = [threshold / 100, 1 - threshold / 100]
+        
+        if values is not None:
+            low_q, high_q = np.nanquantile(values, quantiles, axis=0)
+        else:
+            low_q = np.array([df[column].quantile(quantiles[0]) for column in columns], dtype=float)
+            high_q = np.array([df[column].quantile(quantiles[1]) for column in columns], dtype=float)
+        
+        if method == 'iqr':
+            iqr = high_q - low_q
+            return low_q - threshold * iqr, high_q + threshold * iqr
+        
+        return low_q, high_q
+    
+    def _outlier_replacement_values(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        replace_with: Union[str, float],
+        values: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Compute the per-column values used to replace outliers
+        
+        Args:
+            df: Input DataFrame
+            columns: Columns being processed
+            replace_with: Replacement strategy ('mean', 'median', 'mode') or a constant value
+            values: Pre-materialized column values
+            
+        Returns:
+            Array with one replacement value per column
+        """
+        if replace_with == 'mean':
+            if values is not None:
+                return np.nanmean(values, axis=0)
+            return np.array([df[column].mean() for column in columns], dtype=float)
+        
+        if replace_with == 'median':
+            if values is not None:
+                return np.nanmedian(values, axis=0)
+            return np.array([df[column].median() for column in columns], dtype=float)
+        
+        if replace_with == 'mode':
+            return np.array([df[column].mode()[0] for column in columns], dtype=float)
+        
+        try:
+            return np.full(len(columns), float(replace_with))
+        except (TypeError, ValueError):
+            raise ValueError(f"Unknown outlier replacement value: {replace_with}")
+    
+    @staticmethod
+    def _iter_row_chunks(n_rows: int, chunk_size: Optional[int]) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (start, stop) row positions covering n_rows in blocks of chunk_size
+        """
+        step = chunk_size if chunk_size and chunk_size > 0 else max(n_rows, 1)
+        for start in range(0, n_rows, step):
+            yield start, min(start + step, n_rows)
     
     def fill_missing_values(
         self,
         df: pd.DataFrame,
-        columns: List[str] = None,
-        method: str = 'mean'
+        columns: Union[str, List[str]] = None,
+        method: str = 'mean',
+        chunk_size: Optional[int] = None,
+        inplace: bool = False
     ) -> pd.DataFrame:
         """
         Fill missing values in the data
         
+        Fill values for all applicable columns are computed up front and applied
+        in a single fillna call (or block by block when chunk_size is given).
+        
         Args:
             df: Input DataFrame
-            columns: Columns to process (if None, all columns)
+            columns: Column(s) to process (if None, all columns)
             method: Method to fill missing values ('mean', 'median', 'mode', 'ffill', 'bfill', 'interpolate')
+            chunk_size: Number of rows to process per block (None to process the whole frame at once)
+            inplace: Fill df directly instead of a copy
             
         Returns:
             DataFrame with missing values filled
         """
-        # Create a copy of the DataFrame to avoid modifying the original
-        result_df = df.copy()
-        
         # If no columns specified, use all columns
         if columns is None:
-            columns = result_df.columns.tolist()
+            columns = df.columns.tolist()
+        elif isinstance(columns, str):
+            columns = [columns]
+        
+        result_df = df if inplace else df.copy()
+        
+        # Only columns that actually contain missing values need work
+        missing_columns = [column for column in columns if result_df[column].isna().any()]
+        if not missing_columns:
+            return result_df
+        
+        if method in ('mean', 'median', 'interpolate'):
+            applicable = [
+                column for column in missing_columns
+                if pd.api.types.is_numeric_dtype(result_df[column])
+            ]
+        elif method in ('mode', 'ffill', 'bfill'):
+            applicable = missing_columns
+        else:
+            applicable = []
         
-        # Process each column
-        for column in columns:
-            if result_df[column].isna().any():
-                if method == 'mean' and pd.api.types.is_numeric_dtype(result_df[column]):
-                    result_df[column] = result_df[column].fillna(result_df[column].mean())
-                    
-                elif method == 'median' and pd.api.types.is_numeric_dtype(result_df[column]):
-                    result_df[column] = result_df[column].fillna(result_df[column].median())
-                    
-                elif method == 'mode':
-                    result_df[column] = result_df[column].fillna(result_df[column].mode()[0])
-                    
-                elif method == 'ffill':
-                    result_df[column] = result_df[column].fillna(method='ffill')
-                    
-                elif method == 'bfill':
-                    result_df[column] = result_df[column].fillna(method='bfill')
-                    
-                elif method == 'interpolate' and pd.api.types.is_numeric_dtype(result_df[column]):
-                    result_df[column] = result_df[column].interpolate()
-                    
-                else:
-                    logger.warning(f"Cannot apply method '{method}' to column '{column}'")
+        for column in missing_columns:
+            if column not in applicable:
+                logger.warning(f"Cannot apply method '{method}' to column '{column}'")
+        
+        if not applicable:
+            return result_df
+        
+        if method == 'interpolate':
+            # Interpolation depends on neighbouring values, so it is applied per full column
+            result_df[applicable] = result_df[applicable].interpolate()
+            return result_df
+        
+        if method in ('ffill', 'bfill'):
+            if chunk_size is None:
+                result_df[applicable] = getattr(result_df[applicable], method)()
+            else:
+                self._fill_directional_chunked(result_df, applicable, method, chunk_size)
+            return result_df
+        
+        # Statistic-based fills: compute every fill value first, then apply them together
+        if method == 'mean':
+            fill_values = {column: result_df[column].mean() for column in applicable}
+        elif method == 'median':
+            fill_values = {column: result_df[column].median() for column in applicable}
+        else:  # mode
+            fill_values = {column: result_df[column].mode()[0] for column in applicable}
+        
+        if chunk_size is None:
+            result_df.fillna(value=fill_values, inplace=True)
+            return result_df
+        
+        column_indexer = result_df.columns.get_indexer(applicable)
+        for start, stop in self._iter_row_chunks(len(result_df), chunk_size):
+            block = result_df.iloc[start:stop, column_indexer]
+            if block.isna().to_numpy().any():
+                result_df.iloc[start:stop, column_indexer] = block.fillna(value=fill_values)
         
         return result_df
     
+    def _fill_directional_chunked(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        method: str,
+        chunk_size: int
+    ) -> None:
+        """
+        Forward or backward fill columns in place, one block of rows at a time
+        
+        The last valid value of each block is carried into the next block so the
+        result matches a whole-frame fill.
+        
+        Args:
+            df: DataFrame to fill in place
+            columns: Columns to fill
+            method: Fill direction ('ffill', 'bfill')
+            chunk_size: Number of rows to process per block
+        """
+        column_indexer = df.columns.get_indexer(columns)
+        chunks = list(self._iter_row_chunks(len(df), chunk_size))
+        if method == 'bfill':
+            chunks.reverse()
+        
+        carry = None
+        for start, stop in chunks:
+            block = df.iloc[start:stop, column_indexer]
+            filled = getattr(block, method)()
+            if carry is not None:
+                filled = filled.fillna(value=carry)
+            df.iloc[start:stop, column_indexer] = filled
+            
+            # Remember the value to carry across the block boundary
+            edge = filled.ffill().iloc[-1] if method == 'ffill' else filled.bfill().iloc[0]
+            carry = edge.dropna().to_dict() if carry is None else {**carry, **edge.dropna().to_dict()}
+    
     def normalize_categorical(
         self,
         df: pd.DataFrame,
@@ -0,0 +1,368 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.lazy_imports import lazy_import
+from app.db.database import get_redis_client
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Redis keys
+ETL_GENERATION_KEY = "analytics:etl_generation"
+SCALER_KEY_PREFIX = "analytics:scaler"
+
+# scikit-learn is imported on first use
+preprocessing = lazy_import("sklearn.preprocessing")
+
+# Supported scaler types (sklearn.preprocessing class names)
+SCALER_TYPES = {
+    "minmax": "MinMaxScaler",
+    "standard": "StandardScaler",
+    "robust": "RobustScaler",
+}
+
+# Seconds to wait before retrying Redis after a connection failure
+REDIS_RETRY_SECONDS = 60
+
+
+def scaler_type_name(scaler: Any) -> str:
+    """
+    Get the registry name of a scaler instance
+    """
+    for name, class_name in SCALER_TYPES.items():
+        if type(scaler) is getattr(preprocessing, class_name):
+            return name
+    raise ValueError(f"Unsupported scaler type: {type(scaler).__name__}")
+
+
+def dataset_signature(
+    scaler_id: str,
+    scaler_type: str,
+    columns: List[str],
+    params: Dict[str, Any],
+    spec: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a stable signature for a fitted scaler
+
+    A scaler is identified by what was fitted (scaler id, columns and the
+    feature/window spec of the query the data came from) and how (type and
+    params). Warehouse data only changes with ETL runs and stored scalers are
+    keyed by ETL generation as well, so the spec identifies the fitted data
+    without hashing it, and callers fitting the same scaler id on different
+    queries or windows get separate fits.
+
+    Args:
+        scaler_id: Caller-provided scaler ID
+        scaler_type: Scaler type name ('minmax', 'standard', 'robust')
+        columns: Columns the scaler was fitted on
+        params: Scaler constructor parameters
+        spec: JSON-serializable description of the fitted data (metric,
+            dimensions, filters, window)
+
+    Returns:
+        Hex digest identifying the dataset and scaler configuration
+    """
+    payload = json.dumps(
+        {
+            "scaler_id": scaler_id,
+            "type": scaler_type,
+            "columns": list(columns),
+            "params": params,
+            "spec": spec or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def serialize_scaler(scaler: Any, columns: List[str]) -> str:
+    """
+    Serialize a fitted scaler to JSON
+
+    Only the constructor parameters and fitted attributes (sklearn's trailing
+    underscore convention) are stored, so no pickled code crosses the wire.
+
+    Args:
+        scaler: Fitted MinMax, Standard or Robust scaler
+        columns: Columns the scaler was fitted on
+
+    Returns:
+        JSON string
+    """
+    attributes = {}
+    for name, value in vars(scaler).items():
+        if not name.endswith("_") or name.startswith("_"):
+            continue
+        if isinstance(value, np.ndarray):
+            attributes[name] = {"__ndarray__": value.tolist(), "dtype": str(value.dtype)}
+        elif isinstance(value, np.generic):
+            attributes[name] = value.item()
+        else:
+            attributes[name] = value
+
+    return json.dumps({
+        "type": scaler_type_name(scaler),
+        "params": scaler.get_params(),
+        "attributes": attributes,
+        "columns": list(columns),
+        "fitted_at": datetime.utcnow().isoformat(),
+    })
+
+
+def deserialize_scaler(data: str) -> Any:
+    """
+    Rebuild a fitted scaler from its JSON representation
+
+    Args:
+        data: JSON string produced by serialize_scaler
+
+    Returns:
+        Fitted scaler instance
+    """
+    payload = json.loads(data)
+    scaler_class = getattr(preprocessing, SCALER_TYPES[payload["type"]])
+
+    params = payload["params"]
+    for name in ("feature_range", "quantile_range"):
+        if isinstance(params.get(name), list):
+            params[name] = tuple(params[name])
+
+    scaler = scaler_class(**params)
+    for name, value in payload["attributes"].items():
+        if isinstance(value, dict) and "__ndarray__" in value:
+            value = np.asarray(value["__ndarray__"], dtype=value["dtype"])
+        setattr(scaler, name, value)
+
+    return scaler
+
+
+class ScalerStore:
+    """
+    Shared, versioned registry of fitted scalers
+
+    Fitted scalers are serialized into Redis keyed by ETL generation and dataset
+    signature, so every worker reuses the same fit until the next ETL run.
+    Scalers are loaded lazily and memoized in-process after the first lookup.
+    While the ETL generation cannot be read, nothing is reused, as a scaler
+    memoized earlier may belong to an older generation.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        """
+        Initialize the ScalerStore
+
+        Args:
+            ttl: Seconds to keep scalers in Redis (defaults to SCALER_STORE_TTL)
+        """
+        self.ttl = ttl if ttl is not None else settings.SCALER_STORE_TTL
+        self._local: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0
+        self._generation: Optional[int] = None
+
+    def _redis(self):
+        """
+        Get the Redis client, or None while Redis is unavailable
+        """
+        if time.monotonic() < self._redis_retry_at:
+            return None
+
+        try:
+            return get_redis_client()
+        except Exception as e:
+            logger.warning(f"Scaler store unavailable, fitted scalers are not reused: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+
+    def current_generation(self) -> Optional[int]:
+        """
+        Get the current ETL generation (0 if no ETL run has been recorded)
+
+        Returns:
+            The generation, or None if it cannot be read (Redis unavailable)
+        """
+        client = self._redis()
+        if client is None:
+            return None
+
+        try:
+            value = client.get(ETL_GENERATION_KEY)
+            generation = int(value) if value is not None else 0
+        except Exception as e:
+            logger.warning(f"Could not read ETL generation: {e}")
+            return None
+
+        # Drop scalers memoized for an older generation
+        with self._lock:
+            if generation != self._generation:
+                self._local.clear()
+                self._generation = generation
+
+        return generation
+
+    def bump_generation(self) -> int:
+        """
+        Advance the ETL generation, invalidating all previously stored scalers
+
+        Returns:
+            The new generation number
+        """
+        with self._lock:
+            self._local.clear()
+
+        client = self._redis()
+        if client is None:
+            return 0
+
+        try:
+            return int(client.incr(ETL_GENERATION_KEY))
+        except Exception as e:
+            logger.warning(f"Could not advance ETL generation: {e}")
+            return 0
+
+    def _key(self, scaler_id: str, signature: str, generation: int) -> str:
+        return f"{SCALER_KEY_PREFIX}:{generation}:{scaler_id}:{signature}"
+
+    def get(self, scaler_id: str, signature: str) -> Optional[Any]:
+        """
+        Load a fitted scaler for the current ETL generation
+
+        Args:
+            scaler_id: Scaler ID
+            signature: Dataset signature (see dataset_signature)
+
+        Returns:
+            Fitted scaler, or None if not stored (or the generation is unknown)
+        """
+        generation = self.current_generation()
+        if generation is None:
+            return None
+        key = self._key(scaler_id, signature, generation)
+
+        with self._lock:
+            if key in self._local:
+                return self._local[key]
+
+        client = self._redis()
+        if client is None:
+            return None
+
+        try:
+            data = client.get(key)
+        except Exception as e:
+            logger.warning(f"Could not load scaler {scaler_id}: {e}")
+            return None
+
+        if data is None:
+            return None
+
+        scaler = deserialize_scaler(data)
+        with self._lock:
+            self._local[key] = scaler
+
+        return scaler
+
+    def get_latest(self, scaler_id: str) -> Optional[Any]:
+        """
+        Load the most recently stored scaler with the given ID for the current generation
+
+        Used when the caller only knows the scaler ID and not the full signature.
+
+        Args:
+            scaler_id: Scaler ID
+
+        Returns:
+            Fitted scaler, or None if not stored
+        """
+        generation = self.current_generation()
+        if generation is None:
+            return None
+        alias_key = f"{SCALER_KEY_PREFIX}:{generation}:{scaler_id}:latest"
+
+        with self._lock:
+            if alias_key in self._local:
+                return self._local[alias_key]
+
+        client = self._redis()
+        if client is None:
+            return None
+
+        try:
+            signature = client.get(alias_key)
+        except Exception as e:
+            logger.warning(f"Could not resolve scaler {scaler_id}: {e}")
+            return None
+
+        if signature is None:
+            return None
+        if isinstance(signature, bytes):
+            signature = signature.decode("utf-8")
+
+        scaler = self.get(scaler_id, signature)
+        if scaler is not None:
+            with self._lock:
+                self._local[alias_key] = scaler
+
+        return scaler
+
+    def save(self, scaler_id: str, signature: str, scaler: Any, columns: List[str]) -> None:
+        """
+        Store a fitted scaler for the current ETL generation
+
+        Nothing is stored while the generation cannot be read.
+
+        Args:
+            scaler_id: Scaler ID
+            signature: Dataset signature (see dataset_signature)
+            scaler: Fitted scaler
+            columns: Columns the scaler was fitted on
+        """
+        generation = self.current_generation()
+        if generation is None:
+            return
+        key = self._key(scaler_id, signature, generation)
+        alias_key = f"{SCALER_KEY_PREFIX}:{generation}:{scaler_id}:latest"
+
+        with self._lock:
+            self._local[key] = scaler
+            self._local[alias_key] = scaler
+
+        client = self._redis()
+        if client is None:
+            return
+
+        try:
+            pipe = client.pipeline()
+            pipe.set(key, serialize_scaler(scaler, columns), ex=self.ttl)
+            pipe.set(alias_key, signature, ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not store scaler {scaler_id}: {e}")
+
+
+# Shared store used by all DataNormalizer instances
+_scaler_store = None
+_scaler_store_lock = threading.Lock()
+
+
+def get_scaler_store() -> ScalerStore:
+    """
+    Create or return the shared ScalerStore
+    """
+    global _scaler_store
+    if _scaler_store is None:
+        with _scaler_store_lock:
+            if _scaler_store is None:
+                _scaler_store = ScalerStore()
+    return _scaler_store
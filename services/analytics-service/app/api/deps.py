@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional, Generator
@@ -9,6 +9,7 @@ import json
 
 from app.db.database import get_db
 from app.core.config import settings
+from app.visualization.visualizer import DataVisualizer
 
 # OAuth2 scheme for token validation
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.USER_SERVICE_URL}/api/auth/login")
@@ -20,6 +21,17 @@ def get_db_session() -> Generator:
     """
     return get_db()
 
+def get_visualizer(
+    binary_arrays: bool = Query(
+        False,
+        description="Encode numeric arrays in chart JSON as base64 typed arrays (Plotly bdata) for smaller payloads"
+    )
+) -> DataVisualizer:
+    """
+    Get a DataVisualizer honouring the binary_arrays query flag
+    """
+    return DataVisualizer(binary_arrays=binary_arrays)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db_session)
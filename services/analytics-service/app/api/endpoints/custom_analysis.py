@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
@@ -13,6 +14,7 @@ from app.schemas.analytics import (
     ChartType
 )
 from app.visualization.visualizer import DataVisualizer
+from app.api.deps import get_visualizer
 
 router = APIRouter()
 
@@ -46,7 +48,8 @@ class CustomAnalyticsResponse(BaseModel):
 @router.post("", response_model=CustomAnalyticsResponse)
 async def custom_analytics(
     request: CustomAnalyticsRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Perform custom analytics with flexible configurations.
@@ -138,8 +141,6 @@ async def custom_analytics(
         # Generate visualization if requested
         visualization_data = None
         if request.include_visualization and df is not None and not df.empty:
-            visualizer = DataVisualizer()
-            
             # Determine visualization type
             viz_type = request.visualization_type or ChartType.AUTO
             
@@ -190,7 +191,8 @@ async def custom_analytics(
                 y_columns = [metric.value.lower() for metric in request.metrics]
                 
                 if x_column and y_columns:
-                    visualization_data = visualizer.create_line_chart(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_line_chart,
                         df=df,
                         x_column=x_column,
                         y_columns=y_columns,
@@ -222,7 +224,8 @@ async def custom_analytics(
                 y_column = request.metrics[0].value.lower() if request.metrics else None
                 
                 if x_column and y_column:
-                    visualization_data = visualizer.create_bar_chart(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_bar_chart,
                         df=df,
                         x_column=x_column,
                         y_column=y_column,
@@ -253,7 +256,8 @@ async def custom_analytics(
                 y_columns = [metric.value.lower() for metric in request.metrics]
                 
                 if x_column and y_columns:
-                    visualization_data = visualizer.create_bar_chart(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_bar_chart,
                         df=df,
                         x_column=x_column,
                         y_columns=y_columns,
@@ -284,7 +288,8 @@ async def custom_analytics(
                 value_column = request.metrics[0].value.lower() if request.metrics else None
                 
                 if label_column and value_column:
-                    visualization_data = visualizer.create_pie_chart(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_pie_chart,
                         df=df,
                         label_column=label_column,
                         value_column=value_column,
@@ -312,7 +317,8 @@ async def custom_analytics(
                 value_column = request.metrics[0].value.lower() if request.metrics else None
                 
                 if x_column and y_column and value_column:
-                    visualization_data = visualizer.create_heatmap(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_heatmap,
                         df=df,
                         x_column=x_column,
                         y_column=y_column,
@@ -337,7 +343,8 @@ async def custom_analytics(
                         if dimension_name in df.columns:
                             color_column = dimension_name
                     
-                    visualization_data = visualizer.create_scatter_plot(
+                    visualization_data = await run_in_threadpool(
+                        visualizer.create_scatter_plot,
                         df=df,
                         x_column=x_column,
                         y_column=y_column,
@@ -387,7 +394,11 @@ async def get_correlation_analysis(
     start_date: Optional[datetime] = Body(None),
     end_date: Optional[datetime] = Body(None),
     filters: Optional[List[FilterCondition]] = Body(None),
-    db: Session = Depends(get_db)
+    mode: str = Body("aggregated", description="Correlation mode: aggregated or per_ticket"),
+    chunk_size: int = Body(10000, ge=100, le=100000, description="Rows per streamed chunk in per_ticket mode"),
+    partitions: int = Body(1, ge=1, le=16, description="Date partitions streamed in parallel in per_ticket mode"),
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Analyze correlation between different metrics.
@@ -397,6 +408,10 @@ async def get_correlation_analysis(
     - **start_date**: Optional start date for the analysis
     - **end_date**: Optional end date for the analysis
     - **filters**: Optional filter conditions to apply to the data
+    - **mode**: "aggregated" correlates metrics aggregated by dimension; "per_ticket" streams
+      individual tickets from a server-side cursor with constant memory
+    - **chunk_size**: Rows fetched per chunk in per_ticket mode
+    - **partitions**: Number of date ranges streamed in parallel in per_ticket mode
     
     Returns correlation matrix and visualization.
     """
@@ -404,6 +419,9 @@ async def get_correlation_analysis(
         if len(metrics) < 2:
             raise HTTPException(status_code=400, detail="At least 2 metrics are required for correlation analysis")
         
+        if mode not in ("aggregated", "per_ticket"):
+            raise HTTPException(status_code=400, detail=f"Unknown correlation mode: {mode}")
+        
         # Initialize aggregator
         aggregator = DataAggregator(db)
         
@@ -419,40 +437,58 @@ async def get_correlation_analysis(
                     "value": filter_condition.value
                 }
         
-        # Get data for correlation analysis
-        df = aggregator.aggregate_ticket_metrics(
-            metrics=metrics,
-            dimensions=dimensions,
-            start_date=start_date,
-            end_date=end_date,
-            filters=filter_dict
-        )
-        
-        if df.empty:
-            raise HTTPException(status_code=404, detail="No data found for correlation analysis")
-        
-        # Extract metric columns for correlation
         import pandas as pd
         import numpy as np
         
         metric_columns = [metric.value.lower() for metric in metrics]
-        correlation_df = df[metric_columns].copy()
         
-        # Calculate correlation matrix
-        correlation_matrix = correlation_df.corr().round(3)
+        if mode == "per_ticket":
+            # Stream individual tickets into an incremental covariance accumulator
+            try:
+                accumulator = aggregator.stream_ticket_correlation(
+                    metrics=metrics,
+                    start_date=start_date,
+                    end_date=end_date,
+                    filters=filter_dict,
+                    chunk_size=chunk_size,
+                    partitions=partitions
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            if accumulator.rows == 0:
+                raise HTTPException(status_code=404, detail="No data found for correlation analysis")
+            
+            observations = accumulator.rows
+            correlation_matrix = accumulator.correlation().round(3)
+        else:
+            # Get data for correlation analysis
+            df = aggregator.aggregate_ticket_metrics(
+                metrics=metrics,
+                dimensions=dimensions,
+                start_date=start_date,
+                end_date=end_date,
+                filters=filter_dict
+            )
+            
+            if df.empty:
+                raise HTTPException(status_code=404, detail="No data found for correlation analysis")
+            
+            # Calculate correlation matrix
+            observations = len(df)
+            correlation_matrix = df[metric_columns].corr().round(3)
         
         # Convert correlation matrix to dictionary
         correlation_data = correlation_matrix.to_dict(orient="index")
         
         # Create visualization
-        visualizer = DataVisualizer()
-        
         # Create heatmap for correlation matrix
         viz_df = correlation_matrix.reset_index()
         viz_df = pd.melt(viz_df, id_vars="index", value_vars=metric_columns)
         viz_df.columns = ["x", "y", "value"]
         
-        visualization = visualizer.create_heatmap(
+        visualization = await run_in_threadpool(
+            visualizer.create_heatmap,
             df=viz_df,
             x_column="x",
             y_column="y",
@@ -467,6 +503,8 @@ async def get_correlation_analysis(
         
         return {
             "metrics": [metric.value for metric in metrics],
+            "mode": mode,
+            "observations": observations,
             "correlation_matrix": correlation_data,
             "visualization": visualization
         }
@@ -485,7 +523,8 @@ async def detect_anomalies(
     end_date: Optional[datetime] = Body(None),
     sensitivity: float = Body(1.5, description="Z-score threshold for anomaly detection"),
     filters: Optional[List[FilterCondition]] = Body(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Detect anomalies in time series or dimensional data.
@@ -532,8 +571,22 @@ async def detect_anomalies(
         if dimension_column not in df.columns or metric_column not in df.columns:
             raise HTTPException(status_code=400, detail="Invalid dimension or metric column")
         
-        # Detect anomalies using Z-score
-        df["z_score"] = normalizer.z_score_normalize(df[metric_column])
+        # Detect anomalies using Z-score; the fit is reused for the same query
+        # until the next ETL run
+        spec = {
+            "metric": metric.value,
+            "dimension": dimension.value,
+            "start_date": start_date,
+            "end_date": end_date,
+            "filters": filter_dict
+        }
+        df["z_score"] = normalizer.standardize(
+            df[[metric_column]],
+            [metric_column],
+            persist_scaler=True,
+            scaler_id=f"anomaly:{metric_column}",
+            spec=spec
+        )[metric_column]
         df["is_anomaly"] = abs(df["z_score"]) > sensitivity
         
         # Extract anomalies
@@ -551,15 +604,14 @@ async def detect_anomalies(
             anomalies.append(anomaly)
         
         # Create visualization
-        visualizer = DataVisualizer()
-        
         # Prepare data for visualization
         import pandas as pd
         
         df["anomaly"] = df["is_anomaly"].map({True: "Anomaly", False: "Normal"})
         
         # Create the visualization
-        visualization = visualizer.create_scatter_plot(
+        visualization = await run_in_threadpool(
+            visualizer.create_scatter_plot,
             df=df,
             x_column=dimension_column,
             y_column=metric_column,
@@ -596,7 +648,10 @@ async def create_pivot_table(
     start_date: Optional[datetime] = Body(None),
     end_date: Optional[datetime] = Body(None),
     filters: Optional[List[FilterCondition]] = Body(None),
-    db: Session = Depends(get_db)
+    time_granularity: Optional[TimeGranularity] = Body(None, description="Granularity when a dimension is time"),
+    top_k_columns: int = Body(20, ge=1, le=200, description="Maximum number of columns before folding the rest into 'Other'"),
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Create a pivot table from the data.
@@ -608,6 +663,10 @@ async def create_pivot_table(
     - **start_date**: Optional start date for the analysis
     - **end_date**: Optional end date for the analysis
     - **filters**: Optional filter conditions to apply to the data
+    - **time_granularity**: Optional granularity when a dimension is time
+    - **top_k_columns**: Maximum number of columns; remaining values are folded into an "Other" column
+    
+    The pivot is computed in the database, so only the final matrix is transferred.
     
     Returns pivot table data and visualization.
     """
@@ -624,53 +683,25 @@ async def create_pivot_table(
                     "value": filter_condition.value
                 }
         
-        # Get data for pivot table
-        df = aggregator.aggregate_ticket_metrics(
-            metrics=[value_metric],
-            dimensions=[row_dimension, column_dimension],
-            start_date=start_date,
-            end_date=end_date,
-            filters=filter_dict
-        )
-        
-        if df.empty:
+        # Compute the pivot table in the database
+        try:
+            pivot_df, pivot_metadata = aggregator.pivot_ticket_metrics(
+                row_dimension=row_dimension,
+                column_dimension=column_dimension,
+                value_metric=value_metric,
+                aggregation_function=aggregation_function,
+                start_date=start_date,
+                end_date=end_date,
+                filters=filter_dict,
+                time_granularity=time_granularity,
+                top_k_columns=top_k_columns
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if pivot_df.empty:
             raise HTTPException(status_code=404, detail="No data found for pivot table")
         
-        # Determine dimension and metric columns
-        row_column = row_dimension.value.lower()
-        column_column = column_dimension.value.lower()
-        value_column = value_metric.value.lower()
-        
-        if row_column not in df.columns or column_column not in df.columns or value_column not in df.columns:
-            raise HTTPException(status_code=400, detail="Invalid dimension or metric columns")
-        
-        # Create pivot table
-        import pandas as pd
-        
-        # Map aggregation function
-        agg_func = None
-        if aggregation_function == "sum":
-            agg_func = "sum"
-        elif aggregation_function == "avg":
-            agg_func = "mean"
-        elif aggregation_function == "min":
-            agg_func = "min"
-        elif aggregation_function == "max":
-            agg_func = "max"
-        elif aggregation_function == "count":
-            agg_func = "count"
-        else:
-            agg_func = "sum"
-        
-        pivot_df = pd.pivot_table(
-            df,
-            values=value_column,
-            index=row_column,
-            columns=column_column,
-            aggfunc=agg_func,
-            fill_value=0
-        )
-        
         # Convert pivot table to dictionary
         pivot_data = {
             "rows": pivot_df.index.tolist(),
@@ -679,20 +710,15 @@ async def create_pivot_table(
         }
         
         # Create visualization
-        visualizer = DataVisualizer()
-        
-        # Create heatmap for pivot table
-        # Reset index to convert to regular columns
-        viz_df = pivot_df.reset_index()
-        
-        # Melt the dataframe to get it into a format suitable for heatmap
-        id_vars = [row_column]
-        value_vars = pivot_df.columns.tolist()
+        import pandas as pd
         
-        melted_df = pd.melt(viz_df, id_vars=id_vars, value_vars=value_vars)
+        # Melt the final matrix to get it into a format suitable for heatmap
+        viz_df = pivot_df.rename_axis("row").reset_index()
+        melted_df = pd.melt(viz_df, id_vars=["row"], value_vars=pivot_df.columns.tolist())
         melted_df.columns = ["row", "column", "value"]
         
-        visualization = visualizer.create_heatmap(
+        visualization = await run_in_threadpool(
+            visualizer.create_heatmap,
             df=melted_df,
             x_column="column",
             y_column="row",
@@ -710,6 +736,7 @@ async def create_pivot_table(
             "value_metric": value_metric.value,
             "aggregation_function": aggregation_function,
             "pivot_table": pivot_data,
+            "metadata": pivot_metadata,
             "visualization": visualization
         }
     
@@ -717,4 +744,4 @@ async def create_pivot_table(
         raise
     except Exception as e:
         logging.error(f"Error creating pivot table: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error creating pivot table: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error creating pivot table: {str(e)}")
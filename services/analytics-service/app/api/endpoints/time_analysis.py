@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel
 
 from app.db.database import get_db
@@ -12,9 +15,33 @@ from app.schemas.analytics import (
     TimeSeriesResponse, MetricValue
 )
 from app.visualization.visualizer import DataVisualizer
+from app.api.deps import get_visualizer
 
 router = APIRouter()
 
+# Months per bucket for calendar granularities, used to align compared periods
+CALENDAR_GRANULARITY_MONTHS = {
+    TimeGranularity.MONTH: 1,
+    TimeGranularity.QUARTER: 3,
+    TimeGranularity.YEAR: 12,
+}
+
+def _period_change(current, previous):
+    """
+    Absolute and percentage change from previous to current (percentage is 0 where previous is 0)
+    """
+    current = np.asarray(current, dtype=float)
+    previous = np.asarray(previous, dtype=float)
+    absolute = current - previous
+    percentage = np.divide(absolute * 100, previous, out=np.zeros_like(absolute), where=previous > 0)
+    return absolute, percentage
+
+def _shift_period_end(end, step):
+    """
+    Shift an inclusive period end back by step, keeping month ends on month ends
+    """
+    return (pd.Timestamp(end + timedelta(days=1) - step) - timedelta(days=1)).to_pydatetime()
+
 class TimeRangeParams(BaseModel):
     start_date: datetime
     end_date: datetime
@@ -29,7 +56,8 @@ class TimeSeriesRequest(BaseModel):
 @router.post("/trend", response_model=TimeSeriesResponse)
 async def get_time_series_data(
     request: TimeSeriesRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Retrieve time series data for analysis over time.
@@ -95,8 +123,6 @@ async def get_time_series_data(
         # Generate visualization if requested
         visualization_data = None
         if request.include_visualization:
-            visualizer = DataVisualizer()
-            
             # Prepare data for visualization
             if series_data:
                 # Create a combined dataframe for visualization
@@ -114,7 +140,8 @@ async def get_time_series_data(
                 viz_df = pd.DataFrame(viz_data)
                 
                 # Create the visualization
-                visualization_data = visualizer.create_line_chart(
+                visualization_data = await run_in_threadpool(
+                    visualizer.create_line_chart,
                     df=viz_df,
                     x_column="timestamp",
                     y_columns=list(set([series["metric"].value for series in series_data])),
@@ -146,67 +173,111 @@ async def compare_time_periods(
     current_end: datetime = Query(...),
     previous_start: Optional[datetime] = None,
     previous_end: Optional[datetime] = None,
+    previous_periods: int = Query(1, ge=1, le=52),
     granularity: TimeGranularity = TimeGranularity.DAY,
     filters: Optional[Dict[str, Any]] = None,
     include_visualization: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
-    Compare metrics between two time periods.
+    Compare metrics between the current period and one or more previous periods.
+    
+    All periods are aggregated in a single query and aligned bucket by bucket.
     
     - **metric**: Metric to compare
     - **current_start**: Start date of the current period
     - **current_end**: End date of the current period
     - **previous_start**: Optional start date of the previous period (calculated if not provided)
     - **previous_end**: Optional end date of the previous period (calculated if not provided)
+    - **previous_periods**: Number of consecutive previous periods to compare against (e.g. 4 for "this week vs last 4 weeks")
     - **granularity**: Time granularity for the analysis
     - **filters**: Optional filters to apply to the data
     - **include_visualization**: Whether to include visualization data
     
-    Returns comparison data between the two time periods.
+    Returns comparison data between the current period and the previous periods.
     """
     try:
-        # Calculate previous period if not provided
+        # Step between consecutive periods: whole calendar units for month/quarter/year
+        # buckets so they line up, otherwise the length of the period
+        if granularity in CALENDAR_GRANULARITY_MONTHS:
+            unit = CALENDAR_GRANULARITY_MONTHS[granularity]
+            if previous_start is not None and previous_end is not None:
+                months = (current_start.year - previous_start.year) * 12 + current_start.month - previous_start.month
+            else:
+                span = (current_end.year - current_start.year) * 12 + current_end.month - current_start.month
+                months = (span // unit + 1) * unit
+            step = pd.DateOffset(months=months)
+        elif previous_start is not None and previous_end is not None:
+            step = current_start - previous_start
+        else:
+            step = current_end - current_start + timedelta(days=1)
+        
+        # Default previous period is the one immediately before the current period
         if previous_start is None or previous_end is None:
-            # Calculate the duration of the current period
-            duration = current_end - current_start
-            
-            # Set previous period to the same duration before the current period
-            previous_end = current_start - timedelta(days=1)
-            previous_start = previous_end - duration
+            previous_start = pd.Timestamp(current_start - step).to_pydatetime()
+            previous_end = _shift_period_end(current_end, step)
         
-        # Initialize aggregator
-        aggregator = DataAggregator(db)
+        # Further previous periods repeat back-to-back before the first one
+        periods = [(current_start, current_end)] + [
+            (pd.Timestamp(previous_start - index * step).to_pydatetime(), _shift_period_end(previous_end, index * step))
+            for index in range(previous_periods)
+        ]
         
-        # Get data for current period
-        current_df = aggregator.aggregate_ticket_metrics(
-            metrics=[metric],
-            dimensions=[AggregationDimension.TIME],
-            start_date=current_start,
-            end_date=current_end,
-            filters=filters,
-            time_granularity=granularity
+        aggregator = DataAggregator(db)
+        df = aggregator.compare_ticket_periods(
+            metric=metric,
+            periods=periods,
+            granularity=granularity,
+            filters=filters
         )
         
-        # Get data for previous period
-        previous_df = aggregator.aggregate_ticket_metrics(
-            metrics=[metric],
-            dimensions=[AggregationDimension.TIME],
-            start_date=previous_start,
-            end_date=previous_end,
-            filters=filters,
-            time_granularity=granularity
-        )
+        # Align buckets: one row per bucket offset, one column per period
+        period_names = ["current_period"] + [
+            "previous_period" if index == 1 else f"previous_period_{index}"
+            for index in range(1, len(periods))
+        ]
+        aligned = df.pivot_table(index="bucket", columns="period", values="value", aggfunc="sum")
+        aligned = aligned.reindex(columns=range(len(periods))).fillna(0)
+        aligned.columns = period_names
+        if not aligned.empty:
+            aligned = aligned.reindex(range(int(aligned.index.max()) + 1), fill_value=0)
+        
+        # Period totals: counts add up, averages are weighted by ticket count
+        tickets = df.groupby("period")["tickets"].sum().reindex(range(len(periods)), fill_value=0)
+        if metric == AggregationMetric.TICKET_COUNT:
+            totals = df.groupby("period")["value"].sum()
+        else:
+            weighted = (df["value"].astype(float) * df["tickets"]).groupby(df["period"]).sum()
+            totals = weighted / tickets.replace(0, np.nan)
+        totals = totals.reindex(range(len(periods))).fillna(0).astype(float)
         
-        # Calculate total values
-        metric_column = metric.value.lower()
-        current_total = current_df[metric_column].sum() if not current_df.empty else 0
-        previous_total = previous_df[metric_column].sum() if not previous_df.empty else 0
+        current_total = totals[0]
+        previous_total = totals[1]
+        baseline_total = float(totals[1:].mean())
         
-        # Calculate percentage change
-        percentage_change = 0
-        if previous_total > 0:
-            percentage_change = ((current_total - previous_total) / previous_total) * 100
+        absolute_change, percentage_change = _period_change(current_total, previous_total)
+        baseline_absolute_change, baseline_percentage_change = _period_change(current_total, baseline_total)
+        
+        buckets = []
+        if not aligned.empty:
+            bucket_baseline = aligned[period_names[1:]].mean(axis=1).to_numpy()
+            bucket_absolute, bucket_percentage = _period_change(aligned["current_period"].to_numpy(), aligned["previous_period"].to_numpy())
+            baseline_absolute, baseline_percentage = _period_change(aligned["current_period"].to_numpy(), bucket_baseline)
+            
+            aligned_values = aligned.to_dict(orient="list")
+            buckets = [
+                {
+                    "bucket": int(bucket),
+                    **{name: float(aligned_values[name][position]) for name in period_names},
+                    "absolute_change": float(bucket_absolute[position]),
+                    "percentage_change": float(bucket_percentage[position]),
+                    "baseline": float(bucket_baseline[position]),
+                    "baseline_absolute_change": float(baseline_absolute[position]),
+                    "baseline_percentage_change": float(baseline_percentage[position])
+                }
+                for position, bucket in enumerate(aligned.index)
+            ]
         
         # Prepare response
         response = {
@@ -214,73 +285,48 @@ async def compare_time_periods(
             "current_period": {
                 "start_date": current_start.isoformat(),
                 "end_date": current_end.isoformat(),
-                "total": float(current_total)
+                "total": float(current_total),
+                "tickets": int(tickets[0])
             },
             "previous_period": {
                 "start_date": previous_start.isoformat(),
                 "end_date": previous_end.isoformat(),
-                "total": float(previous_total)
+                "total": float(previous_total),
+                "tickets": int(tickets[1])
             },
+            "previous_periods": [
+                {
+                    "start_date": start.isoformat(),
+                    "end_date": end.isoformat(),
+                    "total": float(totals[index]),
+                    "tickets": int(tickets[index])
+                }
+                for index, (start, end) in enumerate(periods[1:], start=1)
+            ],
             "comparison": {
-                "absolute_change": float(current_total - previous_total),
+                "absolute_change": float(absolute_change),
                 "percentage_change": float(percentage_change)
             },
+            "baseline_comparison": {
+                "baseline": baseline_total,
+                "absolute_change": float(baseline_absolute_change),
+                "percentage_change": float(baseline_percentage_change)
+            },
+            "buckets": buckets,
             "granularity": granularity
         }
         
         # Generate visualization if requested
-        if include_visualization:
-            visualizer = DataVisualizer()
-            
-            # Prepare data for visualization
-            import pandas as pd
-            import numpy as np
+        if include_visualization and not aligned.empty:
+            viz_df = aligned.reset_index()
             
-            # Create time points for x-axis
-            current_period_length = (current_end - current_start).days + 1
-            previous_period_length = (previous_end - previous_start).days + 1
-            max_length = max(current_period_length, previous_period_length)
-            
-            viz_data = {
-                "day": np.arange(max_length),
-                "current_period": np.zeros(max_length),
-                "previous_period": np.zeros(max_length)
-            }
-            
-            # Fill current period data
-            for _, row in current_df.iterrows():
-                time_column = granularity.value.lower()
-                if time_column in row:
-                    if isinstance(row[time_column], datetime):
-                        day_index = (row[time_column] - current_start).days
-                    else:
-                        continue
-                    
-                    if 0 <= day_index < max_length:
-                        viz_data["current_period"][day_index] = row[metric_column]
-            
-            # Fill previous period data
-            for _, row in previous_df.iterrows():
-                time_column = granularity.value.lower()
-                if time_column in row:
-                    if isinstance(row[time_column], datetime):
-                        day_index = (row[time_column] - previous_start).days
-                    else:
-                        continue
-                    
-                    if 0 <= day_index < max_length:
-                        viz_data["previous_period"][day_index] = row[metric_column]
-            
-            # Create dataframe for visualization
-            viz_df = pd.DataFrame(viz_data)
-            
-            # Create the visualization
-            visualization = visualizer.create_line_chart(
+            visualization = await run_in_threadpool(
+                visualizer.create_line_chart,
                 df=viz_df,
-                x_column="day",
-                y_columns=["current_period", "previous_period"],
+                x_column="bucket",
+                y_columns=period_names,
                 title=f"Period Comparison - {metric.value}",
-                x_label="Day",
+                x_label=granularity.value.capitalize(),
                 y_label=metric.value,
                 interactive=True,
                 output_format="json"
@@ -299,8 +345,9 @@ async def seasonal_analysis(
     metric: AggregationMetric,
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
-    seasonality: str = Query(..., description="Type of seasonality: daily, weekly, monthly, quarterly"),
-    db: Session = Depends(get_db)
+    seasonality: str = Query(..., description="Type of seasonality: daily, weekly, monthly, quarterly, yearly, heatmap"),
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Perform seasonal analysis on time series data.
@@ -309,6 +356,15 @@ async def seasonal_analysis(
     - **start_date**: Start date for the analysis
     - **end_date**: End date for the analysis
     - **seasonality**: Type of seasonality pattern to analyze
+        - daily: hour of day
+        - weekly: day of week
+        - monthly: day of month
+        - quarterly: quarter of year
+        - yearly: month of year
+        - heatmap: day of week x hour of day
+    
+    Profiles are grouped on date dimension attributes in the database, so
+    multi-year ranges cost a single aggregate query.
     
     Returns seasonal patterns in the data.
     """
@@ -316,106 +372,97 @@ async def seasonal_analysis(
         # Initialize aggregator
         aggregator = DataAggregator(db)
         
-        # Get time series data
-        dimensions = [AggregationDimension.TIME]
-        
-        # Determine granularity based on seasonality
-        granularity = TimeGranularity.DAY
-        if seasonality == "weekly":
-            granularity = TimeGranularity.WEEK
-        elif seasonality == "monthly":
-            granularity = TimeGranularity.MONTH
-        elif seasonality == "quarterly":
-            granularity = TimeGranularity.QUARTER
-        
-        df = aggregator.aggregate_ticket_metrics(
-            metrics=[metric],
-            dimensions=dimensions,
-            start_date=start_date,
-            end_date=end_date,
-            time_granularity=granularity
-        )
+        try:
+            df = aggregator.seasonal_ticket_profile(
+                metric=metric,
+                seasonality=seasonality,
+                start_date=start_date,
+                end_date=end_date
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Analyze seasonality
         import pandas as pd
         
-        # Ensure the data has a datetime index
-        time_column = granularity.value.lower()
-        metric_column = metric.value.lower()
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        months = ["January", "February", "March", "April", "May", "June",
+                  "July", "August", "September", "October", "November", "December"]
         
-        if time_column in df.columns:
-            df = df.set_index(time_column)
-        
-        # Convert to datetime if needed
-        if not pd.api.types.is_datetime64_any_dtype(df.index):
-            df.index = pd.to_datetime(df.index)
-        
-        # Extract seasonal components
-        seasonal_data = {}
+        if df.empty:
+            # No tickets in range, or none with a creation hour for the hourly modes
+            return {
+                "metric": metric,
+                "seasonality": seasonality,
+                "data": {},
+                "tickets": 0,
+                "visualization": None
+            }
         
-        if seasonality == "daily":
-            # Group by hour of day
-            seasonal_data = df.groupby(df.index.hour)[metric_column].mean().to_dict()
-            
-        elif seasonality == "weekly":
-            # Group by day of week
-            days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            seasonal_values = df.groupby(df.index.dayofweek)[metric_column].mean()
-            seasonal_data = {days[i]: float(seasonal_values.iloc[i]) for i in range(len(days)) if i < len(seasonal_values)}
+        # Create visualization
+        if seasonality == "heatmap":
+            # Day of week x hour of day matrix, with empty cells as zero
+            matrix = df.pivot_table(
+                values="value", index="day_of_week", columns="hour", aggfunc="sum"
+            ).reindex(index=range(7), columns=range(24)).fillna(0)
             
-        elif seasonality == "monthly":
-            # Group by day of month
-            seasonal_data = df.groupby(df.index.day)[metric_column].mean().to_dict()
+            seasonal_data = {
+                "rows": days,
+                "columns": list(range(24)),
+                "data": matrix.values.tolist()
+            }
             
-        elif seasonality == "quarterly":
-            # Group by month of quarter
-            quarters = {"Q1": [], "Q2": [], "Q3": [], "Q4": []}
-            for month in range(1, 13):
-                quarter = (month - 1) // 3 + 1
-                quarters[f"Q{quarter}"].append(month)
+            viz_df = df.assign(day=df["day_of_week"].map(lambda d: days[int(d)]))
+            visualization = await run_in_threadpool(
+                visualizer.create_heatmap,
+                df=viz_df,
+                x_column="hour",
+                y_column="day",
+                value_column="value",
+                title=f"Seasonal Analysis - {metric.value} (day of week x hour)",
+                x_label="Hour",
+                y_label="Day",
+                interactive=True,
+                output_format="json"
+            )
+        else:
+            # Label the buckets
+            bucket_column = df.columns[0]
+            if seasonality == "weekly":
+                labels = [days[int(value)] for value in df[bucket_column]]
+            elif seasonality == "quarterly":
+                labels = [f"Q{int(value)}" for value in df[bucket_column]]
+            elif seasonality == "yearly":
+                labels = [months[int(value) - 1] for value in df[bucket_column]]
+            else:
+                labels = [int(value) for value in df[bucket_column]]
             
-            seasonal_values = df.groupby(df.index.month)[metric_column].mean()
+            seasonal_data = {label: float(value) for label, value in zip(labels, df["value"])}
             
-            # Aggregate by quarter
-            q_data = {}
-            for q, months in quarters.items():
-                values = [seasonal_values.get(m, 0) for m in months if m in seasonal_values.index]
-                if values:
-                    q_data[q] = float(sum(values) / len(values))
-                else:
-                    q_data[q] = 0.0
+            # Prepare data for visualization
+            viz_df = pd.DataFrame({"period": [str(label) for label in labels], "value": df["value"].astype(float)})
             
-            seasonal_data = q_data
-        
-        # Create visualization
-        visualizer = DataVisualizer()
-        
-        # Prepare data for visualization
-        viz_data = []
-        for key, value in seasonal_data.items():
-            viz_data.append({"period": str(key), "value": value})
-        
-        viz_df = pd.DataFrame(viz_data)
-        
-        # Create the visualization
-        visualization = visualizer.create_bar_chart(
-            df=viz_df,
-            x_column="period",
-            y_column="value",
-            title=f"Seasonal Analysis - {metric.value} ({seasonality})",
-            x_label="Period",
-            y_label=metric.value,
-            interactive=True,
-            output_format="json"
-        )
+            visualization = await run_in_threadpool(
+                visualizer.create_bar_chart,
+                df=viz_df,
+                x_column="period",
+                y_column="value",
+                title=f"Seasonal Analysis - {metric.value} ({seasonality})",
+                x_label="Period",
+                y_label=metric.value,
+                interactive=True,
+                output_format="json"
+            )
         
         return {
             "metric": metric,
             "seasonality": seasonality,
             "data": seasonal_data,
+            "tickets": int(df["tickets"].sum()),
             "visualization": visualization
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error performing seasonal analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error performing seasonal analysis: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error performing seasonal analysis: {str(e)}")
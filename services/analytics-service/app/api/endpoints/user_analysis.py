@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -11,6 +12,7 @@ from app.schemas.analytics import (
     AggregationDimension, AggregationMetric, UserAnalyticsResponse
 )
 from app.visualization.visualizer import DataVisualizer
+from app.api.deps import get_visualizer
 
 router = APIRouter()
 
@@ -25,7 +27,8 @@ class UserAnalyticsRequest(BaseModel):
 @router.post("/performance", response_model=UserAnalyticsResponse)
 async def get_user_performance(
     request: UserAnalyticsRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Retrieve user performance analytics.
@@ -85,8 +88,6 @@ async def get_user_performance(
         # Generate visualization if requested
         visualization_data = None
         if request.include_visualization and users_data:
-            visualizer = DataVisualizer()
-            
             # Prepare data for visualization
             import pandas as pd
             
@@ -107,7 +108,8 @@ async def get_user_performance(
             
             # Create the visualization
             metric_names = [metric.value for metric in request.metrics]
-            visualization_data = visualizer.create_horizontal_bar_chart(
+            visualization_data = await run_in_threadpool(
+                visualizer.create_horizontal_bar_chart,
                 df=viz_df,
                 x_columns=metric_names,
                 y_column="user_name",
@@ -133,7 +135,8 @@ async def get_department_analytics(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     include_visualization: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Retrieve department-level analytics.
@@ -182,8 +185,6 @@ async def get_department_analytics(
         # Generate visualization if requested
         visualization_data = None
         if include_visualization and departments_data:
-            visualizer = DataVisualizer()
-            
             # Prepare data for visualization
             import pandas as pd
             
@@ -203,7 +204,8 @@ async def get_department_analytics(
             
             # Create the visualization
             metric_names = [metric.value for metric in metrics]
-            visualization_data = visualizer.create_bar_chart(
+            visualization_data = await run_in_threadpool(
+                visualizer.create_bar_chart,
                 df=viz_df,
                 x_column="department",
                 y_columns=metric_names,
@@ -230,7 +232,8 @@ async def get_top_performers(
     end_date: Optional[datetime] = None,
     department: Optional[str] = None,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Retrieve top-performing users for a specific metric.
@@ -275,8 +278,6 @@ async def get_top_performers(
             results.append(performer)
         
         # Create visualization
-        visualizer = DataVisualizer()
-        
         # Prepare data for visualization
         import pandas as pd
         
@@ -287,7 +288,8 @@ async def get_top_performers(
             )
             
             # Create the visualization
-            visualization = visualizer.create_horizontal_bar_chart(
+            visualization = await run_in_threadpool(
+                visualizer.create_horizontal_bar_chart,
                 df=viz_df,
                 x_column="value",
                 y_column="user_label",
@@ -316,7 +318,8 @@ async def get_user_details(
     metrics: List[AggregationMetric] = Query(...),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    visualizer: DataVisualizer = Depends(get_visualizer)
 ):
     """
     Retrieve detailed analytics for a specific user.
@@ -388,8 +391,6 @@ async def get_user_details(
             time_series_data[metric.value] = values
         
         # Create visualizations
-        visualizer = DataVisualizer()
-        
         # Time series visualization
         time_series_viz = None
         if any(len(values) > 0 for values in time_series_data.values()):
@@ -410,7 +411,8 @@ async def get_user_details(
                 viz_df = pd.DataFrame(viz_data)
                 
                 # Create the visualization
-                time_series_viz = visualizer.create_line_chart(
+                time_series_viz = await run_in_threadpool(
+                    visualizer.create_line_chart,
                     df=viz_df,
                     x_column="timestamp",
                     y_column="value",
@@ -438,7 +440,8 @@ async def get_user_details(
             viz_df = pd.DataFrame(viz_data)
             
             # Create the visualization
-            metrics_viz = visualizer.create_bar_chart(
+            metrics_viz = await run_in_threadpool(
+                visualizer.create_bar_chart,
                 df=viz_df,
                 x_column="metric",
                 y_column="value",
@@ -34,6 +34,35 @@ class Settings(BaseSettings):
     # Redis for caching
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     REDIS_TTL: int = int(os.getenv("REDIS_TTL", "3600"))
+    SCALER_STORE_TTL: int = int(os.getenv("SCALER_STORE_TTL", "604800"))
+    
+    # Chart render cache
+    RENDER_CACHE_ENABLED: bool = os.getenv("RENDER_CACHE_ENABLED", "True") == "True"
+    RENDER_CACHE_MAX_BYTES: int = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RENDER_CACHE_TTL: int = int(os.getenv("RENDER_CACHE_TTL", "900"))
+    
+    # Static chart render worker pool (0 workers renders in-process)
+    RENDER_POOL_WORKERS: int = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+    RENDER_POOL_MAX_PENDING: int = int(os.getenv("RENDER_POOL_MAX_PENDING", "32"))
+    RENDER_POOL_TIMEOUT: float = float(os.getenv("RENDER_POOL_TIMEOUT", "30"))
+    
+    # Maximum points per line chart series before LTTB downsampling (0 disables)
+    CHART_MAX_POINTS: int = int(os.getenv("CHART_MAX_POINTS", "2000"))
+    
+    # Scatter plots with more points than this are rendered as a density grid
+    CHART_BIN_THRESHOLD: int = int(os.getenv("CHART_BIN_THRESHOLD", "100000"))
+    
+    # Bins per axis of density-binned scatter plots and heatmaps
+    CHART_BINS: int = int(os.getenv("CHART_BINS", "200"))
+    
+    # Maximum number of outliers drawn as individual points over a density grid
+    CHART_BIN_MAX_OUTLIERS: int = int(os.getenv("CHART_BIN_MAX_OUTLIERS", "2000"))
+    
+    # Maximum number of dashboard panels built concurrently
+    DASHBOARD_MAX_WORKERS: int = int(os.getenv("DASHBOARD_MAX_WORKERS", "4"))
+    
+    # Import plotting and modelling libraries in the background once the server is up
+    WARM_UP_IMPORTS: bool = os.getenv("WARM_UP_IMPORTS", "True") == "True"
     
     # Service URLs
     USER_SERVICE_URL: str = os.getenv("USER_SERVICE_URL", "http://localhost:8000")
@@ -0,0 +1,136 @@
+import asyncio
+import importlib
+import logging
+import threading
+import time
+import types
+from typing import Dict, Iterable
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Heavy third-party modules deferred until first use in the API process
+HEAVY_MODULES = [
+    "plotly.express",
+    "plotly.graph_objects",
+    "plotly.subplots",
+    "statsmodels.tsa.holtwinters",
+    "statsmodels.tsa.arima.model",
+    "sklearn.preprocessing",
+]
+
+# Plotting modules used only where static charts are rasterized (the render
+# pool workers, or the API process when the pool is disabled)
+RENDER_MODULES = [
+    "matplotlib.pyplot",
+    "seaborn",
+]
+
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access
+
+    Importing is deferred until code actually uses the module, so importing
+    the application (and starting a worker) does not pay for plotting and
+    modelling libraries before the first request that needs them.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        """
+        Import the real module (once) and return it
+        """
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with _import_lock:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    if self.__name__ == "matplotlib.pyplot":
+                        # The service has no display; select the non-interactive backend first
+                        importlib.import_module("matplotlib").use("Agg")
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a lazily imported module
+
+    Args:
+        name: Fully qualified module name (e.g. 'plotly.graph_objects')
+
+    Returns:
+        Module placeholder that imports the module on first attribute access
+    """
+    return LazyModule(name)
+
+
+def warm_up(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """
+    Import modules ahead of the first request that needs them
+
+    Modules that are not installed are logged and skipped.
+
+    Args:
+        modules: Module names to import
+
+    Returns:
+        Seconds spent importing each module
+    """
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            lazy_import(name)._load()
+        except ImportError as e:
+            logger.warning(f"Could not warm up {name}: {e}")
+            continue
+        timings[name] = round(time.perf_counter() - start, 4)
+
+    logger.info(f"Warmed up {len(timings)} modules in {sum(timings.values()):.2f}s")
+    return timings
+
+
+async def schedule_warm_up() -> None:
+    """
+    Startup hook importing heavy libraries in a background thread
+
+    The handler returns immediately, so the server starts listening (and
+    answering health checks) while the imports run. Register it on every
+    app entry point with app.add_event_handler("startup", schedule_warm_up).
+
+    The API process warms only the modules its request path uses. Static
+    charts are rasterized in the render pool, whose workers are started here
+    and import the plotting modules in their initializer.
+    """
+    if not settings.WARM_UP_IMPORTS:
+        return
+
+    loop = asyncio.get_running_loop()
+    if settings.RENDER_POOL_WORKERS > 0:
+        from app.visualization.render_pool import get_render_pool
+        loop.run_in_executor(None, warm_up, HEAVY_MODULES)
+        loop.run_in_executor(None, get_render_pool().start)
+    else:
+        # Static charts are rasterized in this process
+        loop.run_in_executor(None, warm_up, HEAVY_MODULES + RENDER_MODULES)
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pymongo import MongoClient
@@ -72,11 +72,22 @@ def get_db() -> Generator:
 def init_db() -> None:
     """
     Initialize the PostgreSQL database, creating tables if they don't exist
+    and adding columns introduced after the tables were created
     """
     try:
         # Create all tables if they don't exist
         Base.metadata.create_all(bind=engine)
         logger.info("PostgreSQL tables created successfully")
+        
+        # create_all does not alter existing tables. Tickets loaded before
+        # created_hour existed keep a NULL hour until the ETL backfills it
+        # (see ETLPipeline.created_hour_backfill_days)
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE fact_tickets ADD COLUMN IF NOT EXISTS created_hour INTEGER"))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_fact_tickets_created_hour ON fact_tickets (created_hour)"
+            ))
+        logger.info("PostgreSQL columns migrated successfully")
     except Exception as e:
         logger.error(f"Error initializing PostgreSQL database: {e}")
         raise
\ No newline at end of file
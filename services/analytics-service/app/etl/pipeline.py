@@ -4,7 +4,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, cast, Date
 import json
@@ -16,6 +16,7 @@ from app.models.sql_models import (
     DimPriority, DimStatus, FactUserActivity, ETLLog
 )
 from app.api.deps import get_service_token
+from app.analytics.scaler_store import get_scaler_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +57,40 @@ class ETLPipeline:
             logger.error(f"Error extracting ticket data: {str(e)}")
             return []
     
+    async def extract_all_ticket_data(self, days: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Extract all ticket data of the last days from Ticket Service, page by page
+        
+        Returns:
+            The extracted tickets, and whether the extract is complete (every
+            page was fetched until a short page ended it)
+        """
+        from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        tickets = []
+        
+        try:
+            async with httpx.AsyncClient() as client:
+                headers = {"Authorization": f"Bearer {self.service_token}"}
+                while True:
+                    response = await client.get(
+                        f"{settings.TICKET_SERVICE_URL}/api/tickets?from_date={from_date}"
+                        f"&skip={len(tickets)}&limit={settings.ETL_BATCH_SIZE}",
+                        headers=headers
+                    )
+                    
+                    if response.status_code != 200:
+                        logger.error(f"Failed to extract ticket data: {response.status_code} - {response.text}")
+                        return tickets, False
+                    
+                    page = response.json().get("tickets", [])
+                    tickets.extend(page)
+                    if len(page) < settings.ETL_BATCH_SIZE:
+                        return tickets, True
+                    
+        except Exception as e:
+            logger.error(f"Error extracting ticket data: {str(e)}")
+            return tickets, False
+    
     async def extract_user_data(self) -> List[Dict[str, Any]]:
         """
         Extract user data from User Service
@@ -339,6 +374,7 @@ class ETLPipeline:
                     existing_ticket.resolved_date_id = resolved_date_id
                     existing_ticket.response_time_minutes = response_time_minutes
                     existing_ticket.resolution_time_minutes = resolution_time_minutes
+                    existing_ticket.created_hour = created_at.hour if created_at else None
                     existing_ticket.reopened_count = ticket.get("reopened_count", 0)
                     existing_ticket.comment_count = ticket.get("comment_count", 0)
                     existing_ticket.attachment_count = ticket.get("attachment_count", 0)
@@ -364,6 +400,7 @@ class ETLPipeline:
                     new_ticket = FactTicket(
                         ticket_id=ticket_id,
                         created_date_id=created_date_id,
+                        created_hour=created_at.hour if created_at else None,
                         updated_date_id=updated_date_id,
                         resolved_date_id=resolved_date_id,
                         user_id=user_id,
@@ -446,6 +483,29 @@ class ETLPipeline:
                 logger.error(f"Error processing user activity for user {user.user_id}: {str(e)}")
                 self.db.rollback()
     
+    def created_hour_backfill_days(self) -> int:
+        """
+        Days to extract so tickets loaded before created_hour existed get their hour
+        
+        The creation hour is only known to the Ticket Service, so the backfill
+        re-extracts the tickets back to the oldest one without an hour. It runs
+        once: after a successful backfill (or with no such tickets) this is 0.
+        """
+        backfilled = self.db.query(ETLLog.id).filter(
+            ETLLog.process_name == "created_hour_backfill",
+            ETLLog.status == "success"
+        ).first()
+        if backfilled:
+            return 0
+        
+        oldest = self.db.query(func.min(DimDate.date)).join(
+            FactTicket, FactTicket.created_date_id == DimDate.id
+        ).filter(FactTicket.created_hour.is_(None)).scalar()
+        if oldest is None:
+            return 0
+        
+        return (datetime.now() - oldest).days + 1
+    
     async def run_etl_pipeline(self, days: int = 1) -> None:
         """
         Run the complete ETL pipeline
@@ -459,8 +519,14 @@ class ETLPipeline:
         self.db.commit()
         
         try:
-            # Extract data
-            ticket_data = await self.extract_ticket_data(days)
+            # Widen the window once to backfill the creation hour of older tickets
+            backfill_days = self.created_hour_backfill_days()
+            
+            # Extract data; the backfill pages through every ticket of its window
+            if backfill_days > days:
+                ticket_data, backfill_complete = await self.extract_all_ticket_data(backfill_days)
+            else:
+                ticket_data = await self.extract_ticket_data(days)
             user_data = await self.extract_user_data()
             category_data = await self.extract_category_data()
             
@@ -486,8 +552,21 @@ class ETLPipeline:
             etl_log.end_time = datetime.utcnow()
             etl_log.status = "success"
             etl_log.records_processed = len(ticket_data) + len(user_data) + len(category_data)
+            if backfill_days > days:
+                # An incomplete extract leaves tickets without an hour; the next run retries
+                self.db.add(ETLLog(
+                    process_name="created_hour_backfill",
+                    end_time=datetime.utcnow(),
+                    status="success" if backfill_complete else "failed",
+                    records_processed=len(ticket_data),
+                    error_message=None if backfill_complete else "Ticket extract failed or was incomplete",
+                    details={"days": backfill_days}
+                ))
             self.db.commit()
             
+            # New warehouse data invalidates scalers fitted on the previous generation
+            get_scaler_store().bump_generation()
+            
             logger.info(f"ETL pipeline completed successfully. Processed {etl_log.records_processed} records.")
             
         except Exception as e:
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.api import router as api_router
+from app.core.lazy_imports import schedule_warm_up
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +31,9 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router)
 
+# Import heavy libraries in the background once the server is up
+app.add_event_handler("startup", schedule_warm_up)
+
 @app.get("/")
 async def root():
     """
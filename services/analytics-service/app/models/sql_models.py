@@ -16,7 +16,7 @@ class FactTicket(Base):
     ticket_id = Column(String, unique=True, index=True, nullable=False)
     
     # Foreign keys to dimension tables
-    created_date_id = Column(Integer, ForeignKey("dim_dates.id"))
+    created_date_id = Column(Integer, ForeignKey("dim_dates.id"), index=True)
     updated_date_id = Column(Integer, ForeignKey("dim_dates.id"))
     resolved_date_id = Column(Integer, ForeignKey("dim_dates.id"))
     user_id = Column(Integer, ForeignKey("dim_users.id"))
@@ -25,6 +25,9 @@ class FactTicket(Base):
     priority_id = Column(Integer, ForeignKey("dim_priorities.id"))
     status_id = Column(Integer, ForeignKey("dim_statuses.id"))
     
+    # Hour of day (0-23) the ticket was created, for intraday seasonality
+    created_hour = Column(Integer, index=True)
+    
     # Metrics
     response_time_minutes = Column(Float)
     resolution_time_minutes = Column(Float)
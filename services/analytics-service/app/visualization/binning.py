@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from app.visualization.downsampling import numeric_axis
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tukey fence multiplier: points beyond Q1 - k*IQR or Q3 + k*IQR are outliers
+OUTLIER_WHISKER = 1.5
+
+
+def is_binnable(values: pd.Series) -> bool:
+    """
+    Whether a column can be placed on a continuous binned axis
+    """
+    if pd.api.types.is_bool_dtype(values):
+        return False
+    return pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values)
+
+
+def _fences(values: np.ndarray, whisker: float = OUTLIER_WHISKER) -> Tuple[float, float]:
+    """
+    Lower and upper Tukey fences of a set of values
+    """
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = q3 - q1
+    return q1 - whisker * spread, q3 + whisker * spread
+
+
+def _outlier_scores(columns: Tuple[np.ndarray, ...], whisker: float = OUTLIER_WHISKER) -> np.ndarray:
+    """
+    Distance of each point beyond the fences, in IQRs (0 for inliers)
+
+    A point is an outlier if it lies outside the fences on any of the columns.
+    """
+    scores = np.zeros(len(columns[0]))
+    for values in columns:
+        low, high = _fences(values, whisker)
+        spread = max((high - low) / (1 + 2 * whisker), np.finfo(float).eps)
+        beyond = np.maximum(low - values, values - high) / spread
+        scores = np.maximum(scores, beyond)
+    return scores
+
+
+def _select_outliers(scores: np.ndarray, max_outliers: int) -> np.ndarray:
+    """
+    Positions of the most extreme outliers, at most max_outliers of them
+    """
+    if max_outliers <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    positions = np.flatnonzero(scores > 0)
+    if len(positions) > max_outliers:
+        # Keep the points furthest beyond the fences
+        extreme = np.argpartition(scores[positions], -max_outliers)[-max_outliers:]
+        positions = np.sort(positions[extreme])
+    return positions
+
+
+def _axis_labels(positions: np.ndarray, values: pd.Series) -> np.ndarray:
+    """
+    Map bin positions (centers or edges) back to the axis type of the source column
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.to_datetime(positions.astype(np.int64)).to_numpy()
+    return positions
+
+
+def _histogram_range(x: np.ndarray, y: np.ndarray, inliers: np.ndarray) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+    """
+    Grid extent covering the inlier points (None lets NumPy use the full data range)
+    """
+    if not inliers.any():
+        return None
+    x_in, y_in = x[inliers], y[inliers]
+    x_range = (x_in.min(), x_in.max())
+    y_range = (y_in.min(), y_in.max())
+    # Degenerate axes get a unit-wide extent like np.histogram2d does
+    if x_range[0] == x_range[1]:
+        x_range = (x_range[0] - 0.5, x_range[1] + 0.5)
+    if y_range[0] == y_range[1]:
+        y_range = (y_range[0] - 0.5, y_range[1] + 0.5)
+    return x_range, y_range
+
+
+def bin_points(
+    df: pd.DataFrame,
+    x_column: str,
+    y_column: str,
+    bins: int,
+    max_outliers: int
+) -> Dict[str, Any]:
+    """
+    Aggregate scatter points into a 2D density grid
+
+    Points outside the Tukey fences of either axis are kept as individual
+    points (the most extreme max_outliers of them) and the grid spans the
+    points inside the fences, so a few extreme values neither stretch the grid
+    nor disappear into a single cell. Outliers beyond max_outliers are counted
+    in the edge cells of the grid, so the grid and the shown outliers together
+    account for every point.
+
+    Args:
+        df: Input DataFrame
+        x_column: Column for x-axis
+        y_column: Column for y-axis
+        bins: Number of bins per axis
+        max_outliers: Maximum number of outliers kept as points
+
+    Returns:
+        Dict with 'x' and 'y' bin centers, 'x_edges', 'y_edges', 'counts'
+        (shape [y bins, x bins]), 'outliers' (DataFrame rows) and 'summary'
+    """
+    df = df[df[x_column].notna() & df[y_column].notna()]
+    x = numeric_axis(df[x_column])
+    y = numeric_axis(df[y_column])
+
+    scores = _outlier_scores((x, y)) if len(df) else np.zeros(0)
+    outliers = _select_outliers(scores, max_outliers)
+
+    # Every point not shown individually goes into the grid
+    binned = np.ones(len(df), dtype=bool)
+    binned[outliers] = False
+    x_binned, y_binned = x[binned], y[binned]
+
+    grid_range = _histogram_range(x, y, scores == 0)
+    if grid_range is not None:
+        # Outliers beyond the shown ones are clipped into the edge bins
+        x_binned = np.clip(x_binned, *grid_range[0])
+        y_binned = np.clip(y_binned, *grid_range[1])
+
+    counts, x_edges, y_edges = np.histogram2d(x_binned, y_binned, bins=bins, range=grid_range)
+
+    return {
+        "x": _axis_labels((x_edges[:-1] + x_edges[1:]) / 2, df[x_column]),
+        "y": _axis_labels((y_edges[:-1] + y_edges[1:]) / 2, df[y_column]),
+        "x_edges": _axis_labels(x_edges, df[x_column]),
+        "y_edges": _axis_labels(y_edges, df[y_column]),
+        # histogram2d returns [x, y]; plotting expects rows along y
+        "counts": counts.T,
+        "outliers": df.iloc[outliers],
+        "summary": {
+            "method": "histogram2d",
+            "bins": bins,
+            "points": int(len(df)),
+            "binned_points": int(binned.sum()),
+            "outliers": int((scores > 0).sum()),
+            "outliers_shown": int(len(outliers)),
+        }
+    }
+
+
+def bin_values(
+    df: pd.DataFrame,
+    x_column: str,
+    y_column: str,
+    value_column: str,
+    bins: int,
+    max_outliers: int
+) -> Dict[str, Any]:
+    """
+    Aggregate (x, y, value) points into a 2D grid of mean values
+
+    Cells without points are NaN. Points whose value lies outside the Tukey
+    fences of the value column are also returned individually so they stay
+    visible once averaged into their cell.
+
+    Args:
+        df: Input DataFrame
+        x_column: Column for x-axis
+        y_column: Column for y-axis
+        value_column: Column for cell values
+        bins: Number of bins per axis
+        max_outliers: Maximum number of outliers kept as points
+
+    Returns:
+        Dict with 'x' and 'y' bin centers, 'x_edges', 'y_edges', 'values'
+        (mean per cell, shape [y bins, x bins]), 'counts', 'outliers' and 'summary'
+    """
+    df = df[df[x_column].notna() & df[y_column].notna() & df[value_column].notna()]
+    x = numeric_axis(df[x_column])
+    y = numeric_axis(df[y_column])
+    values = df[value_column].to_numpy(dtype=float)
+
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    scores = _outlier_scores((values,)) if len(df) else np.zeros(0)
+    outliers = _select_outliers(scores, max_outliers)
+
+    return {
+        "x": _axis_labels((x_edges[:-1] + x_edges[1:]) / 2, df[x_column]),
+        "y": _axis_labels((y_edges[:-1] + y_edges[1:]) / 2, df[y_column]),
+        "x_edges": _axis_labels(x_edges, df[x_column]),
+        "y_edges": _axis_labels(y_edges, df[y_column]),
+        "values": means.T,
+        "counts": counts.T,
+        "outliers": df.iloc[outliers],
+        "summary": {
+            "method": "histogram2d",
+            "bins": bins,
+            "points": int(len(df)),
+            "binned_points": int(len(df)),
+            "outliers": int((scores > 0).sum()),
+            "outliers_shown": int(len(outliers)),
+        }
+    }
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def numeric_axis(values: pd.Series) -> np.ndarray:
+    """
+    Map x-axis values to floats for geometric downsampling
+
+    Datetimes become nanosecond timestamps, numbers are used as-is and anything
+    else (categories, strings) is spaced evenly by position.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if getattr(values.dtype, "tz", None) is not None:
+            values = values.dt.tz_convert(None)
+        return values.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int, envelope: bool = True) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The remaining points are split
+    into equal buckets and, for each bucket, the point forming the largest
+    triangle with the previously selected point and the average of the next
+    bucket is kept. With envelope enabled the minimum and maximum of each bucket
+    are kept as well, so spikes and dips survive downsampling; budgets below 5
+    points leave no room for it and keep one point per bucket.
+
+    Args:
+        x: Sorted numeric x values (no NaN)
+        y: Numeric y values (no NaN)
+        max_points: Point budget (0 or less keeps every point)
+        envelope: Whether to keep each bucket's min and max
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(x)
+    if n <= max_points or max_points <= 0:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1][:max_points], dtype=np.int64)
+
+    # Each bucket contributes up to 3 points with the envelope, 1 without
+    envelope = envelope and max_points >= 5
+    per_bucket = 3 if envelope else 1
+    buckets = max(1, (max_points - 2) // per_bucket)
+
+    edges = np.floor(np.linspace(1, n - 1, buckets + 1)).astype(np.int64)
+    selected = [0]
+    previous = 0
+
+    for bucket in range(buckets):
+        start, end = edges[bucket], edges[bucket + 1]
+        if end <= start:
+            continue
+
+        # Average of the next bucket (the last point for the final bucket)
+        if bucket + 2 <= buckets:
+            next_start, next_end = edges[bucket + 1], max(edges[bucket + 2], edges[bucket + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs(
+            (x[previous] - average_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (average_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected.append(previous)
+
+        if envelope:
+            selected.append(start + int(np.argmin(bucket_y)))
+            selected.append(start + int(np.argmax(bucket_y)))
+
+    selected.append(n - 1)
+    return np.unique(np.asarray(selected, dtype=np.int64))
+
+
+def downsample_series(
+    df: pd.DataFrame,
+    x_column: str,
+    y_columns: List[str],
+    max_points: int,
+    envelope: bool = True
+) -> Tuple[Dict[str, Tuple[pd.Series, pd.Series]], Dict[str, Any]]:
+    """
+    Downsample each y series of a line chart to a point budget
+
+    Each series is reduced independently (rows where the series is missing are
+    dropped first), so every trace keeps its own shape.
+
+    Args:
+        df: Input DataFrame
+        x_column: Column for x-axis
+        y_columns: Columns for y-axis
+        max_points: Point budget per series (0 disables downsampling)
+        envelope: Whether to keep each bucket's min and max
+
+    Returns:
+        Tuple of ({y_column: (x values, y values)}, downsampling summary)
+    """
+    series = {}
+    summary = {
+        "method": "lttb",
+        "max_points": max_points,
+        "original_points": {},
+        "reduced_points": {},
+    }
+
+    x_values = df[x_column]
+    if max_points and len(df) > max_points and not x_values.is_monotonic_increasing:
+        order = np.argsort(numeric_axis(x_values), kind="stable")
+        df = df.iloc[order]
+        x_values = df[x_column]
+
+    for y_column in y_columns:
+        y_values = df[y_column]
+        original = len(y_values)
+
+        if max_points and original > max_points and pd.api.types.is_numeric_dtype(y_values):
+            present = y_values.notna().to_numpy()
+            x_numeric = numeric_axis(x_values)[present]
+            y_numeric = y_values.to_numpy(dtype=float)[present]
+            keep = np.flatnonzero(present)[lttb_indices(x_numeric, y_numeric, max_points, envelope)]
+            series[y_column] = (x_values.iloc[keep], y_values.iloc[keep])
+        else:
+            series[y_column] = (x_values, y_values)
+
+        summary["original_points"][y_column] = original
+        summary["reduced_points"][y_column] = len(series[y_column][1])
+
+    summary["downsampled"] = any(
+        summary["reduced_points"][y_column] < summary["original_points"][y_column]
+        for y_column in y_columns
+    )
+    return series, summary
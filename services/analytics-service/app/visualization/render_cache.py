@@ -0,0 +1,300 @@
+import functools
+import hashlib
+import inspect
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.db.database import get_redis_client
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for rendered charts
+RENDER_KEY_PREFIX = "analytics:render"
+
+# Seconds to wait before retrying Redis after a connection failure
+REDIS_RETRY_SECONDS = 60
+
+
+def _update_hash(digest: "hashlib._Hash", value: Any) -> None:
+    """
+    Feed a chart argument into a running hash
+
+    DataFrames, Series and arrays are hashed by content (values, index, column
+    names and dtypes); containers are walked recursively so dashboard specs
+    holding DataFrames hash the same way.
+    """
+    if isinstance(value, pd.DataFrame):
+        digest.update(b"DataFrame")
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in value.dtypes.items()]).encode("utf-8"))
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        except TypeError:
+            # Unhashable cells (lists, dicts): fall back to the pickled frame
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    elif isinstance(value, pd.Series):
+        digest.update(b"Series")
+        digest.update(f"{value.name}:{value.dtype}".encode("utf-8"))
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        except TypeError:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype}:{value.shape}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else pickle.dumps(value))
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=str):
+            digest.update(str(key).encode("utf-8"))
+            _update_hash(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update_hash(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode("utf-8"))
+
+
+def render_key(chart_type: str, spec: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a chart render
+
+    Args:
+        chart_type: Name of the render method (e.g. 'create_line_chart')
+        spec: Render arguments, including input DataFrames, theme and output format
+
+    Returns:
+        Hex digest identifying the rendered output
+    """
+    digest = hashlib.sha256(chart_type.encode("utf-8"))
+    _update_hash(digest, spec)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Cache of rendered charts (Plotly JSON or base64 PNG)
+
+    A bounded in-process LRU with byte-size accounting sits in front of Redis,
+    so a chart rendered by any worker is reused until the entry expires.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[int] = None, use_redis: bool = True):
+        """
+        Initialize the RenderCache
+
+        Args:
+            max_bytes: Maximum total size of locally cached renders (defaults to RENDER_CACHE_MAX_BYTES)
+            ttl: Seconds to keep renders in Redis (defaults to RENDER_CACHE_TTL)
+            use_redis: Whether to share renders through Redis
+        """
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RENDER_CACHE_MAX_BYTES
+        self.ttl = ttl if ttl is not None else settings.RENDER_CACHE_TTL
+        self.use_redis = use_redis
+        # A single render may take at most an eighth of the local budget
+        self.max_entry_bytes = self.max_bytes // 8
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis(self):
+        """
+        Get the Redis client, or None while Redis is unavailable
+        """
+        if not self.use_redis or time.monotonic() < self._redis_retry_at:
+            return None
+
+        try:
+            return get_redis_client()
+        except Exception as e:
+            logger.warning(f"Render cache falling back to in-process cache: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+
+    def _store_local(self, key: str, value: str) -> None:
+        """
+        Insert a render into the local LRU, evicting the oldest entries over budget
+        """
+        size = len(value)
+        if size > self.max_entry_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+
+            self._entries[key] = value
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a rendered chart
+
+        Args:
+            key: Key from render_key
+
+        Returns:
+            The rendered chart, or None if not cached
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        client = self._redis()
+        if client is not None:
+            try:
+                value = client.get(f"{RENDER_KEY_PREFIX}:{key}")
+            except Exception as e:
+                logger.warning(f"Could not read render cache: {e}")
+                value = None
+
+            if value is not None:
+                if isinstance(value, bytes):
+                    value = value.decode("utf-8")
+                self._store_local(key, value)
+                self.redis_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a rendered chart
+
+        Args:
+            key: Key from render_key
+            value: Rendered chart (JSON string or base64 image)
+        """
+        if not isinstance(value, str):
+            return
+
+        self._store_local(key, value)
+
+        client = self._redis()
+        if client is None:
+            return
+
+        try:
+            client.set(f"{RENDER_KEY_PREFIX}:{key}", value, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not write render cache: {e}")
+
+    def clear(self) -> None:
+        """
+        Drop all locally cached renders
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+            }
+
+
+def cached_render(
+    method: Optional[Callable] = None,
+    *,
+    stored: Optional[Callable[[Any], Any]] = None
+) -> Callable:
+    """
+    Cache the output of a DataVisualizer render method
+
+    The key covers the method name, every bound argument (DataFrames by content)
+    and the visualizer theme and encoding, so equal inputs reuse the stored render.
+
+    Args:
+        method: Render method (when used as a bare decorator)
+        stored: Function turning a fresh render into the value served on cache
+            hits (e.g. to mark build metadata as cached); applied once, on store
+    """
+    if method is None:
+        return functools.partial(cached_render, stored=stored)
+
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, "render_cache", None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        try:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            spec = {name: value for name, value in bound.arguments.items() if name != "self"}
+            spec["theme"] = self.theme
+            spec["binary_arrays"] = getattr(self, "binary_arrays", False)
+            key = render_key(method.__name__, spec)
+        except Exception as e:
+            logger.warning(f"Could not build render cache key for {method.__name__}: {e}")
+            return method(self, *args, **kwargs)
+
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        value = method(self, *args, **kwargs)
+        try:
+            cache.set(key, stored(value) if stored is not None else value)
+        except Exception as e:
+            logger.warning(f"Could not store render of {method.__name__}: {e}")
+        return value
+
+    return wrapper
+
+
+# Shared cache used by all DataVisualizer instances
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """
+    Create or return the shared RenderCache (None when disabled)
+    """
+    global _render_cache
+    if not settings.RENDER_CACHE_ENABLED:
+        return None
+
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache()
+    return _render_cache
@@ -0,0 +1,437 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Column dtypes passed through shared memory (bool, int, uint, float, complex, timedelta, datetime)
+SHARED_DTYPE_KINDS = "biufcmM"
+
+# Byte alignment of arrays inside the shared memory block
+SHARED_ALIGNMENT = 64
+
+# Seconds between checks for a free render slot from the event loop
+SLOT_POLL_INTERVAL = 0.05
+
+
+class RenderPoolBusy(RuntimeError):
+    """
+    Raised when the render queue is full
+    """
+
+
+class RenderTimeout(TimeoutError):
+    """
+    Raised when a render does not finish within its timeout
+    """
+
+
+def share_frames(frames: Dict[str, pd.DataFrame]) -> Tuple[Optional[SharedMemory], Dict[str, Any]]:
+    """
+    Copy the numeric columns of a set of DataFrames into one shared memory block
+
+    Numeric, boolean and datetime columns are laid out back to back in the block
+    and described by (dtype, length, offset); other columns (strings, categories)
+    are small in practice and travel inline with the layout.
+
+    Args:
+        frames: DataFrames by name
+
+    Returns:
+        Tuple of (shared memory block or None if nothing was shared, layout)
+    """
+    layout: Dict[str, Any] = {"frames": {}}
+    shared = []
+    offset = 0
+
+    for name, df in frames.items():
+        index_names = None
+        if not isinstance(df.index, pd.RangeIndex):
+            index_names = list(df.index.names)
+            df = df.reset_index()
+
+        columns = []
+        for position in range(df.shape[1]):
+            label = df.columns[position]
+            values = df.iloc[:, position].to_numpy()
+
+            if values.dtype.kind in SHARED_DTYPE_KINDS:
+                values = np.ascontiguousarray(values)
+                columns.append({"label": label, "dtype": values.dtype.str, "length": len(values), "offset": offset})
+                shared.append((offset, values))
+                offset += -(-values.nbytes // SHARED_ALIGNMENT) * SHARED_ALIGNMENT
+            else:
+                columns.append({"label": label, "values": values})
+
+        layout["frames"][name] = {"columns": columns, "index": index_names}
+
+    if offset == 0:
+        return None, layout
+
+    block = SharedMemory(create=True, size=offset)
+    for start, values in shared:
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf, offset=start)
+        target[...] = values
+        del target
+
+    layout["block"] = block.name
+    return block, layout
+
+
+def load_frames(layout: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """
+    Rebuild the DataFrames described by a share_frames layout
+    """
+    block = None
+    if layout.get("block"):
+        # The parent process owns (and unlinks) the block
+        block = SharedMemory(name=layout["block"])
+
+    try:
+        frames = {}
+        for name, spec in layout["frames"].items():
+            data = {}
+            for column in spec["columns"]:
+                if "values" in column:
+                    data[column["label"]] = column["values"]
+                else:
+                    dtype = np.dtype(column["dtype"])
+                    view = np.ndarray((column["length"],), dtype=dtype, buffer=block.buf, offset=column["offset"])
+                    data[column["label"]] = view.copy()
+                    del view
+
+            df = pd.DataFrame(data, columns=[column["label"] for column in spec["columns"]])
+            if spec["index"] is not None:
+                index_columns = df.columns[:len(spec["index"])].tolist()
+                df = df.set_index(index_columns)
+                df.index.names = spec["index"]
+            frames[name] = df
+        return frames
+    finally:
+        if block is not None:
+            block.close()
+
+
+def _init_worker() -> None:
+    """
+    Initialize a render worker process
+
+    The plotting libraries are imported here (unless WARM_UP_IMPORTS is off),
+    so a worker pays for them when it starts rather than in its first render.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    if settings.WARM_UP_IMPORTS:
+        from app.core.lazy_imports import RENDER_MODULES, warm_up
+        warm_up(RENDER_MODULES + ["app.visualization.static_charts"])
+
+
+def _ready() -> bool:
+    """
+    No-op task that makes the pool start a worker process
+    """
+    return True
+
+
+def _draw_png(kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str) -> bytes:
+    """
+    Draw a static chart and rasterize it to PNG bytes
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from app.visualization.static_charts import STATIC_CHARTS
+
+    with plt.rc_context():
+        if theme == 'seaborn':
+            sns.set_theme(style="whitegrid")
+        elif theme == 'matplotlib':
+            plt.style.use('ggplot')
+
+        try:
+            STATIC_CHARTS[kind](frames, **params)
+            buf = BytesIO()
+            plt.savefig(buf, format='png')
+            return buf.getvalue()
+        finally:
+            plt.close('all')
+
+
+def _render_chart(kind: str, layout: Dict[str, Any], params: Dict[str, Any], theme: str) -> bytes:
+    """
+    Render a static chart from shared memory to PNG bytes (runs in a worker process)
+    """
+    return _draw_png(kind, load_frames(layout), params, theme)
+
+
+class RenderPool:
+    """
+    Process pool for rasterizing matplotlib/seaborn charts
+
+    Charts are sent as a chart kind plus parameters, with their data passed
+    through shared memory, and come back as PNG bytes. Rendering in separate
+    processes keeps pyplot's global state off the request threads and lets
+    rasterization use every core. The number of queued renders is bounded and
+    each render has a timeout.
+
+    Synchronous callers wait for a free render slot; render_async polls for
+    one instead, so a full queue never blocks the event loop. A render that
+    times out after it started kills the worker processes, so a hung render
+    cannot hold a slot. The report service's ChartRenderer follows the same
+    pattern; it differs only where its callers do: charts come as plain
+    arrays rather than DataFrames, and report generation is async-only, so it
+    has no blocking render.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the RenderPool
+
+        Args:
+            max_workers: Number of worker processes (defaults to RENDER_POOL_WORKERS; 0 renders in-process)
+            max_pending: Maximum number of queued or running renders (defaults to RENDER_POOL_MAX_PENDING)
+            timeout: Seconds to wait for a render (defaults to RENDER_POOL_TIMEOUT)
+        """
+        self.max_workers = max_workers if max_workers is not None else settings.RENDER_POOL_WORKERS
+        self.max_pending = max_pending if max_pending is not None else settings.RENDER_POOL_MAX_PENDING
+        self.timeout = timeout if timeout is not None else settings.RENDER_POOL_TIMEOUT
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # pyplot is not thread-safe, so in-process renders are serialized
+        self._local_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Create the worker processes on first use
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def start(self) -> None:
+        """
+        Start the worker processes ahead of the first render
+
+        Each worker runs the initializer, importing the plotting libraries, as
+        soon as it starts; a render arriving meanwhile waits for a worker.
+        """
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(_ready)
+
+    def _reset_executor(self, executor: Optional[ProcessPoolExecutor] = None, kill: bool = False) -> None:
+        """
+        Drop the executor so the next render starts fresh workers
+
+        Args:
+            executor: Only drop this executor (another render may have replaced it already)
+            kill: Terminate the worker processes, to stop a hung render
+        """
+        with self._lock:
+            if self._executor is None or (executor is not None and self._executor is not executor):
+                return
+            executor, self._executor = self._executor, None
+
+        if kill:
+            # ProcessPoolExecutor cannot stop running tasks; the renders of the
+            # killed workers fail with BrokenProcessPool, releasing their slots
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(
+        self, kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str
+    ) -> Tuple[ProcessPoolExecutor, Future]:
+        """
+        Start a render in a worker process, holding an already acquired slot
+
+        The slot is released when the render finishes, or right away if it
+        cannot start. A broken executor is replaced once.
+
+        Returns:
+            Tuple of (executor running the render, future resolving to PNG bytes)
+        """
+        block = None
+        try:
+            block, layout = share_frames(frames)
+            try:
+                executor = self._get_executor()
+                future = executor.submit(_render_chart, kind, layout, params, theme)
+            except BrokenProcessPool:
+                self._reset_executor()
+                executor = self._get_executor()
+                future = executor.submit(_render_chart, kind, layout, params, theme)
+        except BaseException:
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+            raise
+
+        def _release(_):
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        future.add_done_callback(_release)
+        return executor, future
+
+    def _busy(self) -> RenderPoolBusy:
+        return RenderPoolBusy(f"Render queue is full ({self.max_pending} pending renders)")
+
+    async def _acquire_slot_async(self) -> None:
+        """
+        Wait up to the timeout for a render slot without blocking the event loop
+
+        Raises:
+            RenderPoolBusy: If no slot frees up in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while not self._slots.acquire(blocking=False):
+            if loop.time() >= deadline:
+                raise self._busy()
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    def submit(self, kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str = 'plotly') -> Future:
+        """
+        Queue a chart render, waiting up to the timeout for a free slot (blocking)
+
+        Args:
+            kind: Chart kind (key of static_charts.STATIC_CHARTS)
+            frames: Input DataFrames by name
+            params: Chart parameters
+            theme: Visualization theme
+
+        Returns:
+            Future resolving to PNG bytes
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise self._busy()
+        return self._start(kind, frames, params, theme)[1]
+
+    def render(self, kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str = 'plotly') -> bytes:
+        """
+        Render a chart to PNG bytes, waiting for the result
+
+        Args:
+            kind: Chart kind (key of static_charts.STATIC_CHARTS)
+            frames: Input DataFrames by name
+            params: Chart parameters
+            theme: Visualization theme
+
+        Returns:
+            PNG bytes
+        """
+        if self.max_workers <= 0:
+            return self._render_local(kind, frames, params, theme)
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise self._busy()
+        executor, future = self._start(kind, frames, params, theme)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # A queued render is cancelled; one that already started keeps its
+            # worker (and slot) until killed
+            if not future.cancel() and not future.done():
+                self._reset_executor(executor, kill=True)
+            raise RenderTimeout(f"Rendering {kind} chart timed out after {self.timeout}s")
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise
+
+    async def render_async(self, kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str = 'plotly') -> bytes:
+        """
+        Render a chart to PNG bytes without blocking the event loop
+
+        Args:
+            kind: Chart kind (key of static_charts.STATIC_CHARTS)
+            frames: Input DataFrames by name
+            params: Chart parameters
+            theme: Visualization theme
+
+        Returns:
+            PNG bytes
+        """
+        if self.max_workers <= 0:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._render_local, kind, frames, params, theme
+            )
+
+        await self._acquire_slot_async()
+        executor, future = self._start(kind, frames, params, theme)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # A queued render is cancelled; one that already started keeps its
+            # worker (and slot) until killed
+            if not future.cancel() and not future.done():
+                self._reset_executor(executor, kill=True)
+            raise RenderTimeout(f"Rendering {kind} chart timed out after {self.timeout}s")
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise
+
+    def _render_local(self, kind: str, frames: Dict[str, pd.DataFrame], params: Dict[str, Any], theme: str) -> bytes:
+        """
+        Render in the current process (used when the pool is disabled)
+        """
+        with self._local_lock:
+            return _draw_png(kind, frames, params, theme)
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+# Shared pool used by all DataVisualizer instances
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """
+    Create or return the shared RenderPool
+    """
+    global _render_pool
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                _render_pool = RenderPool()
+    return _render_pool
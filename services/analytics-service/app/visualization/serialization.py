@@ -0,0 +1,153 @@
+import base64
+import datetime
+import decimal
+import json
+import logging
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Plotly typed array dtype codes (little-endian)
+BDATA_DTYPES = {
+    np.dtype("float64"): "f8",
+    np.dtype("float32"): "f4",
+    np.dtype("int32"): "i4",
+    np.dtype("uint32"): "u4",
+    np.dtype("int16"): "i2",
+    np.dtype("uint16"): "u2",
+    np.dtype("int8"): "i1",
+    np.dtype("uint8"): "u1",
+}
+
+# Arrays shorter than this stay plain JSON lists (bdata overhead outweighs the savings)
+BDATA_MIN_LENGTH = 8
+
+
+def encode_typed_array(values: Any) -> Optional[Dict[str, str]]:
+    """
+    Encode a numeric array as a Plotly typed array spec ({"dtype", "bdata", "shape"})
+
+    64-bit integers are narrowed to int32 when they fit (Plotly has no int64
+    typed arrays) and widened to float64 otherwise.
+
+    Args:
+        values: ndarray, Series or list of numbers
+
+    Returns:
+        Typed array spec, or None if the values are not a numeric array
+    """
+    if isinstance(values, (list, tuple)):
+        if len(values) < BDATA_MIN_LENGTH or not all(
+            isinstance(value, (int, float, np.number)) and not isinstance(value, bool) for value in values
+        ):
+            return None
+        values = np.asarray(values)
+    elif isinstance(values, pd.Series):
+        values = values.to_numpy()
+
+    if not isinstance(values, np.ndarray) or values.size < BDATA_MIN_LENGTH:
+        return None
+
+    if values.dtype.kind in "iu" and values.dtype.itemsize == 8:
+        info = np.iinfo(np.int32)
+        if values.size and info.min <= values.min() and values.max() <= info.max:
+            values = values.astype(np.int32)
+        else:
+            values = values.astype(np.float64)
+
+    dtype = values.dtype.newbyteorder("=")
+    code = BDATA_DTYPES.get(dtype)
+    if code is None:
+        return None
+
+    data = np.ascontiguousarray(values, dtype=dtype.newbyteorder("<"))
+    spec = {"dtype": code, "bdata": base64.b64encode(data.tobytes()).decode("ascii")}
+    if data.ndim > 1:
+        spec["shape"] = ", ".join(str(size) for size in data.shape)
+    return spec
+
+
+def _encode_trace_arrays(value: Any) -> Any:
+    """
+    Replace numeric arrays inside trace data with typed array specs
+    """
+    if isinstance(value, dict):
+        return {key: _encode_trace_arrays(item) for key, item in value.items()}
+
+    if isinstance(value, (np.ndarray, list, tuple, pd.Series)):
+        spec = encode_typed_array(value)
+        if spec is not None:
+            return spec
+        # 2D lists (e.g. heatmap z) are encoded as one typed array when rectangular and numeric
+        if isinstance(value, (list, tuple)) and value and all(isinstance(row, (list, tuple, np.ndarray)) for row in value):
+            try:
+                matrix = np.asarray(value, dtype=float)
+            except (TypeError, ValueError):
+                matrix = None
+            if matrix is not None and matrix.ndim == 2:
+                spec = encode_typed_array(matrix)
+                if spec is not None:
+                    return spec
+        if isinstance(value, (list, tuple)):
+            return [_encode_trace_arrays(item) for item in value]
+
+    return value
+
+
+def _default(value: Any) -> Any:
+    """
+    Fallback encoder for values orjson does not handle natively
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, pd.Series):
+        return value.tolist()
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if value is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def figure_to_json(figure: Union[Dict[str, Any], Any], binary_arrays: bool = False) -> str:
+    """
+    Serialize a Plotly figure to a JSON string
+
+    Args:
+        figure: plotly Figure or figure dict (from fig.to_dict())
+        binary_arrays: Encode numeric trace arrays as base64 typed arrays
+            (Plotly's bdata/dtype form) instead of decimal text
+
+    Returns:
+        JSON string
+    """
+    if not isinstance(figure, dict):
+        figure = figure.to_dict()
+
+    if binary_arrays:
+        figure = dict(figure)
+        figure["data"] = [_encode_trace_arrays(trace) for trace in figure.get("data", [])]
+
+    if orjson is not None:
+        return orjson.dumps(
+            figure,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+
+    from plotly.utils import PlotlyJSONEncoder
+    return json.dumps(figure, cls=PlotlyJSONEncoder)
@@ -0,0 +1,388 @@
+import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+from typing import List, Dict, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Static (matplotlib/seaborn) chart drawing functions
+#
+# Each function draws one chart onto a new pyplot figure from a dict of input
+# DataFrames and plain parameters. They run inside the render worker processes
+# (see render_pool), where pyplot's global state is private to the process.
+
+
+def draw_line_chart(
+    frames: Dict[str, pd.DataFrame],
+    x_column: str,
+    y_columns: List[str],
+    title: str = '',
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color_map: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    Draw a line chart
+    """
+    df = frames['df']
+    plt.figure(figsize=(10, 6))
+
+    for y_column in y_columns:
+        color = None
+        if color_map and y_column in color_map:
+            color = color_map[y_column]
+
+        plt.plot(df[x_column], df[y_column], label=y_column, color=color)
+
+    plt.title(title)
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.legend(title="Series")
+    plt.grid(True)
+    plt.tight_layout()
+
+
+def draw_bar_chart(
+    frames: Dict[str, pd.DataFrame],
+    x_column: str,
+    y_column: str,
+    title: str = '',
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color_column: Optional[str] = None,
+    orientation: str = 'vertical'
+) -> None:
+    """
+    Draw a bar chart
+    """
+    df = frames['df']
+    plt.figure(figsize=(10, 6))
+
+    if orientation == 'vertical':
+        if color_column:
+            sns.barplot(x=x_column, y=y_column, hue=color_column, data=df)
+        else:
+            sns.barplot(x=x_column, y=y_column, data=df)
+    else:  # horizontal
+        if color_column:
+            sns.barplot(y=x_column, x=y_column, hue=color_column, data=df)
+        else:
+            sns.barplot(y=x_column, x=y_column, data=df)
+
+    plt.title(title)
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.tight_layout()
+
+
+def draw_pie_chart(
+    frames: Dict[str, pd.DataFrame],
+    names_column: str,
+    values_column: str,
+    title: str = ''
+) -> None:
+    """
+    Draw a pie chart
+    """
+    df = frames['df']
+    plt.figure(figsize=(10, 6))
+
+    plt.pie(
+        df[values_column],
+        labels=df[names_column],
+        autopct='%1.1f%%',
+        startangle=90
+    )
+    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    plt.title(title)
+    plt.tight_layout()
+
+
+def draw_heatmap(
+    frames: Dict[str, pd.DataFrame],
+    title: str = '',
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color_scale: Optional[List[str]] = None
+) -> None:
+    """
+    Draw a heatmap from a pivoted DataFrame
+    """
+    plt.figure(figsize=(12, 8))
+
+    sns.heatmap(
+        frames['pivot'],
+        annot=True,
+        fmt=".1f",
+        cmap=color_scale[0] if color_scale else "YlGnBu",
+        linewidths=.5
+    )
+
+    plt.title(title)
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.tight_layout()
+
+
+def draw_scatter_plot(
+    frames: Dict[str, pd.DataFrame],
+    x_column: str,
+    y_column: str,
+    title: str = '',
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color_column: Optional[str] = None,
+    size_column: Optional[str] = None,
+    trend_line: bool = False
+) -> None:
+    """
+    Draw a scatter plot
+    """
+    df = frames['df']
+    plt.figure(figsize=(10, 6))
+
+    if color_column and size_column:
+        scatter = plt.scatter(
+            df[x_column],
+            df[y_column],
+            c=df[color_column],
+            s=df[size_column],
+            alpha=0.6
+        )
+        plt.colorbar(scatter, label=color_column)
+    elif color_column:
+        scatter = plt.scatter(
+            df[x_column],
+            df[y_column],
+            c=df[color_column],
+            alpha=0.6
+        )
+        plt.colorbar(scatter, label=color_column)
+    elif size_column:
+        plt.scatter(
+            df[x_column],
+            df[y_column],
+            s=df[size_column],
+            alpha=0.6
+        )
+    else:
+        plt.scatter(
+            df[x_column],
+            df[y_column],
+            alpha=0.6
+        )
+
+    if trend_line:
+        z = np.polyfit(df[x_column], df[y_column], 1)
+        p = np.poly1d(z)
+        plt.plot(df[x_column], p(df[x_column]), "r--")
+
+    plt.title(title)
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.grid(True)
+    plt.tight_layout()
+
+
+def draw_grouped_bar_chart(
+    frames: Dict[str, pd.DataFrame],
+    category_column: str,
+    title: str = ''
+) -> None:
+    """
+    Draw a grouped bar chart from long-format (Metric, Value) data
+    """
+    plt.figure(figsize=(12, 8))
+
+    sns.barplot(
+        x=category_column,
+        y='Value',
+        hue='Metric',
+        data=frames['df']
+    )
+
+    plt.title(title)
+    plt.legend(title='Metric')
+    plt.tight_layout()
+
+
+def draw_radar_chart(
+    frames: Dict[str, pd.DataFrame],
+    category_column: str,
+    value_columns: List[str],
+    title: str = ''
+) -> None:
+    """
+    Draw a radar chart
+    """
+    df = frames['df']
+    categories = df[category_column].tolist()
+
+    # Radar charts in matplotlib require more setup
+    num_vars = len(categories)
+    angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
+    angles += angles[:1]  # Close the polygon
+
+    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
+
+    for column in value_columns:
+        values = df[column].tolist()
+        values += values[:1]  # Close the polygon
+        ax.plot(angles, values, linewidth=2, label=column)
+        ax.fill(angles, values, alpha=0.25)
+
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.set_thetagrids(np.degrees(angles[:-1]), categories)
+    ax.set_title(title)
+    ax.legend(loc='upper right')
+
+    plt.tight_layout()
+
+
+def draw_correlation_matrix(
+    frames: Dict[str, pd.DataFrame],
+    title: str = 'Correlation Matrix'
+) -> None:
+    """
+    Draw a correlation matrix heatmap
+    """
+    plt.figure(figsize=(10, 8))
+
+    sns.heatmap(
+        frames['corr'],
+        annot=True,
+        fmt=".2f",
+        cmap='RdBu_r',
+        vmin=-1,
+        vmax=1,
+        linewidths=.5
+    )
+
+    plt.title(title)
+    plt.tight_layout()
+
+
+def draw_forecast_chart(
+    frames: Dict[str, pd.DataFrame],
+    date_column: str,
+    value_column: str,
+    lower_bound_column: Optional[str] = None,
+    upper_bound_column: Optional[str] = None,
+    title: str = 'Forecast'
+) -> None:
+    """
+    Draw historical values and a forecast with an optional confidence interval
+    """
+    historical_df = frames['historical']
+    forecast_df = frames['forecast']
+    plt.figure(figsize=(12, 6))
+
+    # Plot historical data
+    plt.plot(
+        historical_df[date_column],
+        historical_df[value_column],
+        'b-',
+        marker='o',
+        label='Historical'
+    )
+
+    # Plot forecast
+    plt.plot(
+        forecast_df[date_column],
+        forecast_df[value_column],
+        'r--',
+        marker='o',
+        label='Forecast'
+    )
+
+    # Add confidence interval if provided
+    if lower_bound_column and upper_bound_column:
+        plt.fill_between(
+            forecast_df[date_column],
+            forecast_df[lower_bound_column],
+            forecast_df[upper_bound_column],
+            color='red',
+            alpha=0.2,
+            label='Confidence Interval'
+        )
+
+    plt.title(title)
+    plt.xlabel('Date')
+    plt.ylabel(value_column)
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+
+
+def draw_binned_chart(
+    frames: Dict[str, pd.DataFrame],
+    x_column: str,
+    y_column: str,
+    x_edges: np.ndarray,
+    y_edges: np.ndarray,
+    title: str = '',
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    color_label: str = 'Points',
+    color_scale: Optional[List[str]] = None,
+    trend_coefficients: Optional[List[float]] = None
+) -> None:
+    """
+    Draw a density-binned scatter plot or heatmap with outliers as points
+    """
+    grid = frames['grid'].to_numpy(dtype=float)
+    outliers_df = frames['outliers']
+    plt.figure(figsize=(10, 6))
+
+    # Empty cells stay transparent
+    mesh = plt.pcolormesh(
+        x_edges,
+        y_edges,
+        np.ma.masked_where(~np.isfinite(grid) | (grid == 0), grid),
+        cmap=color_scale[0] if color_scale else "viridis",
+        shading='flat'
+    )
+    plt.colorbar(mesh, label=color_label)
+
+    if len(outliers_df):
+        plt.scatter(
+            outliers_df[x_column],
+            outliers_df[y_column],
+            s=12,
+            c='red',
+            alpha=0.8,
+            label='Outliers'
+        )
+        plt.legend()
+
+    if trend_coefficients is not None:
+        x_values = np.linspace(float(x_edges[0]), float(x_edges[-1]), 100)
+        plt.plot(x_values, np.poly1d(trend_coefficients)(x_values), "r--")
+
+    plt.title(title)
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.tight_layout()
+
+
+# Registry of static chart kinds
+STATIC_CHARTS = {
+    'line': draw_line_chart,
+    'bar': draw_bar_chart,
+    'pie': draw_pie_chart,
+    'heatmap': draw_heatmap,
+    'scatter': draw_scatter_plot,
+    'grouped_bar': draw_grouped_bar_chart,
+    'radar': draw_radar_chart,
+    'correlation': draw_correlation_matrix,
+    'forecast': draw_forecast_chart,
+    'binned': draw_binned_chart,
+}
@@ -1,41 +1,112 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
-from typing import List, Dict, Any, Tuple, Optional, Union
+from typing import List, Dict, Any, Tuple, Optional, Union, Callable
 import base64
-from io import BytesIO
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.visualization.render_cache import RenderCache, cached_render, get_render_cache
+from app.visualization.render_pool import get_render_pool
+from app.visualization.downsampling import downsample_series, numeric_axis
+from app.visualization.binning import bin_points, bin_values, is_binnable
+from app.visualization.serialization import figure_to_json
+from app.core.config import settings
+from app.core.lazy_imports import lazy_import
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Plotting libraries are imported on first use
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+plotly_subplots = lazy_import("plotly.subplots")
+
+
+def _mark_panels_cached(dashboard: str) -> str:
+    """
+    Dashboard as served from the render cache: its panel timings are those of
+    the original build, so each panel is flagged as cached
+    """
+    if not dashboard.startswith("{"):
+        # base64 image without panel metadata
+        return dashboard
+    
+    content = json.loads(dashboard)
+    for panel in content.get("panels", []):
+        panel["cached"] = True
+    return json.dumps(content)
+
 class DataVisualizer:
     """
     Data visualization component for analytics
     Provides various methods to create visualizations from data
     """
     
-    def __init__(self, theme: str = 'plotly'):
+    def __init__(
+        self,
+        theme: str = 'plotly',
+        render_cache: Optional[RenderCache] = None,
+        binary_arrays: bool = False
+    ):
         """
         Initialize the DataVisualizer
         
         Args:
             theme: Visualization theme ('plotly', 'seaborn', 'matplotlib')
+            render_cache: Cache for rendered charts (defaults to the shared render cache)
+            binary_arrays: Encode numeric arrays in Plotly JSON as base64 typed arrays (bdata)
         """
         self.theme = theme
+        self.binary_arrays = binary_arrays
+        self.render_cache = render_cache or get_render_cache()
+        # Static chart themes are applied per render (see render_pool._draw_png)
+    
+    def _figure_json(self, figure: Union["go.Figure", Dict[str, Any]]) -> str:
+        """
+        Serialize a Plotly figure, using typed arrays when binary_arrays is enabled
+        """
+        return figure_to_json(figure, binary_arrays=self.binary_arrays)
+    
+    def _render_static(
+        self,
+        kind: str,
+        frames: Dict[str, pd.DataFrame],
+        output_format: str,
+        **params
+    ) -> str:
+        """
+        Render a static chart in the render worker pool
+        
+        Blocks until the chart is rendered, so async endpoints call the
+        visualizer methods through run_in_threadpool.
         
-        # Set up themes
-        if theme == 'seaborn':
-            sns.set_theme(style="whitegrid")
-        elif theme == 'matplotlib':
-            plt.style.use('ggplot')
+        Args:
+            kind: Static chart kind (see static_charts.STATIC_CHARTS)
+            frames: Input DataFrames by name
+            output_format: Output format ('json', 'base64')
+            **params: Chart parameters
+            
+        Returns:
+            Base64-encoded PNG, wrapped in a JSON image structure for 'json'
+        """
+        png = get_render_pool().render(kind, frames, params, theme=self.theme)
+        base64_data = base64.b64encode(png).decode('utf-8')
+        
+        if output_format == 'base64':
+            return base64_data
+        
+        # For non-interactive charts, we'll still return base64 data
+        # but wrapped in a JSON structure for consistency
+        return json.dumps({
+            "type": "image",
+            "format": "png",
+            "data": base64_data
+        })
     
+    @cached_render
     def create_line_chart(
         self,
         df: pd.DataFrame,
@@ -46,7 +117,8 @@ class DataVisualizer:
         y_label: Optional[str] = None,
         color_map: Optional[Dict[str, str]] = None,
         interactive: bool = True,
-        output_format: str = 'json'
+        output_format: str = 'json',
+        max_points: Optional[int] = None
     ) -> Union[str, bytes]:
         """
         Create a line chart
@@ -61,13 +133,19 @@ class DataVisualizer:
             color_map: Mapping of series names to colors
             interactive: Whether to create an interactive chart
             output_format: Output format ('json', 'base64')
+            max_points: Point budget per series for interactive charts; longer series
+                are downsampled with LTTB (defaults to CHART_MAX_POINTS, 0 disables)
             
         Returns:
-            JSON string or base64-encoded image
+            JSON string or base64-encoded image. Interactive JSON includes a
+            "downsampling" entry with the original and reduced point counts.
         """
         if isinstance(y_columns, str):
             y_columns = [y_columns]
         
+        if max_points is None:
+            max_points = settings.CHART_MAX_POINTS
+        
         # Set default labels
         if x_label is None:
             x_label = x_column
@@ -76,14 +154,18 @@ class DataVisualizer:
             # Create interactive plotly chart
             fig = go.Figure()
             
+            # Reduce long series to the point budget before serialization
+            series, downsampling = downsample_series(df, x_column, y_columns, max_points)
+            
             for y_column in y_columns:
                 color = None
                 if color_map and y_column in color_map:
                     color = color_map[y_column]
                 
+                x_values, y_values = series[y_column]
                 fig.add_trace(go.Scatter(
-                    x=df[x_column],
-                    y=df[y_column],
+                    x=x_values,
+                    y=y_values,
                     mode='lines+markers',
                     name=y_column,
                     line=dict(color=color) if color else None
@@ -98,46 +180,28 @@ class DataVisualizer:
             )
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                figure = fig.to_dict()
+                figure["downsampling"] = downsampling
+                return self._figure_json(figure)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(10, 6))
-            
-            for y_column in y_columns:
-                color = None
-                if color_map and y_column in color_map:
-                    color = color_map[y_column]
-                
-                plt.plot(df[x_column], df[y_column], label=y_column, color=color)
-            
-            plt.title(title)
-            plt.xlabel(x_label)
-            plt.ylabel(y_label)
-            plt.legend(title="Series")
-            plt.grid(True)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                # For non-interactive charts, we'll still return base64 data
-                # but wrapped in a JSON structure for consistency
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'line',
+                {'df': df[[x_column] + y_columns]},
+                output_format,
+                x_column=x_column,
+                y_columns=y_columns,
+                title=title,
+                x_label=x_label,
+                y_label=y_label,
+                color_map=color_map
+            )
     
+    @cached_render
     def create_bar_chart(
         self,
         df: pd.DataFrame,
@@ -204,46 +268,27 @@ class DataVisualizer:
             fig.update_layout(template='plotly_white')
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(10, 6))
-            
-            if orientation == 'vertical':
-                if color_column:
-                    sns.barplot(x=x_column, y=y_column, hue=color_column, data=df)
-                else:
-                    sns.barplot(x=x_column, y=y_column, data=df)
-            else:  # horizontal
-                if color_column:
-                    sns.barplot(y=x_column, x=y_column, hue=color_column, data=df)
-                else:
-                    sns.barplot(y=x_column, x=y_column, data=df)
-            
-            plt.title(title)
-            plt.xlabel(x_label)
-            plt.ylabel(y_label)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'bar',
+                {'df': df},
+                output_format,
+                x_column=x_column,
+                y_column=y_column,
+                title=title,
+                x_label=x_label,
+                y_label=y_label,
+                color_column=color_column,
+                orientation=orientation
+            )
     
+    @cached_render
     def create_pie_chart(
         self,
         df: pd.DataFrame,
@@ -277,40 +322,23 @@ class DataVisualizer:
             fig.update_layout(template='plotly_white')
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(10, 6))
-            
-            plt.pie(
-                df[values_column],
-                labels=df[names_column],
-                autopct='%1.1f%%',
-                startangle=90
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'pie',
+                {'df': df[[names_column, values_column]]},
+                output_format,
+                names_column=names_column,
+                values_column=values_column,
+                title=title
             )
-            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-            plt.title(title)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
     
+    @cached_render
     def create_heatmap(
         self,
         df: pd.DataFrame,
@@ -322,7 +350,9 @@ class DataVisualizer:
         y_label: Optional[str] = None,
         color_scale: Optional[List[str]] = None,
         interactive: bool = True,
-        output_format: str = 'json'
+        output_format: str = 'json',
+        binned: Optional[bool] = None,
+        bins: Optional[int] = None
     ) -> Union[str, bytes]:
         """
         Create a heatmap
@@ -338,9 +368,14 @@ class DataVisualizer:
             color_scale: Color scale for values
             interactive: Whether to create an interactive chart
             output_format: Output format ('json', 'base64')
+            binned: Average values over a numeric 2D grid instead of pivoting on
+                every distinct x and y value (defaults to on when x and y are
+                numeric or datetime with more distinct values than bins)
+            bins: Bins per axis when binned (defaults to CHART_BINS)
             
         Returns:
-            JSON string or base64-encoded image
+            JSON string or base64-encoded image. Binned interactive JSON includes a
+            "binning" entry with the point and outlier counts.
         """
         # Set default labels
         if x_label is None:
@@ -349,6 +384,22 @@ class DataVisualizer:
         if y_label is None:
             y_label = y_column
         
+        if bins is None:
+            bins = settings.CHART_BINS
+        
+        if binned is None:
+            binned = (
+                is_binnable(df[x_column])
+                and is_binnable(df[y_column])
+                and max(df[x_column].nunique(), df[y_column].nunique()) > bins
+            )
+        
+        if binned:
+            return self._binned_chart(
+                df, x_column, y_column, value_column, title, x_label, y_label,
+                color_scale, False, interactive, output_format, bins
+            )
+        
         # Create pivot table for heatmap
         pivot_df = df.pivot_table(
             values=value_column,
@@ -369,43 +420,24 @@ class DataVisualizer:
             fig.update_layout(template='plotly_white')
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(12, 8))
-            
-            sns.heatmap(
-                pivot_df,
-                annot=True,
-                fmt=".1f",
-                cmap=color_scale[0] if color_scale else "YlGnBu",
-                linewidths=.5
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'heatmap',
+                {'pivot': pivot_df},
+                output_format,
+                title=title,
+                x_label=x_label,
+                y_label=y_label,
+                color_scale=color_scale
             )
-            
-            plt.title(title)
-            plt.xlabel(x_label)
-            plt.ylabel(y_label)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
     
+    @cached_render
     def create_scatter_plot(
         self,
         df: pd.DataFrame,
@@ -418,7 +450,9 @@ class DataVisualizer:
         size_column: Optional[str] = None,
         trend_line: bool = False,
         interactive: bool = True,
-        output_format: str = 'json'
+        output_format: str = 'json',
+        binned: Optional[bool] = None,
+        bins: Optional[int] = None
     ) -> Union[str, bytes]:
         """
         Create a scatter plot
@@ -435,9 +469,14 @@ class DataVisualizer:
             trend_line: Whether to add a trend line
             interactive: Whether to create an interactive chart
             output_format: Output format ('json', 'base64')
+            binned: Render point density on a 2D grid with outliers drawn as points,
+                ignoring color_column and size_column (defaults to on above
+                CHART_BIN_THRESHOLD points with numeric or datetime axes)
+            bins: Bins per axis when binned (defaults to CHART_BINS)
             
         Returns:
-            JSON string or base64-encoded image
+            JSON string or base64-encoded image. Binned interactive JSON includes a
+            "binning" entry with the point and outlier counts.
         """
         # Set default labels
         if x_label is None:
@@ -446,6 +485,19 @@ class DataVisualizer:
         if y_label is None:
             y_label = y_column
         
+        if binned is None:
+            binned = (
+                len(df) > settings.CHART_BIN_THRESHOLD
+                and is_binnable(df[x_column])
+                and is_binnable(df[y_column])
+            )
+        
+        if binned:
+            return self._binned_chart(
+                df, x_column, y_column, None, title, x_label, y_label,
+                None, trend_line, interactive, output_format, bins or settings.CHART_BINS
+            )
+        
         if interactive:
             # Create interactive plotly chart
             fig = px.scatter(
@@ -462,72 +514,137 @@ class DataVisualizer:
             fig.update_layout(template='plotly_white')
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(10, 6))
-            
-            if color_column and size_column:
-                scatter = plt.scatter(
-                    df[x_column],
-                    df[y_column],
-                    c=df[color_column],
-                    s=df[size_column],
-                    alpha=0.6
-                )
-                plt.colorbar(scatter, label=color_column)
-            elif color_column:
-                scatter = plt.scatter(
-                    df[x_column],
-                    df[y_column],
-                    c=df[color_column],
-                    alpha=0.6
-                )
-                plt.colorbar(scatter, label=color_column)
-            elif size_column:
-                plt.scatter(
-                    df[x_column],
-                    df[y_column],
-                    s=df[size_column],
-                    alpha=0.6
-                )
-            else:
-                plt.scatter(
-                    df[x_column],
-                    df[y_column],
-                    alpha=0.6
-                )
-            
-            if trend_line:
-                z = np.polyfit(df[x_column], df[y_column], 1)
-                p = np.poly1d(z)
-                plt.plot(df[x_column], p(df[x_column]), "r--")
-            
-            plt.title(title)
-            plt.xlabel(x_label)
-            plt.ylabel(y_label)
-            plt.grid(True)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'scatter',
+                {'df': df},
+                output_format,
+                x_column=x_column,
+                y_column=y_column,
+                title=title,
+                x_label=x_label,
+                y_label=y_label,
+                color_column=color_column,
+                size_column=size_column,
+                trend_line=trend_line
+            )
     
+    def _binned_chart(
+        self,
+        df: pd.DataFrame,
+        x_column: str,
+        y_column: str,
+        value_column: Optional[str],
+        title: str,
+        x_label: str,
+        y_label: str,
+        color_scale: Optional[List[str]],
+        trend_line: bool,
+        interactive: bool,
+        output_format: str,
+        bins: int
+    ) -> str:
+        """
+        Render points as a 2D histogram grid with outliers drawn individually
+        
+        Without value_column the grid holds point counts (density scatter);
+        with it, the mean value per cell (binned heatmap).
+        
+        Returns:
+            JSON string or base64-encoded image
+        """
+        if value_column is None:
+            grid = bin_points(df, x_column, y_column, bins, settings.CHART_BIN_MAX_OUTLIERS)
+            z = grid['counts']
+            color_label = 'Points'
+        else:
+            grid = bin_values(df, x_column, y_column, value_column, bins, settings.CHART_BIN_MAX_OUTLIERS)
+            z = grid['values']
+            color_label = value_column
+        
+        # Empty cells are left blank
+        z = np.where(grid['counts'] > 0, z, np.nan)
+        outliers_df = grid['outliers']
+        
+        trend_coefficients = None
+        if trend_line and pd.api.types.is_numeric_dtype(df[x_column]):
+            trend_df = df[[x_column, y_column]].dropna()
+            if len(trend_df) > 1:
+                trend_coefficients = np.polyfit(
+                    numeric_axis(trend_df[x_column]), numeric_axis(trend_df[y_column]), 1
+                ).tolist()
+        
+        if not interactive:
+            # Rasterize the static matplotlib chart in the render pool
+            outlier_columns = [x_column] if x_column == y_column else [x_column, y_column]
+            return self._render_static(
+                'binned',
+                {'grid': pd.DataFrame(z), 'outliers': outliers_df[outlier_columns]},
+                output_format,
+                x_column=x_column,
+                y_column=y_column,
+                x_edges=grid['x_edges'],
+                y_edges=grid['y_edges'],
+                title=title,
+                x_label=x_label,
+                y_label=y_label,
+                color_label=color_label,
+                color_scale=color_scale,
+                trend_coefficients=trend_coefficients
+            )
+        
+        fig = go.Figure()
+        fig.add_trace(go.Heatmap(
+            x=grid['x'],
+            y=grid['y'],
+            z=z,
+            colorscale=color_scale,
+            colorbar=dict(title=color_label),
+            name=color_label
+        ))
+        
+        if len(outliers_df):
+            fig.add_trace(go.Scatter(
+                x=outliers_df[x_column],
+                y=outliers_df[y_column],
+                mode='markers',
+                marker=dict(color='red', size=5),
+                text=outliers_df[value_column] if value_column else None,
+                name='Outliers'
+            ))
+        
+        if trend_coefficients is not None:
+            x_range = np.array([grid['x_edges'][0], grid['x_edges'][-1]], dtype=float)
+            fig.add_trace(go.Scatter(
+                x=x_range,
+                y=np.poly1d(trend_coefficients)(x_range),
+                mode='lines',
+                line=dict(color='red', dash='dash'),
+                name='Trend'
+            ))
+        
+        fig.update_layout(
+            title=title,
+            xaxis_title=x_label,
+            yaxis_title=y_label,
+            template='plotly_white'
+        )
+        
+        if output_format == 'json':
+            figure = fig.to_dict()
+            figure["binning"] = grid['summary']
+            return self._figure_json(figure)
+        else:  # base64
+            img_bytes = fig.to_image(format="png")
+            return base64.b64encode(img_bytes).decode('utf-8')
+    
+    @cached_render(stored=_mark_panels_cached)
     def create_dashboard(
         self,
         charts: List[Dict[str, Any]],
@@ -547,54 +664,26 @@ class DataVisualizer:
             output_format: Output format ('json', 'base64')
             
         Returns:
-            JSON string or base64-encoded image
+            JSON string or base64-encoded image. JSON dashboards list each
+            panel's build time under "panels"; a dashboard served from the
+            render cache has them flagged "cached", with the timings of the
+            build that produced it.
         """
         if not interactive:
             # Non-interactive dashboards not supported, fallback to a series of images
-            chart_images = []
+            # rendered concurrently in the render pool
+            results, panels = self._build_dashboard_panels(charts, self._dashboard_panel_image)
             
-            for chart in charts:
-                chart_type = chart.get('type', '')
-                chart_data = chart.get('data', pd.DataFrame())
-                
-                if chart_type == 'line':
-                    image = self.create_line_chart(
-                        df=chart_data,
-                        x_column=chart.get('x_column', ''),
-                        y_columns=chart.get('y_columns', []),
-                        title=chart.get('title', ''),
-                        interactive=False,
-                        output_format='base64'
-                    )
-                elif chart_type == 'bar':
-                    image = self.create_bar_chart(
-                        df=chart_data,
-                        x_column=chart.get('x_column', ''),
-                        y_column=chart.get('y_column', ''),
-                        title=chart.get('title', ''),
-                        interactive=False,
-                        output_format='base64'
-                    )
-                elif chart_type == 'pie':
-                    image = self.create_pie_chart(
-                        df=chart_data,
-                        names_column=chart.get('names_column', ''),
-                        values_column=chart.get('values_column', ''),
-                        title=chart.get('title', ''),
-                        interactive=False,
-                        output_format='base64'
-                    )
-                else:
-                    continue
-                
-                chart_images.append({
-                    "title": chart.get('title', ''),
-                    "image": image
-                })
+            chart_images = [
+                {"title": chart.get('title', ''), "image": image}
+                for chart, image in zip(charts, results)
+                if image is not None
+            ]
             
             return json.dumps({
                 "dashboard_title": title,
-                "charts": chart_images
+                "charts": chart_images,
+                "panels": panels
             })
         
         # Create interactive plotly dashboard
@@ -617,17 +706,23 @@ class DataVisualizer:
         max_col = len(layout[0]) if layout else 1
         
         # Create subplot figure
-        fig = make_subplots(
+        fig = plotly_subplots.make_subplots(
             rows=max_row,
             cols=max_col,
             subplot_titles=[chart.get('title', '') for chart in charts],
             vertical_spacing=0.1
         )
         
-        # Add traces for each chart
-        for i, chart in enumerate(charts):
-            chart_type = chart.get('type', '')
-            chart_data = chart.get('data', pd.DataFrame())
+        # Build each panel's traces concurrently, then place them on the grid in order
+        results, panels = self._build_dashboard_panels(charts, self._dashboard_panel_traces)
+        
+        downsampling = {}
+        for i, result in enumerate(results):
+            if result is None:
+                continue
+            traces, panel_downsampling = result
+            if panel_downsampling is not None:
+                downsampling[i] = panel_downsampling
             
             # Find position in layout
             row_idx = 1
@@ -639,56 +734,8 @@ class DataVisualizer:
                     col_idx = row.index(i) + 1
                     break
             
-            if chart_type == 'line':
-                y_columns = chart.get('y_columns', [])
-                if isinstance(y_columns, str):
-                    y_columns = [y_columns]
-                
-                for y_column in y_columns:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=chart_data[chart.get('x_column', '')],
-                            y=chart_data[y_column],
-                            mode='lines+markers',
-                            name=y_column
-                        ),
-                        row=row_idx,
-                        col=col_idx
-                    )
-            
-            elif chart_type == 'bar':
-                fig.add_trace(
-                    go.Bar(
-                        x=chart_data[chart.get('x_column', '')],
-                        y=chart_data[chart.get('y_column', '')],
-                        name=chart.get('title', '')
-                    ),
-                    row=row_idx,
-                    col=col_idx
-                )
-            
-            elif chart_type == 'pie':
-                fig.add_trace(
-                    go.Pie(
-                        labels=chart_data[chart.get('names_column', '')],
-                        values=chart_data[chart.get('values_column', '')],
-                        name=chart.get('title', '')
-                    ),
-                    row=row_idx,
-                    col=col_idx
-                )
-            
-            elif chart_type == 'scatter':
-                fig.add_trace(
-                    go.Scatter(
-                        x=chart_data[chart.get('x_column', '')],
-                        y=chart_data[chart.get('y_column', '')],
-                        mode='markers',
-                        name=chart.get('title', '')
-                    ),
-                    row=row_idx,
-                    col=col_idx
-                )
+            for trace in traces:
+                fig.add_trace(trace, row=row_idx, col=col_idx)
         
         # Update layout
         fig.update_layout(
@@ -699,11 +746,154 @@ class DataVisualizer:
         )
         
         if output_format == 'json':
-            return json.dumps(fig.to_dict())
+            figure = fig.to_dict()
+            figure["panels"] = panels
+            if downsampling:
+                figure["downsampling"] = downsampling
+            return self._figure_json(figure)
         else:  # base64
             img_bytes = fig.to_image(format="png")
             return base64.b64encode(img_bytes).decode('utf-8')
     
+    def _build_dashboard_panels(
+        self,
+        charts: List[Dict[str, Any]],
+        builder: Callable[[Dict[str, Any]], Any]
+    ) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Build dashboard panels concurrently with a bounded number of threads
+        
+        A panel that fails is reported in its metadata and left out of the dashboard.
+        
+        Args:
+            charts: List of chart configurations
+            builder: Function building one panel from its configuration
+            
+        Returns:
+            Tuple of (panel results in chart order, per-panel metadata with timings)
+        """
+        def build(index: int, chart: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+            metadata = {
+                "index": index,
+                "type": chart.get('type', ''),
+                "title": chart.get('title', ''),
+                "cached": False
+            }
+            start = time.perf_counter()
+            try:
+                result = builder(chart)
+            except Exception as e:
+                logger.error(f"Error building dashboard panel {index}: {str(e)}")
+                metadata["error"] = str(e)
+                result = None
+            metadata["seconds"] = round(time.perf_counter() - start, 4)
+            return result, metadata
+        
+        if not charts:
+            return [], []
+        
+        max_workers = max(1, min(len(charts), settings.DASHBOARD_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            built = list(executor.map(build, range(len(charts)), charts))
+        
+        return [result for result, _ in built], [metadata for _, metadata in built]
+    
+    def _dashboard_panel_image(self, chart: Dict[str, Any]) -> Optional[str]:
+        """
+        Render one static dashboard panel (None for unsupported chart types)
+        """
+        chart_type = chart.get('type', '')
+        chart_data = chart.get('data', pd.DataFrame())
+        
+        if chart_type == 'line':
+            return self.create_line_chart(
+                df=chart_data,
+                x_column=chart.get('x_column', ''),
+                y_columns=chart.get('y_columns', []),
+                title=chart.get('title', ''),
+                interactive=False,
+                output_format='base64'
+            )
+        elif chart_type == 'bar':
+            return self.create_bar_chart(
+                df=chart_data,
+                x_column=chart.get('x_column', ''),
+                y_column=chart.get('y_column', ''),
+                title=chart.get('title', ''),
+                interactive=False,
+                output_format='base64'
+            )
+        elif chart_type == 'pie':
+            return self.create_pie_chart(
+                df=chart_data,
+                names_column=chart.get('names_column', ''),
+                values_column=chart.get('values_column', ''),
+                title=chart.get('title', ''),
+                interactive=False,
+                output_format='base64'
+            )
+        
+        return None
+    
+    def _dashboard_panel_traces(self, chart: Dict[str, Any]) -> Optional[Tuple[List[Any], Optional[Dict[str, Any]]]]:
+        """
+        Build the Plotly traces of one interactive dashboard panel
+        
+        Returns:
+            Tuple of (traces, downsampling summary for line panels), or None for unsupported chart types
+        """
+        chart_type = chart.get('type', '')
+        chart_data = chart.get('data', pd.DataFrame())
+        
+        if chart_type == 'line':
+            y_columns = chart.get('y_columns', [])
+            if isinstance(y_columns, str):
+                y_columns = [y_columns]
+            
+            # Reduce long series to the panel's point budget before serialization
+            series, downsampling = downsample_series(
+                chart_data,
+                chart.get('x_column', ''),
+                y_columns,
+                chart.get('max_points', settings.CHART_MAX_POINTS)
+            )
+            
+            traces = []
+            for y_column in y_columns:
+                x_values, y_values = series[y_column]
+                traces.append(go.Scatter(
+                    x=x_values,
+                    y=y_values,
+                    mode='lines+markers',
+                    name=y_column
+                ))
+            return traces, downsampling
+        
+        elif chart_type == 'bar':
+            return [go.Bar(
+                x=chart_data[chart.get('x_column', '')],
+                y=chart_data[chart.get('y_column', '')],
+                name=chart.get('title', '')
+            )], None
+        
+        elif chart_type == 'pie':
+            return [go.Pie(
+                labels=chart_data[chart.get('names_column', '')],
+                values=chart_data[chart.get('values_column', '')],
+                name=chart.get('title', '')
+            )], None
+        
+        elif chart_type == 'scatter':
+            return [go.Scatter(
+                x=chart_data[chart.get('x_column', '')],
+                y=chart_data[chart.get('y_column', '')],
+                mode='markers',
+                name=chart.get('title', '')
+            )], None
+        
+        return None
+    
+    @cached_render
     def create_comparative_chart(
         self,
         df: pd.DataFrame,
@@ -752,39 +942,19 @@ class DataVisualizer:
                 fig.update_layout(template='plotly_white')
                 
                 if output_format == 'json':
-                    return json.dumps(fig.to_dict())
+                    return self._figure_json(fig)
                 else:  # base64
                     img_bytes = fig.to_image(format="png")
                     return base64.b64encode(img_bytes).decode('utf-8')
             
             else:
-                plt.figure(figsize=(12, 8))
-                
-                sns.barplot(
-                    x=category_column,
-                    y='Value',
-                    hue='Metric',
-                    data=melted_df
+                return self._render_static(
+                    'grouped_bar',
+                    {'df': melted_df},
+                    output_format,
+                    category_column=category_column,
+                    title=title
                 )
-                
-                plt.title(title)
-                plt.legend(title='Metric')
-                plt.tight_layout()
-                
-                # Save to BytesIO and convert to base64 or JSON
-                buf = BytesIO()
-                plt.savefig(buf, format='png')
-                plt.close()
-                
-                if output_format == 'base64':
-                    return base64.b64encode(buf.getvalue()).decode('utf-8')
-                else:  # json
-                    base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                    return json.dumps({
-                        "type": "image",
-                        "format": "png",
-                        "data": base64_data
-                    })
         
         elif chart_type == 'radar':
             # For radar chart, prepare data in required format
@@ -813,51 +983,25 @@ class DataVisualizer:
                 )
                 
                 if output_format == 'json':
-                    return json.dumps(fig.to_dict())
+                    return self._figure_json(fig)
                 else:  # base64
                     img_bytes = fig.to_image(format="png")
                     return base64.b64encode(img_bytes).decode('utf-8')
             
             else:
-                # Radar charts in matplotlib require more setup
-                num_vars = len(categories)
-                angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False).tolist()
-                angles += angles[:1]  # Close the polygon
-                
-                fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
-                
-                for column in value_columns:
-                    values = df[column].tolist()
-                    values += values[:1]  # Close the polygon
-                    ax.plot(angles, values, linewidth=2, label=column)
-                    ax.fill(angles, values, alpha=0.25)
-                
-                ax.set_theta_offset(np.pi / 2)
-                ax.set_theta_direction(-1)
-                ax.set_thetagrids(np.degrees(angles[:-1]), categories)
-                ax.set_title(title)
-                ax.legend(loc='upper right')
-                
-                plt.tight_layout()
-                
-                # Save to BytesIO and convert to base64 or JSON
-                buf = BytesIO()
-                plt.savefig(buf, format='png')
-                plt.close()
-                
-                if output_format == 'base64':
-                    return base64.b64encode(buf.getvalue()).decode('utf-8')
-                else:  # json
-                    base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                    return json.dumps({
-                        "type": "image",
-                        "format": "png",
-                        "data": base64_data
-                    })
+                return self._render_static(
+                    'radar',
+                    {'df': df[[category_column] + value_columns]},
+                    output_format,
+                    category_column=category_column,
+                    value_columns=value_columns,
+                    title=title
+                )
         
         else:
             raise ValueError(f"Unsupported chart type: {chart_type}")
     
+    @cached_render
     def create_correlation_matrix(
         self,
         df: pd.DataFrame,
@@ -900,43 +1044,21 @@ class DataVisualizer:
             fig.update_layout(template='plotly_white')
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(10, 8))
-            
-            sns.heatmap(
-                corr_matrix,
-                annot=True,
-                fmt=".2f",
-                cmap='RdBu_r',
-                vmin=-1,
-                vmax=1,
-                linewidths=.5
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'correlation',
+                {'corr': corr_matrix},
+                output_format,
+                title=title
             )
-            
-            plt.title(title)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
     
+    @cached_render
     def create_forecast_chart(
         self,
         historical_df: pd.DataFrame,
@@ -1015,62 +1137,20 @@ class DataVisualizer:
             )
             
             if output_format == 'json':
-                return json.dumps(fig.to_dict())
+                return self._figure_json(fig)
             else:  # base64
                 img_bytes = fig.to_image(format="png")
                 return base64.b64encode(img_bytes).decode('utf-8')
         
         else:
-            # Create static matplotlib/seaborn chart
-            plt.figure(figsize=(12, 6))
-            
-            # Plot historical data
-            plt.plot(
-                historical_df[date_column],
-                historical_df[value_column],
-                'b-',
-                marker='o',
-                label='Historical'
-            )
-            
-            # Plot forecast
-            plt.plot(
-                forecast_df[date_column],
-                forecast_df[value_column],
-                'r--',
-                marker='o',
-                label='Forecast'
+            # Rasterize the static matplotlib/seaborn chart in the render pool
+            return self._render_static(
+                'forecast',
+                {'historical': historical_df, 'forecast': forecast_df},
+                output_format,
+                date_column=date_column,
+                value_column=value_column,
+                lower_bound_column=lower_bound_column,
+                upper_bound_column=upper_bound_column,
+                title=title
             )
-            
-            # Add confidence interval if provided
-            if lower_bound_column and upper_bound_column:
-                plt.fill_between(
-                    forecast_df[date_column],
-                    forecast_df[lower_bound_column],
-                    forecast_df[upper_bound_column],
-                    color='red',
-                    alpha=0.2,
-                    label='Confidence Interval'
-                )
-            
-            plt.title(title)
-            plt.xlabel('Date')
-            plt.ylabel(value_column)
-            plt.legend()
-            plt.grid(True)
-            plt.tight_layout()
-            
-            # Save to BytesIO and convert to base64 or JSON
-            buf = BytesIO()
-            plt.savefig(buf, format='png')
-            plt.close()
-            
-            if output_format == 'base64':
-                return base64.b64encode(buf.getvalue()).decode('utf-8')
-            else:  # json
-                base64_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return json.dumps({
-                    "type": "image",
-                    "format": "png",
-                    "data": base64_data
-                })
\ No newline at end of file
@@ -32,10 +32,14 @@ try:
     from app.api.api import api_router
     from app.core.config import settings
     from app.db.database import get_db, get_mongodb_client
+    from app.core.lazy_imports import schedule_warm_up
     
     # Include API router
     app.include_router(api_router, prefix="/api/v1")
     
+    # Import heavy libraries in the background once the server is up
+    app.add_event_handler("startup", schedule_warm_up)
+    
     @app.get("/db-check")
     def db_check(db: Session = Depends(get_db)):
         """Database connection check"""
@@ -0,0 +1,390 @@
+import asyncio
+import base64
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Byte alignment of arrays inside the shared memory block
+SHARED_ALIGNMENT = 64
+
+# Seconds between checks for a free render slot from the event loop
+SLOT_POLL_INTERVAL = 0.05
+
+
+class RenderPoolBusy(RuntimeError):
+    """
+    Raised when the chart render queue is full
+    """
+
+
+class RenderTimeout(TimeoutError):
+    """
+    Raised when a chart render does not finish within its timeout
+    """
+
+
+def share_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[Optional[SharedMemory], Dict[str, Any]]:
+    """
+    Copy a set of numeric arrays into one shared memory block
+
+    Args:
+        arrays: Arrays by name
+
+    Returns:
+        Tuple of (shared memory block or None if empty, layout describing each array)
+    """
+    layout: Dict[str, Any] = {"arrays": {}}
+    offset = 0
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        if values.dtype.kind not in "biufcmM":
+            raise ValueError(f"Array '{name}' must be numeric or datetime, got {values.dtype}")
+        layout["arrays"][name] = {"dtype": values.dtype.str, "shape": values.shape, "offset": offset}
+        arrays[name] = values
+        offset += -(-values.nbytes // SHARED_ALIGNMENT) * SHARED_ALIGNMENT
+
+    if offset == 0:
+        return None, layout
+
+    block = SharedMemory(create=True, size=offset)
+    for name, values in arrays.items():
+        spec = layout["arrays"][name]
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf, offset=spec["offset"])
+        target[...] = values
+        del target
+
+    layout["block"] = block.name
+    return block, layout
+
+
+def load_arrays(layout: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Copy the arrays described by a share_arrays layout out of shared memory
+    """
+    if not layout.get("block"):
+        return {name: np.empty(spec["shape"], dtype=spec["dtype"]) for name, spec in layout["arrays"].items()}
+
+    # The parent process owns (and unlinks) the block
+    block = SharedMemory(name=layout["block"])
+    try:
+        arrays = {}
+        for name, spec in layout["arrays"].items():
+            view = np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=block.buf, offset=spec["offset"])
+            arrays[name] = view.copy()
+            del view
+        return arrays
+    finally:
+        block.close()
+
+
+def _draw_pie(ax, arrays, labels, title=''):
+    ax.pie(arrays["values"], labels=labels, autopct='%1.1f%%')
+    ax.set_title(title)
+
+
+def _draw_bar(ax, arrays, labels, title='', xlabel=None, ylabel=None, horizontal=False):
+    import seaborn as sns
+    if horizontal:
+        sns.barplot(x=arrays["values"], y=labels, ax=ax)
+    else:
+        sns.barplot(x=labels, y=arrays["values"], ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def _draw_line(ax, arrays, title='', xlabel=None, ylabel=None):
+    ax.plot(arrays["x"], arrays["y"])
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def _draw_histogram(ax, arrays, title='', xlabel=None, ylabel=None, bins=20, kde=False):
+    import seaborn as sns
+    # Pre-binned data comes as bin centers ('values') with counts ('weights') and bin edges
+    if "edges" in arrays:
+        bins = arrays["edges"].tolist()
+    sns.histplot(x=arrays["values"], weights=arrays.get("weights"), bins=bins, kde=kde, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+# Chart kinds: drawing function and figure size
+CHART_KINDS = {
+    "pie": (_draw_pie, (8, 6)),
+    "bar": (_draw_bar, (8, 6)),
+    "line": (_draw_line, (10, 6)),
+    "histogram": (_draw_histogram, (10, 6)),
+}
+
+
+def _init_worker() -> None:
+    """
+    Initialize a render worker process
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _draw_png(kind: str, arrays: Dict[str, np.ndarray], params: Dict[str, Any]) -> bytes:
+    """
+    Draw a chart and rasterize it to PNG bytes
+    """
+    import matplotlib.pyplot as plt
+
+    draw, figsize = CHART_KINDS[kind]
+    fig, ax = plt.subplots(figsize=params.pop("figsize", figsize))
+    try:
+        draw(ax, arrays, **params)
+        buf = BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _render_chart(kind: str, layout: Dict[str, Any], params: Dict[str, Any]) -> bytes:
+    """
+    Render a chart from shared memory to PNG bytes (runs in a worker process)
+    """
+    return _draw_png(kind, load_arrays(layout), params)
+
+
+class ChartRenderer:
+    """
+    Process pool for rasterizing report charts
+
+    Charts are described by a kind, numeric arrays (passed through shared memory)
+    and plain parameters such as labels and titles, and are rasterized to PNG in
+    worker processes. This keeps savefig off the event loop and pyplot's global
+    state out of the API process. The number of queued renders is bounded and
+    each render has a timeout.
+
+    render polls for a free render slot, so a full queue never blocks the
+    event loop, and a render that times out after it started kills the worker
+    processes, so a hung render cannot hold a slot. This mirrors the analytics
+    service's RenderPool; it differs only where its callers do: report charts
+    are plain arrays rather than DataFrames, and report generation is
+    async-only, so there is no blocking render.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the ChartRenderer
+
+        Args:
+            max_workers: Number of worker processes (defaults to RENDER_POOL_WORKERS; 0 renders in-process)
+            max_pending: Maximum number of queued or running renders (defaults to RENDER_POOL_MAX_PENDING)
+            timeout: Seconds to wait for a render (defaults to RENDER_POOL_TIMEOUT)
+        """
+        self.max_workers = max_workers if max_workers is not None else settings.RENDER_POOL_WORKERS
+        self.max_pending = max_pending if max_pending is not None else settings.RENDER_POOL_MAX_PENDING
+        self.timeout = timeout if timeout is not None else settings.RENDER_POOL_TIMEOUT
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # pyplot is not thread-safe, so in-process renders are serialized
+        self._local_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _reset_executor(self, executor: Optional[ProcessPoolExecutor] = None, kill: bool = False) -> None:
+        """
+        Drop the executor so the next render starts fresh workers
+
+        Args:
+            executor: Only drop this executor (another render may have replaced it already)
+            kill: Terminate the worker processes, to stop a hung render
+        """
+        with self._lock:
+            if self._executor is None or (executor is not None and self._executor is not executor):
+                return
+            executor, self._executor = self._executor, None
+
+        if kill:
+            # ProcessPoolExecutor cannot stop running tasks; the renders of the
+            # killed workers fail with BrokenProcessPool, releasing their slots
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(
+        self, kind: str, arrays: Dict[str, np.ndarray], params: Dict[str, Any]
+    ) -> Tuple[ProcessPoolExecutor, Future]:
+        """
+        Start a render in a worker process, holding an already acquired slot
+
+        The slot is released when the render finishes, or right away if it
+        cannot start. A broken executor is replaced once.
+
+        Returns:
+            Tuple of (executor running the render, future resolving to PNG bytes)
+        """
+        block = None
+        try:
+            block, layout = share_arrays(dict(arrays))
+            try:
+                executor = self._get_executor()
+                future = executor.submit(_render_chart, kind, layout, params)
+            except BrokenProcessPool:
+                self._reset_executor()
+                executor = self._get_executor()
+                future = executor.submit(_render_chart, kind, layout, params)
+        except BaseException:
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+            raise
+
+        def _release(_):
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        future.add_done_callback(_release)
+        return executor, future
+
+    def _busy(self) -> RenderPoolBusy:
+        return RenderPoolBusy(f"Chart render queue is full ({self.max_pending} pending renders)")
+
+    async def _acquire_slot_async(self) -> None:
+        """
+        Wait up to the timeout for a render slot without blocking the event loop
+
+        Raises:
+            RenderPoolBusy: If no slot frees up in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while not self._slots.acquire(blocking=False):
+            if loop.time() >= deadline:
+                raise self._busy()
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    def submit(self, kind: str, arrays: Dict[str, np.ndarray], params: Dict[str, Any]) -> Future:
+        """
+        Queue a chart render, waiting up to the timeout for a free slot (blocking)
+
+        Returns:
+            Future resolving to PNG bytes
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise self._busy()
+        return self._start(kind, arrays, params)[1]
+
+    async def render(self, kind: str, arrays: Dict[str, np.ndarray], **params) -> bytes:
+        """
+        Render a chart to PNG bytes without blocking the event loop
+
+        Args:
+            kind: Chart kind ('pie', 'bar', 'line', 'histogram')
+            arrays: Numeric chart data ('values' for pie/bar/histogram, 'x' and 'y' for line;
+                pre-binned histograms add 'weights' and 'edges')
+            **params: Labels, title, axis labels and chart options
+
+        Returns:
+            PNG bytes
+        """
+        if kind not in CHART_KINDS:
+            raise ValueError(f"Unsupported chart kind: {kind}")
+
+        if self.max_workers <= 0:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._render_local, kind, arrays, params
+            )
+
+        await self._acquire_slot_async()
+        executor, future = self._start(kind, arrays, params)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # A queued render is cancelled; one that already started keeps its
+            # worker (and slot) until killed
+            if not future.cancel() and not future.done():
+                self._reset_executor(executor, kill=True)
+            raise RenderTimeout(f"Rendering {kind} chart timed out after {self.timeout}s")
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise
+
+    def _render_local(self, kind: str, arrays: Dict[str, np.ndarray], params: Dict[str, Any]) -> bytes:
+        """
+        Render in the current process (used when the pool is disabled)
+        """
+        with self._local_lock:
+            return _draw_png(kind, arrays, dict(params))
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+# Shared renderer for all report generators
+_chart_renderer = None
+_chart_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """
+    Create or return the shared ChartRenderer
+    """
+    global _chart_renderer
+    if _chart_renderer is None:
+        with _chart_renderer_lock:
+            if _chart_renderer is None:
+                _chart_renderer = ChartRenderer()
+    return _chart_renderer
+
+
+async def render_chart(kind: str, arrays: Dict[str, Any], **params) -> str:
+    """
+    Render a report chart in the worker pool and return it as a base64 PNG string
+
+    Args:
+        kind: Chart kind ('pie', 'bar', 'line', 'histogram')
+        arrays: Numeric chart data
+        **params: Labels, title, axis labels and chart options
+
+    Returns:
+        Base64-encoded PNG
+    """
+    arrays = {name: np.asarray(values) for name, values in arrays.items()}
+    png = await get_chart_renderer().render(kind, arrays, **params)
+    return base64.b64encode(png).decode('utf-8')
@@ -0,0 +1,812 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import httpx
+from sqlalchemy import Integer, and_, case, cast, func, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.api.deps import get_service_token
+from app.analytics.snapshot_cache import SnapshotCache, get_snapshot_cache
+from app.analytics.ticket_extraction import TicketExtractionError, extract_tickets
+from app.models.warehouse import dim_dates, dim_priorities, dim_statuses, dim_users, fact_tickets
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bins of response and resolution time histograms
+HISTOGRAM_BINS = 20
+
+# Bucket growth factor of the per-day response time sketches: bucket i holds the
+# minutes in (gamma^(i-1), gamma^i], so each is known to within about 0.05%
+RESPONSE_SKETCH_GAMMA = 1.001
+
+# Format of the stored per-day partials; changing it invalidates every stored day
+DAILY_PARTIALS_VERSION = 2
+
+# Aggregates that can be computed per day and merged (see app.analytics.incremental)
+DAILY_AGGREGATES = ("ticket_summary", "user_activity", "response_times")
+
+# Columns of row-level ticket exports
+TICKET_EXPORT_COLUMNS = [
+    "ticket_id", "created_date", "status", "priority", "created_by",
+    "response_time_hours", "resolution_time_hours"
+]
+
+
+class ReportDataUnavailable(Exception):
+    """
+    Raised when a data source cannot provide the data a report needs
+    """
+
+
+class ReportDataSource:
+    """
+    Source of the aggregates behind the built-in reports
+
+    Every method covers tickets created between start and end (inclusive) and
+    returns aggregates only, so report generators never handle raw tickets.
+    Sources that set supports_daily_partials also provide per-day partial
+    aggregates, from which incremental reports are merged.
+    """
+
+    supports_daily_partials = False
+
+    async def ticket_summary(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """
+        Ticket totals for the summary report
+
+        Returns:
+            Dict with total_tickets, status_counts, priority_counts,
+            avg_resolution_time_hours and daily_counts (Series indexed by date)
+        """
+        raise NotImplementedError
+
+    async def user_activity(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """
+        Ticket creation per user for the user activity report
+
+        Returns:
+            Dict with total_users, tickets_per_user (DataFrame of created_by,
+            ticket_count sorted by count) and role_activity (DataFrame of role,
+            ticket_count, or None)
+        """
+        raise NotImplementedError
+
+    async def response_times(self, start: datetime, end: datetime, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+        """
+        Response and resolution time statistics for the response time report
+
+        Returns:
+            Dict with avg_first_response_time_hours, avg_resolution_time_hours,
+            response_by_priority, resolution_by_priority and response_histogram /
+            resolution_histogram ((bin edges, counts) in hours, or None)
+        """
+        raise NotImplementedError
+
+    def iter_ticket_rows(self, start: datetime, end: datetime) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over row-level ticket data for exports, without loading it all
+
+        Blocking; meant to be consumed on a worker thread by an exporter.
+
+        Returns:
+            Iterator of tuples in TICKET_EXPORT_COLUMNS order
+        """
+        raise ReportDataUnavailable("Row-level ticket export is not supported by this data source")
+
+    async def daily_fingerprints(self, start: datetime, end: datetime) -> Dict[date, List[Any]]:
+        """
+        Version of the data behind each day with tickets between start and end
+
+        A day's fingerprint changes whenever tickets created on that day, or the
+        dimensions they reference, change.
+
+        Returns:
+            Dict mapping days to JSON-serializable fingerprints
+        """
+        raise ReportDataUnavailable("Per-day partial aggregates are not supported by this data source")
+
+    async def daily_partials(self, aggregate: str, days: List[date]) -> Dict[date, Dict[str, Any]]:
+        """
+        Mergeable aggregates of the tickets created on each of the given days
+
+        Args:
+            aggregate: One of DAILY_AGGREGATES
+            days: Days to aggregate
+
+        Returns:
+            Dict mapping days with tickets to JSON-serializable partials
+        """
+        raise ReportDataUnavailable("Per-day partial aggregates are not supported by this data source")
+
+    async def user_count(self) -> int:
+        """
+        Number of known users (not bound to a period)
+        """
+        raise ReportDataUnavailable("User counts are not supported by this data source")
+
+
+def _value_histogram(values: pd.Series, bins: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Histogram of a series as (bin edges, counts), or None if it is empty
+    """
+    values = values.dropna()
+    if values.empty:
+        return None
+    counts, edges = np.histogram(values.to_numpy(dtype=float), bins=bins)
+    return edges, counts
+
+
+class HttpReportDataSource(ReportDataSource):
+    """
+    Report data computed from raw tickets and users fetched from the ticket and
+    user services
+
+    Tickets are fetched page by page into typed column buffers; users are
+    fetched in a single request of at most `limit` rows.
+    """
+
+    def __init__(
+        self,
+        limit: int = 1000,
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        snapshots: Optional[SnapshotCache] = None
+    ):
+        """
+        Initialize the HttpReportDataSource
+
+        Args:
+            limit: Maximum number of users fetched
+            page_size: Tickets per request (defaults to REPORT_TICKET_PAGE_SIZE)
+            concurrency: Ticket page requests in flight (defaults to REPORT_TICKET_FETCH_CONCURRENCY)
+            snapshots: Snapshot cache shared by concurrent reports (defaults to the shared cache)
+        """
+        self.limit = limit
+        self.page_size = page_size or settings.REPORT_TICKET_PAGE_SIZE
+        self.concurrency = concurrency or settings.REPORT_TICKET_FETCH_CONCURRENCY
+        self.snapshots = snapshots or get_snapshot_cache()
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        service_url: str,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch data from another microservice using service token
+        """
+        try:
+            token = get_service_token()
+            headers = {"Authorization": f"Bearer {token}"}
+            if client is None:
+                async with httpx.AsyncClient() as client:
+                    response = await client.get(f"{service_url}{endpoint}", headers=headers)
+            else:
+                response = await client.get(f"{service_url}{endpoint}", headers=headers)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error fetching data from {service_url}{endpoint}: {str(e)}")
+            return {"error": str(e)}
+
+    async def get_tickets(self, from_date: date) -> pd.DataFrame:
+        """
+        Get tickets created since from_date from the ticket service
+
+        Pages are fetched concurrently and parsed into typed column buffers
+        (timestamps as naive UTC), so the tickets are held once, as columns.
+        """
+        async with httpx.AsyncClient() as client:
+            async def fetch_page(skip: int, limit: int) -> Dict[str, Any]:
+                endpoint = f"/api/tickets?from_date={from_date.strftime('%Y-%m-%d')}&skip={skip}&limit={limit}"
+                data = await self._fetch(endpoint, settings.TICKET_SERVICE_URL, client)
+                if "error" in data:
+                    raise TicketExtractionError(data["error"])
+                return data
+
+            try:
+                return await extract_tickets(fetch_page, from_date, self.page_size, self.concurrency)
+            except TicketExtractionError as e:
+                logger.error(f"Failed to get ticket data: {str(e)}")
+                return pd.DataFrame()
+
+    async def get_users(self) -> pd.DataFrame:
+        """
+        Get raw users from the user service
+        """
+        endpoint = f"/api/users?limit={self.limit}"
+        data = await self._fetch(endpoint, settings.USER_SERVICE_URL)
+
+        if "error" in data:
+            logger.error(f"Failed to get user data: {data['error']}")
+            return pd.DataFrame()
+
+        return pd.DataFrame(data.get("users", []))
+
+    @asynccontextmanager
+    async def tickets(self, start: datetime) -> AsyncIterator[pd.DataFrame]:
+        """
+        Hold the shared ticket snapshot covering tickets created since start
+
+        A snapshot already loaded (or loading) for an earlier start date is
+        reused and narrowed to the requested window. The yielded DataFrame
+        must not be modified.
+        """
+        from_date = start.date()
+
+        async def load():
+            return from_date, await self.get_tickets(from_date)
+
+        async with self.snapshots.snapshot(
+            ("tickets", from_date),
+            load,
+            covers=lambda key: key[0] == "tickets" and key[1] <= from_date
+        ) as (snapshot_date, ticket_df):
+            if snapshot_date < from_date and 'created_at' in ticket_df.columns:
+                created_at = ticket_df['created_at']
+                ticket_df = ticket_df[created_at >= pd.Timestamp(from_date, tz=created_at.dt.tz)]
+            yield ticket_df
+
+    @asynccontextmanager
+    async def users(self) -> AsyncIterator[pd.DataFrame]:
+        """
+        Hold the shared user snapshot (must not be modified)
+        """
+        async with self.snapshots.snapshot(("users",), self.get_users) as user_df:
+            yield user_df
+
+    async def ticket_summary(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        async with self.tickets(start) as ticket_df:
+            if ticket_df.empty:
+                raise ReportDataUnavailable("No ticket data available")
+
+            avg_resolution_time = None
+            daily_counts = None
+            if 'created_at' in ticket_df.columns:
+                daily_counts = ticket_df.groupby(ticket_df['created_at'].dt.date).size()
+
+                if 'resolved_at' in ticket_df.columns:
+                    # Calculate only for resolved tickets
+                    resolved_tickets = ticket_df.dropna(subset=['resolved_at'])
+                    if not resolved_tickets.empty:
+                        resolution_times = resolved_tickets['resolved_at'] - resolved_tickets['created_at']
+                        avg_resolution_time = resolution_times.mean().total_seconds() / 3600  # in hours
+
+            return {
+                "total_tickets": len(ticket_df),
+                "status_counts": ticket_df['status'].value_counts().to_dict(),
+                "priority_counts": ticket_df['priority'].value_counts().to_dict(),
+                "avg_resolution_time_hours": avg_resolution_time,
+                "daily_counts": daily_counts
+            }
+
+    async def user_activity(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        async with self.tickets(start) as ticket_df, self.users() as user_df:
+            if ticket_df.empty or user_df.empty:
+                raise ReportDataUnavailable("No data available")
+
+            if 'created_by' not in ticket_df.columns or 'id' not in user_df.columns:
+                raise ReportDataUnavailable("Required columns missing in data")
+
+            # Merge on created_by = user id
+            merged_df = pd.merge(
+                ticket_df,
+                user_df.rename(columns={'id': 'user_id'}),
+                left_on='created_by',
+                right_on='user_id',
+                how='left'
+            )
+
+            tickets_per_user = (
+                merged_df.groupby('created_by').size().reset_index(name='ticket_count')
+                .sort_values('ticket_count', ascending=False)
+            )
+            role_activity = None
+            if 'role' in user_df.columns:
+                role_activity = merged_df.groupby('role').size().reset_index(name='ticket_count')
+
+            return {
+                "total_users": len(user_df),
+                "tickets_per_user": tickets_per_user,
+                "role_activity": role_activity
+            }
+
+    async def response_times(self, start: datetime, end: datetime, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+        async with self.tickets(start) as ticket_df:
+            if ticket_df.empty:
+                raise ReportDataUnavailable("No ticket data available")
+
+            required_cols = ['created_at', 'first_response_at', 'resolved_at', 'priority']
+            missing_cols = [col for col in required_cols if col not in ticket_df.columns]
+            if missing_cols:
+                raise ReportDataUnavailable(f"Required columns missing: {missing_cols}")
+
+            # Response and resolution times in hours
+            times_df = pd.DataFrame({
+                'priority': ticket_df['priority'],
+                'first_response_time': (ticket_df['first_response_at'] - ticket_df['created_at']).dt.total_seconds() / 3600,
+                'resolution_time': (ticket_df['resolved_at'] - ticket_df['created_at']).dt.total_seconds() / 3600
+            })
+
+        response_df = times_df.dropna(subset=['first_response_time'])
+        resolution_df = times_df.dropna(subset=['resolution_time'])
+
+        return {
+            "avg_first_response_time_hours": response_df['first_response_time'].mean() if not response_df.empty else None,
+            "avg_resolution_time_hours": resolution_df['resolution_time'].mean() if not resolution_df.empty else None,
+            "response_by_priority": response_df.groupby('priority')['first_response_time'].mean().to_dict(),
+            "resolution_by_priority": resolution_df.groupby('priority')['resolution_time'].mean().to_dict(),
+            "response_histogram": _value_histogram(response_df['first_response_time'], bins),
+            "resolution_histogram": _value_histogram(resolution_df['resolution_time'], bins)
+        }
+
+
+class WarehouseReportDataSource(ReportDataSource):
+    """
+    Report data aggregated in the analytics data warehouse
+
+    Reads the star schema (fact_tickets and its dimensions) with date-bounded
+    GROUP BY queries, so reports cover any period and only aggregate rows are
+    transferred. Queries run on worker threads to keep the event loop free.
+    """
+
+    supports_daily_partials = True
+
+    def __init__(self, engine: Optional[Engine] = None, snapshots: Optional[SnapshotCache] = None):
+        """
+        Initialize the WarehouseReportDataSource
+
+        Args:
+            engine: Warehouse engine (defaults to the shared warehouse engine)
+            snapshots: Snapshot cache shared by concurrent reports (defaults to the shared cache)
+        """
+        if engine is None:
+            from app.db.warehouse import get_warehouse_engine
+            engine = get_warehouse_engine()
+        self.engine = engine
+        self.snapshots = snapshots or get_snapshot_cache()
+
+    @staticmethod
+    def _date_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+        """
+        Align a window to the warehouse's daily grain
+
+        dim_dates holds one row per day at midnight, so the first and last
+        dates inside the window select exactly the same tickets, and reports
+        requested moments apart share the same window.
+        """
+        first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        return datetime.combine(first_day, time.min), datetime.combine(end.date(), time.min)
+
+    async def _shared(self, name: str, query, start: datetime, end: datetime, *args):
+        """
+        Run a report query once for all concurrent reports over the same window
+        """
+        start, end = self._date_window(start, end)
+        return await self.snapshots.get(
+            ("warehouse", name, start, end) + args,
+            lambda: self._run(query, start, end, *args)
+        )
+
+    @staticmethod
+    def _created_between(start: datetime, end: datetime):
+        """
+        Filter on the ticket creation date
+        """
+        return and_(dim_dates.c.date >= start, dim_dates.c.date <= end)
+
+    @staticmethod
+    def _tickets():
+        """
+        Tickets joined to their creation date
+        """
+        return fact_tickets.join(dim_dates, fact_tickets.c.created_date_id == dim_dates.c.id)
+
+    async def _run(self, query, *args):
+        """
+        Run a blocking warehouse query on a worker thread
+        """
+        try:
+            return await asyncio.to_thread(query, *args)
+        except ReportDataUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"Warehouse query failed: {str(e)}")
+            raise ReportDataUnavailable(f"Warehouse query failed: {str(e)}")
+
+    def _ticket_summary(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        created = self._created_between(start, end)
+
+        with self.engine.connect() as conn:
+            daily_rows = conn.execute(
+                select(dim_dates.c.date, func.count(fact_tickets.c.id))
+                .select_from(self._tickets())
+                .where(created)
+                .group_by(dim_dates.c.date)
+                .order_by(dim_dates.c.date)
+            ).all()
+
+            if not daily_rows:
+                raise ReportDataUnavailable("No ticket data available")
+
+            status_rows = conn.execute(
+                select(dim_statuses.c.name, func.count(fact_tickets.c.id))
+                .select_from(self._tickets().join(dim_statuses, fact_tickets.c.status_id == dim_statuses.c.id))
+                .where(created)
+                .group_by(dim_statuses.c.name)
+                .order_by(func.count(fact_tickets.c.id).desc())
+            ).all()
+
+            priority_rows = conn.execute(
+                select(dim_priorities.c.name, func.count(fact_tickets.c.id))
+                .select_from(self._tickets().join(dim_priorities, fact_tickets.c.priority_id == dim_priorities.c.id))
+                .where(created)
+                .group_by(dim_priorities.c.name)
+                .order_by(func.count(fact_tickets.c.id).desc())
+            ).all()
+
+            avg_resolution_minutes = conn.execute(
+                select(func.avg(fact_tickets.c.resolution_time_minutes))
+                .select_from(self._tickets())
+                .where(created)
+            ).scalar()
+
+        daily_counts = pd.Series(
+            [count for _, count in daily_rows],
+            index=[pd.Timestamp(day).date() for day, _ in daily_rows]
+        )
+
+        return {
+            "total_tickets": int(daily_counts.sum()),
+            "status_counts": {name: count for name, count in status_rows},
+            "priority_counts": {name: count for name, count in priority_rows},
+            "avg_resolution_time_hours": avg_resolution_minutes / 60 if avg_resolution_minutes is not None else None,
+            "daily_counts": daily_counts
+        }
+
+    def _user_activity(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            user_rows = conn.execute(
+                select(dim_users.c.user_id, dim_users.c.role, func.count(fact_tickets.c.id).label("ticket_count"))
+                .select_from(self._tickets().join(dim_users, fact_tickets.c.user_id == dim_users.c.id))
+                .where(self._created_between(start, end))
+                .group_by(dim_users.c.user_id, dim_users.c.role)
+                .order_by(func.count(fact_tickets.c.id).desc())
+            ).all()
+
+            total_users = conn.execute(select(func.count(dim_users.c.id))).scalar() or 0
+
+        if not user_rows or not total_users:
+            raise ReportDataUnavailable("No data available")
+
+        activity = pd.DataFrame(user_rows, columns=['created_by', 'role', 'ticket_count'])
+        role_activity = activity.groupby('role', as_index=False)['ticket_count'].sum()
+
+        return {
+            "total_users": int(total_users),
+            "tickets_per_user": activity[['created_by', 'ticket_count']].reset_index(drop=True),
+            "role_activity": role_activity if not role_activity.empty else None
+        }
+
+    def _histogram(self, conn, column, start: datetime, end: datetime, bins: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Histogram of a fact column in hours, binned in the database
+        """
+        created = self._created_between(start, end)
+        low, high = conn.execute(
+            select(func.min(column), func.max(column))
+            .select_from(self._tickets())
+            .where(created, column.isnot(None))
+        ).one()
+
+        if low is None:
+            return None
+
+        if low == high:
+            high = low + 1
+        width = (high - low) / bins
+
+        # Equal-width buckets; the maximum falls into the last bucket. Floor
+        # before casting: PostgreSQL rounds when casting to an integer
+        bucket = case(
+            (column >= high, bins - 1),
+            else_=cast(func.floor((column - low) / width), Integer)
+        )
+        rows = conn.execute(
+            select(bucket, func.count())
+            .select_from(self._tickets())
+            .where(created, column.isnot(None))
+            .group_by(bucket)
+        ).all()
+
+        counts = np.zeros(bins, dtype=np.int64)
+        for index, count in rows:
+            counts[min(int(index), bins - 1)] += count
+
+        return np.linspace(low, high, bins + 1) / 60, counts
+
+    def _by_priority(self, conn, column, start: datetime, end: datetime) -> Dict[str, float]:
+        """
+        Mean of a fact column in hours per priority
+        """
+        rows = conn.execute(
+            select(dim_priorities.c.name, func.avg(column))
+            .select_from(self._tickets().join(dim_priorities, fact_tickets.c.priority_id == dim_priorities.c.id))
+            .where(self._created_between(start, end), column.isnot(None))
+            .group_by(dim_priorities.c.name)
+        ).all()
+        return {name: value / 60 for name, value in rows}
+
+    def _response_times(self, start: datetime, end: datetime, bins: int) -> Dict[str, Any]:
+        response = fact_tickets.c.response_time_minutes
+        resolution = fact_tickets.c.resolution_time_minutes
+
+        with self.engine.connect() as conn:
+            total, avg_response, avg_resolution = conn.execute(
+                select(func.count(fact_tickets.c.id), func.avg(response), func.avg(resolution))
+                .select_from(self._tickets())
+                .where(self._created_between(start, end))
+            ).one()
+
+            if not total:
+                raise ReportDataUnavailable("No ticket data available")
+
+            return {
+                "avg_first_response_time_hours": avg_response / 60 if avg_response is not None else None,
+                "avg_resolution_time_hours": avg_resolution / 60 if avg_resolution is not None else None,
+                "response_by_priority": self._by_priority(conn, response, start, end),
+                "resolution_by_priority": self._by_priority(conn, resolution, start, end),
+                "response_histogram": self._histogram(conn, response, start, end, bins),
+                "resolution_histogram": self._histogram(conn, resolution, start, end, bins)
+            }
+
+    def iter_ticket_rows(self, start: datetime, end: datetime) -> Iterator[Tuple[Any, ...]]:
+        start, end = self._date_window(start, end)
+        query = (
+            select(
+                fact_tickets.c.ticket_id,
+                dim_dates.c.date,
+                dim_statuses.c.name,
+                dim_priorities.c.name,
+                dim_users.c.user_id,
+                fact_tickets.c.response_time_minutes / 60,
+                fact_tickets.c.resolution_time_minutes / 60
+            )
+            .select_from(
+                self._tickets()
+                .outerjoin(dim_statuses, fact_tickets.c.status_id == dim_statuses.c.id)
+                .outerjoin(dim_priorities, fact_tickets.c.priority_id == dim_priorities.c.id)
+                .outerjoin(dim_users, fact_tickets.c.user_id == dim_users.c.id)
+            )
+            .where(self._created_between(start, end))
+            .order_by(dim_dates.c.date, fact_tickets.c.id)
+        )
+
+        with self.engine.connect() as conn:
+            # Server-side cursor: rows are fetched in batches as the exporter writes them
+            result = conn.execution_options(
+                stream_results=True,
+                yield_per=settings.EXPORT_ROW_BATCH_SIZE
+            ).execute(query)
+            for row in result:
+                yield tuple(row)
+
+    @staticmethod
+    def _day(value) -> date:
+        """
+        Day of a dim_dates date
+        """
+        return pd.Timestamp(value).date()
+
+    def _daily_fingerprints(self, start: datetime, end: datetime) -> Dict[date, List[Any]]:
+        start, end = self._date_window(start, end)
+
+        with self.engine.connect() as conn:
+            day_rows = conn.execute(
+                select(dim_dates.c.date, func.count(fact_tickets.c.id), func.max(fact_tickets.c.etl_updated_at))
+                .select_from(self._tickets())
+                .where(self._created_between(start, end))
+                .group_by(dim_dates.c.date)
+            ).all()
+
+            # Renamed statuses, priorities or user roles change every day's aggregates. The ETL
+            # touches etl_updated_at on every run, so the dimensions are fingerprinted by content
+            digest = hashlib.sha256()
+            for columns in (
+                (dim_statuses.c.id, dim_statuses.c.name),
+                (dim_priorities.c.id, dim_priorities.c.name),
+                (dim_users.c.id, dim_users.c.user_id, dim_users.c.role)
+            ):
+                for row in conn.execute(select(*columns).order_by(columns[0])):
+                    digest.update(json.dumps(list(row), default=str).encode())
+                digest.update(b"|")
+
+        dimensions_version = digest.hexdigest()
+
+        return {
+            self._day(day): [
+                count, updated_at.isoformat() if updated_at else None, dimensions_version, DAILY_PARTIALS_VERSION
+            ]
+            for day, count, updated_at in day_rows
+        }
+
+    def _daily_ticket_summary(self, conn, on_days) -> Dict[date, Dict[str, Any]]:
+        resolution = fact_tickets.c.resolution_time_minutes
+
+        partials = {}
+        for day, count, resolution_sum, resolution_count in conn.execute(
+            select(dim_dates.c.date, func.count(fact_tickets.c.id), func.sum(resolution), func.count(resolution))
+            .select_from(self._tickets())
+            .where(on_days)
+            .group_by(dim_dates.c.date)
+        ):
+            partials[self._day(day)] = {
+                "tickets": count,
+                "status_counts": [],
+                "priority_counts": [],
+                "resolution_sum": float(resolution_sum or 0),
+                "resolution_count": resolution_count
+            }
+
+        for key, dimension, foreign_key in (
+            ("status_counts", dim_statuses, fact_tickets.c.status_id),
+            ("priority_counts", dim_priorities, fact_tickets.c.priority_id)
+        ):
+            for day, name, count in conn.execute(
+                select(dim_dates.c.date, dimension.c.name, func.count(fact_tickets.c.id))
+                .select_from(self._tickets().join(dimension, foreign_key == dimension.c.id))
+                .where(on_days)
+                .group_by(dim_dates.c.date, dimension.c.name)
+            ):
+                partials[self._day(day)][key].append([name, count])
+
+        return partials
+
+    def _daily_user_activity(self, conn, on_days) -> Dict[date, Dict[str, Any]]:
+        partials = {}
+        for day, user_id, role, count in conn.execute(
+            select(dim_dates.c.date, dim_users.c.user_id, dim_users.c.role, func.count(fact_tickets.c.id))
+            .select_from(self._tickets().join(dim_users, fact_tickets.c.user_id == dim_users.c.id))
+            .where(on_days)
+            .group_by(dim_dates.c.date, dim_users.c.user_id, dim_users.c.role)
+        ):
+            partials.setdefault(self._day(day), {"users": []})["users"].append([user_id, role, count])
+        return partials
+
+    def _daily_response_times(self, conn, on_days) -> Dict[date, Dict[str, Any]]:
+        columns = {
+            "response": fact_tickets.c.response_time_minutes,
+            "resolution": fact_tickets.c.resolution_time_minutes
+        }
+
+        aggregates = (func.sum, func.count, func.min, func.max)
+
+        partials = {}
+        for day, count, *totals in conn.execute(
+            select(
+                dim_dates.c.date,
+                func.count(fact_tickets.c.id),
+                *[aggregate(column) for column in columns.values() for aggregate in aggregates]
+            )
+            .select_from(self._tickets())
+            .where(on_days)
+            .group_by(dim_dates.c.date)
+        ):
+            partials[self._day(day)] = {
+                "tickets": count,
+                **{
+                    name: {
+                        "sum": float(totals[4 * i] or 0),
+                        "count": totals[4 * i + 1],
+                        "min": None if totals[4 * i + 2] is None else float(totals[4 * i + 2]),
+                        "max": None if totals[4 * i + 3] is None else float(totals[4 * i + 3]),
+                        "by_priority": [],
+                        "sketch": []
+                    }
+                    for i, name in enumerate(columns)
+                }
+            }
+
+        for name, column in columns.items():
+            for day, priority, total, count in conn.execute(
+                select(dim_dates.c.date, dim_priorities.c.name, func.sum(column), func.count(column))
+                .select_from(self._tickets().join(dim_priorities, fact_tickets.c.priority_id == dim_priorities.c.id))
+                .where(on_days, column.isnot(None))
+                .group_by(dim_dates.c.date, dim_priorities.c.name)
+            ):
+                partials[self._day(day)][name]["by_priority"].append([priority, float(total), count])
+
+            # Histogram bins depend on the whole period, so each day keeps a log-bucketed
+            # sketch of its positive minutes; the rest count as zero
+            bucket = cast(func.ceil(func.ln(column) / np.log(RESPONSE_SKETCH_GAMMA)), Integer)
+            for day, index, count in conn.execute(
+                select(dim_dates.c.date, bucket, func.count(fact_tickets.c.id))
+                .select_from(self._tickets())
+                .where(on_days, column > 0)
+                .group_by(dim_dates.c.date, bucket)
+                .order_by(dim_dates.c.date, bucket)
+            ):
+                partials[self._day(day)][name]["sketch"].append([index, count])
+
+        return partials
+
+    def _daily_partials(self, aggregate: str, days: List[date]) -> Dict[date, Dict[str, Any]]:
+        builders = {
+            "ticket_summary": self._daily_ticket_summary,
+            "user_activity": self._daily_user_activity,
+            "response_times": self._daily_response_times,
+        }
+        if aggregate not in builders:
+            raise ValueError(f"Unknown daily aggregate: {aggregate}")
+
+        on_days = dim_dates.c.date.in_([datetime.combine(day, time.min) for day in days])
+        with self.engine.connect() as conn:
+            return builders[aggregate](conn, on_days)
+
+    def _user_count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count(dim_users.c.id))).scalar() or 0
+
+    async def daily_fingerprints(self, start: datetime, end: datetime) -> Dict[date, List[Any]]:
+        return await self._run(self._daily_fingerprints, start, end)
+
+    async def daily_partials(self, aggregate: str, days: List[date]) -> Dict[date, Dict[str, Any]]:
+        if not days:
+            return {}
+        return await self._run(self._daily_partials, aggregate, days)
+
+    async def user_count(self) -> int:
+        return await self._run(self._user_count)
+
+    async def ticket_summary(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        return await self._shared("ticket_summary", self._ticket_summary, start, end)
+
+    async def user_activity(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        return await self._shared("user_activity", self._user_activity, start, end)
+
+    async def response_times(self, start: datetime, end: datetime, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+        return await self._shared("response_times", self._response_times, start, end, bins)
+
+
+# Data source selected by REPORT_DATA_SOURCE
+_data_source = None
+_data_source_lock = threading.Lock()
+
+
+def get_report_data_source() -> ReportDataSource:
+    """
+    Create or return the configured report data source ('warehouse' or 'http')
+    """
+    global _data_source
+    if _data_source is None:
+        with _data_source_lock:
+            if _data_source is None:
+                if settings.REPORT_DATA_SOURCE == "http":
+                    _data_source = HttpReportDataSource()
+                elif settings.REPORT_DATA_SOURCE == "warehouse":
+                    _data_source = WarehouseReportDataSource()
+                else:
+                    raise ValueError(f"Unknown report data source: {settings.REPORT_DATA_SOURCE}")
+    return _data_source
+
+
+def set_report_data_source(source: ReportDataSource) -> None:
+    """
+    Replace the shared report data source
+
+    Report worker processes use this to load their data through the API process.
+    """
+    global _data_source
+    with _data_source_lock:
+        _data_source = source
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import pdfkit
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# wkhtmltopdf options for report exports
+PDF_OPTIONS = {
+    "quiet": "",
+    "encoding": "UTF-8",
+    "enable-local-file-access": "",
+}
+
+
+class PdfRenderBusy(RuntimeError):
+    """
+    Raised when the PDF render queue is full
+    """
+
+
+class PdfRenderTimeout(TimeoutError):
+    """
+    Raised when a PDF render does not finish within its timeout
+    """
+
+
+class PdfRenderError(RuntimeError):
+    """
+    Raised when wkhtmltopdf fails
+    """
+
+
+class PdfRenderer:
+    """
+    Bounded pool of wkhtmltopdf processes for report PDF exports
+
+    At most `max_workers` wkhtmltopdf processes run at once; further renders
+    wait in a queue of at most `max_pending` jobs, and renders beyond that are
+    rejected instead of piling up. HTML is handed over as a temporary file and
+    the PDF is read back from one, and a process that exceeds the timeout is
+    killed.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize the PdfRenderer
+
+        Args:
+            max_workers: Number of concurrent wkhtmltopdf processes (defaults to PDF_POOL_WORKERS)
+            max_pending: Maximum number of queued or running renders (defaults to PDF_POOL_MAX_PENDING)
+            timeout: Seconds a render may run (defaults to PDF_POOL_TIMEOUT)
+        """
+        self.max_workers = max_workers if max_workers is not None else settings.PDF_POOL_WORKERS
+        self.max_pending = max_pending if max_pending is not None else settings.PDF_POOL_MAX_PENDING
+        self.timeout = timeout if timeout is not None else settings.PDF_POOL_TIMEOUT
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-render")
+        self._configuration = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.render_seconds = 0.0
+
+    def _get_configuration(self):
+        with self._lock:
+            if self._configuration is None:
+                self._configuration = pdfkit.configuration(wkhtmltopdf=settings.WKHTMLTOPDF_PATH or "")
+            return self._configuration
+
+    def _render_file(self, html: str) -> bytes:
+        """
+        Run wkhtmltopdf on the HTML (runs in a pool thread)
+        """
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+
+        started = time.monotonic()
+        try:
+            with tempfile.TemporaryDirectory(prefix="report-pdf-") as workdir:
+                html_path = os.path.join(workdir, "report.html")
+                pdf_path = os.path.join(workdir, "report.pdf")
+                with open(html_path, "w", encoding="utf-8") as f:
+                    f.write(html)
+
+                command = pdfkit.PDFKit(
+                    html_path, "file", options=PDF_OPTIONS, configuration=self._get_configuration()
+                ).command(pdf_path)
+                try:
+                    result = subprocess.run(command, capture_output=True, timeout=self.timeout)
+                except subprocess.TimeoutExpired:
+                    # subprocess.run kills the process before raising
+                    with self._lock:
+                        self.timed_out += 1
+                    raise PdfRenderTimeout(f"PDF render timed out after {self.timeout}s")
+
+                if result.returncode != 0 or not os.path.exists(pdf_path):
+                    with self._lock:
+                        self.failed += 1
+                    error = result.stderr.decode("utf-8", errors="replace").strip()
+                    raise PdfRenderError(f"wkhtmltopdf exited with {result.returncode}: {error}")
+
+                with open(pdf_path, "rb") as f:
+                    pdf = f.read()
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.render_seconds += time.monotonic() - started
+
+        with self._lock:
+            self.completed += 1
+        return pdf
+
+    def submit(self, html: str) -> Future:
+        """
+        Queue a PDF render
+
+        Returns:
+            Future resolving to PDF bytes
+
+        Raises:
+            PdfRenderBusy: If max_pending renders are already queued or running
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PdfRenderBusy(f"PDF render queue is full ({self.max_pending} pending renders)")
+
+        with self._lock:
+            self.queued += 1
+        try:
+            future = self._executor.submit(self._render_file, html)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def render(self, html: str) -> bytes:
+        """
+        Render HTML to PDF bytes, waiting for a free worker
+        """
+        return self.submit(html).result()
+
+    async def render_async(self, html: str) -> bytes:
+        """
+        Render HTML to PDF bytes without blocking the event loop
+        """
+        return await asyncio.wrap_future(self.submit(html))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue and render statistics
+        """
+        with self._lock:
+            renders = self.completed + self.failed + self.timed_out
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "rejected": self.rejected,
+                "avg_render_seconds": self.render_seconds / renders if renders else None,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool after the running renders finish
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Shared renderer for all PDF exports
+_pdf_renderer = None
+_pdf_renderer_lock = threading.Lock()
+
+
+def get_pdf_renderer() -> PdfRenderer:
+    """
+    Create or return the shared PdfRenderer
+    """
+    global _pdf_renderer
+    if _pdf_renderer is None:
+        with _pdf_renderer_lock:
+            if _pdf_renderer is None:
+                _pdf_renderer = PdfRenderer()
+    return _pdf_renderer
+
+
+def set_pdf_renderer(renderer) -> None:
+    """
+    Replace the shared PdfRenderer
+
+    Report worker processes use this to send their renders to the API process.
+    """
+    global _pdf_renderer
+    with _pdf_renderer_lock:
+        _pdf_renderer = renderer
@@ -1,14 +1,22 @@
+import asyncio
+import math
+import numpy as np
 import pandas as pd
 import json
 import csv
 import logging
-from typing import Dict, Any, Union, List, Optional
+from typing import Dict, Any, Union, List, Optional, Iterable, Iterator, Sequence, Tuple
 from io import BytesIO, StringIO
 import base64
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import tempfile
 import jinja2
-import pdfkit
 import os
+import xlsxwriter
+
+from app.core.config import settings
+from app.analytics.pdf_renderer import get_pdf_renderer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +25,19 @@ logger = logging.getLogger(__name__)
 # Define supported export formats
 SUPPORTED_FORMATS = ["json", "csv", "excel", "pdf", "html"]
 
+# Formats that can be streamed as file downloads, with their content types and extensions
+STREAMING_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+# Columns of the streamed report records
+RECORD_COLUMNS = ["section", "metric", "value"]
+
+# Rows per Excel worksheet, header included
+EXCEL_MAX_ROWS = 1048576
+
 
 def export_to_json(data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -102,35 +123,8 @@ def export_to_excel(data: Dict[str, Any]) -> Dict[str, Any]:
     This creates multiple sheets for different sections of the report
     """
     try:
-        # Create an Excel writer
         excel_buffer = BytesIO()
-        writer = pd.ExcelWriter(excel_buffer, engine='xlsxwriter')
-        
-        # Add summary sheet
-        if "summary" in data:
-            # Convert summary to DataFrame
-            summary_data = []
-            for key, value in data["summary"].items():
-                if not isinstance(value, (dict, list)):
-                    summary_data.append({"Metric": key, "Value": value})
-                elif isinstance(value, dict):
-                    # For dictionaries, create separate rows
-                    for sub_key, sub_value in value.items():
-                        summary_data.append({"Metric": f"{key}_{sub_key}", "Value": sub_value})
-            
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Add metadata sheet
-        metadata = {
-            "Report Generated": data.get("timestamp", datetime.now().isoformat()),
-            "Period (Days)": data.get("period_days", "N/A"),
-        }
-        metadata_df = pd.DataFrame([metadata])
-        metadata_df.to_excel(writer, sheet_name='Metadata', index=False)
-        
-        # Save and close
-        writer.close()
+        write_excel(data, excel_buffer)
         
         # Get binary data
         excel_data = excel_buffer.getvalue()
@@ -147,67 +141,76 @@ def export_to_excel(data: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+def render_html(data: Dict[str, Any], template_path: Optional[str] = None) -> str:
+    """
+    Render report data to an HTML document using a template
+    """
+    # Use default template if none provided
+    if not template_path:
+        template_str = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Report {{timestamp}}</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                h1 { color: #333366; }
+                .summary { margin: 20px 0; padding: 10px; background-color: #f5f5f5; border-radius: 5px; }
+                .chart { margin: 20px 0; }
+                table { border-collapse: collapse; width: 100%; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                th { background-color: #f2f2f2; }
+            </style>
+        </head>
+        <body>
+            <h1>Report {{timestamp}}</h1>
+            <p>Period: {{period_days}} days</p>
+            
+            <div class="summary">
+                <h2>Summary</h2>
+                <table>
+                    <tr><th>Metric</th><th>Value</th></tr>
+                    {% for key, value in summary.items() %}
+                        {% if value is not mapping and value is not sequence %}
+                        <tr><td>{{key}}</td><td>{{value}}</td></tr>
+                        {% endif %}
+                    {% endfor %}
+                </table>
+            </div>
+            
+            {% if charts %}
+            <div class="charts">
+                <h2>Charts</h2>
+                {% for chart_name, chart_data in charts.items() %}
+                <div class="chart">
+                    <h3>{{chart_name}}</h3>
+                    <img src="data:image/png;base64,{{chart_data}}" alt="{{chart_name}}">
+                </div>
+                {% endfor %}
+            </div>
+            {% endif %}
+        </body>
+        </html>
+        """
+        template = jinja2.Template(template_str)
+    else:
+        # Load template from file
+        template_loader = jinja2.FileSystemLoader(searchpath=os.path.dirname(template_path))
+        template_env = jinja2.Environment(loader=template_loader)
+        template = template_env.get_template(os.path.basename(template_path))
+    
+    # Render HTML
+    html_content = template.render(**data)
+    
+    return html_content
+
+
 def export_to_html(data: Dict[str, Any], template_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Export data to HTML format using a template
     """
     try:
-        # Use default template if none provided
-        if not template_path:
-            template_str = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Report {{timestamp}}</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    h1 { color: #333366; }
-                    .summary { margin: 20px 0; padding: 10px; background-color: #f5f5f5; border-radius: 5px; }
-                    .chart { margin: 20px 0; }
-                    table { border-collapse: collapse; width: 100%; }
-                    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                    th { background-color: #f2f2f2; }
-                </style>
-            </head>
-            <body>
-                <h1>Report {{timestamp}}</h1>
-                <p>Period: {{period_days}} days</p>
-                
-                <div class="summary">
-                    <h2>Summary</h2>
-                    <table>
-                        <tr><th>Metric</th><th>Value</th></tr>
-                        {% for key, value in summary.items() %}
-                            {% if value is not mapping and value is not sequence %}
-                            <tr><td>{{key}}</td><td>{{value}}</td></tr>
-                            {% endif %}
-                        {% endfor %}
-                    </table>
-                </div>
-                
-                {% if charts %}
-                <div class="charts">
-                    <h2>Charts</h2>
-                    {% for chart_name, chart_data in charts.items() %}
-                    <div class="chart">
-                        <h3>{{chart_name}}</h3>
-                        <img src="data:image/png;base64,{{chart_data}}" alt="{{chart_name}}">
-                    </div>
-                    {% endfor %}
-                </div>
-                {% endif %}
-            </body>
-            </html>
-            """
-            template = jinja2.Template(template_str)
-        else:
-            # Load template from file
-            template_loader = jinja2.FileSystemLoader(searchpath=os.path.dirname(template_path))
-            template_env = jinja2.Environment(loader=template_loader)
-            template = template_env.get_template(os.path.basename(template_path))
-        
-        # Render HTML
-        html_content = template.render(**data)
+        html_content = render_html(data, template_path)
         
         # Convert to base64
         html_bytes = html_content.encode('utf-8')
@@ -224,33 +227,48 @@ def export_to_html(data: Dict[str, Any], template_path: Optional[str] = None) ->
         return {"error": str(e)}
 
 
+def _pdf_export(pdf_bytes: bytes) -> Dict[str, Any]:
+    """
+    Export result of rendered PDF bytes
+    """
+    # Convert to base64
+    base64_str = base64.b64encode(pdf_bytes).decode('utf-8')
+    
+    return {
+        "content_type": "application/pdf",
+        "filename": f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+        "data": base64_str,
+        "encoding": "base64"
+    }
+
+
 def export_to_pdf(data: Dict[str, Any], template_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Export data to PDF format
     
-    First generates HTML, then converts to PDF
+    First renders HTML, then converts it to PDF in the shared PDF render pool,
+    blocking until the render finishes (use export_to_pdf_async on the event loop)
     """
     try:
-        # Generate HTML first
-        html_result = export_to_html(data, template_path)
-        if "error" in html_result:
-            return html_result
-        
-        # Decode HTML content
-        html_content = base64.b64decode(html_result["data"]).decode('utf-8')
-        
-        # Convert HTML to PDF using pdfkit
-        pdf_bytes = pdfkit.from_string(html_content, False)
+        html_content = render_html(data, template_path)
         
-        # Convert to base64
-        base64_str = base64.b64encode(pdf_bytes).decode('utf-8')
+        # Convert HTML to PDF with a pooled wkhtmltopdf process
+        return _pdf_export(get_pdf_renderer().render(html_content))
+    except Exception as e:
+        logger.error(f"Error exporting to PDF: {str(e)}")
+        return {"error": str(e)}
+
+
+async def export_to_pdf_async(data: Dict[str, Any], template_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Export data to PDF format without blocking the event loop
+    """
+    try:
+        html_content = await asyncio.to_thread(render_html, data, template_path)
         
-        return {
-            "content_type": "application/pdf",
-            "filename": f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            "data": base64_str,
-            "encoding": "base64"
-        }
+        # Wait for the pooled wkhtmltopdf process without holding a thread
+        pdf_bytes = await get_pdf_renderer().render_async(html_content)
+        return await asyncio.to_thread(_pdf_export, pdf_bytes)
     except Exception as e:
         logger.error(f"Error exporting to PDF: {str(e)}")
         return {"error": str(e)}
@@ -276,4 +294,264 @@ def export_report(data: Dict[str, Any], export_format: str, template_path: Optio
     if export_format in ["html", "pdf"] and template_path:
         return export_functions[export_format](data, template_path)
     else:
-        return export_functions[export_format](data)
\ No newline at end of file
+        return export_functions[export_format](data)
+
+
+async def export_report_async(
+    data: Dict[str, Any],
+    export_format: str,
+    template_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Export report data to the specified format without blocking the event loop
+    
+    PDFs are awaited from the PDF render pool; other formats are exported in a
+    thread.
+    """
+    if export_format == "pdf":
+        return await export_to_pdf_async(data, template_path)
+    return await asyncio.to_thread(export_report, data, export_format, template_path)
+
+
+def iter_report_records(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over a report as flat (section, metric, value) records
+
+    Metadata comes first, followed by the summary with nested dictionaries
+    flattened into `parent_child` metric names. Charts are not included.
+    """
+    yield {"section": "metadata", "metric": "timestamp", "value": data.get("timestamp")}
+    yield {"section": "metadata", "metric": "period_days", "value": data.get("period_days")}
+
+    def flatten(d: Dict[str, Any], prefix: str = "") -> Iterator[Dict[str, Any]]:
+        for key, value in d.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f"{prefix}{key}_")
+            elif not isinstance(value, list):
+                yield {"section": "summary", "metric": f"{prefix}{key}", "value": value}
+
+    yield from flatten(data.get("summary", {}))
+
+
+def _chunked_text(lines: Iterator[str], chunk_size: int) -> Iterator[bytes]:
+    """
+    Group encoded lines into chunks of about chunk_size bytes
+    """
+    chunk = []
+    size = 0
+    for line in lines:
+        encoded = line.encode('utf-8')
+        chunk.append(encoded)
+        size += len(encoded)
+        if size >= chunk_size:
+            yield b"".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+def stream_csv(
+    data: Dict[str, Any],
+    chunk_size: Optional[int] = None,
+    rows: Optional[Iterable[Sequence[Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[bytes]:
+    """
+    Stream report records as CSV, in chunks of about chunk_size bytes
+
+    Row-level data, when given, follows the records as a second table: a
+    blank line, its header and its rows.
+    """
+    def lines() -> Iterator[str]:
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RECORD_COLUMNS)
+        writer.writeheader()
+        for record in iter_report_records(data):
+            writer.writerow(record)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if rows is not None:
+            row_writer = csv.writer(buffer)
+            buffer.write("\r\n")
+            if columns:
+                row_writer.writerow(columns)
+            for values in rows:
+                row_writer.writerow(values)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked_text(lines(), chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(
+    data: Dict[str, Any],
+    chunk_size: Optional[int] = None,
+    rows: Optional[Iterable[Sequence[Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[bytes]:
+    """
+    Stream report records as newline-delimited JSON, in chunks of about chunk_size bytes
+
+    Row-level data, when given, follows the records as objects of the
+    "data" section keyed by column.
+    """
+    def records() -> Iterator[Dict[str, Any]]:
+        yield from iter_report_records(data)
+        if rows is not None:
+            for values in rows:
+                yield {"section": "data", **dict(zip(columns or range(len(values)), values))}
+
+    lines = (json.dumps(record, default=str) + "\n" for record in records())
+    return _chunked_text(lines, chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def _excel_value(value: Any) -> Any:
+    """
+    Value as written to a cell (numbers, dates and blanks keep their type)
+
+    NumPy scalars are unwrapped and Decimals written as numbers; missing
+    values, NaN and infinities become blank cells, which Excel cannot store
+    as numbers.
+    """
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (int, date, time, timedelta)):
+        return value
+    return str(value)
+
+
+def write_excel(
+    data: Dict[str, Any],
+    file,
+    rows: Optional[Iterable[Sequence[Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> int:
+    """
+    Write the report as an XLSX workbook to a binary file or path
+
+    The workbook is written in xlsxwriter's constant_memory mode: each row is
+    flushed to a temporary file as soon as the next one starts, so memory
+    does not grow with the number of rows. Summary and Metadata sheets are
+    followed by row-level data sheets when rows are given; data that exceeds
+    the Excel row limit continues on further sheets.
+
+    Args:
+        data: Report data
+        file: Binary file object or path
+        rows: Iterator of row-level data, consumed once
+        columns: Header of the row-level data
+
+    Returns:
+        Number of data rows written
+    """
+    workbook = xlsxwriter.Workbook(file, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'remove_timezone': True
+    })
+    try:
+        sheets = {}
+        for record in iter_report_records(data):
+            section = record["section"]
+            if section not in sheets:
+                sheet = workbook.add_worksheet(section.capitalize())
+                sheet.write_row(0, 0, ["Metric", "Value"])
+                sheets[section] = [sheet, 1]
+            sheet, row = sheets[section]
+            sheet.write_row(row, 0, [record["metric"], _excel_value(record["value"])])
+            sheets[section][1] = row + 1
+
+        written = 0
+        if rows is not None:
+            sheet = None
+            row_index = EXCEL_MAX_ROWS
+            for values in rows:
+                if row_index == EXCEL_MAX_ROWS:
+                    part = written // (EXCEL_MAX_ROWS - 1)
+                    sheet = workbook.add_worksheet("Data" if part == 0 else f"Data {part + 1}")
+                    if columns:
+                        sheet.write_row(0, 0, columns)
+                    row_index = 1
+                sheet.write_row(row_index, 0, [_excel_value(value) for value in values])
+                row_index += 1
+                written += 1
+    finally:
+        workbook.close()
+
+    return written
+
+
+def stream_excel(
+    data: Dict[str, Any],
+    chunk_size: Optional[int] = None,
+    rows: Optional[Iterable[Sequence[Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[bytes]:
+    """
+    Stream the report as an XLSX workbook
+
+    The whole workbook is written before the first byte is sent: an XLSX
+    file is a zip archive that cannot be read until it is closed. It goes
+    through a spooled temporary file, which stays in memory up to
+    EXPORT_SPOOL_MAX_SIZE and moves to disk beyond it, and is then read back
+    in chunks of chunk_size bytes.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    with tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MAX_SIZE) as spool:
+        write_excel(data, spool, rows, columns)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_report(
+    data: Dict[str, Any],
+    export_format: str,
+    rows: Optional[Iterable[Sequence[Any]]] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[Iterator[bytes], str, str]:
+    """
+    Stream report data in one of the STREAMING_FORMATS
+
+    Rendering is lazy: nothing is written until the returned iterator is consumed.
+
+    Args:
+        data: Report data
+        export_format: Streaming format
+        rows: Row-level data written after the report (as data sheets in excel)
+        columns: Header of the row-level data
+
+    Returns:
+        (chunks, content type, filename)
+    """
+    if export_format not in STREAMING_FORMATS:
+        raise ValueError(
+            f"Unsupported streaming format: {export_format}. "
+            f"Supported formats: {', '.join(STREAMING_FORMATS)}"
+        )
+
+    stream_functions = {
+        "csv": stream_csv,
+        "ndjson": stream_ndjson,
+        "excel": stream_excel,
+    }
+
+    content_type, extension = STREAMING_FORMATS[export_format]
+    filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return stream_functions[export_format](data, rows=rows, columns=columns), content_type, filename
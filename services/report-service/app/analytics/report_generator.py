@@ -1,154 +1,98 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import Dict, List, Any, Optional, Tuple
 import json
 import os
 from datetime import datetime, timedelta
 import logging
-from io import BytesIO
-import base64
 
-from app.core.config import settings
-from app.api.deps import get_service_token
-import httpx
+from app.analytics.chart_renderer import render_chart
+from app.analytics.data_sources import ReportDataSource, ReportDataUnavailable, get_report_data_source
+from app.analytics.incremental import get_incremental_data_source
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Constants
-TICKET_SERVICE_URL = settings.TICKET_SERVICE_URL
-USER_SERVICE_URL = settings.USER_SERVICE_URL
 
-
-async def fetch_data_from_service(endpoint: str, service_url: str) -> Dict[str, Any]:
+def report_period(days: int) -> Tuple[datetime, datetime]:
     """
-    Fetch data from another microservice using service token
+    Start and end of a report covering the last `days` days
     """
-    try:
-        token = get_service_token()
-        async with httpx.AsyncClient() as client:
-            headers = {"Authorization": f"Bearer {token}"}
-            response = await client.get(f"{service_url}{endpoint}", headers=headers)
-            response.raise_for_status()
-            return response.json()
-    except Exception as e:
-        logger.error(f"Error fetching data from {service_url}{endpoint}: {str(e)}")
-        return {"error": str(e)}
-
-
-async def get_ticket_data(days: int = 30) -> pd.DataFrame:
-    """
-    Get ticket data from the ticket service
-    """
-    from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-    endpoint = f"/api/tickets?from_date={from_date}&limit=1000"
-    data = await fetch_data_from_service(endpoint, TICKET_SERVICE_URL)
-    
-    if "error" in data:
-        logger.error(f"Failed to get ticket data: {data['error']}")
-        return pd.DataFrame()
-    
-    tickets = data.get("tickets", [])
-    return pd.DataFrame(tickets)
+    end = datetime.now()
+    return end - timedelta(days=days), end
 
 
-async def get_user_data() -> pd.DataFrame:
+def report_error(message: str) -> Dict[str, Any]:
     """
-    Get user data from the user service
+    Report payload for a report that could not be generated
     """
-    endpoint = "/api/users?limit=1000"
-    data = await fetch_data_from_service(endpoint, USER_SERVICE_URL)
-    
-    if "error" in data:
-        logger.error(f"Failed to get user data: {data['error']}")
-        return pd.DataFrame()
-    
-    users = data.get("users", [])
-    return pd.DataFrame(users)
+    return {
+        "error": message,
+        "timestamp": datetime.now().isoformat()
+    }
 
 
-def plot_to_base64(fig) -> str:
+async def histogram_chart(histogram: Tuple[np.ndarray, np.ndarray], **params) -> str:
     """
-    Convert matplotlib figure to base64 string
+    Render a pre-binned (bin edges, counts) histogram
     """
-    buf = BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close(fig)
-    return img_str
+    edges, counts = histogram
+    return await render_chart(
+        'histogram',
+        {'values': (edges[:-1] + edges[1:]) / 2, 'weights': counts, 'edges': edges},
+        **params
+    )
 
 
-async def generate_ticket_summary_report(days: int = 30) -> Dict[str, Any]:
+async def generate_ticket_summary_report(days: int = 30, data_source: Optional[ReportDataSource] = None) -> Dict[str, Any]:
     """
     Generate a summary report of ticket data
     """
-    ticket_df = await get_ticket_data(days)
-    
-    if ticket_df.empty:
-        return {
-            "error": "No ticket data available",
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    # Calculate summary statistics
-    total_tickets = len(ticket_df)
-    
-    # Status breakdown
-    status_counts = ticket_df['status'].value_counts().to_dict()
-    
-    # Priority breakdown
-    priority_counts = ticket_df['priority'].value_counts().to_dict()
+    start, end = report_period(days)
+    try:
+        data = await (data_source or get_report_data_source()).ticket_summary(start, end)
+    except ReportDataUnavailable as e:
+        return report_error(str(e))
     
-    # Calculate average resolution time
-    if 'created_at' in ticket_df.columns and 'resolved_at' in ticket_df.columns:
-        # Convert to datetime
-        ticket_df['created_at'] = pd.to_datetime(ticket_df['created_at'])
-        ticket_df['resolved_at'] = pd.to_datetime(ticket_df['resolved_at'])
-        
-        # Calculate only for resolved tickets
-        resolved_tickets = ticket_df.dropna(subset=['resolved_at'])
-        if not resolved_tickets.empty:
-            resolution_times = (resolved_tickets['resolved_at'] - resolved_tickets['created_at'])
-            avg_resolution_time = resolution_times.mean().total_seconds() / 3600  # in hours
-        else:
-            avg_resolution_time = None
-    else:
-        avg_resolution_time = None
+    total_tickets = data["total_tickets"]
+    status_counts = data["status_counts"]
+    priority_counts = data["priority_counts"]
+    avg_resolution_time = data["avg_resolution_time_hours"]
+    daily_counts = data["daily_counts"]
     
     # Create visualizations
     charts = {}
     
     # Status chart
     if status_counts:
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.pie(status_counts.values(), labels=status_counts.keys(), autopct='%1.1f%%')
-        ax.set_title('Ticket Status Distribution')
-        charts['status_distribution'] = plot_to_base64(fig)
+        charts['status_distribution'] = await render_chart(
+            'pie',
+            {'values': list(status_counts.values())},
+            labels=[str(label) for label in status_counts.keys()],
+            title='Ticket Status Distribution'
+        )
     
     # Priority chart
     if priority_counts:
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.barplot(x=list(priority_counts.keys()), y=list(priority_counts.values()), ax=ax)
-        ax.set_title('Ticket Priority Distribution')
-        ax.set_xlabel('Priority')
-        ax.set_ylabel('Count')
-        charts['priority_distribution'] = plot_to_base64(fig)
+        charts['priority_distribution'] = await render_chart(
+            'bar',
+            {'values': list(priority_counts.values())},
+            labels=[str(label) for label in priority_counts.keys()],
+            title='Ticket Priority Distribution',
+            xlabel='Priority',
+            ylabel='Count'
+        )
     
     # Daily ticket volume
-    if 'created_at' in ticket_df.columns:
-        ticket_df['date'] = ticket_df['created_at'].dt.date
-        daily_counts = ticket_df.groupby('date').size()
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        daily_counts.plot(kind='line', ax=ax)
-        ax.set_title('Daily Ticket Volume')
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Number of Tickets')
-        charts['daily_volume'] = plot_to_base64(fig)
+    if daily_counts is not None and not daily_counts.empty:
+        charts['daily_volume'] = await render_chart(
+            'line',
+            {'x': pd.to_datetime(daily_counts.index).to_numpy(), 'y': daily_counts.to_numpy()},
+            title='Daily Ticket Volume',
+            xlabel='Date',
+            ylabel='Number of Tickets'
+        )
     
     # Create report data
     report_data = {
@@ -166,44 +110,18 @@ async def generate_ticket_summary_report(days: int = 30) -> Dict[str, Any]:
     return report_data
 
 
-async def generate_user_activity_report(days: int = 30) -> Dict[str, Any]:
+async def generate_user_activity_report(days: int = 30, data_source: Optional[ReportDataSource] = None) -> Dict[str, Any]:
     """
     Generate a report of user activity
     """
-    ticket_df = await get_ticket_data(days)
-    user_df = await get_user_data()
-    
-    if ticket_df.empty or user_df.empty:
-        return {
-            "error": "No data available",
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    # Merge user data with ticket data
-    if 'created_by' in ticket_df.columns and 'id' in user_df.columns:
-        # Rename user id to avoid collision
-        user_df = user_df.rename(columns={'id': 'user_id'})
-        
-        # Merge on created_by = user_id
-        merged_df = pd.merge(
-            ticket_df, 
-            user_df, 
-            left_on='created_by', 
-            right_on='user_id',
-            how='left'
-        )
-    else:
-        return {
-            "error": "Required columns missing in data",
-            "timestamp": datetime.now().isoformat()
-        }
+    start, end = report_period(days)
+    try:
+        data = await (data_source or get_report_data_source()).user_activity(start, end)
+    except ReportDataUnavailable as e:
+        return report_error(str(e))
     
-    # Calculate user activity metrics
-    tickets_per_user = merged_df.groupby('created_by').size().reset_index(name='ticket_count')
-    if 'role' in user_df.columns:
-        role_activity = merged_df.groupby('role').size().reset_index(name='ticket_count')
-    else:
-        role_activity = None
+    tickets_per_user = data["tickets_per_user"]
+    role_activity = data["role_activity"]
     
     # Create visualizations
     charts = {}
@@ -211,26 +129,32 @@ async def generate_user_activity_report(days: int = 30) -> Dict[str, Any]:
     # Top 10 most active users
     top_users = tickets_per_user.sort_values('ticket_count', ascending=False).head(10)
     if not top_users.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='ticket_count', y='created_by', data=top_users, ax=ax)
-        ax.set_title('Top 10 Most Active Users')
-        ax.set_xlabel('Number of Tickets')
-        ax.set_ylabel('User ID')
-        charts['top_users'] = plot_to_base64(fig)
+        charts['top_users'] = await render_chart(
+            'bar',
+            {'values': top_users['ticket_count'].to_numpy()},
+            labels=top_users['created_by'].astype(str).tolist(),
+            horizontal=True,
+            figsize=(10, 6),
+            title='Top 10 Most Active Users',
+            xlabel='Number of Tickets',
+            ylabel='User ID'
+        )
     
     # Role-based activity
     if role_activity is not None and not role_activity.empty:
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.barplot(x='role', y='ticket_count', data=role_activity, ax=ax)
-        ax.set_title('Ticket Creation by User Role')
-        ax.set_xlabel('Role')
-        ax.set_ylabel('Number of Tickets')
-        charts['role_activity'] = plot_to_base64(fig)
+        charts['role_activity'] = await render_chart(
+            'bar',
+            {'values': role_activity['ticket_count'].to_numpy()},
+            labels=role_activity['role'].astype(str).tolist(),
+            title='Ticket Creation by User Role',
+            xlabel='Role',
+            ylabel='Number of Tickets'
+        )
     
     # Create report data
     report_data = {
         "summary": {
-            "total_users": len(user_df),
+            "total_users": data["total_users"],
             "active_users": len(tickets_per_user),
             "tickets_per_user_avg": tickets_per_user['ticket_count'].mean() if not tickets_per_user.empty else 0,
             "most_active_user": {
@@ -246,89 +170,65 @@ async def generate_user_activity_report(days: int = 30) -> Dict[str, Any]:
     return report_data
 
 
-async def generate_response_time_report(days: int = 30) -> Dict[str, Any]:
+async def generate_response_time_report(days: int = 30, data_source: Optional[ReportDataSource] = None) -> Dict[str, Any]:
     """
     Generate a report analyzing response times for tickets
     """
-    ticket_df = await get_ticket_data(days)
-    
-    if ticket_df.empty:
-        return {
-            "error": "No ticket data available",
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    # Check if required columns exist
-    required_cols = ['created_at', 'first_response_at', 'resolved_at', 'priority']
-    if not all(col in ticket_df.columns for col in required_cols):
-        missing_cols = [col for col in required_cols if col not in ticket_df.columns]
-        return {
-            "error": f"Required columns missing: {missing_cols}",
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    # Convert datetime columns
-    for col in ['created_at', 'first_response_at', 'resolved_at']:
-        ticket_df[col] = pd.to_datetime(ticket_df[col])
-    
-    # Calculate response times
-    ticket_df['first_response_time'] = (ticket_df['first_response_at'] - ticket_df['created_at']).dt.total_seconds() / 3600  # hours
-    ticket_df['resolution_time'] = (ticket_df['resolved_at'] - ticket_df['created_at']).dt.total_seconds() / 3600  # hours
-    
-    # Filter out invalid entries
-    response_df = ticket_df.dropna(subset=['first_response_time']).copy()
-    resolution_df = ticket_df.dropna(subset=['resolution_time']).copy()
-    
-    # Calculate summary statistics
-    avg_first_response = response_df['first_response_time'].mean() if not response_df.empty else None
-    avg_resolution = resolution_df['resolution_time'].mean() if not resolution_df.empty else None
+    start, end = report_period(days)
+    try:
+        data = await (data_source or get_report_data_source()).response_times(start, end)
+    except ReportDataUnavailable as e:
+        return report_error(str(e))
     
-    # Response time by priority
-    response_by_priority = response_df.groupby('priority')['first_response_time'].mean().to_dict() if not response_df.empty else {}
-    resolution_by_priority = resolution_df.groupby('priority')['resolution_time'].mean().to_dict() if not resolution_df.empty else {}
+    avg_first_response = data["avg_first_response_time_hours"]
+    avg_resolution = data["avg_resolution_time_hours"]
+    response_by_priority = data["response_by_priority"]
+    resolution_by_priority = data["resolution_by_priority"]
     
     # Create visualizations
     charts = {}
     
     # Response time distribution
-    if not response_df.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.histplot(response_df['first_response_time'], bins=20, kde=True, ax=ax)
-        ax.set_title('First Response Time Distribution (Hours)')
-        ax.set_xlabel('Hours')
-        ax.set_ylabel('Frequency')
-        charts['response_distribution'] = plot_to_base64(fig)
+    if data["response_histogram"] is not None:
+        charts['response_distribution'] = await histogram_chart(
+            data["response_histogram"],
+            kde=True,
+            title='First Response Time Distribution (Hours)',
+            xlabel='Hours',
+            ylabel='Frequency'
+        )
     
     # Resolution time distribution
-    if not resolution_df.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.histplot(resolution_df['resolution_time'], bins=20, kde=True, ax=ax)
-        ax.set_title('Resolution Time Distribution (Hours)')
-        ax.set_xlabel('Hours')
-        ax.set_ylabel('Frequency')
-        charts['resolution_distribution'] = plot_to_base64(fig)
+    if data["resolution_histogram"] is not None:
+        charts['resolution_distribution'] = await histogram_chart(
+            data["resolution_histogram"],
+            kde=True,
+            title='Resolution Time Distribution (Hours)',
+            xlabel='Hours',
+            ylabel='Frequency'
+        )
     
     # Response time by priority
     if response_by_priority:
-        fig, ax = plt.subplots(figsize=(8, 6))
-        priorities = list(response_by_priority.keys())
-        times = list(response_by_priority.values())
-        sns.barplot(x=priorities, y=times, ax=ax)
-        ax.set_title('Average First Response Time by Priority (Hours)')
-        ax.set_xlabel('Priority')
-        ax.set_ylabel('Hours')
-        charts['response_by_priority'] = plot_to_base64(fig)
+        charts['response_by_priority'] = await render_chart(
+            'bar',
+            {'values': list(response_by_priority.values())},
+            labels=[str(priority) for priority in response_by_priority.keys()],
+            title='Average First Response Time by Priority (Hours)',
+            xlabel='Priority',
+            ylabel='Hours'
+        )
     
     # Resolution time by priority
     if resolution_by_priority:
-        fig, ax = plt.subplots(figsize=(8, 6))
-        priorities = list(resolution_by_priority.keys())
-        times = list(resolution_by_priority.values())
-        sns.barplot(x=priorities, y=times, ax=ax)
-        ax.set_title('Average Resolution Time by Priority (Hours)')
-        ax.set_xlabel('Priority')
-        ax.set_ylabel('Hours')
-        charts['resolution_by_priority'] = plot_to_base64(fig)
+        charts['resolution_by_priority'] = await render_chart(
+            'bar',
+            {'values': list(resolution_by_priority.values())},
+            labels=[str(priority) for priority in resolution_by_priority.keys()],
+            title='Average Resolution Time by Priority (Hours)',
+            xlabel='Priority',
+            ylabel='Hours'
+        )
     
     # Create report data
     report_data = {
@@ -347,9 +247,22 @@ async def generate_response_time_report(days: int = 30) -> Dict[str, Any]:
 
 
 # Additional report generators can be added here
-async def generate_report_by_type(report_type: str, days: int = 30, **params) -> Dict[str, Any]:
+async def generate_report_by_type(
+    report_type: str,
+    days: int = 30,
+    incremental: bool = False,
+    full_rebuild: bool = False,
+    **params
+) -> Dict[str, Any]:
     """
     Generate a report based on the specified type
+    
+    Args:
+        report_type: Type of report to generate
+        days: Number of days the report covers
+        incremental: Merge per-day partial aggregates stored by earlier runs,
+            computing only new or changed days (the result is identical)
+        full_rebuild: With incremental, recompute and store every day's partials
     """
     report_generators = {
         "ticket_summary": generate_ticket_summary_report,
@@ -364,4 +277,7 @@ async def generate_report_by_type(report_type: str, days: int = 30, **params) ->
             "timestamp": datetime.now().isoformat()
         }
     
+    if incremental:
+        params["data_source"] = get_incremental_data_source(full_rebuild=full_rebuild)
+    
     return await report_generators[report_type](days=days, **params)
\ No newline at end of file
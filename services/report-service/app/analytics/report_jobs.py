@@ -0,0 +1,658 @@
+import asyncio
+import importlib
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.analytics.data_sources import (
+    HISTOGRAM_BINS,
+    ReportDataSource,
+    ReportDataUnavailable,
+    get_report_data_source,
+    set_report_data_source
+)
+from app.analytics.pdf_renderer import get_pdf_renderer, set_pdf_renderer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Job priorities (lower runs first)
+PRIORITY_ON_DEMAND = 0
+PRIORITY_SCHEDULED = 10
+
+# Report build tasks, as "module:function" paths of coroutine functions
+TASK_BUILD_REPORT = "app.analytics.scheduler:build_report"
+TASK_BUILD_EXPORT = "app.analytics.scheduler:build_export"
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_CANCELLING = "cancelling"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class ReportQueueFull(RuntimeError):
+    """
+    Raised when the report job queue is full
+    """
+
+
+class ReportJobCancelled(Exception):
+    """
+    Raised when a report job is cancelled
+    """
+
+
+ProgressCallback = Callable[[str, float], None]
+
+
+def _resolve_task(task: str) -> Callable[..., Awaitable[Any]]:
+    """
+    Import the coroutine function of a "module:function" task path
+    """
+    module_name, function_name = task.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _init_worker() -> None:
+    """
+    Initialize a report worker process
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    # Charts are rendered by the worker itself instead of a nested process pool
+    settings.RENDER_POOL_WORKERS = 0
+
+
+class _ApiProcessPdfRenderer:
+    """
+    PDF renderer of a worker process, rendering in the API process's PDF render pool
+
+    Keeps PDF_POOL_WORKERS a limit for the whole service rather than per
+    worker process, and the render statistics in the API process.
+    """
+
+    def __init__(self, job_id: str, update_queue, pdf_results, check_cancelled: Callable[[], None]):
+        self.job_id = job_id
+        self._update_queue = update_queue
+        self._pdf_results = pdf_results
+        self._check_cancelled = check_cancelled
+        self._lock = threading.Lock()
+
+    def render(self, html: str) -> bytes:
+        """
+        Render HTML to PDF bytes, waiting for the API process
+
+        Raises:
+            ReportJobCancelled: If the job was cancelled
+            PdfRenderBusy, PdfRenderTimeout, PdfRenderError: As raised by the API process's renderer
+        """
+        # Results come back in order on the job's queue, one render at a time
+        with self._lock:
+            self._check_cancelled()
+            self._update_queue.put(("pdf", self.job_id, html))
+            pdf, error = self._pdf_results.get()
+        if error is not None:
+            raise error
+        return pdf
+
+    async def render_async(self, html: str) -> bytes:
+        """
+        Render HTML to PDF bytes without blocking the event loop
+        """
+        return await asyncio.to_thread(self.render, html)
+
+
+class _ApiProcessDataSource(ReportDataSource):
+    """
+    Report data source of a worker process, loading through the API process's data source
+
+    Keeps the snapshot cache in the API process, so concurrent jobs over the
+    same window still share one load instead of fetching it once per worker.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        update_queue,
+        data_results,
+        supports_daily_partials: bool,
+        check_cancelled: Callable[[], None]
+    ):
+        self.job_id = job_id
+        self.supports_daily_partials = supports_daily_partials
+        self._update_queue = update_queue
+        self._data_results = data_results
+        self._check_cancelled = check_cancelled
+        self._lock = threading.Lock()
+
+    def _request(self, method: str, *args) -> Any:
+        """
+        Call a method of the API process's data source, waiting for its result
+
+        Raises:
+            ReportJobCancelled: If the job was cancelled
+        """
+        # Results come back in order on the job's queue, one request at a time
+        with self._lock:
+            self._check_cancelled()
+            self._update_queue.put(("data", self.job_id, method, args))
+            result, error = self._data_results.get()
+        if error is not None:
+            raise error
+        return result
+
+    async def _call(self, method: str, *args) -> Any:
+        return await asyncio.to_thread(self._request, method, *args)
+
+    async def ticket_summary(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        return await self._call("ticket_summary", start, end)
+
+    async def user_activity(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        return await self._call("user_activity", start, end)
+
+    async def response_times(self, start: datetime, end: datetime, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+        return await self._call("response_times", start, end, bins)
+
+    async def daily_fingerprints(self, start: datetime, end: datetime) -> Dict[date, List[Any]]:
+        return await self._call("daily_fingerprints", start, end)
+
+    async def daily_partials(self, aggregate: str, days: List[date]) -> Dict[date, Dict[str, Any]]:
+        return await self._call("daily_partials", aggregate, days)
+
+    async def user_count(self) -> int:
+        return await self._call("user_count")
+
+
+def _run_job(
+    job_id: str,
+    task: str,
+    kwargs: Dict[str, Any],
+    update_queue,
+    cancel_event,
+    pdf_results,
+    data_results,
+    supports_daily_partials: bool
+) -> Any:
+    """
+    Run a report task (runs in a worker process)
+
+    Progress goes back to the API process through update_queue; the task
+    stops with ReportJobCancelled at its next progress update, data request
+    or PDF render once cancel_event is set. Report data is loaded and PDFs
+    are rendered by the API process, with results coming back through
+    data_results and pdf_results.
+    """
+    def check_cancelled() -> None:
+        if cancel_event.is_set():
+            raise ReportJobCancelled(f"Report job {job_id} was cancelled")
+
+    def progress(stage: str, fraction: float) -> None:
+        check_cancelled()
+        update_queue.put(("progress", job_id, stage, fraction))
+
+    set_pdf_renderer(_ApiProcessPdfRenderer(job_id, update_queue, pdf_results, check_cancelled))
+    set_report_data_source(
+        _ApiProcessDataSource(job_id, update_queue, data_results, supports_daily_partials, check_cancelled)
+    )
+    progress("starting", 0.0)
+    return asyncio.run(_resolve_task(task)(progress=progress, **kwargs))
+
+
+class ReportJob:
+    """
+    A report build queued in or run by the report worker pool
+    """
+
+    def __init__(
+        self,
+        task: str,
+        kwargs: Dict[str, Any],
+        priority: int,
+        user_id: Optional[str] = None,
+        description: Optional[str] = None
+    ):
+        self.id = str(uuid.uuid4())
+        self.task = task
+        self.kwargs = kwargs
+        self.priority = priority
+        self.user_id = user_id
+        self.description = description
+        self.status = JOB_QUEUED
+        self.stage: Optional[str] = None
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.report_id: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.cancel_event = None
+        self.pdf_results = None
+        self.data_results = None
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting for the job; do not report its failure as unretrieved
+        self.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    async def wait(self) -> Any:
+        """
+        Wait for the job's result
+
+        Cancelling the waiting coroutine does not cancel the job.
+
+        Raises:
+            ReportJobCancelled: If the job was cancelled
+        """
+        return await asyncio.shield(self.future)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Job status for API responses
+        """
+        return {
+            "job_id": self.id,
+            "description": self.description,
+            "priority": self.priority,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "error": self.error,
+            "report_id": self.report_id,
+            "user_id": self.user_id,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ReportWorkerPool:
+    """
+    Priority queue of report builds run by a pool of worker processes
+
+    Report generation (data aggregation, chart rendering and exports) runs
+    in worker processes, so it never blocks the API's event loop. At most
+    `max_workers` jobs run at once; queued jobs are started by priority
+    (on-demand before scheduled), then in submission order, and the queue
+    holds at most `max_queued` jobs. Running jobs report their stage and
+    progress, and can be cancelled: a queued job is dropped, a running job
+    stops at its next progress update, data request or PDF render. Worker
+    processes load report data through the API process's data source, so its
+    snapshot cache is shared by all jobs, and hand PDF renders to the API
+    process's PDF render pool, so its limits apply to all jobs.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queued: Optional[int] = None):
+        """
+        Initialize the ReportWorkerPool
+
+        Args:
+            max_workers: Number of worker processes (defaults to REPORT_WORKERS; 0 runs jobs
+                one at a time in the API process)
+            max_queued: Maximum number of queued jobs (defaults to REPORT_QUEUE_MAX)
+        """
+        self.max_workers = max_workers if max_workers is not None else settings.REPORT_WORKERS
+        self.max_queued = max_queued if max_queued is not None else settings.REPORT_QUEUE_MAX
+
+        self._jobs: Dict[str, ReportJob] = {}
+        self._sequence = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._queued = 0
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._update_queue = None
+        self._update_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._manager is None:
+                context = multiprocessing.get_context("spawn")
+                self._manager = context.Manager()
+                self._update_queue = self._manager.Queue()
+                self._update_thread = threading.Thread(
+                    target=self._read_updates,
+                    args=(self._update_queue,),
+                    name="report-job-updates",
+                    daemon=True
+                )
+                self._update_thread.start()
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _read_updates(self, update_queue) -> None:
+        """
+        Apply progress updates and start PDF renders sent by worker processes (runs in a thread)
+        """
+        while True:
+            try:
+                update = update_queue.get()
+            except (EOFError, OSError):
+                return
+            if update is None:
+                return
+            kind, job_id, *payload = update
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            if kind == "pdf":
+                self._render_pdf(job, *payload)
+            elif kind == "data":
+                asyncio.run_coroutine_threadsafe(self._load_data(job, *payload), self._loop)
+            elif not job.finished:
+                job.stage, job.progress = payload
+
+    def _render_pdf(self, job: ReportJob, html: str) -> None:
+        """
+        Render a PDF for a job in the shared PDF render pool, replying on the job's queue
+        """
+        def reply(future) -> None:
+            try:
+                job.pdf_results.put((future.result(), None))
+            except Exception as e:
+                job.pdf_results.put((None, e))
+
+        try:
+            future = get_pdf_renderer().submit(html)
+        except Exception as e:
+            job.pdf_results.put((None, e))
+        else:
+            future.add_done_callback(reply)
+
+    async def _load_data(self, job: ReportJob, method: str, args) -> None:
+        """
+        Load report data for a job from the shared data source, replying on the job's queue
+        """
+        try:
+            reply = (await getattr(get_report_data_source(), method)(*args), None)
+        except Exception as e:
+            reply = (None, e)
+
+        try:
+            await asyncio.to_thread(job.data_results.put, reply)
+        except Exception as e:
+            # The error could not be pickled; send its message instead
+            await asyncio.to_thread(job.data_results.put, (None, ReportDataUnavailable(str(reply[1] or e))))
+
+    def _ensure_started(self) -> None:
+        """
+        Start the dispatchers on the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        # Jobs of a previous (closed) loop cannot complete any more
+        for job in self._jobs.values():
+            if not job.finished:
+                job.status = JOB_CANCELLED
+                job.finished_at = datetime.now()
+
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self._queued = 0
+        self._dispatchers = [
+            loop.create_task(self._dispatch()) for _ in range(max(self.max_workers, 1))
+        ]
+
+    def _prune(self) -> None:
+        """
+        Forget finished jobs older than REPORT_JOB_RETENTION_SECONDS
+        """
+        now = datetime.now()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and (now - job.finished_at).total_seconds() > settings.REPORT_JOB_RETENTION_SECONDS:
+                del self._jobs[job_id]
+
+    def submit(
+        self,
+        task: str,
+        kwargs: Dict[str, Any],
+        priority: int = PRIORITY_ON_DEMAND,
+        user_id: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> ReportJob:
+        """
+        Queue a report job (call from the event loop)
+
+        Args:
+            task: "module:function" path of the coroutine function to run
+            kwargs: Keyword arguments of the task (must be picklable)
+            priority: Job priority (PRIORITY_ON_DEMAND or PRIORITY_SCHEDULED)
+            user_id: User the job runs for
+            description: Human-readable description of the job
+
+        Returns:
+            The queued job
+
+        Raises:
+            ReportQueueFull: If max_queued jobs are already waiting
+        """
+        self._ensure_started()
+        self._prune()
+
+        if self._queued >= self.max_queued:
+            self.rejected += 1
+            raise ReportQueueFull(f"Report job queue is full ({self.max_queued} queued jobs)")
+
+        job = ReportJob(task, kwargs, priority, user_id=user_id, description=description)
+        self._jobs[job.id] = job
+        self._queued += 1
+        self._queue.put_nowait((priority, next(self._sequence), job))
+        return job
+
+    async def run(self, task: str, kwargs: Dict[str, Any], priority: int = PRIORITY_ON_DEMAND, **job_info) -> Any:
+        """
+        Queue a report job and wait for its result
+        """
+        return await self.submit(task, kwargs, priority, **job_info).wait()
+
+    async def _dispatch(self) -> None:
+        """
+        Start queued jobs by priority, one at a time
+        """
+        while True:
+            _, _, job = await self._queue.get()
+            # Jobs cancelled while queued are skipped
+            if job.finished:
+                continue
+            self._queued -= 1
+            await self._execute(job)
+
+    async def _execute(self, job: ReportJob) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now()
+        self.wait_seconds += (job.started_at - job.created_at).total_seconds()
+        started = time.monotonic()
+
+        try:
+            if self.max_workers <= 0:
+                job.cancel_event = threading.Event()
+                result = await self._run_local(job)
+            else:
+                # Starting the pool spawns processes, keep that off the event loop
+                executor = await asyncio.to_thread(self._get_executor)
+                job.cancel_event = await asyncio.to_thread(self._manager.Event)
+                job.pdf_results = await asyncio.to_thread(self._manager.Queue)
+                job.data_results = await asyncio.to_thread(self._manager.Queue)
+                supports_daily_partials = get_report_data_source().supports_daily_partials
+                if job.status == JOB_CANCELLING:
+                    job.cancel_event.set()
+                job_args = (
+                    job.id, job.task, job.kwargs, self._update_queue, job.cancel_event,
+                    job.pdf_results, job.data_results, supports_daily_partials
+                )
+                try:
+                    future = executor.submit(_run_job, *job_args)
+                except BrokenProcessPool:
+                    self._reset_executor()
+                    future = self._get_executor().submit(_run_job, *job_args)
+                result = await asyncio.wrap_future(future)
+        except ReportJobCancelled as e:
+            self._finish(job, JOB_CANCELLED, exception=e)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._reset_executor()
+            logger.error(f"Report job {job.id} failed: {str(e)}")
+            job.error = str(e)
+            self._finish(job, JOB_FAILED, exception=e)
+        else:
+            job.stage = "done"
+            job.progress = 1.0
+            self._finish(job, JOB_COMPLETED, result=result)
+        finally:
+            self.run_seconds += time.monotonic() - started
+
+    async def _run_local(self, job: ReportJob) -> Any:
+        """
+        Run a job in the API process (used when the pool is disabled)
+        """
+        def progress(stage: str, fraction: float) -> None:
+            if job.cancel_event.is_set():
+                raise ReportJobCancelled(f"Report job {job.id} was cancelled")
+            job.stage = stage
+            job.progress = fraction
+
+        if job.status == JOB_CANCELLING:
+            job.cancel_event.set()
+        progress("starting", 0.0)
+        return await _resolve_task(job.task)(progress=progress, **job.kwargs)
+
+    def _finish(self, job: ReportJob, state: str, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        job.status = state
+        job.finished_at = datetime.now()
+        if state == JOB_COMPLETED:
+            self.completed += 1
+        elif state == JOB_FAILED:
+            self.failed += 1
+        else:
+            self.cancelled += 1
+
+        if not job.future.done():
+            if exception is not None:
+                job.future.set_exception(exception)
+            else:
+                job.future.set_result(result)
+
+    def cancel(self, job_id: str) -> Optional[ReportJob]:
+        """
+        Cancel a job (call from the event loop)
+
+        A queued job is dropped right away; a running job stops at its next
+        progress update.
+
+        Returns:
+            The job, or None if it is unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        if job.status == JOB_QUEUED:
+            self._queued -= 1
+            self._finish(job, JOB_CANCELLED, exception=ReportJobCancelled(f"Report job {job_id} was cancelled"))
+        else:
+            job.status = JOB_CANCELLING
+            if job.cancel_event is not None:
+                job.cancel_event.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """
+        Get a job by ID
+        """
+        return self._jobs.get(job_id)
+
+    def jobs(self, user_id: Optional[str] = None) -> List[ReportJob]:
+        """
+        Get the known jobs of a user, or all jobs if user_id is None, newest first
+        """
+        jobs = [job for job in self._jobs.values() if user_id is None or job.user_id == user_id]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue and job statistics
+        """
+        states = [job.status for job in self._jobs.values()]
+        started = self.completed + self.failed + self.cancelled
+        return {
+            "workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "queued": self._queued,
+            "running": states.count(JOB_RUNNING) + states.count(JOB_CANCELLING),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.wait_seconds / started if started else None,
+            "avg_run_seconds": self.run_seconds / started if started else None,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes after the running jobs finish
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._update_queue.put(None)
+                self._update_thread.join()
+                self._manager.shutdown()
+                self._manager = None
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+
+
+# Worker pool shared by all report builds
+_report_worker_pool = None
+_report_worker_pool_lock = threading.Lock()
+
+
+def get_report_worker_pool() -> ReportWorkerPool:
+    """
+    Create or return the shared ReportWorkerPool
+    """
+    global _report_worker_pool
+    if _report_worker_pool is None:
+        with _report_worker_pool_lock:
+            if _report_worker_pool is None:
+                _report_worker_pool = ReportWorkerPool()
+    return _report_worker_pool
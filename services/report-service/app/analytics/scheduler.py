@@ -1,9 +1,18 @@
 from fastapi import BackgroundTasks
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.mongodb import MongoDBJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
-from typing import Dict, Any, List, Optional
+from apscheduler.jobstores.base import ConflictingIdError
+from typing import Callable, Dict, Any, List, Optional
+import asyncio
+import base64
+import hashlib
+import json
 import logging
+import os
+import socket
+import threading
 from datetime import datetime, timedelta
 import uuid
 import pytz
@@ -11,9 +20,26 @@ import pytz
 from app.core.config import settings
 from app.db.database import get_mongodb_client
 from app.analytics.report_generator import generate_report_by_type
-from app.analytics.report_exporter import export_report
+from app.analytics.report_exporter import export_report_async
+from app.analytics.report_jobs import (
+    PRIORITY_ON_DEMAND,
+    PRIORITY_SCHEDULED,
+    TASK_BUILD_REPORT,
+    ProgressCallback,
+    ReportJob,
+    ReportJobCancelled,
+    get_report_worker_pool
+)
+from app.db.artifact_store import get_artifact_store, store_charts
 from app.models.report import create_report
 from app.models.notification import send_report_notification
+from app.models.scheduled_report import (
+    claim_due_report,
+    claim_group_run,
+    complete_claimed_report,
+    release_claimed_report,
+    renew_report_lease
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +48,34 @@ logger = logging.getLogger(__name__)
 # Create scheduler
 scheduler = AsyncIOScheduler()
 
+# Intervals of recurring reports ("monthly" is approximate)
+SCHEDULE_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+}
+
+# Anchor of recurring fire times
+SCHEDULE_EPOCH = datetime(1970, 1, 1)
+
+# Delay tolerated between a run's fire time and a subscriber's start date
+SCHEDULE_GRACE_SECONDS = 60
+
+# Owner of this replica's scheduled report claims
+REPLICA_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Serializes read-modify-write updates of report group subscribers
+_group_lock = threading.RLock()
+
+# Report period of scheduled reports by time range
+TIME_RANGE_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 30,
+    "quarterly": 90,
+    "yearly": 365,
+}
+
 # Configure the scheduler
 def configure_scheduler():
     """
@@ -30,13 +84,14 @@ def configure_scheduler():
     try:
         # Get MongoDB client
         client = get_mongodb_client()
-        db = client[settings.MONGODB_DATABASE]
+        db = client[settings.MONGO_DB]
         
-        # Configure job stores
+        # Configure job stores ('local' holds this replica's own jobs)
         jobstores = {
-            'default': MongoDBJobStore(database=settings.MONGODB_DATABASE, 
+            'default': MongoDBJobStore(database=settings.MONGO_DB, 
                                       collection='scheduled_jobs',
-                                      client=client)
+                                      client=client),
+            'local': MemoryJobStore()
         }
         
         # Configure executors
@@ -57,6 +112,18 @@ def configure_scheduler():
                            job_defaults=job_defaults, 
                            timezone=pytz.utc)
         
+        # Every replica polls for due scheduled reports; claims keep each run on one replica
+        scheduler.add_job(
+            run_due_scheduled_reports,
+            'interval',
+            seconds=settings.SCHEDULED_REPORT_POLL_SECONDS,
+            id='scheduled-reports-poll',
+            jobstore='local',
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True
+        )
+        
         # Start the scheduler
         scheduler.start()
         logger.info("Scheduler started successfully")
@@ -66,6 +133,183 @@ def configure_scheduler():
         raise
 
 
+def store_report_artifacts(report_data: Dict[str, Any], exports: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Move chart images and export files into the artifact store
+    
+    Returns the report data and exports with artifact references in place
+    of their base64 contents.
+    """
+    store = get_artifact_store()
+    
+    report_data = dict(report_data)
+    report_data["charts"] = store_charts(store, report_data.get("charts", {}))
+    
+    stored_exports = {}
+    for export_format, export_result in exports.items():
+        stored_exports[export_format] = {
+            **store.put(base64.b64decode(export_result["data"]), export_result["content_type"]),
+            "filename": export_result["filename"]
+        }
+    
+    return {"data": report_data, "exports": stored_exports}
+
+
+async def build_report(
+    report_type: str,
+    params: Dict[str, Any],
+    export_formats: List[str],
+    incremental: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Generate a report and its exports, and move their bytes into the artifact store
+    
+    Runs as a report worker pool task (see submit_report_build).
+    
+    Args:
+        report_type: Type of report to generate
+        params: Report parameters ('full_rebuild' disables reuse of stored partials)
+        export_formats: Export formats to create
+        incremental: Reuse per-day partial aggregates of earlier runs
+        progress: Called with the stage and completed fraction of the build
+    
+    Returns:
+        Dict with the report data and exports (holding artifact references),
+        or None if the report could not be generated
+    """
+    # Generate the report
+    if progress:
+        progress("generating", 0.1)
+    report_data = await generate_report_by_type(
+        report_type=report_type,
+        incremental=incremental,
+        **params
+    )
+    
+    if "error" in report_data:
+        logger.error(f"Error generating report: {report_data['error']}")
+        return None
+    
+    # Create exports, reporting progress (and stopping if cancelled) between formats
+    exports = {}
+    for i, export_format in enumerate(export_formats):
+        if progress:
+            progress(f"exporting {export_format}", 0.6 + 0.3 * i / len(export_formats))
+        export_result = await export_report_async(report_data, export_format)
+        if "error" not in export_result:
+            exports[export_format] = export_result
+    
+    # Keep only artifact references in the report document
+    if progress:
+        progress("storing", 0.9)
+    return await asyncio.to_thread(store_report_artifacts, report_data, exports)
+
+
+async def build_export(
+    report_type: str,
+    params: Dict[str, Any],
+    export_format: str,
+    template_path: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Generate a report and export it to one format, without saving anything
+    
+    Runs as a report worker pool task for reports returned directly.
+    
+    Returns:
+        The export result, or a dict with an 'error' message
+    """
+    if progress:
+        progress("generating", 0.1)
+    report_data = await generate_report_by_type(report_type=report_type, **params)
+    
+    if "error" in report_data:
+        return {"error": f"Error generating report: {report_data['error']}"}
+    
+    if progress:
+        progress("exporting", 0.6)
+    export_result = await export_report_async(report_data, export_format, template_path)
+    
+    if "error" in export_result:
+        return {"error": f"Error exporting report: {export_result['error']}"}
+    
+    return export_result
+
+
+def submit_report_build(
+    report_type: str,
+    params: Dict[str, Any],
+    export_formats: List[str],
+    priority: int = PRIORITY_ON_DEMAND,
+    incremental: bool = False,
+    user_id: Optional[str] = None
+) -> ReportJob:
+    """
+    Queue a report build in the report worker pool
+    
+    Returns:
+        The job, resolving to the build_report result
+    """
+    return get_report_worker_pool().submit(
+        TASK_BUILD_REPORT,
+        {
+            "report_type": report_type,
+            "params": params,
+            "export_formats": export_formats,
+            "incremental": incremental
+        },
+        priority=priority,
+        user_id=user_id,
+        description=f"{report_type} report"
+    )
+
+
+async def save_report_for_user(
+    built_report: Dict[str, Any],
+    report_type: str,
+    params: Dict[str, Any],
+    user_id: str,
+    template_id: Optional[str] = None,
+    send_notification: bool = False,
+    notification_email: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Save a built report for one user and optionally send notification
+    
+    The report document only holds artifact references, so saving the same
+    built report for several users does not copy any export or chart.
+    """
+    report = {
+        "type": report_type,
+        "name": f"{report_type.replace('_', ' ').title()} Report",
+        "description": f"Automatically generated {report_type} report",
+        "data": built_report["data"],
+        "params": params,
+        "template_id": template_id,
+        "exports": built_report["exports"],
+        "created_by": user_id,
+        "created_at": datetime.now().isoformat()
+    }
+    if run_id:
+        report["run_id"] = run_id
+    
+    # Save to database
+    saved_report = create_report(report)
+    
+    # Send notification if requested
+    if send_notification and saved_report and notification_email:
+        await send_report_notification(
+            report_id=saved_report["id"],
+            email=notification_email,
+            report_name=saved_report["name"]
+        )
+    
+    return saved_report
+
+
 async def generate_and_save_report(
     report_type: str,
     params: Dict[str, Any],
@@ -73,58 +317,334 @@ async def generate_and_save_report(
     template_id: Optional[str] = None,
     export_formats: List[str] = ["json"],
     send_notification: bool = False,
-    notification_email: Optional[str] = None
+    notification_email: Optional[str] = None,
+    job: Optional[ReportJob] = None
 ):
     """
     Generate a report, save it to the database, and optionally send notification
+    
+    The report is built in the report worker pool as an on-demand job, or
+    by `job` if its build was already submitted (see submit_report_build).
     """
     try:
-        # Generate the report
-        report_data = await generate_report_by_type(
+        if job is None:
+            job = submit_report_build(report_type, params, export_formats, user_id=user_id)
+        built_report = await job.wait()
+        if built_report is None:
+            return None
+        
+        saved_report = await save_report_for_user(
+            built_report,
             report_type=report_type,
-            **params
+            params=params,
+            user_id=user_id,
+            template_id=template_id,
+            send_notification=send_notification,
+            notification_email=notification_email
         )
-        
-        if "error" in report_data:
-            logger.error(f"Error generating report: {report_data['error']}")
+        if saved_report:
+            job.report_id = saved_report["id"]
+        return saved_report
+    
+    except ReportJobCancelled:
+        logger.info(f"Report job {job.id} was cancelled")
+        return None
+    
+    except Exception as e:
+        logger.error(f"Error in generate_and_save_report: {str(e)}")
+        return None
+
+
+def _subscription_active(subscriber: Dict[str, Any], at: datetime) -> bool:
+    """
+    Whether a subscriber's schedule window contains a run time
+    """
+    start_date = datetime.fromisoformat(subscriber["start_date"])
+    end_date = datetime.fromisoformat(subscriber["end_date"]) if subscriber.get("end_date") else None
+    # Runs fire at the subscriber's own start time at the earliest, allow for that run's delay
+    return start_date <= at + timedelta(seconds=SCHEDULE_GRACE_SECONDS) and (end_date is None or at <= end_date)
+
+
+def _update_group_subscribers(
+    group_id: str,
+    update: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Replace the subscribers of a report group job with update(current subscribers)
+    
+    The job is re-read under a lock, so concurrent subscriptions,
+    cancellations and pruning do not overwrite each other's changes. The job
+    is removed once no subscribers remain.
+    
+    Returns:
+        The new subscribers, or None if the group job does not exist
+    """
+    with _group_lock:
+        job = scheduler.get_job(group_id)
+        if job is None:
             return None
         
-        # Create exports
-        exports = {}
-        for export_format in export_formats:
-            export_result = export_report(report_data, export_format)
-            if "error" not in export_result:
-                exports[export_format] = export_result
-        
-        # Save the report
-        report = {
-            "type": report_type,
-            "name": f"{report_type.replace('_', ' ').title()} Report",
-            "description": f"Automatically generated {report_type} report",
-            "data": report_data,
-            "params": params,
-            "template_id": template_id,
-            "exports": exports,
-            "created_by": user_id,
-            "created_at": datetime.now().isoformat()
-        }
+        subscribers = update(job.kwargs.get("subscribers", []))
+        if subscribers:
+            scheduler.modify_job(group_id, kwargs={**job.kwargs, "subscribers": subscribers})
+        else:
+            scheduler.remove_job(group_id)
+        return subscribers
+
+
+async def run_report_group(
+    group_id: str,
+    report_type: str,
+    params: Dict[str, Any],
+    template_id: Optional[str],
+    export_formats: List[str],
+    subscribers: List[Dict[str, Any]]
+):
+    """
+    Run one scheduled report for all of its subscribers
+    
+    The report is generated and exported once; every subscriber whose
+    schedule window contains this run gets a report document referencing the
+    same artifacts, and its notification. Subscribers whose window has ended
+    are removed from the group, and the group job with them once none remain.
+    Each run is built in the report worker pool at scheduled priority, and
+    reuses the per-day partial aggregates of earlier runs.
+    
+    Every replica sharing the job store fires the group job; the run is
+    claimed by group and run time, so only one replica builds it.
+    """
+    now = datetime.now()
+    active = [subscriber for subscriber in subscribers if _subscription_active(subscriber, now)]
+    
+    def unexpired(current: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            subscriber for subscriber in current
+            if not subscriber.get("end_date") or datetime.fromisoformat(subscriber["end_date"]) > now
+        ]
+    
+    try:
+        if len(unexpired(subscribers)) < len(subscribers):
+            _update_group_subscribers(group_id, unexpired)
+    except Exception as e:
+        logger.error(f"Error pruning report group {group_id}: {str(e)}")
+    
+    if not active:
+        return []
+    
+    try:
+        run_time = _group_run_time(subscribers, now)
+        if not await asyncio.to_thread(claim_group_run, group_id, run_time, REPLICA_ID):
+            logger.info(f"Report group {group_id} run at {run_time} is handled by another replica")
+            return []
         
-        # Save to database
-        saved_report = create_report(report)
+        job = submit_report_build(
+            report_type, params, export_formats, priority=PRIORITY_SCHEDULED, incremental=True
+        )
+        built_report = await job.wait()
+        if built_report is None:
+            return []
+        
+        run_id = str(uuid.uuid4())
+        results = await asyncio.gather(*[
+            save_report_for_user(
+                built_report,
+                report_type=report_type,
+                params=params,
+                user_id=subscriber["user_id"],
+                template_id=template_id,
+                send_notification=subscriber.get("send_notification", False),
+                notification_email=subscriber.get("notification_email"),
+                run_id=run_id
+            )
+            for subscriber in active
+        ], return_exceptions=True)
         
-        # Send notification if requested
-        if send_notification and saved_report and notification_email:
-            await send_report_notification(
-                report_id=saved_report["id"],
-                email=notification_email,
-                report_name=saved_report["name"]
+        saved_reports = []
+        for subscriber, result in zip(active, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error saving report for subscription {subscriber['subscription_id']}: {str(result)}")
+            elif result:
+                saved_reports.append(result)
+        
+        logger.info(f"Report group {group_id} ran once for {len(active)} subscribers")
+        return saved_reports
+    
+    except Exception as e:
+        logger.error(f"Error in run_report_group: {str(e)}")
+        return []
+
+
+def scheduled_report_days(report_params: Dict[str, Any]) -> int:
+    """
+    Number of days a scheduled report covers
+    """
+    time_range = report_params.get("time_range")
+    if time_range == "custom" and report_params.get("start_date") and report_params.get("end_date"):
+        return max((report_params["end_date"] - report_params["start_date"]).days, 1)
+    return TIME_RANGE_DAYS.get(time_range, 30)
+
+
+async def _keep_lease(report_id: str) -> None:
+    """
+    Renew a claim until cancelled, so long report builds keep it
+    """
+    lease_seconds = settings.SCHEDULED_REPORT_LEASE_SECONDS
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await asyncio.to_thread(renew_report_lease, report_id, REPLICA_ID, lease_seconds):
+            logger.warning(f"Lost the claim on scheduled report {report_id}")
+            return
+
+
+async def execute_claimed_report(scheduled_report: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Generate a claimed scheduled report, notify its recipients and advance it
+    
+    The claim is released without advancing the report if generation fails,
+    so a later poll (on any replica) retries it. The report is built in the
+    report worker pool at scheduled priority, and reuses per-day partial
+    aggregates of earlier runs unless it asks for a full rebuild.
+    """
+    report_id = scheduled_report["id"]
+    report_params = scheduled_report.get("report_params", {})
+    report_type = report_params.get("report_type")
+    params = {"days": scheduled_report_days(report_params)}
+    if scheduled_report.get("full_rebuild"):
+        params["full_rebuild"] = True
+    
+    lease = asyncio.create_task(_keep_lease(report_id))
+    try:
+        job = submit_report_build(
+            report_type,
+            params,
+            [scheduled_report.get("format", "pdf")],
+            priority=PRIORITY_SCHEDULED,
+            incremental=True,
+            user_id=scheduled_report["created_by"]
+        )
+        built_report = await job.wait()
+        if built_report is None:
+            await asyncio.to_thread(
+                release_claimed_report, report_id, REPLICA_ID, settings.SCHEDULED_REPORT_POLL_SECONDS
             )
+            return None
+        
+        saved_report = await save_report_for_user(
+            built_report,
+            report_type=report_type,
+            params=params,
+            user_id=scheduled_report["created_by"],
+            template_id=scheduled_report.get("template_id")
+        )
+        
+        if saved_report:
+            for email in scheduled_report.get("recipients", []):
+                await send_report_notification(
+                    report_id=saved_report["id"],
+                    email=email,
+                    report_name=scheduled_report.get("name", saved_report["name"])
+                )
+        
+        if not await asyncio.to_thread(complete_claimed_report, report_id, REPLICA_ID):
+            logger.warning(f"Scheduled report {report_id} finished after its claim was lost")
         
         return saved_report
     
     except Exception as e:
-        logger.error(f"Error in generate_and_save_report: {str(e)}")
+        logger.error(f"Error executing scheduled report {report_id}: {str(e)}")
+        await asyncio.to_thread(
+            release_claimed_report, report_id, REPLICA_ID, settings.SCHEDULED_REPORT_POLL_SECONDS
+        )
         return None
+    
+    finally:
+        lease.cancel()
+
+
+async def run_due_scheduled_reports(concurrency: Optional[int] = None) -> int:
+    """
+    Claim and execute due scheduled reports until none are left
+    
+    Runs on every replica. Each report is claimed atomically before it runs,
+    so it is executed by exactly one replica, and replicas share the due
+    reports between them.
+    
+    Args:
+        concurrency: Reports executed at once by this replica (defaults to SCHEDULED_REPORT_CONCURRENCY)
+    
+    Returns:
+        Number of reports executed
+    """
+    concurrency = concurrency or settings.SCHEDULED_REPORT_CONCURRENCY
+    lease_seconds = settings.SCHEDULED_REPORT_LEASE_SECONDS
+    executed = 0
+    
+    async def worker():
+        nonlocal executed
+        while True:
+            scheduled_report = await asyncio.to_thread(claim_due_report, REPLICA_ID, lease_seconds)
+            if scheduled_report is None:
+                return
+            await execute_claimed_report(scheduled_report)
+            executed += 1
+    
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    
+    if executed:
+        logger.info(f"Executed {executed} scheduled reports on {REPLICA_ID}")
+    return executed
+
+
+def _report_group_id(
+    report_type: str,
+    params: Dict[str, Any],
+    template_id: Optional[str],
+    export_formats: List[str],
+    frequency: str,
+    fire_time: datetime
+) -> str:
+    """
+    Job ID shared by all subscriptions to the same report at the same fire times
+    """
+    key = json.dumps(
+        [report_type, params, template_id, sorted(export_formats), frequency, fire_time.isoformat()],
+        sort_keys=True,
+        default=str
+    )
+    return f"report-group-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}"
+
+
+def _group_run_time(subscribers: List[Dict[str, Any]], at: datetime) -> datetime:
+    """
+    Scheduled time of the group run firing at (or shortly after) a given time
+    
+    All subscribers of a group share its fire times, so any of them yields it.
+    """
+    frequency = subscribers[0]["frequency"]
+    fire_time = _fire_time(frequency, datetime.fromisoformat(subscribers[0]["start_date"]))
+    if frequency == "one_time":
+        return fire_time
+    
+    # Replicas fire the same run up to a misfire delay apart
+    interval = SCHEDULE_INTERVALS[frequency]
+    return fire_time + (at + timedelta(seconds=SCHEDULE_GRACE_SECONDS) - fire_time) // interval * interval
+
+
+def _fire_time(frequency: str, start_date: datetime) -> datetime:
+    """
+    Canonical fire time of a schedule
+    
+    One-time reports fire at their start date. Recurring reports fire at
+    start_date + k * interval, so their fire times are identified by the
+    start date's offset within the interval, anchored at the epoch: every
+    start date with the same offset yields the same fire times.
+    """
+    start_date = start_date.replace(second=0, microsecond=0)
+    if frequency == "one_time":
+        return start_date
+    
+    interval = SCHEDULE_INTERVALS[frequency]
+    return SCHEDULE_EPOCH + (start_date - SCHEDULE_EPOCH) % interval
 
 
 def schedule_report(
@@ -132,7 +652,11 @@ def schedule_report(
     background_tasks: BackgroundTasks
 ) -> Dict[str, Any]:
     """
-    Schedule a report to be generated periodically
+    Subscribe to a report generated periodically
+    
+    Subscriptions to the same report (type, params, template and formats) at
+    the same fire times share one scheduler job, which generates the report
+    once per run and fans it out to every subscriber.
     
     schedule_data should contain:
     - report_type: type of report to generate
@@ -157,6 +681,10 @@ def schedule_report(
         start_date = schedule_info.get("start_date")
         end_date = schedule_info.get("end_date")
         
+        if frequency != "one_time" and frequency not in SCHEDULE_INTERVALS:
+            logger.error(f"Unsupported frequency: {frequency}")
+            return {"error": f"Unsupported frequency: {frequency}"}
+        
         if not start_date:
             start_date = datetime.now() + timedelta(minutes=1)
         else:
@@ -165,81 +693,82 @@ def schedule_report(
         if end_date:
             end_date = datetime.fromisoformat(end_date)
         
-        # Generate a job ID
+        # Generate a subscription ID
         job_id = str(uuid.uuid4())
         
-        # Define the job function
-        job_kwargs = {
+        subscriber = {
+            "subscription_id": job_id,
+            "user_id": user_id,
+            "send_notification": send_notification,
+            "notification_email": notification_email,
+            "frequency": frequency,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat() if end_date else None
+        }
+        
+        fire_time = _fire_time(frequency, start_date)
+        group_id = _report_group_id(report_type, params, template_id, export_formats, frequency, fire_time)
+        
+        group_kwargs = {
+            "group_id": group_id,
             "report_type": report_type,
             "params": params,
-            "user_id": user_id,
             "template_id": template_id,
             "export_formats": export_formats,
-            "send_notification": send_notification,
-            "notification_email": notification_email
+            "subscribers": [subscriber]
         }
         
-        # Schedule based on frequency
-        if frequency == "one_time":
-            # Schedule one-time job
-            scheduler.add_job(
-                generate_and_save_report,
-                'date',
-                run_date=start_date,
-                kwargs=job_kwargs,
-                id=job_id,
-                replace_existing=True
-            )
-        elif frequency == "daily":
-            # Schedule daily job
-            scheduler.add_job(
-                generate_and_save_report,
-                'interval',
-                days=1,
-                start_date=start_date,
-                end_date=end_date,
-                kwargs=job_kwargs,
-                id=job_id,
-                replace_existing=True
-            )
-        elif frequency == "weekly":
-            # Schedule weekly job
-            scheduler.add_job(
-                generate_and_save_report,
-                'interval',
-                weeks=1,
-                start_date=start_date,
-                end_date=end_date,
-                kwargs=job_kwargs,
-                id=job_id,
-                replace_existing=True
-            )
-        elif frequency == "monthly":
-            # Schedule monthly job
-            scheduler.add_job(
-                generate_and_save_report,
-                'interval',
-                days=30,  # Approximate month
-                start_date=start_date,
-                end_date=end_date,
-                kwargs=job_kwargs,
-                id=job_id,
-                replace_existing=True
-            )
-        else:
-            logger.error(f"Unsupported frequency: {frequency}")
-            return {"error": f"Unsupported frequency: {frequency}"}
+        def add_group_job():
+            if frequency == "one_time":
+                # Schedule one-time job
+                scheduler.add_job(
+                    run_report_group,
+                    'date',
+                    run_date=fire_time,
+                    kwargs=group_kwargs,
+                    id=group_id,
+                    replace_existing=False
+                )
+            else:
+                # Recurring job at the shared fire times; subscribers' own
+                # start and end dates are applied on each run
+                scheduler.add_job(
+                    run_report_group,
+                    'interval',
+                    seconds=SCHEDULE_INTERVALS[frequency].total_seconds(),
+                    start_date=fire_time,
+                    kwargs=group_kwargs,
+                    id=group_id,
+                    replace_existing=False
+                )
+        
+        with _group_lock:
+            try:
+                add_group_job()
+            except ConflictingIdError:
+                # The group exists already: join its execution
+                joined = _update_group_subscribers(group_id, lambda subscribers: subscribers + [subscriber])
+                if joined is None:
+                    # It ran and was removed in the meantime
+                    add_group_job()
         
         # If this is a one-time job that should run now, also run it in the background
         if frequency == "one_time" and (start_date - datetime.now()).total_seconds() < 60:
             background_tasks.add_task(
                 generate_and_save_report,
-                **job_kwargs
+                report_type=report_type,
+                params=params,
+                user_id=user_id,
+                template_id=template_id,
+                export_formats=export_formats,
+                send_notification=send_notification,
+                notification_email=notification_email
             )
         
         # Return schedule information
         return {
             "job_id": job_id,
+            "group_id": group_id,
             "report_type": report_type,
             "frequency": frequency,
             "start_date": start_date.isoformat(),
@@ -254,11 +783,24 @@ def schedule_report(
 
 def cancel_scheduled_report(job_id: str) -> bool:
     """
-    Cancel a scheduled report job
+    Cancel a scheduled report subscription
+    
+    The group job is removed with its last subscriber.
     """
+    def without_subscription(subscribers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [subscriber for subscriber in subscribers if subscriber["subscription_id"] != job_id]
+    
     try:
-        scheduler.remove_job(job_id)
-        return True
+        for job in scheduler.get_jobs():
+            subscribers = job.kwargs.get("subscribers", [])
+            if len(without_subscription(subscribers)) == len(subscribers):
+                continue
+            
+            _update_group_subscribers(job.id, without_subscription)
+            return True
+        
+        logger.error(f"Scheduled report subscription not found: {job_id}")
+        return False
     except Exception as e:
         logger.error(f"Error canceling scheduled report: {str(e)}")
         return False
@@ -266,7 +808,7 @@ def cancel_scheduled_report(job_id: str) -> bool:
 
 def get_scheduled_report_jobs(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    Get all scheduled report jobs for a user or all jobs if user_id is None
+    Get all scheduled report subscriptions for a user or all subscriptions if user_id is None
     """
     try:
         jobs = scheduler.get_jobs()
@@ -274,25 +816,27 @@ def get_scheduled_report_jobs(user_id: Optional[str] = None) -> List[Dict[str, A
         
         for job in jobs:
             job_kwargs = job.kwargs
-            job_user_id = job_kwargs.get("user_id")
-            
-            # Filter by user_id if provided
-            if user_id and job_user_id != user_id:
-                continue
-            
-            # Extract job details
-            job_info = {
-                "job_id": job.id,
-                "report_type": job_kwargs.get("report_type"),
-                "params": job_kwargs.get("params"),
-                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                "user_id": job_user_id
-            }
             
-            job_list.append(job_info)
+            for subscriber in job_kwargs.get("subscribers", []):
+                # Filter by user_id if provided
+                if user_id and subscriber["user_id"] != user_id:
+                    continue
+                
+                # Extract subscription details
+                job_info = {
+                    "job_id": subscriber["subscription_id"],
+                    "group_id": job.id,
+                    "report_type": job_kwargs.get("report_type"),
+                    "params": job_kwargs.get("params"),
+                    "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+                    "user_id": subscriber["user_id"],
+                    "subscribers": len(job_kwargs["subscribers"])
+                }
+                
+                job_list.append(job_info)
         
         return job_list
     
     except Exception as e:
         logger.error(f"Error getting scheduled jobs: {str(e)}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    """
+    One in-flight or loaded snapshot and the number of consumers holding it
+    """
+
+    def __init__(self, task: asyncio.Future, expires_at: float):
+        self.task = task
+        self.expires_at = expires_at
+        self.loop = asyncio.get_running_loop()
+        self.consumers = 0
+
+    def usable(self) -> bool:
+        """
+        Whether a new consumer may share this snapshot
+        """
+        if time.monotonic() >= self.expires_at or self.loop is not asyncio.get_running_loop():
+            return False
+        # A failed load is not shared with consumers arriving after the failure
+        return not (self.task.done() and (self.task.cancelled() or self.task.exception() is not None))
+
+
+class SnapshotCache:
+    """
+    Single-flight cache of report data snapshots
+
+    Concurrent report builds asking for the same window share one load: the
+    first consumer starts it and everyone else awaits the same result. A
+    snapshot is evicted as soon as its last consumer finishes, and is not
+    handed to new consumers once it is older than the TTL, so it never outlives
+    the report builds that use it.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Initialize the SnapshotCache
+
+        Args:
+            ttl: Seconds a snapshot may be shared (defaults to REPORT_SNAPSHOT_TTL)
+        """
+        self.ttl = ttl if ttl is not None else settings.REPORT_SNAPSHOT_TTL
+        self._snapshots: Dict[Hashable, _Snapshot] = {}
+
+        self.loads = 0
+        self.shared = 0
+
+    def _lookup(self, key: Hashable, covers: Optional[Callable[[Hashable], bool]]) -> Optional[_Snapshot]:
+        """
+        Find a usable snapshot for key, or one whose key covers it
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.usable():
+            return snapshot
+
+        if covers is not None:
+            for other_key, other in self._snapshots.items():
+                if covers(other_key) and other.usable():
+                    return other
+
+        return None
+
+    def _release(self, key: Hashable, snapshot: _Snapshot) -> None:
+        snapshot.consumers -= 1
+        if snapshot.consumers == 0 and self._snapshots.get(key) is snapshot:
+            del self._snapshots[key]
+
+    @asynccontextmanager
+    async def snapshot(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        covers: Optional[Callable[[Hashable], bool]] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Hold a shared snapshot for the duration of the block
+
+        The yielded value is shared with other consumers and must not be modified.
+
+        Args:
+            key: Snapshot key (e.g. data kind and window)
+            loader: Coroutine function loading the snapshot, called only when
+                no usable snapshot exists
+            covers: Predicate accepting the key of a wider snapshot that can
+                serve this request (the consumer narrows it down itself)
+
+        Yields:
+            The loaded snapshot
+        """
+        snapshot = self._lookup(key, covers)
+        if snapshot is None:
+            snapshot = _Snapshot(asyncio.ensure_future(loader()), time.monotonic() + self.ttl)
+            self._snapshots[key] = snapshot
+            self.loads += 1
+        else:
+            self.shared += 1
+            # Release under the snapshot's own key
+            key = next(
+                (existing for existing, value in self._snapshots.items() if value is snapshot),
+                key
+            )
+
+        snapshot.consumers += 1
+        try:
+            # Shield the shared load from cancellation of any single consumer
+            yield await asyncio.shield(snapshot.task)
+        finally:
+            self._release(key, snapshot)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Load a value with single-flight semantics and release it immediately
+
+        Suitable for small results (aggregates) that consumers copy or do not modify.
+        """
+        async with self.snapshot(key, loader) as value:
+            return value
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        """
+        return {
+            "snapshots": len(self._snapshots),
+            "loads": self.loads,
+            "shared": self.shared,
+        }
+
+
+# Snapshot cache shared by all report data sources
+_snapshot_cache = None
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    """
+    Create or return the shared SnapshotCache
+    """
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        _snapshot_cache = SnapshotCache()
+    return _snapshot_cache
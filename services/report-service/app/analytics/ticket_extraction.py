@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Ticket columns kept for reports and their buffer dtypes
+TICKET_COLUMNS = {
+    "id": object,
+    "status": object,
+    "priority": object,
+    "created_by": object,
+    "created_at": "datetime64[ns]",
+    "first_response_at": "datetime64[ns]",
+    "resolved_at": "datetime64[ns]",
+}
+
+# Alternative field names used by the ticket service
+TICKET_COLUMN_ALIASES = {
+    "created_by": ["requester_id"],
+}
+
+
+class TicketExtractionError(Exception):
+    """
+    Raised when a page of tickets cannot be fetched
+    """
+
+
+class ColumnBuffers:
+    """
+    Typed column arrays filled page by page
+
+    Each page is written into its own row range as soon as it arrives, so rows
+    exist once, as typed arrays, and the raw JSON of a page can be dropped
+    right after it is written.
+    """
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 0):
+        """
+        Initialize the ColumnBuffers
+
+        Args:
+            columns: Column names and dtypes
+            capacity: Initial number of rows
+        """
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.arrays = {name: self._empty(dtype, capacity) for name, dtype in self.columns.items()}
+        self.capacity = capacity
+        self.rows = 0
+
+    @staticmethod
+    def _empty(dtype: np.dtype, size: int) -> np.ndarray:
+        if dtype.kind == "M":
+            return np.full(size, np.datetime64("NaT"), dtype=dtype)
+        return np.full(size, None, dtype=dtype) if dtype == object else np.zeros(size, dtype=dtype)
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Grow the buffers to hold at least capacity rows
+        """
+        if capacity <= self.capacity:
+            return
+        for name, dtype in self.columns.items():
+            grown = self._empty(dtype, capacity)
+            grown[:self.capacity] = self.arrays[name]
+            self.arrays[name] = grown
+        self.capacity = capacity
+
+    def _column_values(self, records: List[Dict[str, Any]], name: str) -> List[Any]:
+        keys = [name] + TICKET_COLUMN_ALIASES.get(name, [])
+        values = []
+        for record in records:
+            value = None
+            for key in keys:
+                value = record.get(key)
+                if value is not None:
+                    break
+            values.append(value)
+        return values
+
+    def write(self, offset: int, records: List[Dict[str, Any]]) -> None:
+        """
+        Parse a page of records into rows offset .. offset + len(records)
+
+        Datetime columns are parsed per page (as naive UTC).
+        """
+        end = offset + len(records)
+        if end > self.capacity:
+            # Grow geometrically so pages arriving one by one are not copied each time
+            self.reserve(max(end, 2 * self.capacity))
+
+        for name, dtype in self.columns.items():
+            values = self._column_values(records, name)
+            if dtype.kind == "M":
+                parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce")
+                self.arrays[name][offset:end] = parsed.dt.tz_convert(None).to_numpy(dtype=dtype)
+            else:
+                self.arrays[name][offset:end] = values
+
+        self.rows = max(self.rows, end)
+
+    def to_frame(self, mask: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Build a DataFrame over the filled rows without copying the buffers
+        (rows are selected when a mask is given)
+        """
+        arrays = {name: array[:self.rows] for name, array in self.arrays.items()}
+        if mask is not None:
+            arrays = {name: array[mask] for name, array in arrays.items()}
+        return pd.DataFrame(arrays, copy=False)
+
+
+async def iter_ticket_pages(
+    fetch_page: Callable[[int, int], Awaitable[Dict[str, Any]]],
+    page_size: int,
+    concurrency: int,
+    from_date: Optional[date] = None
+) -> AsyncIterator[Tuple[int, int, List[Dict[str, Any]]]]:
+    """
+    Fetch pages of tickets (newest first), several at a time
+
+    The first page gives the total; the remaining pages are fetched in waves
+    of `concurrency` requests. Since tickets are sorted by creation time,
+    fetching stops after the wave that reaches tickets older than from_date.
+
+    Args:
+        fetch_page: Coroutine function fetching (skip, limit) and returning the
+            response body ({"total", "items"})
+        page_size: Tickets per request
+        concurrency: Maximum number of requests in flight
+        from_date: Oldest creation date needed
+
+    Yields:
+        (offset, total, records) for each page, in offset order
+    """
+    def reaches_from_date(records: List[Dict[str, Any]]) -> bool:
+        if from_date is None or not records:
+            return False
+        oldest = pd.to_datetime(records[-1].get("created_at"), utc=True, errors="coerce")
+        return pd.notna(oldest) and oldest.date() < from_date
+
+    first = await fetch_page(0, page_size)
+    records = first.get("items", first.get("tickets", []))
+    total = int(first.get("total", len(records)))
+    yield 0, total, records
+
+    done = reaches_from_date(records) or len(records) < page_size
+    offset = page_size
+    while not done and offset < total:
+        wave = range(offset, min(total, offset + concurrency * page_size), page_size)
+        pending = [asyncio.ensure_future(fetch_page(skip, page_size)) for skip in wave]
+        try:
+            for skip, task in zip(wave, pending):
+                page = await task
+                records = page.get("items", page.get("tickets", []))
+                if reaches_from_date(records) or len(records) < page_size:
+                    done = True
+                yield skip, total, records
+        finally:
+            for task in pending:
+                task.cancel()
+        offset = wave.stop if len(wave) else total
+
+
+async def extract_tickets(
+    fetch_page: Callable[[int, int], Awaitable[Dict[str, Any]]],
+    from_date: Optional[date],
+    page_size: int,
+    concurrency: int
+) -> pd.DataFrame:
+    """
+    Extract tickets created since from_date into a DataFrame of typed columns
+
+    Args:
+        fetch_page: Coroutine function fetching (skip, limit)
+        from_date: Oldest creation date to keep
+        page_size: Tickets per request
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        DataFrame with the TICKET_COLUMNS
+    """
+    buffers = ColumnBuffers(TICKET_COLUMNS)
+
+    async for offset, total, records in iter_ticket_pages(fetch_page, page_size, concurrency, from_date):
+        buffers.write(offset, records)
+
+    if from_date is None or not buffers.rows:
+        return buffers.to_frame()
+
+    keep = buffers.arrays["created_at"][:buffers.rows] >= np.datetime64(from_date, "ns")
+    kept = int(keep.sum())
+    if keep[:kept].all():
+        # Newest-first pages: the window is a prefix of the buffers, so no copy is needed
+        buffers.rows = kept
+        return buffers.to_frame()
+    return buffers.to_frame(keep)
@@ -1,11 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Path
 from fastapi import status
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+import asyncio
 
 from app.api.deps import get_current_user
-from app.analytics.report_generator import generate_report_by_type
-from app.analytics.report_exporter import export_report, SUPPORTED_FORMATS
-from app.analytics.scheduler import generate_and_save_report
+from app.core.cache import cached, get_response_cache
+from app.core.config import settings
+from app.analytics.data_sources import TICKET_EXPORT_COLUMNS, ReportDataUnavailable, get_report_data_source
+from app.analytics.report_exporter import export_report_async, stream_report, SUPPORTED_FORMATS, STREAMING_FORMATS
+from app.analytics.pdf_renderer import get_pdf_renderer
+from app.analytics.report_jobs import (
+    PRIORITY_ON_DEMAND,
+    TASK_BUILD_EXPORT,
+    ReportJob,
+    ReportQueueFull,
+    get_report_worker_pool
+)
+from app.analytics.scheduler import generate_and_save_report, submit_report_build
+from app.db.artifact_store import ArtifactNotFound, get_artifact_store, is_artifact_ref, load_charts
 from app.models.report import get_report
 from app.models.template import get_template
 
@@ -26,7 +40,9 @@ async def generate_report(
     Generate a report on demand
     
     This endpoint generates a report based on the specified type and parameters.
-    The report can be returned directly or saved to the database.
+    The report can be returned directly or saved to the database. Reports are
+    built in the report worker pool, ahead of scheduled reports; a saved
+    report's job ID can be polled for progress and cancelled under /jobs.
     """
     # Check if export format is supported
     if export_format not in SUPPORTED_FORMATS:
@@ -40,9 +56,16 @@ async def generate_report(
         "days": days
     }
     
-    # If saving to database, use background task
+    # If saving to database, queue the build and save it in the background
     if save and background_tasks:
-        # Schedule the report generation in the background
+        try:
+            job = submit_report_build(report_type, params, [export_format], user_id=current_user["id"])
+        except ReportQueueFull as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+        
         background_tasks.add_task(
             generate_and_save_report,
             report_type=report_type,
@@ -50,24 +73,50 @@ async def generate_report(
             user_id=current_user["id"],
             template_id=template_id,
             export_formats=[export_format],
-            send_notification=False
+            send_notification=False,
+            job=job
         )
         
         return {
             "message": "Report generation scheduled",
+            "job_id": job.id,
             "report_type": report_type,
             "params": params
         }
     
-    # Generate report directly
-    report_data = await generate_report_by_type(report_type, **params)
-    
-    if "error" in report_data:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating report: {report_data['error']}"
-        )
+    # Generate report directly (or serve it from the cache)
+    return await generate_report_export(
+        report_type=report_type,
+        days=days,
+        export_format=export_format,
+        template_id=template_id
+    )
+
+
+def report_cache_tags(arguments: Dict[str, Any]) -> List[str]:
+    """
+    Cache tags of an on-demand report export
+    """
+    tags = ["reports", f"report_type:{arguments['report_type']}"]
+    if arguments.get("template_id"):
+        tags.append(f"template:{arguments['template_id']}")
+    return tags
+
+
+@cached("report_export", ttl=settings.REPORT_CACHE_TTL, tags=report_cache_tags)
+async def generate_report_export(
+    report_type: str,
+    days: int,
+    export_format: str,
+    template_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generate a report and export it to the requested format
     
+    The report is built and exported in the report worker pool. Results are
+    shared by all users for REPORT_CACHE_TTL seconds; failures raise and are
+    not cached.
+    """
     # Get template path if template_id is provided
     template_path = None
     if template_id and export_format in ["html", "pdf"]:
@@ -75,19 +124,144 @@ async def generate_report(
         if template and "template_path" in template:
             template_path = template["template_path"]
     
-    # Export to requested format
-    export_result = export_report(report_data, export_format, template_path)
+    try:
+        export_result = await get_report_worker_pool().run(
+            TASK_BUILD_EXPORT,
+            {
+                "report_type": report_type,
+                "params": {"days": days},
+                "export_format": export_format,
+                "template_path": template_path
+            },
+            priority=PRIORITY_ON_DEMAND,
+            description=f"{report_type} report ({export_format})"
+        )
+    except ReportQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     
     if "error" in export_result:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error exporting report: {export_result['error']}"
+            detail=export_result["error"]
         )
     
     # Return the export result
     return export_result
 
 
+def get_accessible_report(report_id: str, current_user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get a report owned by the current user, or raise 404/403
+    """
+    report = get_report(report_id)
+    
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    
+    # Check if user has access to this report
+    if report["created_by"] != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this report"
+        )
+    
+    return report
+
+
+async def stream_artifact(artifact: Dict[str, Any], filename: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream an artifact from the artifact store
+    """
+    try:
+        chunks = await asyncio.to_thread(get_artifact_store().open, artifact["artifact_id"])
+    except ArtifactNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report artifact not found"
+        )
+    
+    headers = {"Content-Length": str(artifact["size"])}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    
+    return StreamingResponse(chunks, media_type=artifact["content_type"], headers=headers)
+
+
+@router.get("/download/{report_id}/charts/{chart_name}")
+async def download_report_chart(
+    report_id: str = Path(..., description="ID of the report"),
+    chart_name: str = Path(..., description="Name of the chart"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Download a chart image of a previously generated report
+    """
+    report = get_accessible_report(report_id, current_user)
+    
+    chart = report.get("data", {}).get("charts", {}).get(chart_name)
+    if not is_artifact_ref(chart):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chart not found"
+        )
+    
+    return await stream_artifact(chart)
+
+
+@router.get("/download/{report_id}/file")
+async def download_report_file(
+    report_id: str = Path(..., description="ID of the report to download"),
+    export_format: str = Query("csv", description=f"File format. Supported: {', '.join(STREAMING_FORMATS)}"),
+    include_tickets: bool = Query(False, description="Add row-level ticket data after the report"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Download a previously generated report as a streamed file
+    
+    The file is rendered while it is sent, in chunks, instead of being
+    base64-encoded into a JSON response. Ticket rows are read from the data
+    source while the file is written, so exports of any size use bounded
+    memory.
+    """
+    if export_format not in STREAMING_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file format: {export_format}. Supported formats: {', '.join(STREAMING_FORMATS)}"
+        )
+    
+    report = get_accessible_report(report_id, current_user)
+    report_data = report.get("data", {})
+    
+    rows = None
+    if include_tickets:
+        # Tickets of the period the report covers, ending when it was generated
+        timestamp = report_data.get("timestamp")
+        end = datetime.fromisoformat(timestamp) if timestamp else report.get("created_at") or datetime.now()
+        start = end - timedelta(days=report_data.get("period_days") or 30)
+        try:
+            rows = get_report_data_source().iter_ticket_rows(start, end)
+        except ReportDataUnavailable as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    # Synchronous iterators are consumed in the threadpool, off the event loop
+    chunks, content_type, filename = stream_report(report_data, export_format, rows, TICKET_EXPORT_COLUMNS)
+    
+    return StreamingResponse(
+        chunks,
+        media_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/download/{report_id}")
 async def download_report(
     report_id: str = Path(..., description="ID of the report to download"),
@@ -105,27 +279,23 @@ async def download_report(
         )
     
     # Get the report
-    report = get_report(report_id)
-    
-    if not report:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Report not found"
-        )
-    
-    # Check if user has access to this report
-    if report["created_by"] != current_user["id"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this report"
-        )
+    report = get_accessible_report(report_id, current_user)
     
     # Check if export is already available
     if "exports" in report and export_format in report["exports"]:
-        return report["exports"][export_format]
+        export = report["exports"][export_format]
+        if is_artifact_ref(export):
+            return await stream_artifact(export, export.get("filename"))
+        return export
     
     # If not, generate the export
     report_data = report.get("data", {})
+    if export_format in ["html", "pdf"] and report_data.get("charts"):
+        # Templates embed the chart images themselves
+        report_data = {
+            **report_data,
+            "charts": await asyncio.to_thread(load_charts, get_artifact_store(), report_data["charts"])
+        }
     
     # Get template path if template_id is provided
     template_path = None
@@ -135,7 +305,7 @@ async def download_report(
             template_path = template["template_path"]
     
     # Export to requested format
-    export_result = export_report(report_data, export_format, template_path)
+    export_result = await export_report_async(report_data, export_format, template_path)
     
     if "error" in export_result:
         raise HTTPException(
@@ -144,4 +314,93 @@ async def download_report(
         )
     
     # Return the export result
-    return export_result
\ No newline at end of file
+    return export_result
+
+
+@router.get("/pdf-renderer/stats")
+async def pdf_renderer_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Queue depth and render statistics of the PDF render pool
+
+    Report worker processes render their PDFs in this pool too.
+    """
+    return get_pdf_renderer().stats()
+
+
+@router.get("/cache/stats")
+async def cache_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Hit, miss and latency metrics of the response cache
+    """
+    return get_response_cache().stats()
+
+
+def get_accessible_job(job_id: str, current_user: Dict[str, Any]) -> ReportJob:
+    """
+    Get a report job of the current user, or raise 404
+    """
+    job = get_report_worker_pool().get(job_id)
+    
+    if not job or job.user_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    
+    return job
+
+
+@router.get("/jobs")
+async def list_report_jobs(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Status and progress of the current user's report jobs on this replica
+    """
+    return [job.to_dict() for job in get_report_worker_pool().jobs(current_user["id"])]
+
+
+@router.get("/jobs/stats")
+async def report_job_stats(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Queue depth and job statistics of the report worker pool
+    """
+    return get_report_worker_pool().stats()
+
+
+@router.get("/jobs/{job_id}")
+async def get_report_job(
+    job_id: str = Path(..., description="ID of the report job"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Status and progress of a report job
+    """
+    return get_accessible_job(job_id, current_user).to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_report_job(
+    job_id: str = Path(..., description="ID of the report job"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Cancel a queued or running report job
+    
+    A queued job is dropped; a running job stops at its next stage.
+    """
+    job = get_accessible_job(job_id, current_user)
+    
+    if job.finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job already {job.status}"
+        )
+    
+    return get_report_worker_pool().cancel(job.id).to_dict()
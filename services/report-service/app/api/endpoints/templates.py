@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
 from typing import Optional, List, Dict, Any
 
 from app.api.deps import get_current_user
+from app.core.cache import cached, get_response_cache
 from app.models.template import (
     create_template,
     get_template,
@@ -36,6 +37,8 @@ async def create_new_template(
             detail="Template with this name already exists"
         )
     
+    await get_response_cache().invalidate_tags("templates")
+    
     return template
 
 
@@ -87,10 +90,13 @@ async def update_template_by_id(
             detail="Could not update template"
         )
     
+    await get_response_cache().invalidate_tags("templates", f"template:{template_id}")
+    
     return updated
 
 
 @router.get("/", response_model=ReportTemplateList)
+@cached("templates", tags=["templates"], vary_on=["skip", "limit", "report_type"], model=ReportTemplateList)
 async def get_templates(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -143,4 +149,6 @@ async def delete_template_by_id(
             detail="Error deleting template"
         )
     
+    await get_response_cache().invalidate_tags("templates", f"template:{template_id}")
+    
     return None
\ No newline at end of file
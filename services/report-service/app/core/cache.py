@@ -1,11 +1,99 @@
+import asyncio
+import functools
+import hashlib
+import inspect
 import json
-from typing import Optional, Any, Dict
-import pickle
-from datetime import datetime, timedelta
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import redis
+import redis.asyncio
+from pydantic import BaseModel
 
-from app.core.database import redis_client
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Key prefixes of cached values, fill locks and tag sets
+VALUE_PREFIX = "cache:"
+LOCK_PREFIX = "cache-lock:"
+TAG_PREFIX = "cache-tag:"
+
+# Payload header: serialized as is, or zlib-compressed
+PLAIN = b"\x00"
+COMPRESSED = b"\x01"
+
+# Release a fill lock only if it is still held by the same token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """
+    JSON representation of values the encoders do not handle natively
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a value to JSON bytes, compressed above CACHE_COMPRESS_THRESHOLD
+    """
+    if orjson is not None:
+        payload = orjson.dumps(
+            value,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    else:
+        payload = json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+    if len(payload) > settings.CACHE_COMPRESS_THRESHOLD:
+        return COMPRESSED + zlib.compress(payload, 6)
+    return PLAIN + payload
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Deserialize bytes written by encode_value
+    """
+    header, payload = data[:1], data[1:]
+    if header == COMPRESSED:
+        payload = zlib.decompress(payload)
+    elif header != PLAIN:
+        raise ValueError("Unknown cache payload format")
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
 
 def get_cache_key(prefix: str, **kwargs) -> str:
     """
@@ -18,17 +106,434 @@ def get_cache_key(prefix: str, **kwargs) -> str:
     return ":".join(key_parts)
 
 
+class CacheMetrics:
+    """
+    Hit, miss and latency counters of a cache
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.early_refreshes = 0
+        self.lock_waits = 0
+        self.errors = 0
+        self.computes = 0
+        self.compressed = 0
+        self.bytes_written = 0
+        self.lookup_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "early_refreshes": self.early_refreshes,
+            "lock_waits": self.lock_waits,
+            "errors": self.errors,
+            "computes": self.computes,
+            "compressed": self.compressed,
+            "bytes_written": self.bytes_written,
+            "avg_lookup_ms": 1000 * self.lookup_seconds / lookups if lookups else None,
+            "avg_compute_ms": 1000 * self.compute_seconds / self.computes if self.computes else None,
+        }
+
+
+class ResponseCache:
+    """
+    Redis cache for computed endpoint results
+
+    - Stampede protection: a missing key is computed once per process (other
+      callers await the same computation) and once across replicas (a Redis
+      lock is held while computing; other replicas wait for the value).
+    - Early probabilistic refresh: a hit close to expiry is refreshed in the
+      background with a probability that grows as expiry nears and with the
+      time the value took to compute, so popular keys rarely expire at all.
+    - Values are stored as JSON (orjson when installed), compressed above
+      CACHE_COMPRESS_THRESHOLD, never pickled.
+    - Keys are grouped by tags (Redis sets) and invalidated per tag, without
+      scanning the keyspace.
+
+    Redis errors are logged and counted, and the value is computed directly.
+    """
+
+    def __init__(self, client: Optional["redis.asyncio.Redis"] = None):
+        """
+        Initialize the ResponseCache
+
+        Args:
+            client: Async Redis client (defaults to one connected to REDIS_URI)
+        """
+        self.client = client or redis.asyncio.Redis.from_url(settings.REDIS_URI)
+        self.metrics = CacheMetrics()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._release_lock = self.client.register_script(RELEASE_LOCK_SCRIPT)
+
+    async def _read(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """
+        Read an entry as (value, compute seconds, expiry timestamp)
+        """
+        try:
+            data = await self.client.get(VALUE_PREFIX + key)
+            if data is None:
+                return None
+            value, delta, expires_at = decode_value(data)
+            return value, delta, expires_at
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error reading cache key {key}: {str(e)}")
+            return None
+
+    async def _write(self, key: str, value: Any, ttl: int, delta: float, tags: Iterable[str]) -> None:
+        try:
+            data = encode_value([value, delta, time.time() + ttl])
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(VALUE_PREFIX + key, data, ex=ttl)
+                for tag in tags:
+                    pipe.sadd(TAG_PREFIX + tag, key)
+                    pipe.expire(TAG_PREFIX + tag, max(ttl, settings.CACHE_TAG_TTL))
+                await pipe.execute()
+            self.metrics.bytes_written += len(data)
+            if data[:1] == COMPRESSED:
+                self.metrics.compressed += 1
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error writing cache key {key}: {str(e)}")
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        """
+        Take the fill lock of a key, returning its token (or None if held elsewhere)
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.client.set(LOCK_PREFIX + key, token, nx=True, ex=settings.CACHE_LOCK_TIMEOUT)
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error locking cache key {key}: {str(e)}")
+            # Without Redis, compute locally
+            return token
+        return token if acquired else None
+
+    async def _release(self, key: str, token: str) -> None:
+        try:
+            await self._release_lock(keys=[LOCK_PREFIX + key], args=[token])
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error unlocking cache key {key}: {str(e)}")
+
+    async def _wait_for_fill(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """
+        Wait for another replica holding the fill lock to write the value
+        """
+        self.metrics.lock_waits += 1
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            entry = await self._read(key)
+            if entry is not None:
+                return entry
+            try:
+                if not await self.client.exists(LOCK_PREFIX + key):
+                    return None
+            except Exception:
+                return None
+            delay = min(delay * 2, 0.25)
+        return None
+
+    async def _fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: List[str],
+        cache_if: Optional[Callable[[Any], bool]],
+        wait: bool
+    ) -> Tuple[bool, Any]:
+        """
+        Compute a value under the fill lock and store it
+
+        Returns:
+            (whether the value was computed here, value); when another replica
+            holds the lock and wait is False, returns (False, None)
+        """
+        token = await self._acquire(key)
+        if token is None:
+            if not wait:
+                return False, None
+            entry = await self._wait_for_fill(key)
+            if entry is not None:
+                return False, entry[0]
+            # The other replica gave up; compute without the lock
+            token = await self._acquire(key)
+
+        try:
+            started = time.monotonic()
+            value = await compute()
+            delta = time.monotonic() - started
+            self.metrics.computes += 1
+            self.metrics.compute_seconds += delta
+
+            if cache_if is None or cache_if(value):
+                await self._write(key, value, ttl, delta, tags)
+            return True, value
+        finally:
+            if token is not None:
+                await self._release(key, token)
+
+    def _should_refresh(self, delta: float, expires_at: float) -> bool:
+        """
+        Probabilistic early expiration (XFetch)
+        """
+        beta = settings.CACHE_EARLY_REFRESH_BETA
+        if beta <= 0:
+            return False
+        return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+    def _log_refresh_error(self, key: str) -> Callable[[asyncio.Future], None]:
+        """
+        Done-callback of an early refresh, which no caller awaits
+        """
+        def log(future: asyncio.Future) -> None:
+            if future.cancelled() or future.exception() is None:
+                return
+            self.metrics.errors += 1
+            logger.error(f"Early refresh of cache key {key} failed: {future.exception()!r}")
+
+        return log
+
+    def _single_flight(self, key: str, fill: Callable[[], Awaitable[Tuple[bool, Any]]]) -> asyncio.Future:
+        """
+        Share one fill of a key among the callers in this process
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fill())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss
+
+        Args:
+            key: Cache key
+            compute: Coroutine function computing the value
+            ttl: Seconds to keep the value (defaults to CACHE_TTL)
+            tags: Tags to invalidate the value by
+            cache_if: Predicate deciding whether a computed value is stored
+            decode: Conversion applied to values read from the cache (e.g. a
+                Pydantic model's parse_obj)
+
+        Returns:
+            The cached or computed value
+        """
+        ttl = ttl or settings.CACHE_TTL
+        tags = list(tags)
+
+        started = time.monotonic()
+        entry = await self._read(key)
+        self.metrics.lookup_seconds += time.monotonic() - started
+
+        if entry is not None:
+            self.metrics.hits += 1
+            value, delta, expires_at = entry
+            if key not in self._inflight and self._should_refresh(delta, expires_at):
+                self.metrics.early_refreshes += 1
+                refresh = self._single_flight(key, lambda: self._fill(key, compute, ttl, tags, cache_if, wait=False))
+                refresh.add_done_callback(self._log_refresh_error(key))
+            return decode(value) if decode else value
+
+        self.metrics.misses += 1
+        computed, value = await asyncio.shield(
+            self._single_flight(key, lambda: self._fill(key, compute, ttl, tags, cache_if, wait=True))
+        )
+        return value if computed or not decode else decode(value)
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Remove cached values by key
+        """
+        if not keys:
+            return
+        try:
+            await self.client.delete(*[VALUE_PREFIX + key for key in keys])
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error invalidating cache keys: {str(e)}")
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Remove all cached values carrying any of the tags
+
+        Returns:
+            Number of keys removed
+        """
+        removed = 0
+        try:
+            for tag in tags:
+                keys = await self.client.smembers(TAG_PREFIX + tag)
+                async with self.client.pipeline(transaction=False) as pipe:
+                    if keys:
+                        pipe.delete(*[VALUE_PREFIX + key.decode("utf-8") for key in keys])
+                    pipe.delete(TAG_PREFIX + tag)
+                    results = await pipe.execute()
+                if keys:
+                    removed += results[0]
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Error invalidating cache tags {tags}: {str(e)}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics
+        """
+        return {**self.metrics.to_dict(), "inflight": len(self._inflight)}
+
+
+# Response cache singleton
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Create or return the shared ResponseCache
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+
+def _key_default(value: Any) -> Any:
+    """
+    Canonical JSON representation of non-scalar key values
+    """
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return _json_default(value)
+
+
+def _key_value(value: Any) -> Any:
+    """
+    Part of a cache key for an argument, or None if it does not identify the result
+
+    Lists, dicts and Pydantic models (e.g. request bodies) contribute a hash of
+    their canonical JSON, so calls with different contents get different keys.
+    Other objects (sessions, requests, clients) are left out of the key.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool, date)):
+        return value
+    if isinstance(value, dict) and "id" in value:
+        # e.g. the current user
+        return value["id"]
+    if isinstance(value, (dict, list, tuple, set, frozenset, BaseModel)):
+        canonical = json.dumps(value, default=_key_default, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+    return None
+
+
+def cached(
+    prefix: str,
+    ttl: Optional[int] = None,
+    tags: Union[Iterable[str], Callable[[Dict[str, Any]], Iterable[str]], None] = None,
+    vary_on: Optional[List[str]] = None,
+    model: Optional[type] = None,
+    cache_if: Optional[Callable[[Any], bool]] = None
+):
+    """
+    Cache the result of an async function (e.g. an endpoint) in the response cache
+
+    The key is built from the prefix and the arguments named in vary_on
+    (default: every argument with a plain value). Dicts with an "id", such as
+    the current user, contribute their id; other lists, dicts and Pydantic
+    models contribute a hash of their contents. When CACHE_ENABLED is off the
+    function is called directly.
+
+    Args:
+        prefix: Key prefix
+        ttl: Seconds to keep results (defaults to CACHE_TTL)
+        tags: Tags of the results, or a function of the bound arguments returning them
+        vary_on: Names of the arguments the result depends on
+        model: Pydantic model cached values are parsed into
+        cache_if: Predicate deciding whether a result is stored
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return await func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+
+            names = vary_on if vary_on is not None else list(arguments)
+            key = get_cache_key(prefix, **{name: _key_value(arguments.get(name)) for name in names})
+            value_tags = tags(arguments) if callable(tags) else (tags or [])
+
+            return await get_response_cache().get_or_compute(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                tags=value_tags,
+                cache_if=cache_if,
+                decode=model.parse_obj if model is not None else None
+            )
+
+        return wrapper
+
+    return decorator
+
+
+# Synchronous helpers for code outside the event loop
+_redis_client = None
+_redis_client_lock = threading.Lock()
+
+
+def get_redis_client() -> "redis.Redis":
+    """
+    Create or return the synchronous Redis client
+    """
+    global _redis_client
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(settings.REDIS_URI)
+    return _redis_client
+
+
 def get_cached_data(key: str) -> Optional[Any]:
     """
     Get data from cache
     """
     try:
-        cached = redis_client.get(key)
-        if cached:
-            return pickle.loads(cached)
+        cached_value = get_redis_client().get(VALUE_PREFIX + key)
+        if cached_value:
+            return decode_value(cached_value)[0]
         return None
     except Exception as e:
-        print(f"Error getting cache: {str(e)}")
+        logger.error(f"Error getting cache: {str(e)}")
         return None
 
 
@@ -38,11 +543,11 @@ def set_cached_data(key: str, data: Any, ttl: int = None) -> bool:
     """
     try:
         ttl = ttl or settings.CACHE_TTL
-        serialized = pickle.dumps(data)
-        redis_client.setex(key, ttl, serialized)
+        serialized = encode_value([data, 0.0, time.time() + ttl])
+        get_redis_client().setex(VALUE_PREFIX + key, ttl, serialized)
         return True
     except Exception as e:
-        print(f"Error setting cache: {str(e)}")
+        logger.error(f"Error setting cache: {str(e)}")
         return False
 
 
@@ -51,22 +556,31 @@ def invalidate_cache(key: str) -> bool:
     Invalidate cache for a specific key
     """
     try:
-        redis_client.delete(key)
+        get_redis_client().delete(VALUE_PREFIX + key)
         return True
     except Exception as e:
-        print(f"Error invalidating cache: {str(e)}")
+        logger.error(f"Error invalidating cache: {str(e)}")
         return False
 
 
 def invalidate_cache_pattern(pattern: str) -> bool:
     """
     Invalidate cache for all keys matching a pattern
+
+    Iterates with SCAN, which does not block Redis like KEYS; prefer tags
+    (ResponseCache.invalidate_tags) for keys that are invalidated together.
     """
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
+        client = get_redis_client()
+        batch = []
+        for key in client.scan_iter(match=VALUE_PREFIX + pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                client.delete(*batch)
+                batch = []
+        if batch:
+            client.delete(*batch)
         return True
     except Exception as e:
-        print(f"Error invalidating cache pattern: {str(e)}")
-        return False
\ No newline at end of file
+        logger.error(f"Error invalidating cache pattern: {str(e)}")
+        return False
@@ -44,12 +44,63 @@ class Settings(BaseSettings):
     def POSTGRES_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    # Report data source: 'warehouse' (analytics star schema) or 'http' (ticket/user services)
+    REPORT_DATA_SOURCE: str = "http"
+    # Analytics warehouse database (required by the 'warehouse' data source)
+    WAREHOUSE_URI: Optional[str] = None
+    WAREHOUSE_POOL_SIZE: int = 5
+    # Seconds a report data snapshot may be shared by concurrent report builds
+    REPORT_SNAPSHOT_TTL: int = 300
+    # Ticket service pagination for the 'http' report data source
+    REPORT_TICKET_PAGE_SIZE: int = 100
+    REPORT_TICKET_FETCH_CONCURRENCY: int = 4
+    
     # Redis Settings (for caching)
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str = ""
     REDIS_DB: int = 0
     CACHE_TTL: int = 3600  # 1 hour in seconds
+    CACHE_ENABLED: bool = True
+    CACHE_COMPRESS_THRESHOLD: int = 1024  # bytes
+    CACHE_LOCK_TIMEOUT: int = 30  # seconds a fill may take before others compute too
+    CACHE_EARLY_REFRESH_BETA: float = 1.0  # 0 disables early refresh
+    CACHE_TAG_TTL: int = 86400
+    REPORT_CACHE_TTL: int = 300  # on-demand report exports
+    
+    # Chart render worker pool (0 workers renders in-process)
+    RENDER_POOL_WORKERS: int = 2
+    RENDER_POOL_MAX_PENDING: int = 32
+    RENDER_POOL_TIMEOUT: float = 30.0
+    
+    # Scheduled report execution (claims are shared by all replicas)
+    SCHEDULED_REPORT_POLL_SECONDS: int = 30
+    SCHEDULED_REPORT_LEASE_SECONDS: int = 600
+    SCHEDULED_REPORT_CONCURRENCY: int = 2
+    
+    # Report build worker processes (0 builds in the API process) and job queue
+    REPORT_WORKERS: int = 2
+    REPORT_QUEUE_MAX: int = 100
+    REPORT_JOB_RETENTION_SECONDS: int = 3600
+    
+    # Incremental scheduled reports (per-day partial aggregates reused across runs)
+    REPORT_INCREMENTAL: bool = True
+    REPORT_PARTIALS_RETENTION_DAYS: int = 400
+    
+    # PDF render pool (concurrent wkhtmltopdf processes)
+    PDF_POOL_WORKERS: int = 2
+    PDF_POOL_MAX_PENDING: int = 32
+    PDF_POOL_TIMEOUT: float = 60.0
+    WKHTMLTOPDF_PATH: Optional[str] = None
+    
+    # Streaming exports (chunk size and in-memory limit of the spooled file, in bytes)
+    EXPORT_CHUNK_SIZE: int = 64 * 1024
+    EXPORT_SPOOL_MAX_SIZE: int = 8 * 1024 * 1024
+    EXPORT_ROW_BATCH_SIZE: int = 10000
+    
+    # Content-addressed store for export files and chart images ("gridfs" or "local")
+    ARTIFACT_STORE_BACKEND: str = "gridfs"
+    ARTIFACT_STORE_PATH: str = "./data/artifacts"
     
     @property
     def REDIS_URI(self) -> str:
@@ -14,12 +14,21 @@ class FileBasedDB:
         # Create a simple collection-like interface
         self.reports = FileCollection(os.path.join(base_dir, "reports"))
         self.templates = FileCollection(os.path.join(base_dir, "templates"))
+        self.scheduled_reports = FileCollection(os.path.join(base_dir, "scheduled_reports"))
+        self.report_partials = FileCollection(os.path.join(base_dir, "report_partials"))
+        self.report_group_runs = FileCollection(os.path.join(base_dir, "report_group_runs"))
     
     def __getitem__(self, collection_name):
         if collection_name == "reports":
             return self.reports
         elif collection_name == "templates":
             return self.templates
+        elif collection_name == "scheduled_reports":
+            return self.scheduled_reports
+        elif collection_name == "report_partials":
+            return self.report_partials
+        elif collection_name == "report_group_runs":
+            return self.report_group_runs
         raise KeyError(f"Collection {collection_name} not found")
 
 class FileCollection:
@@ -27,7 +36,7 @@ class FileCollection:
         self.directory = directory
         os.makedirs(directory, exist_ok=True)
     
-    def create_index(self, field_name):
+    def create_index(self, keys, **kwargs):
         # No-op for file-based storage
         pass
     
@@ -47,10 +56,22 @@ class FileCollection:
         # Implementation for local file ops will be handled in models
         return {"modified_count": 0}
     
+    def replace_one(self, query, document, **kwargs):
+        # Implementation for local file ops will be handled in models
+        return {"modified_count": 0}
+    
+    def find_one_and_update(self, query, update, **kwargs):
+        # Implementation for local file ops will be handled in models
+        return None
+    
     def delete_one(self, query):
         # Implementation for local file ops will be handled in models
         return {"deleted_count": 0}
     
+    def delete_many(self, query):
+        # Implementation for local file ops will be handled in models
+        return {"deleted_count": 0}
+    
     def count_documents(self, query):
         # Implementation for local file ops will be handled in models
         return 0
@@ -71,11 +92,20 @@ except Exception as e:
 # Define collections
 report_collection = db["reports"]
 template_collection = db["templates"]
+scheduled_report_collection = db["scheduled_reports"]
+report_partial_collection = db["report_partials"]
+report_group_run_collection = db["report_group_runs"]
 
 # Create indexes (only affects MongoDB, no-op for file-based)
 try:
     report_collection.create_index("user_id")
     report_collection.create_index("created_at")
     template_collection.create_index("name")
+    # Due-report claims scan active reports by next run time
+    scheduled_report_collection.create_index([("active", 1), ("next_run", 1)])
+    # Incremental reports load the partials of a window's days
+    report_partial_collection.create_index([("aggregate", 1), ("day", 1)])
+    # Group run claims are only needed while replicas fire the same run
+    report_group_run_collection.create_index("claimed_at", expireAfterSeconds=7 * 24 * 3600)
 except Exception as e:
     print(f"Failed to create indexes: {e}")
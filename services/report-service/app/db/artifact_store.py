@@ -0,0 +1,205 @@
+import base64
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ArtifactNotFound(Exception):
+    """
+    Raised when an artifact is not in the store
+    """
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for report exports and chart images
+
+    Artifacts are keyed by the SHA-256 of their bytes, so storing the same
+    bytes twice (e.g. an identical chart in two reports) keeps a single copy.
+    Report documents only hold the reference returned by put().
+    """
+
+    def put(self, data: bytes, content_type: str) -> Dict[str, Any]:
+        """
+        Store bytes unless an identical artifact already exists
+
+        Args:
+            data: Artifact bytes
+            content_type: MIME type of the artifact
+
+        Returns:
+            Artifact reference {"artifact_id", "size", "content_type"}
+        """
+        artifact_id = hashlib.sha256(data).hexdigest()
+        if not self.exists(artifact_id):
+            self._write(artifact_id, data, content_type)
+        return {"artifact_id": artifact_id, "size": len(data), "content_type": content_type}
+
+    def exists(self, artifact_id: str) -> bool:
+        raise NotImplementedError
+
+    def _write(self, artifact_id: str, data: bytes, content_type: str) -> None:
+        raise NotImplementedError
+
+    def open(self, artifact_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Iterate over the bytes of an artifact in chunks
+
+        Raises:
+            ArtifactNotFound: If the artifact is not in the store
+        """
+        raise NotImplementedError
+
+    def read(self, artifact_id: str) -> bytes:
+        """
+        Read a whole artifact
+        """
+        return b"".join(self.open(artifact_id))
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    Artifact store on the local disk, one file per artifact under root/ab/cd/<sha256>
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> str:
+        return os.path.join(self.root, artifact_id[:2], artifact_id[2:4], artifact_id)
+
+    def exists(self, artifact_id: str) -> bool:
+        return os.path.exists(self._path(artifact_id))
+
+    def _write(self, artifact_id: str, data: bytes, content_type: str) -> None:
+        path = self._path(artifact_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it, so readers never see a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def open(self, artifact_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        path = self._path(artifact_id)
+        if not os.path.exists(path):
+            raise ArtifactNotFound(artifact_id)
+        return self._iter_file(path, chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def _iter_file(path: str, chunk_size: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class GridFSArtifactStore(ArtifactStore):
+    """
+    Artifact store in MongoDB GridFS, using the SHA-256 as the file _id
+    """
+
+    def __init__(self, database, collection: str = "artifacts"):
+        import gridfs
+
+        self.fs = gridfs.GridFS(database, collection=collection)
+
+    def exists(self, artifact_id: str) -> bool:
+        return self.fs.exists(artifact_id)
+
+    def _write(self, artifact_id: str, data: bytes, content_type: str) -> None:
+        import gridfs.errors
+
+        try:
+            self.fs.put(data, _id=artifact_id, content_type=content_type)
+        except gridfs.errors.FileExists:
+            # Stored concurrently by another report
+            pass
+
+    def open(self, artifact_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        import gridfs.errors
+
+        try:
+            grid_out = self.fs.get(artifact_id)
+        except gridfs.errors.NoFile:
+            raise ArtifactNotFound(artifact_id)
+        return self._iter_grid_out(grid_out, chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def _iter_grid_out(grid_out, chunk_size: int) -> Iterator[bytes]:
+        try:
+            while True:
+                chunk = grid_out.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            grid_out.close()
+
+
+def is_artifact_ref(value: Any) -> bool:
+    """
+    Whether a stored value is an artifact reference
+    """
+    return isinstance(value, dict) and "artifact_id" in value
+
+
+def store_charts(store: ArtifactStore, charts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Move base64 PNG charts into the store, returning references in their place
+    """
+    return {
+        name: chart if is_artifact_ref(chart) else store.put(base64.b64decode(chart), "image/png")
+        for name, chart in charts.items()
+    }
+
+
+def load_charts(store: ArtifactStore, charts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve chart references back to base64 PNGs (for rendering HTML/PDF exports)
+    """
+    return {
+        name: base64.b64encode(store.read(chart["artifact_id"])).decode("utf-8") if is_artifact_ref(chart) else chart
+        for name, chart in charts.items()
+    }
+
+
+# Artifact store singleton
+_artifact_store = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Create or return the artifact store configured by ARTIFACT_STORE_BACKEND
+    """
+    global _artifact_store
+    if _artifact_store is None:
+        with _artifact_store_lock:
+            if _artifact_store is None:
+                if settings.ARTIFACT_STORE_BACKEND == "gridfs":
+                    from app.db.database import get_mongodb_client
+
+                    _artifact_store = GridFSArtifactStore(get_mongodb_client()[settings.MONGO_DB])
+                elif settings.ARTIFACT_STORE_BACKEND == "local":
+                    _artifact_store = LocalArtifactStore(settings.ARTIFACT_STORE_PATH)
+                else:
+                    raise ValueError(f"Unknown artifact store backend: {settings.ARTIFACT_STORE_BACKEND}")
+                logger.info(f"Artifact store created ({settings.ARTIFACT_STORE_BACKEND})")
+    return _artifact_store
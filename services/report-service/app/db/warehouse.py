@@ -0,0 +1,37 @@
+import logging
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Warehouse engine singleton
+_warehouse_engine = None
+_warehouse_engine_lock = threading.Lock()
+
+
+def get_warehouse_engine() -> Engine:
+    """
+    Create or return the engine for the analytics data warehouse
+
+    Raises:
+        ValueError: If WAREHOUSE_URI is not configured
+    """
+    global _warehouse_engine
+    if _warehouse_engine is None:
+        if not settings.WAREHOUSE_URI:
+            raise ValueError("WAREHOUSE_URI must be set to use the 'warehouse' report data source")
+        with _warehouse_engine_lock:
+            if _warehouse_engine is None:
+                _warehouse_engine = create_engine(
+                    settings.WAREHOUSE_URI,
+                    pool_pre_ping=True,
+                    pool_size=settings.WAREHOUSE_POOL_SIZE
+                )
+                logger.info("Warehouse engine created")
+    return _warehouse_engine
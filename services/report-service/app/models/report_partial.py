@@ -0,0 +1,75 @@
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.database import report_partial_collection
+
+
+def _day_key(day: date) -> datetime:
+    """
+    Stored form of a day (BSON has no date type)
+    """
+    return datetime.combine(day, time.min)
+
+
+def get_report_partials(aggregate: str, days: Iterable[date]) -> Dict[date, Dict[str, Any]]:
+    """
+    Get the stored partial aggregates of the given days
+
+    Returns:
+        Dict mapping each stored day to its fingerprint and partial
+    """
+    days = [_day_key(day) for day in days]
+    if not days:
+        return {}
+
+    partials = {}
+    for document in report_partial_collection.find({"aggregate": aggregate, "day": {"$in": days}}):
+        partials[document["day"].date()] = {
+            "fingerprint": document["fingerprint"],
+            "partial": document["partial"]
+        }
+    return partials
+
+
+def save_report_partials(aggregate: str, partials: Dict[date, Tuple[Any, Dict[str, Any]]]) -> None:
+    """
+    Store partial aggregates by day, replacing earlier ones
+
+    Args:
+        aggregate: Aggregate name (e.g. 'ticket_summary')
+        partials: Dict mapping days to (fingerprint, partial)
+    """
+    now = datetime.utcnow()
+    for day, (fingerprint, partial) in partials.items():
+        report_partial_collection.replace_one(
+            {"_id": f"{aggregate}:{day.isoformat()}"},
+            {
+                "aggregate": aggregate,
+                "day": _day_key(day),
+                "fingerprint": fingerprint,
+                "partial": partial,
+                "updated_at": now
+            },
+            upsert=True
+        )
+
+
+def delete_report_partials(aggregate: Optional[str] = None, before: Optional[date] = None) -> int:
+    """
+    Delete stored partial aggregates, forcing the next runs to recompute them
+
+    Args:
+        aggregate: Only delete partials of this aggregate
+        before: Only delete partials of days before this one
+
+    Returns:
+        Number of deleted partials
+    """
+    query = {}
+    if aggregate:
+        query["aggregate"] = aggregate
+    if before:
+        query["day"] = {"$lt": _day_key(before)}
+
+    result = report_partial_collection.delete_many(query)
+    return getattr(result, "deleted_count", 0)
@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
-from app.core.database import scheduled_report_collection
+from app.core.database import report_group_run_collection, scheduled_report_collection
 from app.schemas.report import ScheduledReportCreate, ScheduledReportUpdate, ScheduleFrequency
 
 
@@ -184,6 +186,9 @@ def delete_scheduled_report(report_id: str) -> bool:
 def get_due_reports() -> List[Dict[str, Any]]:
     """
     Get reports that are due to run
+    
+    Only lists them; replicas executing reports must claim each one with
+    claim_due_report so it runs once.
     """
     now = datetime.utcnow()
     
@@ -246,6 +251,141 @@ def update_report_after_run(report_id: str) -> Optional[Dict[str, Any]]:
     return get_scheduled_report(str(object_id))
 
 
+def claim_due_report(owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+    """
+    Atomically claim the most overdue report that no other replica holds
+    
+    The claim sets a lease (owner and expiry) in the same find_one_and_update
+    that selects the report, so concurrent replicas never claim the same
+    report. A lease that expires (its owner crashed) makes the report
+    claimable again.
+    
+    Args:
+        owner: ID of the claiming replica
+        lease_seconds: How long the claim holds without renewal
+    
+    Returns:
+        The claimed report, or None if no report is due
+    """
+    now = datetime.utcnow()
+    
+    report = scheduled_report_collection.find_one_and_update(
+        {
+            "active": True,
+            "next_run": {"$lte": now},
+            "$or": [
+                {"lease_expires_at": None},
+                {"lease_expires_at": {"$lte": now}}
+            ]
+        },
+        {
+            "$set": {
+                "lease_owner": owner,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds)
+            }
+        },
+        sort=[("next_run", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+    
+    # Convert ObjectId to string
+    if report:
+        report["id"] = str(report.pop("_id"))
+    
+    return report
+
+
+def renew_report_lease(report_id: str, owner: str, lease_seconds: float) -> bool:
+    """
+    Extend a claim for a report that is still running
+    
+    Returns:
+        False if the lease was lost (expired and claimed by another replica)
+    """
+    result = scheduled_report_collection.update_one(
+        {"_id": ObjectId(report_id), "lease_owner": owner},
+        {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}}
+    )
+    return result.matched_count > 0
+
+
+def complete_claimed_report(report_id: str, owner: str) -> bool:
+    """
+    Advance a claimed report to its next run and release the claim
+    
+    Returns:
+        False if the lease was lost, in which case nothing is changed
+    """
+    object_id = ObjectId(report_id)
+    
+    report = scheduled_report_collection.find_one({"_id": object_id, "lease_owner": owner})
+    if not report:
+        return False
+    
+    # Calculate next run time
+    next_run = calculate_next_run(
+        frequency=report["frequency"],
+        day_of_week=report.get("day_of_week"),
+        day_of_month=report.get("day_of_month"),
+        hour=report["hour"],
+        minute=report["minute"]
+    )
+    
+    now = datetime.utcnow()
+    
+    result = scheduled_report_collection.update_one(
+        {"_id": object_id, "lease_owner": owner},
+        {
+            "$set": {
+                "last_run": now,
+                "next_run": next_run,
+                "updated_at": now
+            },
+            "$unset": {"lease_owner": "", "lease_expires_at": ""}
+        }
+    )
+    return result.matched_count > 0
+
+
+def release_claimed_report(report_id: str, owner: str, retry_seconds: float = 0) -> bool:
+    """
+    Release a claim without advancing the report
+    
+    The report becomes claimable again after retry_seconds, so a failing
+    report is retried on a later poll rather than in a tight loop.
+    """
+    result = scheduled_report_collection.update_one(
+        {"_id": ObjectId(report_id), "lease_owner": owner},
+        {
+            "$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=retry_seconds)},
+            "$unset": {"lease_owner": ""}
+        }
+    )
+    return result.matched_count > 0
+
+
+def claim_group_run(group_id: str, run_time: datetime, owner: str) -> bool:
+    """
+    Atomically claim one run of a report group job
+    
+    Every replica sharing the scheduler job store fires group jobs itself.
+    The first replica to insert the run's claim (keyed by group and run
+    time) builds it; the insert fails with a duplicate key for the others.
+    
+    Returns:
+        True if this replica claimed the run
+    """
+    try:
+        report_group_run_collection.insert_one({
+            "_id": f"{group_id}:{run_time.isoformat()}",
+            "owner": owner,
+            "claimed_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
+        return False
+    return True
+
+
 def calculate_next_run(
     frequency: ScheduleFrequency,
     hour: int,
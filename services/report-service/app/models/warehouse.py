@@ -0,0 +1,62 @@
+"""
+Read-only table definitions for the analytics data warehouse
+
+The star schema is owned and loaded by analytics-service; only the columns
+used by report queries are declared here.
+"""
+from sqlalchemy import (
+    Boolean, Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table
+)
+
+warehouse_metadata = MetaData()
+
+fact_tickets = Table(
+    "fact_tickets",
+    warehouse_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("ticket_id", String),
+    Column("created_date_id", Integer, ForeignKey("dim_dates.id")),
+    Column("resolved_date_id", Integer, ForeignKey("dim_dates.id")),
+    Column("user_id", Integer, ForeignKey("dim_users.id")),
+    Column("assigned_to_id", Integer, ForeignKey("dim_users.id")),
+    Column("priority_id", Integer, ForeignKey("dim_priorities.id")),
+    Column("status_id", Integer, ForeignKey("dim_statuses.id")),
+    Column("response_time_minutes", Float),
+    Column("resolution_time_minutes", Float),
+    Column("etl_updated_at", DateTime),
+)
+
+dim_dates = Table(
+    "dim_dates",
+    warehouse_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("date", DateTime),
+)
+
+dim_users = Table(
+    "dim_users",
+    warehouse_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", String),
+    Column("username", String),
+    Column("role", String),
+    Column("is_active", Boolean),
+    Column("etl_updated_at", DateTime),
+)
+
+dim_priorities = Table(
+    "dim_priorities",
+    warehouse_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+    Column("level", Integer),
+    Column("etl_updated_at", DateTime),
+)
+
+dim_statuses = Table(
+    "dim_statuses",
+    warehouse_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+    Column("etl_updated_at", DateTime),
+)
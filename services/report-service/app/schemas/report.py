@@ -116,6 +116,7 @@ class ScheduledReportCreate(BaseModel):
     minute: int
     format: ReportFormat = ReportFormat.PDF
     recipients: List[str]  # Email addresses
+    full_rebuild: bool = False  # recompute every day instead of reusing stored partials
 
 
 class ScheduledReportUpdate(BaseModel):
@@ -129,6 +130,7 @@ class ScheduledReportUpdate(BaseModel):
     minute: Optional[int] = None
     format: Optional[ReportFormat] = None
     recipients: Optional[List[str]] = None
+    full_rebuild: Optional[bool] = None
     active: Optional[bool] = None
 
 